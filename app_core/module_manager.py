@@ -96,13 +96,15 @@ class ModuleManager:
     def _init_translator(self):
         """Initialiseer Translator service"""
         try:
-            # Test LibreTranslate server connectie
-            import requests
-            server_url = "http://100.90.127.78:5000"
-            response = requests.get(f"{server_url}/languages", timeout=10)
-            if response.status_code == 200:
+            # Test LibreTranslate server connectie (standaard server of MAGIC_TIME_LIBRETRANSLATE_URL)
+            from core.translation_backends import LibreTranslateBackend, TranslationError
+            backend = LibreTranslateBackend(timeout=10)
+            try:
+                backend.languages()
                 print("✅ LibreTranslate server bereikbaar")
-            else:
+            except TranslationError:
                 print("⚠️ LibreTranslate server niet bereikbaar")
+            finally:
+                backend.close()
         except Exception as e:
             print(f"⚠️ Fout bij controleren LibreTranslate: {e}")
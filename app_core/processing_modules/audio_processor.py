@@ -8,6 +8,10 @@ import tempfile
 import subprocess
 from typing import Optional
 
+from core.media_probe import get_media_duration
+from core.cancellation import CancelledError
+from core.audio_extraction import extract_audio
+
 class AudioProcessor:
     """Audio verwerking module"""
     
@@ -141,23 +145,20 @@ class AudioProcessor:
             if hasattr(self, 'processing_thread') and self.processing_thread:
                 self.processing_thread.progress_updated.emit(25.0, "Audio extractie...")
             
-            # FFmpeg commando voor audio extractie
-            cmd = [
-                self.ffmpeg_path, "-i", video_path,
-                "-vn",  # Geen video
-                "-acodec", "pcm_s16le",  # PCM 16-bit
-                "-ar", "16000",  # 16kHz sample rate (optimaal voor Whisper)
-                "-ac", "1",  # Mono
-                "-y",  # Overschrijf bestaand bestand
-                audio_path
-            ]
-            
-            # Voer FFmpeg uit
+            # Goedkoopste commando op basis van de probe: alleen het spoor in de ingestelde taal,
+            # kopiëren als het al 16 kHz mono PCM is
             print(f"🎬 [START] FFmpeg gestart voor audio extractie")
-            print(f"🔍 [BEZIG] FFmpeg commando: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            # Via de gedeelde runner: bij stop wordt alleen dit eigen FFmpeg proces beëindigd,
+            # de timeout schaalt met de duur van de video
+            token = getattr(getattr(self, 'processing_thread', None), 'cancel_token', None)
+            language = (getattr(self, 'settings', None) or {}).get("language")
+            result = extract_audio(video_path, audio_path, language=language, reuse_input=False,
+                                   token=token, ffmpeg_path=self.ffmpeg_path,
+                                   progress_callback=self._extraction_progress_callback())
             
-            if result.returncode == 0 and os.path.exists(audio_path):
+            if not result.get("error") and os.path.exists(audio_path):
+                print(f"🔍 [INFO] Audio {result['mode']} (spoor {result['stream']['position']}): "
+                      f"{result['speed'] or 0:.0f}x realtime")
                 # Controleer of bestand toegankelijk is
                 try:
                     # Test of bestand kan worden geopend
@@ -187,16 +188,18 @@ class AudioProcessor:
                     print(f"❌ [FOUT] Audio bestand niet toegankelijk: {e}")
                     return None
             else:
-                error_msg = f"FFmpeg fout (code {result.returncode}): {result.stderr}"
-                if result.stdout:
-                    error_msg += f"\nOutput: {result.stdout}"
+                # Exit code en de laatste stderr regels zijn al door de runner gelogd
+                error_msg = result.get("error", "Geen audio bestand")
                 print(f"❌ [FOUT] {error_msg}")
                 if hasattr(self, 'processing_thread') and self.processing_thread:
                     self.processing_thread.error_occurred.emit(f"Audio extractie gefaald: {error_msg}")
                 return None
             
+        except CancelledError:
+            print("🛑 [STOP] Audio extractie gestopt")
+            raise
         except subprocess.TimeoutExpired:
-            print("❌ [FOUT] Audio extractie timeout (5 minuten)")
+            print("❌ [FOUT] Audio extractie timeout (geen voortgang of trager dan realtime)")
             if hasattr(self, 'processing_thread') and self.processing_thread:
                 self.processing_thread.error_occurred.emit("Audio extractie timeout - probeer een kortere video of controleer FFmpeg")
             return None
@@ -213,6 +216,16 @@ class AudioProcessor:
                 self.processing_thread.error_occurred.emit(f"Audio extractie gefaald: {e}")
             return None
     
+    def _extraction_progress_callback(self):
+        """Voortgang van de FFmpeg extractie naar de status van de processing thread"""
+        processing_thread = getattr(self, 'processing_thread', None)
+        if not processing_thread:
+            return None
+        
+        def callback(percent: float, message: str):
+            processing_thread.progress_updated.emit(25.0, f"Audio extractie... {message}")
+        return callback
+    
     def get_audio_path(self, video_path: str) -> str:
         """Genereer het pad naar het audio bestand voor een video bestand"""
         video_name = os.path.splitext(os.path.basename(video_path))[0]
@@ -247,7 +260,12 @@ class AudioProcessor:
     def get_audio_duration(self, audio_path: str) -> Optional[float]:
         """Bepaal de duur van een audio bestand"""
         try:
-            # Probeer eerst met FFprobe als het beschikbaar is
+            # Gecachede metadata (één ffprobe aanroep per bestand versie)
+            duration = get_media_duration(audio_path)
+            if duration:
+                return duration
+            
+            # Probeer daarna met FFprobe als het beschikbaar is
             if (os.path.exists(self.ffprobe_path) and 
                 not self.ffprobe_path.endswith("ffmpeg") and
                 self.ffprobe_path != self.ffmpeg_path and
@@ -4,15 +4,25 @@ Handelt vertaling van transcripties af
 """
 
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, Any, List
 
+from core.transcript import Transcript
+from core.cancellation import CancelledError
+from core.batch_manifest import STAGE_TRANSLATE, write_json_atomic, load_json
+from core.translation_backends import (backend_from_settings, TranslationError,
+                                       DEFAULT_LIBRETRANSLATE_URL, LIBRETRANSLATE_URL_ENV)
+
+# Aantal segmenten per bulk request; tussen requests wordt op stop/pauze gecontroleerd
+TRANSLATION_BATCH_SIZE = 50
+
 class TranslationProcessor:
-    """Vertaling module met LibreTranslate ondersteuning"""
+    """Vertaling module met LibreTranslate, offline en andere backends (core.translation_backends)"""
     
     def __init__(self, processing_thread):
         self.processing_thread = processing_thread
         self.settings = None  # Instellingen worden later ingesteld
+        self.translator = "libretranslate"
         # Haal server URL op uit instellingen of gebruik default
         self.server_url = self._get_server_url()
         # Haal target language op uit instellingen of gebruik default
@@ -39,6 +49,7 @@ class TranslationProcessor:
                 # print(f"🔍 [DEBUG] TranslationProcessor.set_settings: Brontaal ingesteld op {source_language}")
             if 'translator' in self.settings:
                 translator = self.settings['translator']
+                self.translator = translator or "libretranslate"
                 # print(f"🔍 [DEBUG] TranslationProcessor.set_settings: Translator ingesteld op {translator}")
                 # Als vertaling is uitgeschakeld, gebruik originele tekst
                 if translator == "none":
@@ -69,8 +80,8 @@ class TranslationProcessor:
             # print(f"⚠️ TranslationProcessor._get_server_url: Fout bij ophalen server URL uit instellingen: {e}")
             pass
         
-        # Fallback naar default server
-        default_server = "http://100.90.127.78:5000"
+        # Fallback naar omgevingsvariabele of default server
+        default_server = os.environ.get(LIBRETRANSLATE_URL_ENV) or DEFAULT_LIBRETRANSLATE_URL
         # Debug log uitgeschakeld voor betere console prestaties
         # print(f"🔍 [DEBUG] TranslationProcessor._get_server_url: Gebruik default server: {default_server}")
         return default_server
@@ -102,12 +113,25 @@ class TranslationProcessor:
         """Stel LibreTranslate server in"""
         self.server_url = server_url
     
+    def _translation_enabled(self) -> bool:
+        """Vertaling aan: een LibreTranslate server is ingesteld of een andere backend gekozen"""
+        if self.translator == "none":
+            return False
+        return self.translator != "libretranslate" or bool(self.server_url)
+    
+    def _get_backend(self):
+        """Gedeelde backend met connection pool of geladen model (None als vertaling uit staat)"""
+        settings = dict(self.settings or {})
+        settings["translator"] = self.translator
+        settings["libretranslate_server"] = self.server_url
+        return backend_from_settings(settings)
+    
     def set_target_language(self, target_lang: str):
         """Stel doeltaal in"""
         self.target_language = target_lang
     
-    def translate_text(self, text: str, source_lang: str = None) -> Optional[str]:
-        """Vertaal enkele tekst"""
+    def translate_text(self, text: str, source_lang: str = None, target_lang: str = None) -> Optional[str]:
+        """Vertaal enkele tekst (target_lang standaard de ingestelde doeltaal)"""
         try:
             # Controleer of tekst niet leeg is
             if not text or not text.strip():
@@ -115,7 +139,7 @@ class TranslationProcessor:
                 return text
             
             # Controleer of vertaling is ingeschakeld
-            if not self.server_url or self.server_url == "":
+            if not self._translation_enabled():
                 print(f"🔍 [DEBUG] TranslationProcessor.translate_text: Vertaling uitgeschakeld, gebruik originele tekst")
                 return text
             
@@ -128,48 +152,53 @@ class TranslationProcessor:
                     source_lang = "auto"  # Fallback naar auto-detectie
                     print(f"🔍 [DEBUG] TranslationProcessor.translate_text: Geen brontaal instelling, gebruik auto-detectie")
             
-            payload = {
-                "q": text,
-                "source": source_lang,
-                "target": self.target_language,
-                "format": "text"
-            }
-            
-            # Debug log uitgeschakeld voor betere console prestaties
-            # print(f"🔍 [DEBUG] TranslationProcessor.translate_text: Payload = {payload}")
-            
-            response = requests.post(
-                f"{self.server_url}/translate",
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("translatedText", text)
-            else:
-                print(f"❌ Vertaling fout: {response.status_code} - {response.text}")
-                print(f"🔍 Payload: {payload}")
-                return text
+            return self._get_backend().translate(text, source_lang, target_lang or self.target_language)
                 
+        except TranslationError as e:
+            print(f"❌ Vertaling fout: {e}")
+            return text
         except Exception as e:
             print(f"❌ Fout bij vertaling: {e}")
             return text
     
-    def translate_bulk_texts(self, texts: List[str], source_lang: str = None) -> List[str]:
-        """Vertaal meerdere teksten in één keer voor betere prestaties"""
+    def _cancel_token(self):
+        """Cancellation token van de processing thread (None als die er niet is)"""
+        return getattr(self.processing_thread, 'cancel_token', None)
+    
+    def translate_bulk_texts(self, texts: List[str], source_lang: str = None, target_lang: str = None) -> List[str]:
+        """
+        Vertaal meerdere teksten in bulk requests van TRANSLATION_BATCH_SIZE segmenten
+        
+        Tussen de requests wordt het cancellation token gecontroleerd, zodat
+        stop en pauze binnen één request effect hebben.
+        """
+        batch_size = TRANSLATION_BATCH_SIZE
+        if self.settings:
+            try:
+                batch_size = max(1, int(self.settings.get('translation_batch_size', TRANSLATION_BATCH_SIZE)))
+            except (TypeError, ValueError):
+                pass
+        token = self._cancel_token()
+        translated = []
+        for start in range(0, len(texts), batch_size):
+            if token is not None:
+                token.checkpoint()
+            translated.extend(self._translate_bulk_batch(texts[start:start + batch_size], source_lang, target_lang))
+        return translated
+    
+    def _translate_bulk_batch(self, texts: List[str], source_lang: str = None, target_lang: str = None) -> List[str]:
+        """Vertaal meerdere teksten via translate_batch (de backend splitst op zijn limieten)"""
         try:
             # Controleer of vertaling is ingeschakeld
-            if not self.server_url or self.server_url == "":
+            if not self._translation_enabled():
                 print(f"🔍 [DEBUG] TranslationProcessor.translate_bulk_texts: Vertaling uitgeschakeld, gebruik originele teksten")
                 return texts
             
             if not texts:
                 return []
             
-            # Filter lege teksten uit
-            filtered_texts = [text for text in texts if text and text.strip()]
-            if not filtered_texts:
+            # Lege teksten blijven leeg: translate_batch stuurt alleen niet-lege teksten naar de backend
+            if not any(text and text.strip() for text in texts):
                 print("⚠️ Geen geldige teksten gevonden voor bulk vertaling")
                 return texts  # Return originele teksten als allemaal leeg zijn
             
@@ -182,57 +211,70 @@ class TranslationProcessor:
                     source_lang = "auto"  # Fallback naar auto-detectie
                     print(f"🔍 [DEBUG] TranslationProcessor.translate_bulk_texts: Geen brontaal instelling, gebruik auto-detectie")
             
-            # Combineer alle teksten met scheidingstekens voor bulk vertaling
-            # LibreTranslate ondersteunt bulk vertaling door meerdere teksten te combineren
-            combined_text = "\n---SEGMENT---\n".join(filtered_texts)
-            
-            payload = {
-                "q": combined_text,
-                "source": source_lang,
-                "target": self.target_language,
-                "format": "text"
-            }
-            
-            print(f"📤 Bulk vertaling: {len(filtered_texts)} teksten gecombineerd tot één request")
-            # Debug log uitgeschakeld voor betere console prestaties
-            # print(f"🔍 [DEBUG] TranslationProcessor.translate_bulk_texts: Payload = {payload}")
-            
-            response = requests.post(
-                f"{self.server_url}/translate",
-                json=payload,
-                timeout=60  # Langere timeout voor bulk vertaling
+            print(f"📤 Bulk vertaling: {len(texts)} segmenten")
+            translated_segments = self._get_backend().translate_batch(
+                texts, source_lang, target_lang or self.target_language
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                translated_combined = result.get("translatedText", combined_text)
-                
-                # Split de vertaalde tekst terug in segmenten
-                translated_segments = translated_combined.split("\n---SEGMENT---\n")
-                
-                # Zorg ervoor dat we evenveel segmenten hebben als origineel
-                if len(translated_segments) != len(texts):
-                    print(f"⚠️ Aantal vertaalde segmenten ({len(translated_segments)}) komt niet overeen met origineel ({len(texts)})")
-                    # Fallback: gebruik originele teksten voor ontbrekende segmenten
-                    while len(translated_segments) < len(texts):
-                        translated_segments.append("")
-                    translated_segments = translated_segments[:len(texts)]
-                
-                print(f"✅ Bulk vertaling succesvol: {len(translated_segments)} segmenten vertaald")
-                return translated_segments
-                
-            else:
-                print(f"❌ Bulk vertaling fout: {response.status_code} - {response.text}")
-                print(f"🔍 Payload: {payload}")
-                # Fallback naar individuele vertaling
-                print("🔄 Fallback naar individuele vertaling...")
-                return [self.translate_text(text, source_lang) for text in texts]
+            print(f"✅ Bulk vertaling succesvol: {len(translated_segments)} segmenten vertaald")
+            return translated_segments
                 
+        except CancelledError:
+            raise
         except Exception as e:
             print(f"❌ Fout bij bulk vertaling: {e}")
             # Fallback naar individuele vertaling
             print("🔄 Fallback naar individuele vertaling...")
-            return [self.translate_text(text, source_lang) for text in texts]
+            return [self.translate_text(text, source_lang, target_lang) for text in texts]
+    
+    def _resolve_source_language(self, source_language: Optional[str]) -> str:
+        """Gebruik brontaal uit instellingen als deze niet expliciet is opgegeven"""
+        if source_language is None or source_language == "auto":
+            if self.settings and 'language' in self.settings:
+                return self.settings['language']
+            return "auto"  # Fallback naar auto-detectie
+        return source_language
+    
+    def _get_target_languages(self) -> List[str]:
+        """Haal doeltalen op (target_languages lijst of komma-gescheiden, anders target_language)"""
+        languages = self.settings.get('target_languages') if self.settings else None
+        if isinstance(languages, str):
+            languages = [language.strip() for language in languages.split(",")]
+        languages = [language for language in (languages or []) if language]
+        # Dubbele talen maar één keer vertalen, volgorde behouden
+        return list(dict.fromkeys(languages)) or [self.target_language]
+    
+    def _translate_for_language(self, transcript: str, transcriptions: Transcript,
+                                source_language: str, target_language: str) -> tuple:
+        """Vertaal transcript en segmenten naar één doeltaal (zonder progress signalen)"""
+        segment_texts = list(transcriptions.texts)
+        
+        # Vertaal alle segment teksten in één keer
+        print(f"🚀 Bulk vertaling van {len(segment_texts)} segmenten naar {target_language}...")
+        translated_segment_texts = self.translate_bulk_texts(segment_texts, source_language, target_language)
+        
+        # Vertaal hoofdtranscript alleen als deze niet leeg is
+        if transcript and transcript.strip():
+            translated_transcript = self.translate_text(transcript, source_language, target_language)
+        else:
+            # Als transcript leeg is, combineer alle segment teksten
+            combined_text = " ".join([text for text in segment_texts if text.strip()])
+            if combined_text.strip():
+                translated_transcript = self.translate_text(combined_text, source_language, target_language)
+            else:
+                translated_transcript = ""
+                print("⚠️ Geen tekst gevonden om te vertalen")
+        
+        # Maak vertaalde transcriptie aan: nieuwe tekst buffer, tijden en woorden gedeeld
+        translated_segment_texts = [
+            translated if translated is not None else original
+            for translated, original in zip(translated_segment_texts, segment_texts)
+        ] + segment_texts[len(translated_segment_texts):]
+        translated_transcriptions = transcriptions.with_texts(
+            translated_segment_texts,
+            source_language=source_language,
+            target_language=target_language
+        )
+        return translated_transcript, translated_transcriptions
     
     def translate_content(self, transcript: str, transcriptions: List[Dict[str, Any]], 
                          source_language: str = None) -> tuple:
@@ -242,34 +284,25 @@ class TranslationProcessor:
             print(f"🔍 [DEBUG] TranslationProcessor.translate_content: self.server_url = {self.server_url}")
             
             # Controleer of vertaling is ingeschakeld
-            if not self.server_url or self.server_url == "":
+            if not self._translation_enabled():
                 print(f"🔍 [DEBUG] TranslationProcessor.translate_content: Vertaling uitgeschakeld, gebruik originele tekst")
                 return transcript, transcriptions
             
-            # Gebruik brontaal uit instellingen als deze niet expliciet is opgegeven
-            if source_language is None or source_language == "auto":
-                if self.settings and 'language' in self.settings:
-                    source_language = self.settings['language']
-                    print(f"🔍 [DEBUG] TranslationProcessor.translate_content: Gebruik brontaal uit instellingen: {source_language}")
-                else:
-                    source_language = "auto"  # Fallback naar auto-detectie
-                    print(f"🔍 [DEBUG] TranslationProcessor.translate_content: Geen brontaal instelling, gebruik auto-detectie")
-            
+            source_language = self._resolve_source_language(source_language)
             print(f"🌐 Start vertaling naar {self.target_language} (van {source_language})")
             
-            # Bereid alle segment teksten voor voor bulk vertaling
-            segment_texts = [segment["text"] for segment in transcriptions]
-            total_segments = len(transcriptions)
+            # Kolomsgewijze transcriptie: teksten komen direct uit de tekst buffer
+            transcriptions = Transcript.from_segments(transcriptions)
             
             # Update progress voor bulk vertaling
             self.processing_thread.progress_updated.emit(
                 25, 
-                f"Bereid {total_segments} segmenten voor bulk vertaling..."
+                f"Bereid {len(transcriptions)} segmenten voor bulk vertaling..."
             )
             
-            # Vertaal alle segment teksten in één keer
-            print(f"🚀 Bulk vertaling van {total_segments} segmenten...")
-            translated_segment_texts = self.translate_bulk_texts(segment_texts, source_language)
+            translated_transcript, translated_transcriptions = self._translate_for_language(
+                transcript, transcriptions, source_language, self.target_language
+            )
             
             # Update progress
             self.processing_thread.progress_updated.emit(
@@ -277,29 +310,6 @@ class TranslationProcessor:
                 f"Verwerk vertaalde segmenten..."
             )
             
-            # Vertaal hoofdtranscript alleen als deze niet leeg is
-            if transcript and transcript.strip():
-                translated_transcript = self.translate_text(transcript, source_language)
-            else:
-                # Als transcript leeg is, combineer alle segment teksten
-                combined_text = " ".join([segment["text"] for segment in transcriptions if segment["text"].strip()])
-                if combined_text.strip():
-                    translated_transcript = self.translate_text(combined_text, source_language)
-                else:
-                    translated_transcript = ""
-                    print("⚠️ Geen tekst gevonden om te vertalen")
-            
-            # Maak vertaalde transcripties aan
-            translated_transcriptions = []
-            for i, (segment, translated_text) in enumerate(zip(transcriptions, translated_segment_texts)):
-                translated_segment = {
-                    "start": segment["start"],
-                    "end": segment["end"],
-                    "text": translated_text,
-                    "original_text": segment["text"]
-                }
-                translated_transcriptions.append(translated_segment)
-            
             print(f"✅ Bulk vertaling voltooid: {len(translated_transcriptions)} segmenten")
             return translated_transcript, translated_transcriptions
             
@@ -311,11 +321,97 @@ class TranslationProcessor:
             # Return originele content als vertaling faalt
             return transcript, transcriptions
     
+    def translate_content_multi(self, transcript: str, transcriptions: List[Dict[str, Any]],
+                                source_language: str = None,
+                                target_languages: List[str] = None,
+                                file_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Vertaal één transcriptie parallel naar meerdere doeltalen
+        
+        Elke taal is een aparte job; een fout in één taal heeft geen invloed op
+        de andere talen. Progress wordt per voltooide taal gemeld. Met file_path
+        worden de vertalingen in het batch manifest vastgelegd en bij een
+        hervatte batch hergebruikt.
+        
+        Returns:
+            Dict per taal met "transcript", "transcriptions" en "error" (None bij succes)
+        """
+        target_languages = target_languages or self._get_target_languages()
+        manifest = getattr(self.processing_thread, 'manifest', None) if file_path else None
+        if manifest is not None:
+            path = manifest.artifact(file_path, STAGE_TRANSLATE, "translations")
+            previous = load_json(path) if path else None
+            if previous and all(language in previous for language in target_languages):
+                print(f"⏯️ Vertalingen uit een eerdere run hergebruikt voor {os.path.basename(file_path)}")
+                return {language: previous[language] for language in target_languages}
+        
+        results = self._translate_content_multi(transcript, transcriptions, source_language, target_languages)
+        # Alleen echte vertalingen vastleggen (niet de originele tekst bij uitgeschakelde vertaling)
+        if manifest is not None and self._translation_enabled() and not any(result.get("error") for result in results.values()):
+            path = manifest.artifact_path(file_path, "translations.json")
+            if write_json_atomic(path, results):
+                manifest.record(file_path, STAGE_TRANSLATE, artifacts={"translations": path})
+        return results
+    
+    def _translate_content_multi(self, transcript: str, transcriptions: List[Dict[str, Any]],
+                                 source_language: str, target_languages: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Vertaal parallel naar de opgegeven doeltalen"""
+        # Vertaling uitgeschakeld: elke taal krijgt de originele tekst
+        if not self._translation_enabled():
+            print(f"🔍 [DEBUG] TranslationProcessor.translate_content_multi: Vertaling uitgeschakeld, gebruik originele tekst")
+            return {language: {"transcript": transcript, "transcriptions": transcriptions, "error": None}
+                    for language in target_languages}
+        
+        source_language = self._resolve_source_language(source_language)
+        transcriptions = Transcript.from_segments(transcriptions)
+        total = len(target_languages)
+        print(f"🌐 Start vertaling naar {', '.join(target_languages)} (van {source_language})")
+        
+        self.processing_thread.progress_updated.emit(
+            25,
+            f"Bereid {len(transcriptions)} segmenten voor vertaling naar {total} talen..."
+        )
+        
+        results = {}
+        max_workers = max(1, min(total, int(self.settings.get('translation_workers', 3)) if self.settings else 3))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate") as executor:
+            futures = {
+                executor.submit(self._translate_for_language, transcript, transcriptions,
+                                source_language, language): language
+                for language in target_languages
+            }
+            
+            # Signalen worden vanuit deze thread verstuurd, niet vanuit de workers
+            token = self._cancel_token()
+            for completed, future in enumerate(as_completed(futures), 1):
+                language = futures[future]
+                try:
+                    if token is not None:
+                        token.raise_if_cancelled()
+                    translated_transcript, translated_transcriptions = future.result()
+                    results[language] = {"transcript": translated_transcript,
+                                         "transcriptions": translated_transcriptions, "error": None}
+                    status = f"✅ Vertaling {language.upper()} voltooid ({completed}/{total})"
+                except CancelledError:
+                    # Talen die nog niet begonnen zijn niet meer starten
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                except Exception as e:
+                    results[language] = {"transcript": transcript, "transcriptions": transcriptions,
+                                         "error": str(e)}
+                    status = f"❌ Vertaling {language.upper()} gefaald ({completed}/{total}): {e}"
+                print(status)
+                self.processing_thread.progress_updated.emit(25 + 10 * completed / total, status)
+        
+        # Resultaten in de opgegeven taalvolgorde
+        return {language: results[language] for language in target_languages}
+    
     def detect_language(self, text: str) -> Optional[str]:
         """Detecteer taal van tekst"""
         try:
             # Controleer of vertaling is ingeschakeld
-            if not self.server_url or self.server_url == "":
+            if not self._translation_enabled():
                 print(f"🔍 [DEBUG] TranslationProcessor.detect_language: Vertaling uitgeschakeld, gebruik Engels als standaard")
                 return "en"
             
@@ -325,22 +421,14 @@ class TranslationProcessor:
                 print(f"🔍 [DEBUG] TranslationProcessor.detect_language: Gebruik brontaal uit instellingen: {detected_lang}")
                 return detected_lang
             
-            # Anders, detecteer taal via API
+            # Anders, detecteer taal via API (alleen LibreTranslate kan dat)
             print(f"🔍 [DEBUG] TranslationProcessor.detect_language: Geen brontaal instelling, detecteer via API")
-            payload = {"q": text}
-            
-            response = requests.post(
-                f"{self.server_url}/detect",
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result and len(result) > 0:
-                    detected_lang = result[0].get("language", "en")
-                    print(f"🌍 Gedetecteerde taal: {detected_lang}")
-                    return detected_lang
+            backend = self._get_backend()
+            result = backend.detect(text) if hasattr(backend, "detect") else None
+            if result:
+                detected_lang = result[0]
+                print(f"🌍 Gedetecteerde taal: {detected_lang}")
+                return detected_lang
             
             print(f"⚠️ Taal detectie faalde, gebruik Engels als standaard")
             return "en"
@@ -353,18 +441,16 @@ class TranslationProcessor:
         """Krijg beschikbare talen"""
         try:
             # Controleer of vertaling is ingeschakeld
-            if not self.server_url or self.server_url == "":
+            if not self._translation_enabled():
                 print(f"🔍 [DEBUG] TranslationProcessor.get_available_languages: Vertaling uitgeschakeld, geen talen beschikbaar")
                 return []
             
-            response = requests.get(f"{self.server_url}/languages", timeout=10)
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"⚠️ Ophalen talen faalde: {response.status_code} - {response.text}")
-                return []
+            backend = self._get_backend()
+            return backend.languages() if hasattr(backend, "languages") else []
                 
+        except TranslationError as e:
+            print(f"⚠️ Ophalen talen faalde: {e}")
+            return []
         except Exception as e:
             print(f"❌ Fout bij ophalen talen: {e}")
             return []
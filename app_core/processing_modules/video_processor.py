@@ -4,28 +4,31 @@ Handelt video verwerking en ondertiteling af
 """
 
 import os
-import subprocess
 from typing import Optional, Dict, Any, List
 
-# Import WhisperX SRT functies als beschikbaar
-try:
-    from core.whisperx_srt_functions import (
-        create_whisperx_srt_content,
-        create_enhanced_srt_with_word_timing,
-        validate_whisperx_transcriptions,
-        get_whisperx_statistics
-    )
-    WHISPERX_SRT_AVAILABLE = True
-except ImportError:
-    WHISPERX_SRT_AVAILABLE = False
-    print("⚠️ WhisperX SRT functies niet beschikbaar, gebruik standaard SRT generatie")
+# Streaming ondertitel writers (één pass, gehele milliseconden)
+from core.subtitle_writers import write_subtitles, write_subtitle_file
+# Layout engine voor re-flow van cues op basis van word timing
+from core.subtitle_layout import iter_reflowed_segments, resolve_layout
+# Registratie van afgeronde stappen voor hervatbare batches
+from core.batch_manifest import STAGE_SRT
+# Stream-copy muxing van alle ondertitel sporen in één ffmpeg aanroep
+from core.subtitle_mux import SubtitleMuxer, MUX_WORKERS, MUX_IO_BUDGET_MB
 
 class VideoProcessor:
-    """Video verwerking module met FFmpeg"""
+    """
+    Video verwerking module met FFmpeg
+    
+    Met de instelling mux_subtitles zet process_video() de sporen in de video
+    en wacht het op de mux job; het resultaat staat onder "mux" in het
+    resultaat en de mux workers stoppen daarna weer.
+    """
     
     def __init__(self, processing_thread):
         self.processing_thread = processing_thread
         self.settings = None  # Instellingen worden later ingesteld
+        self.muxer = None  # SubtitleMuxer, aangemaakt bij de eerste mux job
+        self._mux_jobs = {}  # Video pad -> Future van de mux job
     
     def set_settings(self, settings: dict):
         """Stel instellingen in voor de video processor"""
@@ -36,8 +39,42 @@ class VideoProcessor:
         print(f"🔍 [DEBUG] VideoProcessor.set_settings: self.settings ingesteld = {self.settings}")
     
     def process_video(self, file_path: str, transcript: str, transcriptions: List[Dict[str, Any]], 
-                     translated_transcriptions: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Verwerk video - maak alleen SRT bestanden"""
+                     translated_transcriptions: List[Dict[str, Any]],
+                     translations: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Verwerk video - maak alleen SRT bestanden
+        
+        Met translations (resultaat van TranslationProcessor.translate_content_multi)
+        wordt per doeltaal een <naam>_<TAAL>.srt geschreven. Met de instelling
+        mux_subtitles worden alle SRT's daarna als sporen in de video gezet.
+        """
+        if translations:
+            result = self._process_video_multi(file_path, transcriptions, translations)
+        else:
+            result = self._process_video_single(file_path, transcript, transcriptions, translated_transcriptions)
+        result = self._record_srt_stage(file_path, result)
+        if not result.get("error") and self._get_mux_setting():
+            job = self._add_subtitles_to_video(file_path, result)
+            if job is not None:
+                self._mux_jobs[file_path] = job
+                # Wacht op de eigen job: fouten worden gemeld en de muxer (met het token van deze run) stopt
+                result["mux"] = self.finish_muxing().get(file_path, {})
+        return result
+    
+    def _record_srt_stage(self, file_path: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Registreer geschreven SRT bestanden in het batch manifest (als de thread er een heeft)"""
+        manifest = getattr(self.processing_thread, 'manifest', None)
+        if manifest is None or result.get("error"):
+            return result
+        artifacts = dict(result.get("srt_paths") or {"translated": result.get("srt_path")})
+        if result.get("original_srt_path"):
+            artifacts["original"] = result["original_srt_path"]
+        manifest.record(file_path, STAGE_SRT, artifacts={name: path for name, path in artifacts.items() if path})
+        return result
+    
+    def _process_video_single(self, file_path: str, transcript: str, transcriptions: List[Dict[str, Any]],
+                              translated_transcriptions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Maak het SRT bestand voor één doeltaal"""
         try:
             print(f"🎬 Start video verwerking: {file_path}")
             print(f"🔍 [DEBUG] VideoProcessor.process_video: self.settings = {self.settings}")
@@ -56,15 +93,14 @@ class VideoProcessor:
             # Maak alleen SRT bestanden - geen video verwerking
             print("📝 Maak alleen SRT bestanden - geen video verwerking")
             
-            # Maak SRT bestand voor ondertiteling
-            srt_path = self._create_srt_file(translated_transcriptions, file_path)
+            # Maak vertaalde en (optioneel) originele SRT in één pass over de segmenten
+            srt_path, original_srt_path = self._create_srt_files(
+                translated_transcriptions, transcriptions, file_path, preserve_subtitles
+            )
             if not srt_path:
                 return {"error": "Kon SRT bestand niet maken"}
             
-            # Maak ook SRT bestand met alleen originele tekst (zonder vertaling) - alleen als preserve_subtitles is ingeschakeld
-            original_srt_path = None
             if preserve_subtitles:
-                original_srt_path = self._create_original_srt_file(transcriptions, file_path)
                 if not original_srt_path:
                     print("⚠️ Kon origineel SRT bestand niet maken")
                 else:
@@ -83,157 +119,211 @@ class VideoProcessor:
             print(f"❌ Fout bij video verwerking: {e}")
             return {"error": str(e)}
     
-    def _create_srt_file(self, transcriptions: List[Dict[str, Any]], video_path: str) -> Optional[str]:
-        """Maak SRT bestand van transcripties (vertaald)"""
+    def _process_video_multi(self, file_path: str, transcriptions: List[Dict[str, Any]],
+                             translations: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Maak één SRT per doeltaal; een fout in één taal stopt de andere niet"""
         try:
-            print(f"🔍 [DEBUG] VideoProcessor._create_srt_file: Start met {len(transcriptions)} transcripties")
+            print(f"🎬 Start video verwerking: {file_path} ({len(translations)} talen)")
+            self.processing_thread.status_updated.emit("🎬 SRT bestanden worden gemaakt...")
             
-            # Genereer SRT bestandsnaam - gebruik _NL voor vertaalde versie
-            base_name = os.path.splitext(os.path.basename(video_path))[0]
-            srt_path = os.path.join(os.path.dirname(video_path), f"{base_name}_NL.srt")
-            print(f"🔍 [DEBUG] VideoProcessor._create_srt_file: SRT pad = {srt_path}")
+            preserve_subtitles = self._get_preserve_subtitles_setting()
+            srt_paths = {}
+            errors = {}
+            original_srt_path = None
+            original_pending = preserve_subtitles
             
-            # Gebruik WhisperX SRT functies voor betere accuracy als beschikbaar
-            if WHISPERX_SRT_AVAILABLE:
-                print("🎯 Gebruik WhisperX SRT generatie voor betere accuracy")
-                # Valideer transcripties eerst
-                if validate_whisperx_transcriptions(transcriptions):
-                    # Genereer SRT met WhisperX functies
-                    srt_content = create_whisperx_srt_content(transcriptions)
-                    # Schrijf SRT bestand
-                    with open(srt_path, 'w', encoding='utf-8') as f:
-                        f.write(srt_content)
+            for index, (language, translation) in enumerate(translations.items(), 1):
+                self.processing_thread.progress_updated.emit(
+                    70.0 + 20.0 * (index - 1) / len(translations),
+                    f"SRT bestand maken voor {language.upper()}..."
+                )
+                if translation.get("error"):
+                    errors[language] = translation["error"]
+                    print(f"⚠️ Geen SRT voor {language.upper()}: vertaling gefaald ({translation['error']})")
+                    continue
+                
+                # Origineel SRT bestand maar één keer schrijven (samen met de eerste geslaagde taal)
+                srt_path, written_original = self._create_srt_files(
+                    translation["transcriptions"], transcriptions, file_path, original_pending, language
+                )
+                if srt_path:
+                    srt_paths[language] = srt_path
                 else:
-                    print("⚠️ WhisperX validatie gefaald, gebruik standaard SRT generatie")
-                    srt_content = self._create_standard_srt_content(transcriptions)
-                    with open(srt_path, 'w', encoding='utf-8') as f:
-                        f.write(srt_content)
-            else:
-                # Fallback naar standaard SRT generatie
-                print("📝 Gebruik standaard SRT generatie")
-                srt_content = self._create_standard_srt_content(transcriptions)
-                with open(srt_path, 'w', encoding='utf-8') as f:
-                    f.write(srt_content)
+                    errors[language] = "Kon SRT bestand niet maken"
+                if written_original:
+                    original_srt_path = written_original
+                    original_pending = False
             
-            print(f"✅ SRT bestand gemaakt: {srt_path}")
-            print(f"🔍 [DEBUG] VideoProcessor._create_srt_file: SRT bestand grootte = {os.path.getsize(srt_path)} bytes")
+            if preserve_subtitles and original_pending:
+                original_srt_path = self._create_original_srt_file(transcriptions, file_path)
+            elif not preserve_subtitles:
+                self._remove_existing_original_srt(file_path)
+            
+            if not srt_paths:
+                return {"error": "Kon geen SRT bestanden maken", "errors": errors}
+            
+            print(f"✅ SRT bestanden gemaakt: {', '.join(srt_paths.values())}")
+            return {
+                "output_path": file_path,
+                "srt_path": next(iter(srt_paths.values())),
+                "srt_paths": srt_paths,
+                "original_srt_path": original_srt_path,
+                "errors": errors
+            }
+            
+        except Exception as e:
+            print(f"❌ Fout bij video verwerking: {e}")
+            return {"error": str(e)}
+    
+    def _get_target_language(self) -> str:
+        """Haal doeltaal op voor de bestandsnaam van het vertaalde SRT bestand"""
+        if self.settings and self.settings.get("target_language"):
+            return self.settings["target_language"]
+        return "nl"
+    
+    def _get_srt_paths(self, video_path: str, language: Optional[str] = None) -> tuple:
+        """Genereer paden voor vertaalde (<naam>_<TAAL>) en originele SRT bestanden"""
+        base_name = os.path.splitext(os.path.basename(video_path))[0]
+        video_dir = os.path.dirname(video_path)
+        language = (language or self._get_target_language()).upper()
+        return (os.path.join(video_dir, f"{base_name}_{language}.srt"),
+                os.path.join(video_dir, f"{base_name}.srt"))
+    
+    def _create_srt_files(self, translated_transcriptions: List[Dict[str, Any]],
+                          transcriptions: List[Dict[str, Any]], video_path: str,
+                          include_original: bool, language: Optional[str] = None) -> tuple:
+        """Maak vertaalde en originele SRT bestanden - waar mogelijk in één pass"""
+        srt_path, original_srt_path = self._get_srt_paths(video_path, language)
+        
+        # Vertaalde segmenten dragen de originele tekst mee in "original_text";
+        # zonder vertaling zijn beide lijsten hetzelfde object
+        untranslated = translated_transcriptions is transcriptions
+        original_key = None
+        if include_original:
+            if untranslated:
+                original_key = "text"
+            elif (translated_transcriptions and 
+                  len(translated_transcriptions) == len(transcriptions) and
+                  "original_text" in translated_transcriptions[0]):
+                original_key = "original_text"
+        
+        # Woord timing hoort bij de brontaal - alleen bruikbaar voor niet-vertaalde tekst
+        translated_output = {"path": srt_path, "format": "srt", "text_key": "text",
+                             "layout": self._get_layout_setting("translated"),
+                             "use_words": untranslated}
+        
+        if not include_original or original_key:
+            try:
+                outputs = [translated_output]
+                if original_key:
+                    outputs.append({"path": original_srt_path, "format": "srt", "text_key": original_key,
+                                    "layout": self._get_layout_setting("original"), "use_words": True})
+                counts = self._write_srt_outputs(translated_transcriptions, outputs)
+                print(f"✅ SRT bestand gemaakt: {srt_path} ({counts.get(srt_path, 0)} cues)")
+                return srt_path, (original_srt_path if original_key else None)
+            except Exception as e:
+                print(f"❌ Fout bij maken SRT bestanden: {e}")
+                return None, None
+        
+        # Segmenten komen niet overeen - schrijf beide bestanden los
+        return (self._create_srt_file(translated_transcriptions, video_path, language),
+                self._create_original_srt_file(transcriptions, video_path))
+    
+    def _write_srt_outputs(self, segments: List[Dict[str, Any]], outputs: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Schrijf outputs zonder layout in één pass, outputs met layout via re-flow"""
+        plain_outputs = [output for output in outputs if not output.get("layout")]
+        counts = write_subtitles(segments, plain_outputs) if plain_outputs else {}
+        
+        for output in outputs:
+            if output.get("layout"):
+                reflowed = iter_reflowed_segments(segments, output["layout"], output["text_key"],
+                                                  use_words=output.get("use_words", True))
+                counts[output["path"]] = write_subtitle_file(reflowed, output["path"], output.get("format", "srt"))
+                print(f"📐 Cues herverdeeld voor {os.path.basename(output['path'])}: {counts[output['path']]} cues")
+        return counts
+    
+    def _create_srt_file(self, transcriptions: List[Dict[str, Any]], video_path: str,
+                         language: Optional[str] = None) -> Optional[str]:
+        """Maak SRT bestand van transcripties (vertaald)"""
+        try:
+            # Genereer SRT bestandsnaam - gebruik _<TAAL> voor vertaalde versie
+            srt_path, _ = self._get_srt_paths(video_path, language)
+            counts = self._write_srt_outputs(transcriptions, [{
+                "path": srt_path, "format": "srt", "text_key": "text",
+                "layout": self._get_layout_setting("translated"), "use_words": False
+            }])
+            print(f"✅ SRT bestand gemaakt: {srt_path} ({counts.get(srt_path, 0)} cues)")
             return srt_path
             
         except Exception as e:
             print(f"❌ Fout bij maken SRT bestand: {e}")
             return None
     
-    def _create_standard_srt_content(self, transcriptions: List[Dict[str, Any]]) -> str:
-        """Maak standaard SRT content als fallback"""
-        srt_content = ""
-        for i, segment in enumerate(transcriptions, 1):
-            start_time = self._format_time(segment["start"])
-            end_time = self._format_time(segment["end"])
-            text = segment.get("text", "")
-            srt_content += f"{i}\n{start_time} --> {end_time}\n{text}\n\n"
-        return srt_content
-    
     def _create_original_srt_file(self, transcriptions: List[Dict[str, Any]], video_path: str) -> Optional[str]:
         """Maak SRT bestand van originele transcripties (zonder vertaling)"""
         try:
-            print(f"🔍 [DEBUG] VideoProcessor._create_original_srt_file: Start met {len(transcriptions)} transcripties")
-            
             # Genereer SRT bestandsnaam - gebruik originele bestandsnaam zonder toevoegingen
-            base_name = os.path.splitext(os.path.basename(video_path))[0]
-            srt_path = os.path.join(os.path.dirname(video_path), f"{base_name}.srt")
-            print(f"🔍 [DEBUG] VideoProcessor._create_original_srt_file: SRT pad = {srt_path}")
-            
-            # Gebruik WhisperX SRT functies voor betere accuracy als beschikbaar
-            if WHISPERX_SRT_AVAILABLE:
-                print("🎯 Gebruik WhisperX SRT generatie voor originele transcripties")
-                # Valideer transcripties eerst
-                if validate_whisperx_transcriptions(transcriptions):
-                    # Genereer SRT met WhisperX functies
-                    srt_content = create_whisperx_srt_content(transcriptions)
-                    # Schrijf SRT bestand
-                    with open(srt_path, 'w', encoding='utf-8') as f:
-                        f.write(srt_content)
-                else:
-                    print("⚠️ WhisperX validatie gefaald, gebruik standaard SRT generatie")
-                    srt_content = self._create_standard_srt_content(transcriptions)
-                    with open(srt_path, 'w', encoding='utf-8') as f:
-                        f.write(srt_content)
-            else:
-                # Fallback naar standaard SRT generatie
-                print("📝 Gebruik standaard SRT generatie voor originele transcripties")
-                srt_content = self._create_standard_srt_content(transcriptions)
-                with open(srt_path, 'w', encoding='utf-8') as f:
-                    f.write(srt_content)
-            
-            print(f"✅ Origineel SRT bestand gemaakt: {srt_path}")
-            print(f"🔍 [DEBUG] VideoProcessor._create_original_srt_file: SRT bestand grootte = {os.path.getsize(srt_path)} bytes")
+            _, srt_path = self._get_srt_paths(video_path)
+            counts = self._write_srt_outputs(transcriptions, [{
+                "path": srt_path, "format": "srt", "text_key": "text",
+                "layout": self._get_layout_setting("original"), "use_words": True
+            }])
+            print(f"✅ Origineel SRT bestand gemaakt: {srt_path} ({counts.get(srt_path, 0)} cues)")
             return srt_path
             
         except Exception as e:
             print(f"❌ Fout bij maken origineel SRT bestand: {e}")
             return None
     
-    def _add_subtitles_to_video(self, video_path: str, srt_path: str) -> Optional[str]:
-        """Voeg ondertiteling toe aan video met FFmpeg"""
+    def _subtitle_tracks(self, result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Ondertitel sporen van een process_video resultaat (alle doeltalen plus origineel)"""
+        srt_paths = result.get("srt_paths") or {self._get_target_language(): result.get("srt_path")}
+        tracks = [{"path": path, "language": language} for language, path in srt_paths.items() if path]
+        if result.get("original_srt_path"):
+            source_language = (self.settings or {}).get("language")
+            tracks.append({"path": result["original_srt_path"],
+                           "language": source_language if source_language != "auto" else None})
+        return tracks
+    
+    def _add_subtitles_to_video(self, video_path: str, result: Dict[str, Any]):
+        """Plan het muxen van alle SRT sporen in de video (stream-copy, op de achtergrond)"""
         try:
-            print(f"🔍 [DEBUG] VideoProcessor._add_subtitles_to_video: Start met video_path = {video_path}")
-            print(f"🔍 [DEBUG] VideoProcessor._add_subtitles_to_video: srt_path = {srt_path}")
-            
-            # Genereer output bestandsnaam
-            base_name = os.path.splitext(os.path.basename(video_path))[0]
-            output_path = os.path.join(os.path.dirname(video_path), f"{base_name}_subtitled.mp4")
-            print(f"🔍 [DEBUG] VideoProcessor._add_subtitles_to_video: output_path = {output_path}")
-            
-            # Haal subtitle type instelling op
-            subtitle_type = self._get_subtitle_type_setting()
-            print(f"🔍 [DEBUG] VideoProcessor._add_subtitles_to_video: subtitle_type = {subtitle_type}")
-            
-            # Altijd softcoded ondertiteling (hardcoded wordt niet meer ondersteund)
-            print("📝 Softcoded ondertiteling - voeg SRT toe als externe track")
-            print(f"🔍 [DEBUG] VideoProcessor: FFmpeg commando voor softcoded (replace):")
-            
-            # FFmpeg commando voor softcoded ondertiteling
-            cmd = [
-                "ffmpeg", "-i", video_path,
-                "-i", srt_path,  # Voeg SRT toe als tweede input
-                "-c:v", "copy",  # Kopieer video stream
-                "-c:a", "copy",  # Kopieer audio stream
-                "-c:s", "mov_text",  # Converteer SRT naar mov_text formaat
-                "-metadata:s:s:0", "language=nld",  # Stel taal in
-                "-y",  # Overschrijf bestaand bestand
-                output_path
-            ]
-            print(f"🔍 [DEBUG] VideoProcessor: FFmpeg commando: {' '.join(cmd)}")
-            
-            # Voer FFmpeg uit
-            print(f"🔍 [DEBUG] VideoProcessor: Start FFmpeg uitvoering...")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-            print(f"🔍 [DEBUG] VideoProcessor: FFmpeg returncode: {result.returncode}")
-            
-            if result.returncode == 0 and os.path.exists(output_path):
-                print(f"✅ Ondertiteling toegevoegd: {output_path}")
-                return output_path
-            else:
-                print(f"❌ FFmpeg gefaald: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            print("❌ FFmpeg timeout - video te lang")
-            return None
+            if self.muxer is None:
+                settings = self.settings or {}
+                self.muxer = SubtitleMuxer(
+                    max_workers=int(settings.get("mux_workers", MUX_WORKERS)),
+                    io_budget_mb=float(settings.get("mux_io_budget_mb", MUX_IO_BUDGET_MB)),
+                    in_place=bool(settings.get("mux_in_place", False)),
+                    token=getattr(self.processing_thread, 'cancel_token', None)
+                )
+            tracks = self._subtitle_tracks(result)
+            print(f"🎞️ Ondertiteling toevoegen aan {os.path.basename(video_path)}: {len(tracks)} spo(o)r(en)")
+            return self.muxer.submit(video_path, tracks)
         except Exception as e:
             print(f"❌ Fout bij toevoegen ondertiteling: {e}")
             return None
     
-    def _format_time(self, seconds: float) -> str:
-        """Converteer seconden naar SRT timestamp formaat"""
-        try:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            secs = int(seconds % 60)
-            millisecs = int((seconds % 1) * 1000)
-            return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
-        except:
-            return "00:00:00,000"
+    def finish_muxing(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Wacht op alle geplande mux jobs, stop de muxer en geef per video het resultaat
+        
+        process_video() roept dit zelf aan; een volgende mux job maakt een nieuwe muxer.
+        """
+        results = {}
+        for video_path, future in self._mux_jobs.items():
+            try:
+                results[video_path] = future.result()
+            except Exception as e:
+                results[video_path] = {"error": str(e)}
+            if results[video_path].get("error"):
+                print(f"❌ Ondertiteling toevoegen gefaald voor {os.path.basename(video_path)}: {results[video_path]['error']}")
+            else:
+                print(f"✅ Ondertiteling toegevoegd: {results[video_path]['output_path']}")
+        self._mux_jobs = {}
+        if self.muxer is not None:
+            self.muxer.shutdown()
+            self.muxer = None
+        return results
     
     def _get_preserve_subtitles_setting(self) -> bool:
         """Haal preserve_subtitles instelling op"""
@@ -249,6 +339,10 @@ class VideoProcessor:
             print(f"❌ Fout bij ophalen preserve_subtitles instelling: {e}")
             return False
     
+    def _get_mux_setting(self) -> bool:
+        """Haal mux_subtitles instelling op (SRT sporen in de video zetten)"""
+        return bool(self.settings and self.settings.get("mux_subtitles", False))
+    
     def _get_subtitle_type_setting(self) -> str:
         """Haal subtitle_type instelling op"""
         try:
@@ -263,6 +357,18 @@ class VideoProcessor:
             print(f"❌ Fout bij ophalen subtitle_type instelling: {e}")
             return "softcoded"
 
+    def _get_layout_setting(self, output: str) -> Optional[Dict[str, Any]]:
+        """Haal ondertitel layout op voor een output ("translated" of "original")"""
+        try:
+            if not self.settings:
+                return None
+            # Per output instelbaar, met subtitle_layout als gemeenschappelijke standaard
+            layout = self.settings.get(f"subtitle_layout_{output}", self.settings.get("subtitle_layout"))
+            return resolve_layout(layout)
+        except Exception as e:
+            print(f"❌ Fout bij ophalen subtitle_layout instelling: {e}")
+            return None
+
     def _remove_existing_original_srt(self, video_path: str):
         """Verwijder bestaand origineel SRT bestand als het bestaat"""
         try:
@@ -6,6 +6,9 @@ Handelt speech-to-text transcriptie af met WhisperX (enige ondersteunde optie)
 import os
 from typing import Optional, Dict, Any
 
+from core.model_config import build_vad_settings, reload_metrics
+from core.inference_tuning import default_compute_type
+
 # Import alleen WhisperX
 try:
     from ..whisperx_processor import WhisperXProcessor
@@ -25,6 +28,7 @@ class WhisperProcessor:
         self.whisperx_processor = WhisperXProcessor()
         
         self.settings = None  # Instellingen worden later ingesteld
+        self.model_config = None  # ModelConfig van het geladen model
         
         # Initialiseer Whisper manager (zonder model te laden)
         if whisper_manager:
@@ -63,22 +67,22 @@ class WhisperProcessor:
             if torch.cuda.is_available():
                 # CUDA beschikbaar - gebruik GPU
                 device = "cuda"
-                compute_type = "float16"
+                compute_type = default_compute_type(device)
                 print("✅ CUDA gedetecteerd - gebruik GPU")
             else:
                 # Geen CUDA - gebruik CPU
                 device = "cpu"
-                compute_type = "int8"  # CPU-optimale compute type
+                compute_type = default_compute_type(device)  # CPU-optimale compute type
                 print("⚠️ CUDA niet beschikbaar - gebruik CPU met int8")
         except ImportError:
             # PyTorch niet beschikbaar - gebruik CPU
             device = "cpu"
-            compute_type = "float32"
+            compute_type = default_compute_type(device)
             print("⚠️ PyTorch niet beschikbaar - gebruik CPU")
         except Exception as e:
             # Fallback naar CPU bij fouten
             device = "cpu"
-            compute_type = "float32"
+            compute_type = default_compute_type(device)
             print(f"⚠️ Fout bij device detectie: {e} - gebruik CPU")
         
         return device, compute_type
@@ -99,102 +103,42 @@ class WhisperProcessor:
             whisper_type = settings.get("whisper_type", "whisperx")
             whisperx_model = settings.get("whisper_model", "tiny")
             
-            # Controleer of VAD instellingen zijn gewijzigd
-            current_vad_settings = getattr(self, 'current_vad_settings', {})
-            new_vad_settings = {
-                "vad_enabled": settings.get("vad_enabled", False),
-                "vad_method": settings.get("vad_method", "Silero (snel)"),
-                "vad_threshold": settings.get("vad_threshold", 0.5),
-                "vad_onset": settings.get("vad_onset", 0.5),
-                "vad_chunk_size": settings.get("vad_chunk_size", 30),
-                "vad_min_speech": settings.get("vad_min_speech", 0.5),
-                "vad_min_silence": settings.get("vad_min_silence", 0.5),
-            }
-            
-            # Controleer of VAD instellingen zijn gewijzigd
-            vad_settings_changed = (
-                current_vad_settings.get("vad_enabled") != new_vad_settings["vad_enabled"] or
-                current_vad_settings.get("vad_method") != new_vad_settings["vad_method"] or
-                abs(current_vad_settings.get("vad_threshold", 0.5) - new_vad_settings["vad_threshold"]) > 0.01 or
-                abs(current_vad_settings.get("vad_onset", 0.5) - new_vad_settings["vad_onset"]) > 0.01 or
-                current_vad_settings.get("vad_chunk_size", 30) != new_vad_settings["vad_chunk_size"] or
-                abs(current_vad_settings.get("vad_min_speech", 0.5) - new_vad_settings["vad_min_speech"]) > 0.01 or
-                abs(current_vad_settings.get("vad_min_silence", 0.5) - new_vad_settings["vad_min_silence"]) > 0.01
-            )
-            
-            if vad_settings_changed:
-                print(f"🔄 VAD instellingen gewijzigd, herlaad model")
-                
-                # Herlaad model met nieuwe VAD instellingen
-                if self.whisperx_processor:
-                    success = self.whisperx_processor.reload_model_with_vad_settings(whisperx_model, new_vad_settings)
-                    if success:
-                        print(f"✅ WhisperX model herladen met VAD instellingen: {whisperx_model}")
-                        # Update de huidige VAD instellingen
-                        self.current_vad_settings = new_vad_settings.copy()
-                    else:
-                        print(f"❌ WhisperX model herladen met VAD instellingen gefaald: {whisperx_model}")
-                        # Probeer normale herlading als fallback
-                        success = self.whisperx_processor.load_model(whisperx_model)
-                        if success:
-                            print(f"✅ WhisperX model herladen (fallback): {whisperx_model}")
-                            self.whisperx_processor.current_model = whisperx_model
-                        else:
-                            print(f"❌ Fallback naar gekozen model gefaald: {whisperx_model}")
-                            # Probeer een kleiner model als fallback
-                            fallback_models = ["tiny", "base", "small", "medium", "large-v3"]
-                            fallback_success = False
-                            
-                            for fallback_model in fallback_models:
-                                if fallback_model != whisperx_model:
-                                    print(f"🔄 Probeer fallback naar {fallback_model} model...")
-                                    success = self.whisperx_processor.load_model(fallback_model)
-                                    if success:
-                                        print(f"✅ WhisperX fallback model geladen: {fallback_model}")
-                                        self.whisperx_processor.current_model = fallback_model
-                                        fallback_success = True
-                                        break
-                            
-                            if not fallback_success:
-                                print(f"❌ Alle fallback modellen gefaald")
+            # Canonieke model configuratie: herlaad alleen als deze sleutel verandert
+            vad_settings = build_vad_settings(settings)
+            self.whisperx_processor.resolve_inference(whisperx_model, settings)
+            model_config = self.whisperx_processor.model_config_for(whisperx_model, vad_settings)
             
             # Initialiseer whisper manager met het gekozen model
             if whisper_manager:
                 whisper_manager.initialize(whisper_type, whisperx_model)
             
-            # Controleer of het model moet worden herladen (alleen als VAD niet is gewijzigd)
-            if not vad_settings_changed:
-                current_model = getattr(self.whisperx_processor, 'current_model', None)
-                if current_model != whisperx_model:
-                    print(f"🔄 Model wijziging: {current_model} -> {whisperx_model}")
-                    
-                    # Herlaad het model met nieuwe instellingen
-                    if self.whisperx_processor:
-                        success = self.whisperx_processor.load_model(whisperx_model)
-                        if success:
-                            print(f"✅ WhisperX model herladen: {whisperx_model}")
-                            # Update de huidige model referentie
-                            self.whisperx_processor.current_model = whisperx_model
-                        else:
-                            print(f"❌ WhisperX model herladen gefaald: {whisperx_model}")
-                            # Probeer een kleiner model als fallback
-                            fallback_models = ["tiny", "base", "small", "medium", "large-v3"]
-                            fallback_success = False
-                            
-                            for fallback_model in fallback_models:
-                                if fallback_model != whisperx_model:
-                                    print(f"🔄 Probeer fallback naar {fallback_model} model...")
-                                    success = self.whisperx_processor.load_model(fallback_model)
-                                    if success:
-                                        print(f"✅ WhisperX fallback model geladen: {fallback_model}")
-                                        self.whisperx_processor.current_model = fallback_model
-                                        fallback_success = True
-                                        break
-                            
-                            if not fallback_success:
-                                print(f"❌ Alle fallback modellen gefaald")
+            if model_config == self.model_config:
+                reload_metrics.record_avoided(model_config)
+                print(f"✅ Model hoeft niet te worden herladen: {model_config.describe()}")
+            else:
+                print(f"🔄 Model configuratie gewijzigd: {model_config.describe()}")
+                success = self.whisperx_processor.load_model_config(model_config)
+                if success:
+                    print(f"✅ WhisperX model geladen: {whisperx_model}")
+                    self.model_config = model_config
                 else:
-                    print(f"✅ Model hoeft niet te worden herladen: {whisperx_model}")
+                    print(f"❌ WhisperX model laden gefaald: {whisperx_model}")
+                    # Probeer een kleiner model als fallback
+                    fallback_models = ["tiny", "base", "small", "medium", "large-v3"]
+                    fallback_success = False
+                    
+                    for fallback_model in fallback_models:
+                        if fallback_model != whisperx_model:
+                            print(f"🔄 Probeer fallback naar {fallback_model} model...")
+                            fallback_config = self.whisperx_processor.model_config_for(fallback_model, vad_settings)
+                            if self.whisperx_processor.load_model_config(fallback_config):
+                                print(f"✅ WhisperX fallback model geladen: {fallback_model}")
+                                self.model_config = fallback_config
+                                fallback_success = True
+                                break
+                    
+                    if not fallback_success:
+                        print(f"❌ Alle fallback modellen gefaald")
             
             print(f"✅ WhisperX instellingen ingesteld: {whisperx_model}")
             
@@ -240,20 +184,19 @@ class WhisperProcessor:
             
             # Haal taal instellingen op uit configuratie
             try:
-                # Probeer verschillende import methoden
-                try:
-                    from ...core.config import ConfigManager
-                except ImportError:
+                # Gebruik de snapshot van deze verwerking (geen nieuwe ConfigManager per bestand)
+                config = getattr(self.processing_thread, 'config_snapshot', None)
+                if config is None:
                     try:
-                        from magic_time_studio.core.config import ConfigManager
+                        from core.config import config_manager as shared_config_manager
+                        config = shared_config_manager.snapshot()
                     except ImportError:
                         # Fallback naar directe configuratie
-                        ConfigManager = None
+                        config = None
                 
-                if ConfigManager:
-                    config_manager = ConfigManager()
-                    default_language = config_manager.get_env("DEFAULT_LANGUAGE", "en")
-                    auto_detect_language = config_manager.get_env("AUTO_DETECT_LANGUAGE", "false").lower() == "true"
+                if config is not None:
+                    default_language = config.get_env("DEFAULT_LANGUAGE", "en")
+                    auto_detect_language = config.get_env("AUTO_DETECT_LANGUAGE", "false").lower() == "true"
                 else:
                     # Fallback waarden
                     default_language = "en"
@@ -7,6 +7,14 @@ import os
 from PySide6.QtCore import QThread, Signal
 from typing import List, Dict
 
+from core.model_config import build_vad_settings, reload_metrics
+from core.audio_extraction import extraction_metrics
+from core.cancellation import CancellationToken, CancelledError
+from core.resume_state import resume_key
+from core.device_pool import parse_devices
+from core.batch_manifest import (BatchManifest, STAGE_TRANSCRIBE, STATUS_FAILED,
+                                 write_json_atomic, load_json)
+
 class ProcessingThread(QThread):
     """Processing thread voor Magic Time Studio"""
     
@@ -25,6 +33,25 @@ class ProcessingThread(QThread):
         self.whisperx_processor = None
         self.is_running = True
         self._should_stop = False
+        self.cancel_token = CancellationToken()  # Stop/pauze binnen één transcriptie venster
+        self.duplicate_map = {}  # duplicaat pad -> origineel pad
+        self._results_by_path = {}  # resultaten van originelen met duplicaten
+        self._batch_by_path = {}  # pad -> batch van korte bestanden
+        self._batched_results = {}  # pad -> resultaat uit een batch transcriptie
+        self.manifest = None  # Crash-veilige voortgang per bestand (zie _load_manifest)
+        self.transcription_client = None  # Verbinding met de transcriptie server (optioneel)
+        self._server_jobs = {}  # pad -> job id van vooraf ingediende server jobs
+        self.devices = parse_devices(self.settings.get("transcription_devices"))  # Meerdere GPU's (optioneel)
+        self.device_pool = None
+        self._device_jobs = {}  # pad -> future van de DevicePool
+        
+        # Eén configuratie snapshot per verwerking (wijzigingen tijdens de run hebben geen invloed)
+        try:
+            from core.config import config_manager
+            self.config_snapshot = config_manager.snapshot()
+        except Exception as e:
+            print(f"⚠️ [DEBUG] ProcessingThread: Kon configuratie snapshot niet maken: {e}")
+            self.config_snapshot = None
         
         # Debug: toon instellingen
         print(f"🔧 [DEBUG] ProcessingThread: Instellingen ontvangen: {self.settings}")
@@ -35,6 +62,12 @@ class ProcessingThread(QThread):
         else:
             print("⚠️ [DEBUG] ProcessingThread: Geen instellingen ontvangen, gebruik standaardwaarden")
         
+        # Optioneel: transcriptie in een apart server proces met een blijvend geladen model
+        if self.settings.get("transcription_server"):
+            self._connect_transcription_server()
+            if self.transcription_client is not None:
+                return
+        
         # Initialiseer WhisperX processor
         try:
             # Gebruik absolute import in plaats van relatief
@@ -53,10 +86,113 @@ class ProcessingThread(QThread):
             except Exception as e2:
                 print(f"❌ [FOUT] Ook alternatieve import gefaald: {e2}")
     
+    def _connect_transcription_server(self):
+        """Verbind met de transcriptie server (start hem als er nog geen draait)"""
+        try:
+            from core.transcription_service import connect
+            from app_core.whisperx.transcription_worker import serve_command
+            self.transcription_client = connect(spawn_command=serve_command(self.settings))
+            if self.transcription_client is not None:
+                print(f"✅ [INFO] Verbonden met transcriptie server: {self.transcription_client.address}")
+            else:
+                print("⚠️ [WAARSCHUWING] Transcriptie server niet bereikbaar, transcribeer in dit proces")
+        except Exception as e:
+            print(f"⚠️ [WAARSCHUWING] Kon niet verbinden met transcriptie server: {e}")
+            self.transcription_client = None
+    
+    def _submit_server_jobs(self, language: str):
+        """Dien alle te transcriberen bestanden vooraf in als de server meerdere workers heeft (CPU replica's)"""
+        self._server_jobs = {}
+        if self.transcription_client is None:
+            return
+        try:
+            if self.transcription_client.status().get("workers", 1) < 2:
+                return
+            done = set(self.manifest.completed(self.files, STAGE_TRANSCRIBE)) if self.manifest else set()
+            model = self.settings.get('whisper_model', 'large-v3')
+            for path in self.files:
+                if path in self.duplicate_map or path in done or path in self._server_jobs:
+                    continue
+                options = {"settings": self.settings, "resume_key": resume_key(path, model, language)}
+                self._server_jobs[path] = self.transcription_client.submit(os.path.abspath(path), options)
+            print(f"🧵 [INFO] {len(self._server_jobs)} bestand(en) parallel ingediend bij de transcriptie server")
+        except Exception as e:
+            print(f"⚠️ [WAARSCHUWING] Vooraf indienen mislukt, verwerk bestanden één voor één: {e}")
+    
+    def _file_progress_callback(self, index: int):
+        """Progress callback voor een bestand dat parallel op een ander device loopt"""
+        def callback(progress: float, message: str):
+            total_progress = (index - 1) / len(self.files) * 100 + progress / len(self.files)
+            self.progress_updated.emit(total_progress, f"Bestand {index}: {message}")
+        return callback
+    
+    def _submit_device_jobs(self, language: str, vad_settings):
+        """Verdeel alle te transcriberen bestanden over de devices (één model replica per GPU)"""
+        self._device_jobs = {}
+        if self.transcription_client is not None or len(self.devices) < 2:
+            return
+        try:
+            from app_core.whisperx.device_replicas import create_device_pool
+            from core.media_probe import probe_many
+            model = self.settings.get('whisper_model', 'large-v3')
+            done = set(self.manifest.completed(self.files, STAGE_TRANSCRIBE)) if self.manifest else set()
+            pending = [path for path in dict.fromkeys(self.files) if path not in self.duplicate_map and path not in done]
+            if not pending:
+                return
+            # Audio duur als belasting: lange bestanden eerst en naar het minst belaste device
+            infos = probe_many(pending)
+            costs = [(infos.get(path) or {}).get("duration") or 1.0 for path in pending]
+            indexes = {path: i for i, path in enumerate(self.files, 1)}
+            
+            def run(replica, path):
+                return replica.transcribe(
+                    path,
+                    language=language,
+                    progress_callback=self._file_progress_callback(indexes[path]),
+                    vad_settings=vad_settings,
+                    cancel_token=self.cancel_token,
+                    resume_key=resume_key(path, model, language),
+                    chunk_seconds=self.settings.get("transcribe_chunk_seconds")
+                )
+            
+            self.device_pool = create_device_pool(self.devices, model, self.settings, vad_settings)
+            self._device_jobs = dict(zip(pending, self.device_pool.map(run, pending, costs)))
+            print(f"🎮 [INFO] {len(pending)} bestand(en) verdeeld over {len(self.devices)} devices: {', '.join(self.devices)}")
+        except Exception as e:
+            print(f"⚠️ [WAARSCHUWING] Device pool niet beschikbaar, verwerk op één device: {e}")
+            self._device_jobs = {}
+            if self.device_pool is not None:
+                self.device_pool.shutdown(wait=False, cancel_pending=True)
+                self.device_pool = None
+    
+    def stop(self):
+        """Stop de verwerking binnen één venster en beëindig eigen subprocessen"""
+        print("🛑 [STOP] ProcessingThread: Stop aangevraagd")
+        self._should_stop = True
+        self.cancel_token.cancel()
+    
+    def pause(self):
+        """Pauzeer bij het volgende venster (de model lock wordt vrijgegeven)"""
+        print("⏸️ [PAUZE] ProcessingThread: Pauze aangevraagd")
+        self.cancel_token.pause()
+        self.status_updated.emit("Verwerking gepauzeerd")
+    
+    def resume(self):
+        """Hervat een gepauzeerde verwerking"""
+        print("▶️ [HERVAT] ProcessingThread: Verwerking hervat")
+        self.cancel_token.resume()
+        self.status_updated.emit("Verwerking hervat")
+    
+    @property
+    def is_paused(self) -> bool:
+        """True als de verwerking gepauzeerd is"""
+        return self.cancel_token.paused
+    
     def cleanup(self):
         """Veilige cleanup van de thread"""
         print(f"🧹 [CLEANUP] ProcessingThread: Start cleanup")
         self._should_stop = True
+        self.cancel_token.cancel()
         self.is_running = False
         
         # Wacht tot thread natuurlijk stopt
@@ -86,15 +222,138 @@ class ProcessingThread(QThread):
         except Exception as e:
             print(f"⚠️ [WAARSCHUWING] Fout in progress callback: {e}")
     
+    def _detect_duplicates(self):
+        """Zoek dubbele invoer vóór de batch start zodat elk origineel maar één keer wordt getranscribeerd"""
+        if not self.settings.get("detect_duplicates", True) or len(self.files) < 2:
+            return
+        try:
+            from core.duplicate_detector import find_duplicates, build_duplicate_map, format_duplicate_report
+            groups = find_duplicates(
+                self.files,
+                audio_aware=self.settings.get("duplicate_audio_aware", False),
+                should_stop=lambda: self._should_stop
+            )
+            self.duplicate_map = build_duplicate_map(groups)
+            if groups:
+                print(f"♻️ [INFO] {len(self.duplicate_map)} dubbel bestand(en) gevonden:")
+                print(format_duplicate_report(groups))
+                self.status_updated.emit(f"{len(self.duplicate_map)} dubbel bestand(en) gevonden, transcriptie wordt hergebruikt")
+        except Exception as e:
+            print(f"⚠️ [WAARSCHUWING] Duplicaat detectie mislukt: {e}")
+            self.duplicate_map = {}
+    
+    def _load_manifest(self):
+        """Laad het batch manifest zodat afgeronde bestanden na een crash worden overgeslagen"""
+        self.manifest = None
+        if not self.settings.get("resume_batches", True) or not self.files:
+            return
+        try:
+            self.manifest = BatchManifest.for_batch(self.files, self.settings.get("output_dir"))
+            self.manifest.load()
+            done = self.manifest.completed(self.files, STAGE_TRANSCRIBE)
+            if done:
+                print(f"⏯️ [INFO] {len(done)}/{len(self.files)} bestand(en) al getranscribeerd in een eerdere run, worden overgeslagen")
+                self.status_updated.emit(f"Batch hervat: {len(done)} bestand(en) al verwerkt")
+        except Exception as e:
+            print(f"⚠️ [WAARSCHUWING] Batch manifest niet beschikbaar: {e}")
+            self.manifest = None
+    
+    def _load_transcript(self, file_path: str):
+        """Transcriptie uit een eerdere run (of None)"""
+        if self.manifest is None:
+            return None
+        path = self.manifest.artifact(file_path, STAGE_TRANSCRIBE, "transcript")
+        return load_json(path) if path else None
+    
+    def _save_transcript(self, file_path: str, result):
+        """Schrijf de transcriptie atomair weg en registreer de stap in het manifest"""
+        if self.manifest is None:
+            return
+        try:
+            path = self.manifest.artifact_path(file_path, "transcript.json")
+            if write_json_atomic(path, result):
+                self.manifest.record(file_path, STAGE_TRANSCRIBE, artifacts={"transcript": path})
+        except Exception as e:
+            print(f"⚠️ [WAARSCHUWING] Kon transcriptie niet in manifest vastleggen: {e}")
+    
+    def _plan_short_file_batches(self):
+        """Groepeer korte bestanden zodat ze samen in één GPU batch getranscribeerd worden"""
+        self._batch_by_path = {}
+        self._batched_results = {}
+        if not self.settings.get("batch_short_files", True) or len(self.files) < 2:
+            return
+        if self.transcription_client is not None or len(self.devices) > 1:
+            return  # Server of device pool verwerkt bestanden los; het model blijft daar geladen
+        try:
+            from core.media_probe import probe_many
+            from core.batch_packing import plan_batches
+            # Duplicaten worden hergebruikt en afgeronde bestanden overgeslagen; die horen niet in een batch
+            done = set(self.manifest.completed(self.files, STAGE_TRANSCRIBE)) if self.manifest else set()
+            candidates = [path for path in self.files if path not in self.duplicate_map and path not in done]
+            infos = probe_many(candidates)
+            items = [(path, (infos.get(path) or {}).get("duration")) for path in candidates]
+            batches, _ = plan_batches(
+                items,
+                max_batch_seconds=float(self.settings.get("batch_max_seconds", 300)),
+                max_files=int(self.settings.get("batch_max_files", 16)),
+                short_file_seconds=float(self.settings.get("batch_short_file_seconds", 60))
+            )
+            for batch in batches:
+                for path in batch:
+                    self._batch_by_path[path] = batch
+            if batches:
+                print(f"📦 [INFO] {len(self._batch_by_path)} korte bestanden verdeeld over {len(batches)} batch(es)")
+        except Exception as e:
+            print(f"⚠️ [WAARSCHUWING] Batch planning mislukt, verwerk bestanden los: {e}")
+            self._batch_by_path = {}
+    
+    def _transcribe_from_batch(self, file_path: str, language: str, vad_settings):
+        """Resultaat voor een bestand uit zijn batch (de hele batch wordt bij het eerste bestand getranscribeerd)"""
+        batch = self._batch_by_path.get(file_path)
+        if not batch:
+            return None
+        if file_path not in self._batched_results:
+            results = self.whisperx_processor.transcribe_batch(batch, language, vad_settings)
+            # Bij een mislukte batch vallen alle bestanden terug op losse verwerking
+            for path in batch:
+                self._batched_results[path] = (results or {}).get(path)
+                self._batch_by_path.pop(path, None)
+        return self._batched_results.pop(file_path, None)
+    
     def run(self):
         """Voer verwerking uit in aparte thread"""
         try:
             print(f"🔧 [START] Processing thread gestart voor {len(self.files)} bestand(en)")
             
+            self._detect_duplicates()
+            self._load_manifest()
+            self._plan_short_file_batches()
+            self._submit_server_jobs(self.settings.get('language', 'en'))
+            
+            # VAD instellingen en model configuratie één keer per run bepalen
+            vad_settings = None
+            model_config = None
+            if self.settings:
+                vad_settings = build_vad_settings(self.settings, whisperx_method="pyannote")  # Altijd pyannote voor WhisperX
+                vad_settings["whisper_model"] = self.settings.get("whisper_model", "large-v3")  # Voor ETA berekening
+                print(f"🔧 [DEBUG] VAD instellingen voor deze run: {vad_settings}")
+            self._submit_device_jobs(self.settings.get('language', 'en'), vad_settings)
+            if self.whisperx_processor and self.device_pool is None:
+                selected_model = self.settings.get('whisper_model', 'large-v3')
+                # batch_size/compute_type: handmatig, bewaard of benchmark bij eerste gebruik
+                sample_path = self.settings.get("auto_tune_sample") or (self.files[0] if self.files else None)
+                self.whisperx_processor.resolve_inference(selected_model, self.settings, sample_path)
+                model_config = self.whisperx_processor.model_config_for(selected_model, vad_settings)
+                print(f"🔧 [DEBUG] ProcessingThread: Model configuratie: {model_config.describe()}")
+            
             for i, file_path in enumerate(self.files, 1):
-                # Controleer of verwerking moet stoppen
+                # Controleer of verwerking moet stoppen (wacht hier tijdens een pauze)
+                try:
+                    self.cancel_token.checkpoint()
+                except CancelledError:
+                    self._should_stop = True
                 if self._should_stop:
-                    print(f"🛑 [STOP] Verwerking gestopt door gebruiker")
+                    print("🛑 [STOP] Verwerking gestopt door gebruiker")
                     break
                 
                 # Stel huidige bestand index in voor progress callback
@@ -106,38 +365,30 @@ class ProcessingThread(QThread):
                     # Update status
                     self.status_updated.emit(f"Verwerking bestand {i}/{len(self.files)}: {os.path.basename(file_path)}")
                     
+                    # Dubbel bestand: hergebruik de transcriptie van het origineel
+                    original_path = self.duplicate_map.get(file_path)
+                    if original_path and self._results_by_path.get(original_path):
+                        filename = os.path.basename(file_path)
+                        print(f"♻️ [VOLTOOID] {filename} is gelijk aan {os.path.basename(original_path)}, transcriptie hergebruikt")
+                        self.progress_updated.emit((i / len(self.files)) * 100, f"Bestand {i}/{len(self.files)} voltooid: {filename}")
+                        continue
+                    
+                    # Afgerond in een eerdere run: geen GPU werk opnieuw doen
+                    previous = self._load_transcript(file_path)
+                    if previous:
+                        filename = os.path.basename(file_path)
+                        if file_path in self.duplicate_map.values():
+                            self._results_by_path[file_path] = previous
+                        print(f"⏯️ [VOLTOOID] {filename} al getranscribeerd in een eerdere run, overgeslagen")
+                        self.progress_updated.emit((i / len(self.files)) * 100, f"Bestand {i}/{len(self.files)} voltooid: {filename}")
+                        continue
+                    
                     # Start WhisperX verwerking
                     print(f"🎤 [START] Start WhisperX verwerking van {os.path.basename(file_path)}...")
                     
-                    # Laad model als dat nog niet is gebeurd
-                    if not self.whisperx_processor.model_manager.is_loaded:
-                        print(f"🔧 [BEZIG] Laad WhisperX model...")
-                        
-                        # Haal VAD instellingen op uit settings
-                        vad_settings = None
-                        if self.settings:
-                            vad_settings = {
-                                "vad_enabled": self.settings.get("vad_enabled", True),
-                                "vad_method": self.settings.get("vad_method", "Pyannote (nauwkeurig)"),
-                                "vad_method_whisperx": "pyannote",  # Altijd pyannote voor WhisperX
-                                "vad_threshold": self.settings.get("vad_threshold", 0.5),
-                                "vad_onset": self.settings.get("vad_onset", 0.5),
-                                "vad_chunk_size": self.settings.get("vad_chunk_size", 30),
-                                "vad_min_speech": self.settings.get("vad_min_speech", 0.5),
-                                "vad_min_silence": self.settings.get("vad_min_silence", 0.5),
-                                "whisper_model": self.settings.get("whisper_model", "large-v3"),  # Voeg model toe voor ETA berekening
-                            }
-                            print(f"🔧 [DEBUG] VAD instellingen voor model loading: {vad_settings}")
-                        
-                        # Haal het geselecteerde model op uit de UI instellingen
-                        selected_model = self.settings.get('whisper_model', 'large-v3')
-                        print(f"🔧 [DEBUG] ProcessingThread: Gebruik geselecteerd model: {selected_model}")
-                        
-                        self.whisperx_processor.load_model(
-                            model_name=selected_model,
-                            vad_settings=vad_settings
-                        )
-                        print(f"✅ [VOLTOOID] WhisperX model geladen met VAD instellingen")
+                    # Laad model alleen als de model configuratie van deze run nog niet geladen is
+                    if model_config is not None:
+                        self.whisperx_processor.load_model_config(model_config)
                     
                     # Start transcriptie
                     print(f"🎯 [START] Start transcriptie van {os.path.basename(file_path)}...")
@@ -149,30 +400,39 @@ class ProcessingThread(QThread):
                     language = self.settings.get('language', 'en')  # Standaard Engels
                     print(f"🌍 [INFO] Gebruik taal: {language}")
                     
-                    # Haal VAD instellingen op voor transcriptie
-                    vad_settings = None
-                    if self.settings:
-                        vad_settings = {
-                            "vad_enabled": self.settings.get("vad_enabled", True),
-                            "vad_method": self.settings.get("vad_method", "Pyannote (nauwkeurig)"),
-                            "vad_method_whisperx": "pyannote",  # Altijd pyannote voor WhisperX
-                            "vad_threshold": self.settings.get("vad_threshold", 0.5),
-                            "vad_onset": self.settings.get("vad_onset", 0.5),
-                            "vad_chunk_size": self.settings.get("vad_chunk_size", 30),
-                            "vad_min_speech": self.settings.get("vad_min_speech", 0.5),
-                            "vad_min_silence": self.settings.get("vad_min_silence", 0.5),
-                            "whisper_model": self.settings.get("whisper_model", "large-v3"),  # Voeg model toe voor ETA berekening
-                        }
-                        print(f"🔧 [DEBUG] VAD instellingen voor transcriptie: {vad_settings}")
-                    
-                    # Start transcriptie met progress callback
-                    print(f"🎯 [DEBUG] Start transcriptie met progress callback")
-                    result = self.whisperx_processor.transcribe_with_alignment(
-                        file_path,
-                        language=language,
-                        progress_callback=self._progress_callback,
-                        vad_settings=vad_settings
-                    )
+                    # Korte bestanden komen uit een gedeelde batch, anders losse transcriptie
+                    result = self._transcribe_from_batch(file_path, language, vad_settings)
+                    device_job = self._device_jobs.pop(file_path, None)
+                    if device_job is not None:
+                        # Loopt al op het toegewezen device; resultaten in de volgorde van de bestanden
+                        print(f"🎮 [INFO] Wacht op {os.path.basename(file_path)} ({device_job.device})")
+                        result = device_job.result()
+                    elif result is None:
+                        print("🎯 [DEBUG] Start transcriptie met progress callback")
+                        # Bewaarde vensters van een eerder gestopte verwerking worden hergebruikt
+                        key = resume_key(file_path, model_config, language) if model_config is not None else None
+                        if self.transcription_client is not None:
+                            # Het model blijft in het server proces geladen; een crash daar raakt de GUI niet
+                            key = resume_key(file_path, self.settings.get('whisper_model', 'large-v3'), language)
+                            job_id = self._server_jobs.pop(file_path, None)
+                            if job_id is None:
+                                job_id = self.transcription_client.submit(
+                                    os.path.abspath(file_path), {"settings": self.settings, "resume_key": key})
+                            result = self.transcription_client.wait(
+                                job_id,
+                                progress_callback=self._progress_callback,
+                                cancel_token=self.cancel_token
+                            )
+                        else:
+                            result = self.whisperx_processor.transcribe_with_alignment(
+                                file_path,
+                                language=language,
+                                progress_callback=self._progress_callback,
+                                vad_settings=vad_settings,
+                                cancel_token=self.cancel_token,
+                                resume_key=key,
+                                chunk_seconds=self.settings.get("transcribe_chunk_seconds")
+                            )
                     
                     # Update progress na voltooiing van bestand
                     progress = (i / len(self.files)) * 100
@@ -181,15 +441,32 @@ class ProcessingThread(QThread):
                     print(f"🔧 [DEBUG] Progress bijgewerkt: {progress:.1f}%")
                     
                     if result:
+                        if file_path in self.duplicate_map.values():
+                            self._results_by_path[file_path] = result
+                        self._save_transcript(file_path, result)
                         print(f"✅ [VOLTOOID] Transcriptie succesvol voor {filename}")
                     else:
+                        if self.manifest is not None:
+                            self.manifest.record(file_path, STAGE_TRANSCRIBE, STATUS_FAILED)
                         print(f"❌ [FOUT] Transcriptie gefaald voor {filename}")
                     
+                except CancelledError:
+                    print(f"🛑 [STOP] Transcriptie van {os.path.basename(file_path)} gestopt, voortgang bewaard")
+                    break
                 except Exception as e:
+                    if self.manifest is not None:
+                        self.manifest.record(file_path, STAGE_TRANSCRIBE, STATUS_FAILED, error=str(e))
                     print(f"❌ [FOUT] Fout tijdens transcriptie van {os.path.basename(file_path)}: {e}")
                     self.error_occurred.emit(f"Fout tijdens transcriptie van {os.path.basename(file_path)}: {e}")
             
             print(f"🎉 [VOLTOOID] Alle bestanden verwerkt!")
+            metrics = reload_metrics.summary()
+            print(f"📊 [INFO] Model loads: {metrics['loads']}, vermeden herladingen: {metrics['avoided_reloads']}")
+            extraction = extraction_metrics.summary()
+            if extraction["files"]:
+                print(f"📊 [INFO] Audio extractie: {extraction['files']} bestanden {extraction['modes']}, "
+                      f"{extraction['media_seconds']:.0f}s audio in {extraction['elapsed']:.1f}s"
+                      + (f" ({extraction['speed']:.0f}x realtime)" if extraction['speed'] else ""))
             self.processing_completed.emit()
             self.processing_finished.emit()  # Emit beide signals voor backward compatibility
             
@@ -200,6 +477,20 @@ class ProcessingThread(QThread):
             print(f"❌ [FOUT] Fout in processing thread: {e}")
             self.error_occurred.emit(f"Fout in processing thread: {e}")
         finally:
+            if self.transcription_client is not None:
+                # Niet meer afgewachte jobs (stop of fout) niet op de server laten doorlopen
+                for job_id in self._server_jobs.values():
+                    try:
+                        self.transcription_client.cancel(job_id)
+                    except Exception:
+                        pass
+                self._server_jobs = {}
+                self.transcription_client.close()  # De server blijft draaien voor volgende runs
+                self.transcription_client = None
+            if self.device_pool is not None:
+                self.device_pool.shutdown(wait=False, cancel_pending=True)
+                self.device_pool = None
+                self._device_jobs = {}
             print(f"🔧 [INFO] Processing thread gestopt")
             self.is_running = False
     
@@ -6,6 +6,8 @@ Alleen WhisperX ondersteund - voor maximale accuracy
 import os
 from typing import Dict, Any
 
+from core.inference_tuning import default_compute_type
+
 class WhisperManager:
     """Eenvoudige Whisper Manager - alleen WhisperX ondersteund"""
     
@@ -40,10 +42,9 @@ class WhisperManager:
                 gpu_available = self.check_cuda_availability()
                 if gpu_available:
                     self.gpu_device = "cuda"
-                    self.compute_type = "float16"
                 else:
                     self.gpu_device = "cpu"
-                    self.compute_type = "float32"
+                self.compute_type = default_compute_type(self.gpu_device)
                 
                 return True
             
@@ -59,10 +60,9 @@ class WhisperManager:
             gpu_available = self.check_cuda_availability()
             if gpu_available:
                 self.gpu_device = "cuda"
-                self.compute_type = "float16"
             else:
                 self.gpu_device = "cpu"
-                self.compute_type = "float32"
+            self.compute_type = default_compute_type(self.gpu_device)
             
             print(f"✅ WhisperX geïnitialiseerd met model: {model}")
             return True
@@ -101,14 +101,10 @@ class WhisperManager:
             self.gpu_device = device.lower()
             
             # Update compute type voor CPU
-            if device.lower() == "cpu":
-                self.compute_type = "float32"
-            elif device.lower() == "cuda" and self.check_cuda_availability():
-                self.compute_type = "float16"
-            else:
+            if device.lower() == "cuda" and not self.check_cuda_availability():
                 print("⚠️ CUDA niet beschikbaar, gebruik CPU")
                 self.gpu_device = "cpu"
-                self.compute_type = "float32"
+            self.compute_type = default_compute_type(self.gpu_device)
             
             return True
         else:
@@ -121,14 +117,14 @@ class WhisperManager:
     
     def set_compute_type(self, compute_type: str) -> bool:
         """Stel compute type in"""
-        valid_types = ["float16", "float32", "int8"]
+        valid_types = ["float16", "int8_float16", "float32", "int8"]
         if compute_type.lower() in valid_types:
             self.compute_type = compute_type.lower()
             
             # Controleer of float16 mogelijk is
-            if compute_type.lower() == "float16" and not self.check_cuda_availability():
-                print("⚠️ float16 vereist CUDA, gebruik float32")
-                self.compute_type = "float32"
+            if compute_type.lower() in ("float16", "int8_float16") and not self.check_cuda_availability():
+                print(f"⚠️ {compute_type} vereist CUDA, gebruik {default_compute_type('cpu')}")
+                self.compute_type = default_compute_type("cpu")
             
             return True
         else:
@@ -160,11 +156,11 @@ class WhisperManager:
         """Probeer CUDA te gebruiken"""
         if self.check_cuda_availability():
             self.gpu_device = "cuda"
-            self.compute_type = "float16"
+            self.compute_type = default_compute_type(self.gpu_device)
             return True
         else:
             self.gpu_device = "cpu"
-            self.compute_type = "float32"
+            self.compute_type = default_compute_type(self.gpu_device)
             return False
     
     def check_gpu_status(self) -> Dict[str, Any]:
@@ -0,0 +1,52 @@
+"""
+Audio laden voor WhisperX
+Vervangt whisperx.load_audio: goedkoopste extractie uit de probe cache, taalspoor keuze en fragmenten
+"""
+
+import os
+import wave
+import tempfile
+import numpy as np
+import whisperx
+from typing import Optional
+
+from core.audio_extraction import extract_audio, read_pcm, MODE_REUSE, SAMPLE_RATE
+
+def load_audio(audio_path: str, language: Optional[str] = None, preview_seconds: Optional[float] = None,
+               start: float = 0.0, cancel_token=None) -> np.ndarray:
+    """
+    Laad audio als float32 mono 16 kHz (zelfde formaat als whisperx.load_audio)
+
+    Bij meerdere audio sporen wordt het spoor in de ingestelde taal gebruikt;
+    met preview_seconds wordt alleen het fragment gedecodeerd. Als de
+    extractie mislukt valt dit terug op whisperx.load_audio.
+    """
+    fd, wav_path = tempfile.mkstemp(prefix="magic_time_audio_", suffix=".wav")
+    os.close(fd)
+    try:
+        result = extract_audio(audio_path, wav_path, language, preview_seconds, start, token=cancel_token)
+        if result.get("error"):
+            print(f"⚠️ [WAARSCHUWING] Audio extractie gefaald ({result['error']}), gebruik whisperx.load_audio")
+            audio = whisperx.load_audio(audio_path)
+            first = int(start * SAMPLE_RATE)
+            return audio[first:first + int(preview_seconds * SAMPLE_RATE)] if preview_seconds else audio[first:]
+
+        if result["speed"]:
+            print(f"🔊 [INFO] Audio {result['mode']}: {result['media_seconds']:.0f}s in {result['elapsed']:.1f}s "
+                  f"({result['speed']:.0f}x realtime)")
+        if result["mode"] == MODE_REUSE:
+            try:
+                pcm = read_pcm(audio_path, start, preview_seconds)
+            except (wave.Error, EOFError):
+                # Bijv. WAVE_FORMAT_EXTENSIBLE: het wave module leest dit niet, ffmpeg wel
+                extract_audio(audio_path, wav_path, language, preview_seconds, start,
+                              reuse_input=False, token=cancel_token)
+                pcm = read_pcm(wav_path)
+        else:
+            pcm = read_pcm(result["audio_path"])
+        return np.frombuffer(pcm, np.int16).flatten().astype(np.float32) / 32768.0
+    finally:
+        try:
+            os.remove(wav_path)
+        except OSError:
+            pass
@@ -0,0 +1,89 @@
+"""
+Auto tuner voor WhisperX
+Benchmarkt batch_size en compute_type op een kort audio fragment
+"""
+
+import time
+import whisperx
+import torch
+from typing import Dict, Any, Optional, Callable
+
+from .audio_loading import load_audio
+from core.device_pool import GpuMemorySampler, split_device
+
+# Lengte van het benchmark fragment in seconden
+SAMPLE_SECONDS = 30
+
+# Sample rate van whisperx.load_audio
+SAMPLE_RATE = 16000
+
+def load_sample(audio_path: str, seconds: int = SAMPLE_SECONDS):
+    """Laad de eerste seconden audio van een bestand als benchmark fragment (alleen dat stuk wordt gedecodeerd)"""
+    audio = load_audio(audio_path, preview_seconds=seconds)
+    return audio[:seconds * SAMPLE_RATE]
+
+def make_benchmark(model_name: str, device: str, sample_path: str,
+                   vad_options: Optional[Dict[str, Any]] = None) -> Callable[[str, int], Dict[str, Any]]:
+    """
+    Maak een benchmark functie voor core.inference_tuning.autotune
+
+    Het fragment wordt pas geladen bij de eerste meting; per compute type
+    wordt het model één keer geladen en voor alle batch sizes hergebruikt.
+
+    Args:
+        model_name: Whisper model naam
+        device: "cuda", "cuda:N" of "cpu"
+        sample_path: Audio of video bestand voor het fragment
+        vad_options: Optionele WhisperX vad_options
+
+    Returns:
+        Callable(compute_type, batch_size) -> dict met audio_seconds, seconds en peak_memory_mb
+        (piek van het device geheugen boven het gebruik vóór het laden van het model,
+        via nvidia-smi; None op CPU of zonder nvidia-smi)
+    """
+    state = {"audio": None, "compute_type": None, "model": None, "baseline_mb": None}
+    device_type, device_index = split_device(device)
+    sampler = None
+    if device_type == "cuda":
+        sampler = GpuMemorySampler(device_index if device_index is not None else torch.cuda.current_device())
+
+    def benchmark(compute_type: str, batch_size: int) -> Dict[str, Any]:
+        if state["audio"] is None:
+            state["audio"] = load_sample(sample_path)
+        if state["compute_type"] != compute_type:
+            # Vorig model vrijgeven voordat het volgende geladen wordt
+            state["model"] = None
+            if sampler is not None:
+                torch.cuda.empty_cache()
+                # Geheugen van andere processen en torch telt niet mee voor dit model
+                state["baseline_mb"] = sampler.used_mb()
+            state["model"] = whisperx.load_model(model_name, device, compute_type=compute_type,
+                                                 language=None, vad_options=vad_options)
+            state["compute_type"] = compute_type
+
+        peak_memory_mb = None
+        if sampler is not None:
+            # CTranslate2 alloceert buiten torch: het hele device meten in plaats van max_memory_allocated
+            with sampler:
+                start = time.perf_counter()
+                state["model"].transcribe(state["audio"], batch_size=batch_size)
+                seconds = time.perf_counter() - start
+            if sampler.peak_mb is not None and state["baseline_mb"] is not None:
+                peak_memory_mb = max(sampler.peak_mb - state["baseline_mb"], 0.0)
+        else:
+            start = time.perf_counter()
+            state["model"].transcribe(state["audio"], batch_size=batch_size)
+            seconds = time.perf_counter() - start
+        print(f"⏱️ {compute_type}, batch_size {batch_size}: {seconds:.2f}s"
+              + (f", piek {peak_memory_mb:.0f} MB" if peak_memory_mb else ""))
+        return {"audio_seconds": len(state["audio"]) / SAMPLE_RATE, "seconds": seconds,
+                "peak_memory_mb": peak_memory_mb}
+
+    def release():
+        state["model"] = None
+        state["audio"] = None
+        if sampler is not None:
+            torch.cuda.empty_cache()
+
+    benchmark.release = release
+    return benchmark
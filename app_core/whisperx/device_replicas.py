@@ -0,0 +1,62 @@
+"""
+Device replica's voor WhisperX
+Eén geladen model per device (GPU of CPU) met een eigen lock, voor verwerking via de DevicePool
+"""
+
+import threading
+import torch
+from typing import Dict, Any, List, Optional, Callable
+
+from .model_manager import WhisperXModelManager
+from .transcription_core import TranscriptionCore
+from .vad_integration import VADIntegration
+from core.device_pool import DevicePool, split_device
+from core.inference_tuning import resolve_inference_config
+from core.model_config import ModelConfig
+
+class DeviceReplica:
+    """WhisperX model op één device; wordt op de thread van dat device aangemaakt en gebruikt"""
+
+    def __init__(self, device: str, model_name: str, settings: Optional[Dict[str, Any]] = None,
+                 vad_settings: Optional[Dict[str, Any]] = None):
+        self.device = device
+        device_type, device_index = split_device(device)
+        if device_type == "cuda" and device_index is not None:
+            # Huidig CUDA device van deze thread: VAD en alignment van whisperx volgen dit device
+            torch.cuda.set_device(device_index)
+
+        inference = resolve_inference_config(model_name, device, settings)  # Geen benchmark per replica
+        self.model_manager = WhisperXModelManager(device, inference["compute_type"])
+        self.model_manager.batch_size = inference["batch_size"]
+
+        from ..whisperx_time_estimator import TimeEstimator
+        self.transcription_core = TranscriptionCore(
+            self.model_manager,
+            TimeEstimator(),
+            VADIntegration(),
+            lock=threading.RLock()  # Eigen lock: replica's op andere devices wachten niet op elkaar
+        )
+        self.model_config = ModelConfig.from_settings(model_name, vad_settings, device, inference["compute_type"])
+        print(f"📥 Laad replica op {device}: {self.model_config.describe()}")
+        if not self.model_manager.load_model_config(self.model_config):
+            raise RuntimeError(f"Model kon niet geladen worden op {device}")
+
+    def transcribe(self, audio_path: str, language: Optional[str] = None,
+                   progress_callback: Optional[Callable[[float, str], None]] = None,
+                   vad_settings: Optional[Dict[str, Any]] = None,
+                   cancel_token=None, resume_key: Optional[str] = None,
+                   chunk_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Transcribeer met alignment op dit device (zelfde gedrag als WhisperXProcessor)"""
+        return self.transcription_core.transcribe_with_alignment(
+            audio_path, language, progress_callback, vad_settings,
+            cancel_token, resume_key, chunk_seconds
+        )
+
+    def cleanup(self):
+        """Geef het model van dit device vrij"""
+        self.model_manager.cleanup()
+
+def create_device_pool(devices: List[str], model_name: str, settings: Optional[Dict[str, Any]] = None,
+                       vad_settings: Optional[Dict[str, Any]] = None) -> DevicePool:
+    """DevicePool met een WhisperX replica per device (replica's worden bij het eerste bestand geladen)"""
+    return DevicePool(devices, lambda device: DeviceReplica(device, model_name, settings, vad_settings))
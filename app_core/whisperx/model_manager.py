@@ -6,138 +6,117 @@ Handelt het laden en beheren van WhisperX modellen af
 import os
 import whisperx
 import torch
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 
+from core.model_config import ModelConfig, reload_metrics
+from core.inference_tuning import DEFAULT_BATCH_SIZE
+from core.device_pool import split_device
+
 class WhisperXModelManager:
     """Manager voor WhisperX modellen"""
     
+    # Aantal geladen modellen dat in geheugen blijft (sleutel: ModelConfig)
+    MODEL_POOL_SIZE = 1
+    
     def __init__(self, device: str = "cuda", compute_type: str = "float16"):
         self.device = device
         self.compute_type = compute_type
+        self.batch_size = DEFAULT_BATCH_SIZE.get(split_device(device)[0], 8)  # Wordt door resolve_inference ingesteld
+        self.cpu_threads: Optional[int] = None  # Threads per CPU replica (None = CTranslate2 standaard)
         self.model = None
         self.align_model = None
         self.align_extend = None
         self.current_model = None
         self.is_loaded = False
-        self._model_cache = {}  # Cache voor geladen modellen
+        self.current_config: Optional[ModelConfig] = None
+        self._model_cache = OrderedDict()  # ModelConfig -> geladen model
     
     def load_model(self, model_name: str = "large-v3", vad_settings: Dict[str, Any] = None) -> bool:
         """Laad WhisperX model met VAD (altijd ingeschakeld)"""
-        # Controleer of het model al geladen is
-        if self.is_loaded and self.current_model == model_name and self.model is not None:
-            print(f"✅ Model {model_name} is al geladen, skip loading")
+        config = ModelConfig.from_settings(model_name, vad_settings, self.device, self.compute_type)
+        return self.load_model_config(config)
+    
+    def reload_model_with_vad_settings(self, model_name: str, vad_settings: Dict[str, Any]) -> bool:
+        """Herlaad WhisperX model met VAD instellingen (alleen als de model configuratie verandert)"""
+        return self.load_model(model_name, vad_settings)
+    
+    def load_model_config(self, config: ModelConfig) -> bool:
+        """Zorg dat het model voor deze configuratie geladen is; herlaad alleen als de sleutel verandert"""
+        if self.is_loaded and self.model is not None and self.current_config == config:
+            reload_metrics.record_avoided(config)
+            print(f"✅ Model {config.model_name} is al geladen met dezelfde configuratie, skip loading")
             return True
-            
+        
+        # Model uit de pool hergebruiken als deze configuratie al eerder geladen is
+        cached_model = self._model_cache.get(config)
+        if cached_model is not None:
+            self._model_cache.move_to_end(config)
+            self.model = cached_model
+            self.current_config = config
+            self.current_model = config.model_name
+            self.is_loaded = True
+            reload_metrics.record_avoided(config)
+            print(f"♻️ Model uit pool hergebruikt: {config.describe()}")
+            return True
+        
         try:
-            print(f"📥 Laad WhisperX model: {model_name} op {self.device}")
+            print(f"📥 Laad WhisperX model: {config.describe()}")
+            # Oude modellen eerst vrijgeven zodat er geen twee volledige modellen tegelijk in geheugen staan
+            self.model = None
+            while len(self._model_cache) >= self.MODEL_POOL_SIZE:
+                self._model_cache.popitem(last=False)
             
-            # Gebruik doorgegeven VAD instellingen of standaard waarden
-            if vad_settings and vad_settings.get("vad_enabled", True):
-                preferred_vad_method = vad_settings.get("vad_method_whisperx", "pyannote")
-                print(f"🔧 [DEBUG] Gebruik voorkeur VAD methode: {preferred_vad_method}")
-                print(f"🔧 [DEBUG] VAD instellingen: device={self.device}, compute_type={self.compute_type}")
-                
-                # Probeer eerst de voorkeur VAD methode
+            vad_options = config.vad_options_dict()
+            # CPU replica's: CTranslate2 gebruikt precies de cores van deze replica
+            load_kwargs = {"threads": self.cpu_threads} if config.device == "cpu" and self.cpu_threads else {}
+            # "cuda:1": CTranslate2 wil het device type en de index los
+            device_type, device_index = split_device(config.device)
+            if device_index is not None:
+                load_kwargs["device_index"] = device_index
+            # Voorkeur VAD methode eerst, daarna fallbacks (pyannote eerst)
+            vad_methods = [config.vad_method] + [m for m in ("pyannote", "auditok", "silero") if m != config.vad_method]
+            vad_method = None
+            for method in vad_methods:
                 try:
-                    print(f"🔍 Probeer voorkeur VAD methode: {preferred_vad_method}")
-                    # Gebruik veilige compute type voor CPU
-                    safe_compute_type = "int8" if self.device == "cpu" else self.compute_type
-                    print(f"🔧 [DEBUG] Gebruik compute_type: {safe_compute_type}")
-                    
-                    # Maak VAD opties op basis van instellingen
-                    vad_options = {
-                        "chunk_size": vad_settings.get("vad_chunk_size", 30),
-                        "vad_onset": vad_settings.get("vad_onset", 0.5),
-                        "vad_offset": vad_settings.get("vad_onset", 0.5),  # Gebruik onset als offset
-                    }
-                    
+                    print(f"🔍 Probeer VAD methode: {method}")
                     self.model = whisperx.load_model(
-                        model_name, 
-                        self.device, 
-                        compute_type=safe_compute_type,
+                        config.model_name, 
+                        device_type, 
+                        compute_type=config.compute_type,
                         language=None,  # Auto-detect
-                        vad_method=preferred_vad_method,
-                        vad_options=vad_options
+                        vad_method=method,
+                        vad_options=vad_options,
+                        **load_kwargs
                     )
-                    vad_method = preferred_vad_method
-                    print(f"✅ Voorkeur VAD methode {preferred_vad_method} succesvol geladen")
-                    print(f"🔧 VAD opties gebruikt: {vad_options}")
-                    
+                    vad_method = method
+                    print(f"✅ VAD methode {method} succesvol geladen")
+                    break
                 except Exception as e:
-                    print(f"⚠️ Voorkeur VAD methode {preferred_vad_method} gefaald: {e}")
-                    
-                    # Fallback naar andere beschikbare VAD methoden (pyannote eerst)
-                    fallback_methods = ["pyannote", "auditok", "silero"]
-                    fallback_methods = [m for m in fallback_methods if m != preferred_vad_method]
-                    
-                    for method in fallback_methods:
-                        try:
-                            print(f"🔍 Probeer fallback VAD methode: {method}")
-                            self.model = whisperx.load_model(
-                                model_name, 
-                                self.device, 
-                                compute_type=safe_compute_type,
-                                language=None,
-                                vad_method=method,
-                                vad_options=vad_options
-                            )
-                            vad_method = method
-                            print(f"✅ Fallback VAD methode {method} succesvol geladen")
-                            break
-                        except Exception as e:
-                            print(f"⚠️ Fallback VAD methode {method} gefaald: {e}")
-                            continue
-                    
-                    # Als alle VAD methoden falen, probeer zonder VAD
-                    if not self.model:
-                        try:
-                            print("🔍 Probeer model zonder VAD te laden...")
-                            self.model = whisperx.load_model(
-                                model_name, 
-                                self.device, 
-                                compute_type=safe_compute_type,
-                                language=None
-                            )
-                            print("✅ Model zonder VAD succesvol geladen")
-                            vad_method = "geen"
-                        except Exception as e:
-                            print(f"❌ Alle model loading methoden gefaald: {e}")
-                            return False
-            else:
-                # Geen VAD instellingen, gebruik standaard aanpak (pyannote eerst)
-                print("🔧 Geen VAD instellingen, gebruik standaard VAD loading")
-                vad_methods = ["pyannote", "auditok", "silero"]
-                vad_method = None
-                
-                for method in vad_methods:
-                    try:
-                        print(f"🔍 Probeer VAD methode: {method}")
-                        safe_compute_type = "int8" if self.device == "cpu" else self.compute_type
-                        
-                        self.model = whisperx.load_model(
-                            model_name, 
-                            self.device, 
-                            compute_type=safe_compute_type,
-                            language=None,
-                            vad_method=method,
-                            vad_options={
-                                "chunk_size": 30,
-                                "vad_onset": 0.5,
-                                "vad_offset": 0.5,
-                            }
-                        )
-                        vad_method = method
-                        print(f"✅ VAD methode {method} succesvol geladen")
-                        break
-                    except Exception as e:
-                        print(f"⚠️ VAD methode {method} gefaald: {e}")
-                        continue
-                
-                if not self.model:
-                    print("❌ Alle VAD methoden gefaald")
+                    print(f"⚠️ VAD methode {method} gefaald: {e}")
+                    continue
+            
+            # Als alle VAD methoden falen, probeer zonder VAD
+            if not self.model:
+                try:
+                    print("🔍 Probeer model zonder VAD te laden...")
+                    self.model = whisperx.load_model(
+                        config.model_name, 
+                        device_type, 
+                        compute_type=config.compute_type,
+                        language=None,
+                        **load_kwargs
+                    )
+                    print("✅ Model zonder VAD succesvol geladen")
+                    vad_method = "geen"
+                except Exception as e:
+                    print(f"❌ Alle model loading methoden gefaald: {e}")
+                    self.is_loaded = False
+                    self.current_config = None
                     return False
             
             print(f"✅ WhisperX model geladen met VAD methode: {vad_method}")
+            print(f"🔧 VAD opties gebruikt: {vad_options}")
             
             # Laad alignment model voor accurate timestamps
             if self.align_model is None:
@@ -152,108 +131,32 @@ class WhisperXModelManager:
                     self.align_model = None
                     self.align_extend = None
             
-            self.current_model = model_name  # Update het huidige model
+            self._model_cache[config] = self.model
+            self.current_config = config
+            self.current_model = config.model_name  # Update het huidige model
             self.is_loaded = True
-            print(f"✅ WhisperX model geladen: {model_name}")
+            reload_metrics.record_load(config)
+            print(f"✅ WhisperX model geladen: {config.model_name}")
             return True
             
         except Exception as e:
             print(f"❌ Fout bij laden WhisperX model: {e}")
+            self.is_loaded = False
+            self.current_config = None
             return False
     
-    def reload_model_with_vad_settings(self, model_name: str, vad_settings: Dict[str, Any]) -> bool:
-        """Herlaad WhisperX model met VAD instellingen (altijd ingeschakeld)"""
-        # Controleer of we echt moeten herladen
-        if (self.is_loaded and self.current_model == model_name and 
-            self.model is not None and not self._vad_settings_changed(vad_settings)):
-            print(f"✅ Model {model_name} hoeft niet te worden herladen - VAD instellingen ongewijzigd")
-            return True
-            
-        print(f"🔄 Herlaad WhisperX model met VAD instellingen: {model_name}")
-        
-        # VAD is altijd ingeschakeld, gebruik instellingen of standaard waarden
-        if vad_settings and vad_settings.get("vad_enabled", True):
-            # Converteer VAD methode naar WhisperX formaat
-            from ..whisperx_vad import VADManager
-            vad_manager = VADManager()
-            whisperx_vad_method = vad_manager.convert_vad_method(
-                vad_settings.get("vad_method", "Silero (snel)")
-            )
-            
-            # Maak VAD opties
-            vad_options = vad_manager.create_vad_options(vad_settings)
-            
-            print(f"🔧 VAD opties: {vad_options}")
-        else:
-            # Gebruik standaard VAD instellingen
-            whisperx_vad_method = "silero"
-            vad_options = {
-                "chunk_size": 30,
-                "vad_onset": 0.5,
-                "vad_offset": 0.5,
-            }
-            print(f"🔧 Standaard VAD opties: {vad_options}")
-        
-        try:
-            # Laad WhisperX model MET VAD instellingen
-            # Gebruik veilige compute type voor CPU
-            safe_compute_type = "int8" if self.device == "cpu" else self.compute_type
-            self.model = whisperx.load_model(
-                model_name, 
-                self.device, 
-                compute_type=safe_compute_type,
-                language=None,  # Auto-detect
-                vad_method=whisperx_vad_method,
-                vad_options=vad_options
-            )
-        except Exception as e:
-            print(f"❌ Fout bij laden WhisperX model: {e}")
-            return False
-        
-        # Laad alignment model voor accurate timestamps
-        if self.align_model is None:
-            try:
-                self.align_model, self.align_extend = whisperx.load_align_model(
-                    language_code="en",  # Altijd Engels voor alignment
-                    device=self.device
-                )
-            except Exception as e:
-                print(f"⚠️ Kon alignment model niet laden: {e}")
-                self.align_model = None
-                self.align_extend = None
-        
-        self.current_model = model_name  # Update het huidige model
-        self.is_loaded = True
-        self._last_vad_settings = vad_settings.copy() if vad_settings else {}
-        print(f"✅ WhisperX model herladen: {model_name}")
-        print(f"🎯 VAD methode: {whisperx_vad_method}")
-        print(f"🎯 VAD opties: {vad_options}")
-        return True
-    
-    def _vad_settings_changed(self, new_settings: Dict[str, Any]) -> bool:
-        """Controleer of VAD instellingen zijn veranderd"""
-        if not hasattr(self, '_last_vad_settings'):
-            return True
-        
-        if not new_settings:
-            return False
-            
-        # Vergelijk alleen relevante VAD instellingen
-        relevant_keys = ['vad_method', 'vad_threshold', 'vad_onset', 'vad_chunk_size']
-        for key in relevant_keys:
-            if (key in new_settings and key in self._last_vad_settings and 
-                new_settings[key] != self._last_vad_settings[key]):
-                return True
-        return False
-    
     def get_model_info(self) -> Dict[str, Any]:
         """Krijg informatie over het geladen model"""
         return {
             "device": self.device,
-            "compute_type": self.compute_type,
+            "compute_type": self.current_config.compute_type if self.current_config else self.compute_type,
+            "batch_size": self.batch_size,
+            "cpu_threads": self.cpu_threads,
             "gpu_available": torch.cuda.is_available(),
             "is_loaded": self.is_loaded,
             "current_model": self.current_model,
+            "current_config": self.current_config.describe() if self.current_config else None,
+            "reload_metrics": reload_metrics.summary(),
             "has_align_model": self.align_model is not None
         }
     
@@ -263,6 +166,7 @@ class WhisperXModelManager:
             print("🧹 WhisperX geheugen opruimen...")
             
             # Ruim PyTorch modellen op
+            self._model_cache.clear()
             if self.model:
                 del self.model
                 self.model = None
@@ -276,6 +180,7 @@ class WhisperXModelManager:
             # Reset status
             self.is_loaded = False
             self.current_model = None
+            self.current_config = None
             
             print("🧹 WhisperX geheugen opgeruimd")
             
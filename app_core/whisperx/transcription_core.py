@@ -5,22 +5,46 @@ Handelt de daadwerkelijke transcriptie logica af
 
 import os
 import time
-import shutil
 import whisperx
+import numpy as np
 from typing import Dict, Any, List, Optional, Callable
 
+from core.batch_packing import (layout_spans, split_segments, gap_for_chunk_size,
+                                plan_chunks, quiet_boundary, offset_segments,
+                                TRANSCRIBE_CHUNK_SECONDS, QUIET_SEARCH_SECONDS)
+from core.cancellation import CancelledError, model_lock
+from core.resume_state import ChunkCheckpoint
+from core.audio_extraction import audio_work_copy
+from .audio_loading import load_audio
+
+# Sample rate van load_audio (zelfde als whisperx.load_audio)
+SAMPLE_RATE = 16000
+
+# Frame duur voor het zoeken naar stilte bij venstergrenzen (seconden)
+QUIET_FRAME_SECONDS = 0.1
+
 class TranscriptionCore:
     """Core transcriptie logica voor WhisperX"""
     
-    def __init__(self, model_manager, time_estimator, vad_integration):
+    def __init__(self, model_manager, time_estimator, vad_integration, lock=None):
         self.model_manager = model_manager
         self.time_estimator = time_estimator
         self.vad_integration = vad_integration
+        # Gedeelde model_lock voor het singleton model; replica's op andere devices krijgen een eigen lock
+        self.model_lock = lock if lock is not None else model_lock
     
     def transcribe_with_alignment(self, audio_path: str, language: Optional[str] = None, 
                                  progress_callback: Optional[Callable[[float, str], None]] = None,
-                                 vad_settings: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        """Transcribeer audio met WhisperX en word-level alignment"""
+                                 vad_settings: Optional[Dict[str, Any]] = None,
+                                 cancel_token=None, resume_key: Optional[str] = None,
+                                 chunk_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Transcribeer audio met WhisperX en word-level alignment
+        
+        Lange bestanden worden per venster getranscribeerd; tussen vensters
+        wordt cancel_token gecontroleerd (CancelledError wordt doorgegeven) en
+        met een resume_key wordt de voortgang per venster bewaard.
+        """
         try:
             print(f"🎤 [START] WhisperX transcriptie gestart voor: {os.path.basename(audio_path)}")
             
@@ -44,7 +68,8 @@ class TranscriptionCore:
                 return None
             
             # Voer transcriptie uit
-            result = self._perform_basic_transcription(audio_path, language, progress_callback, vad_settings)
+            result = self._perform_basic_transcription(audio_path, language, progress_callback, vad_settings,
+                                                       cancel_token, resume_key, chunk_seconds)
             if result:
                 print(f"✅ [VOLTOOID] WhisperX transcriptie succesvol voltooid")
                 return result
@@ -52,10 +77,66 @@ class TranscriptionCore:
                 print(f"❌ [FOUT] WhisperX transcriptie gefaald")
                 return None
                 
+        except CancelledError:
+            raise
         except Exception as e:
             print(f"❌ [FOUT] Fout tijdens WhisperX transcriptie: {e}")
             return None
     
+    def transcribe_batch(self, audio_paths: List[str], language: str,
+                         vad_settings: Optional[Dict[str, Any]] = None,
+                         batch_size: Optional[int] = None) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Transcribeer meerdere korte bestanden in gedeelde inference batches
+        
+        De audio wordt achter elkaar gezet met stilte van minstens één VAD chunk
+        ertussen, zodat VAD segmenten van verschillende bestanden in dezelfde
+        batches op het model terechtkomen maar nooit in één chunk. Daarna worden
+        de segmenten per bestand teruggezet met tijden relatief aan dat bestand.
+        
+        Returns:
+            Dictionary pad -> resultaat (zelfde vorm als transcribe_with_alignment) of None bij fout
+        """
+        try:
+            if not language:
+                # Taaldetectie gebeurt op de eerste 30 seconden; bij een batch zou dat voor alle bestanden gelden
+                print("⚠️ [WAARSCHUWING] Batch transcriptie vereist een ingestelde taal")
+                return None
+            
+            chunk_size = (vad_settings or {}).get("vad_chunk_size", 30)
+            gap = np.zeros(int(gap_for_chunk_size(chunk_size) * SAMPLE_RATE), dtype=np.float32)
+            
+            parts = []
+            durations = []
+            for index, audio_path in enumerate(audio_paths):
+                audio = load_audio(audio_path, language)
+                if index:
+                    parts.append(gap)
+                parts.append(audio)
+                durations.append(len(audio) / SAMPLE_RATE)
+            
+            spans = layout_spans(durations, len(gap) / SAMPLE_RATE)
+            print(f"📦 [START] Batch transcriptie van {len(audio_paths)} bestanden ({sum(durations):.1f}s audio)")
+            with self.model_lock:
+                result = self.model_manager.model.transcribe(
+                    np.concatenate(parts),
+                    batch_size=batch_size or self.model_manager.batch_size,
+                    language=language,
+                    chunk_size=chunk_size
+                )
+            if not result:
+                return None
+            
+            results = {}
+            for audio_path, segments in zip(audio_paths, split_segments(result.get("segments", []), spans)):
+                results[audio_path] = {"segments": segments, "language": result.get("language", language)}
+            print(f"✅ [VOLTOOID] Batch transcriptie: {len(result.get('segments', []))} segmenten verdeeld over {len(audio_paths)} bestanden")
+            return results
+            
+        except Exception as e:
+            print(f"❌ [FOUT] Fout tijdens batch transcriptie: {e}")
+            return None
+    
     def _show_eta(self, audio_path: str, progress_callback: Optional[Callable[[float, str], None]], model_name: str = None):
         """Toon ETA informatie"""
         audio_duration = self.time_estimator.get_audio_duration(audio_path)
@@ -78,7 +159,9 @@ class TranscriptionCore:
     
     def _perform_basic_transcription(self, audio_path: str, language: Optional[str] = None, 
                                     progress_callback: Optional[Callable[[float, str], None]] = None,
-                                    vad_settings: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+                                    vad_settings: Optional[Dict[str, Any]] = None,
+                                    cancel_token=None, resume_key: Optional[str] = None,
+                                    chunk_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Voer basis transcriptie uit met WhisperX"""
         try:
             print(f"🔧 [BEZIG] Start basis transcriptie...")
@@ -113,21 +196,26 @@ class TranscriptionCore:
             print(f"⏳ [BEZIG] Wacht tot bestand volledig is geschreven...")
             time.sleep(1)
             
-            # Kopieer het bestand naar een eenvoudiger pad om WhisperX problemen te voorkomen
-            try:
-                simple_filename = "whisperx_audio.wav"
-                simple_path = os.path.join(os.path.dirname(audio_path), simple_filename)
-                shutil.copy2(audio_path, simple_path)
-                print(f"✅ [INFO] Bestand gekopieerd naar eenvoudig pad: {simple_path}")
-                time.sleep(0.5)
-                if os.path.exists(simple_path):
-                    audio_path = simple_path
-                    print(f"✅ [INFO] Gebruik gekopieerd bestand: {audio_path}")
-                else:
-                    print(f"⚠️ [WAARSCHUWING] Gekopieerd bestand niet gevonden, gebruik origineel")
-            except Exception as e:
-                print(f"⚠️ [WAARSCHUWING] Fout bij kopiëren bestand: {e}")
-            
+            # Kopieer het bestand naar een eenvoudiger pad om WhisperX problemen te voorkomen;
+            # elke job een eigen tijdelijk bestand, zodat parallelle jobs elkaars audio niet overschrijven
+            with audio_work_copy(audio_path) as work_path:
+                print(f"✅ [INFO] Gebruik gekopieerd bestand: {work_path}")
+                return self._transcribe_work_copy(work_path, language, progress_callback, vad_settings,
+                                                  cancel_token, resume_key, chunk_seconds)
+                
+        except CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ [FOUT] Fout tijdens basis transcriptie: {e}")
+            return None
+    
+    def _transcribe_work_copy(self, audio_path: str, language: Optional[str],
+                              progress_callback: Optional[Callable[[float, str], None]],
+                              vad_settings: Dict[str, Any], cancel_token=None,
+                              resume_key: Optional[str] = None,
+                              chunk_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Transcribeer de tijdelijke kopie van één job"""
+        try:
             # Converteer Windows pad naar formaat dat WhisperX kan begrijpen
             try:
                 if os.name == 'nt':
@@ -194,10 +282,14 @@ class TranscriptionCore:
              # progress_thread.daemon = True
              # progress_thread.start()
             
-            result = self.model_manager.model.transcribe(
+            result = self._transcribe_in_chunks(
                 audio_path,
-                language=language,
-                chunk_size=vad_settings.get("vad_chunk_size", 30)
+                language,
+                vad_settings.get("vad_chunk_size", 30),
+                progress_callback,
+                cancel_token,
+                resume_key,
+                chunk_seconds
             )
             
             # Stop progress tracking
@@ -211,10 +303,93 @@ class TranscriptionCore:
                 print(f"❌ [FOUT] WhisperX transcriptie gaf geen resultaat")
                 return None
                 
+        except CancelledError:
+            raise
         except Exception as e:
             print(f"❌ [FOUT] Fout tijdens basis transcriptie: {e}")
             return None
     
+    def _chunk_bounds(self, audio, chunk_seconds: Optional[float]) -> List[List[int]]:
+        """Venstergrenzen in samples, verschoven naar het stilste punt rond elke grens"""
+        duration = len(audio) / SAMPLE_RATE
+        bounds = plan_chunks(duration, chunk_seconds)
+        frame = int(QUIET_FRAME_SECONDS * SAMPLE_RATE)
+        cuts = [0]
+        for _, end in bounds[:-1]:
+            # Alleen het zoekbereik rond de grens bekijken, niet de hele audio
+            first = max(0, int((end - QUIET_SEARCH_SECONDS) * SAMPLE_RATE))
+            window = audio[first:first + int(2 * QUIET_SEARCH_SECONDS * SAMPLE_RATE)]
+            frames = len(window) // frame
+            if frames == 0:
+                cuts.append(int(end * SAMPLE_RATE))
+                continue
+            energy = np.square(window[:frames * frame].reshape(frames, frame)).mean(axis=1)
+            local = quiet_boundary(energy, QUIET_FRAME_SECONDS, end - first / SAMPLE_RATE)
+            cuts.append(max(cuts[-1] + 1, first + int(local * SAMPLE_RATE)))
+        cuts.append(len(audio))
+        return [[cuts[index], cuts[index + 1]] for index in range(len(cuts) - 1)]
+    
+    def _transcribe_in_chunks(self, audio_path: str, language: Optional[str], chunk_size: int,
+                              progress_callback: Optional[Callable[[float, str], None]],
+                              cancel_token=None, resume_key: Optional[str] = None,
+                              chunk_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Transcribeer per venster met checkpoints tussen de vensters
+        
+        Tussen vensters wordt het cancellation token gecontroleerd; tijdens een
+        pauze wordt de model lock vrijgegeven. Met een resume_key worden
+        afgeronde vensters bewaard en bij een volgende poging overgeslagen.
+        """
+        # Alleen het audio spoor in de ingestelde taal, zonder onnodig decoderen
+        audio = load_audio(audio_path, language, cancel_token=cancel_token)
+        if chunk_seconds is None:
+            chunk_seconds = TRANSCRIBE_CHUNK_SECONDS
+        
+        checkpoint = ChunkCheckpoint(resume_key) if resume_key else None
+        if checkpoint and checkpoint.load() and checkpoint.boundaries and checkpoint.boundaries[-1][1] == len(audio):
+            bounds = checkpoint.boundaries
+            segments = list(checkpoint.segments)
+            language = language or checkpoint.language
+            print(f"⏯️ [INFO] Hervat transcriptie bij venster {checkpoint.completed + 1}/{len(bounds)}")
+        else:
+            bounds = self._chunk_bounds(audio, chunk_seconds)
+            segments = []
+            if checkpoint:
+                checkpoint.completed = 0
+                checkpoint.segments = []
+                checkpoint.boundaries = bounds
+        first_chunk = checkpoint.completed if checkpoint else 0
+        
+        if len(bounds) > 1:
+            print(f"🧩 [INFO] Transcriptie in {len(bounds)} vensters van maximaal {chunk_seconds:.0f}s")
+        
+        with self.model_lock:
+            for index in range(first_chunk, len(bounds)):
+                if cancel_token is not None:
+                    cancel_token.checkpoint(self.model_lock)
+                start, end = bounds[index]
+                result = self.model_manager.model.transcribe(
+                    audio[start:end],
+                    batch_size=self.model_manager.batch_size,
+                    language=language,
+                    chunk_size=chunk_size
+                )
+                if not result:
+                    return None
+                # Taal van het eerste venster geldt voor de rest van het bestand
+                language = language or result.get("language")
+                chunk_segments = offset_segments(result.get("segments", []), start / SAMPLE_RATE)
+                segments.extend(chunk_segments)
+                if checkpoint:
+                    checkpoint.add_chunk(chunk_segments, language)
+                if progress_callback and len(bounds) > 1:
+                    progress_callback(50.0 + 40.0 * (index + 1) / len(bounds),
+                                      f"WhisperX transcriptie venster {index + 1}/{len(bounds)}")
+        
+        if checkpoint:
+            checkpoint.clear()
+        return {"segments": segments, "language": language}
+    
     def _progress_timer(self, progress_wrapper):
         """Progress timer voor real-time updates"""
         try:
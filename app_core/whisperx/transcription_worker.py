@@ -0,0 +1,224 @@
+"""
+Transcriptie worker voor Magic Time Studio
+Houdt het WhisperX model geladen in een apart proces en verwerkt jobs van de transcriptie server
+
+Gebruik:
+    python -m app_core.whisperx.transcription_worker serve
+    python -m app_core.whisperx.transcription_worker serve --cpu-replicas auto --model large-v3
+    python -m app_core.whisperx.transcription_worker transcribe video1.mp4 video2.mp4 --language nl
+    python -m app_core.whisperx.transcription_worker coordinate /mnt/share/*.mp4 --host 0.0.0.0 --token ...
+    python -m app_core.whisperx.transcription_worker work http://coordinator:8765 --token ... --path-map /mnt/share=Z:\\share
+"""
+
+import os
+import sys
+import json
+import argparse
+from typing import Dict, Any, Callable, Optional, List
+
+from core.cancellation import CancellationToken
+from core.model_config import build_vad_settings
+from core.transcription_service import TranscriptionServer, serve_jobs, connect
+from core.cpu_replicas import plan_cpu_replicas, apply_replica
+from core.coordinator import Coordinator, CoordinatorClient, LeaseQueue, run_worker, DEFAULT_PORT
+
+SERVE_COMMAND = [sys.executable, "-m", "app_core.whisperx.transcription_worker", "serve"]
+
+# Processor blijft tussen jobs geladen (één per worker proces)
+_processor = None
+_replica: Optional[Dict[str, Any]] = None  # Cores en threads als dit proces een CPU replica is
+
+def _get_processor():
+    global _processor
+    if _processor is None:
+        from app_core.whisperx.whisperx_processor import WhisperXProcessor
+        _processor = WhisperXProcessor()
+        if _replica is not None:
+            _processor.use_cpu_replica(_replica["threads"])
+    return _processor
+
+def serve_command(settings: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Commando om de server te starten met de CPU replica instellingen uit de UI"""
+    settings = settings or {}
+    command = list(SERVE_COMMAND)
+    replicas = settings.get("cpu_replicas")
+    if replicas:
+        command += ["--cpu-replicas", str(replicas), "--model", settings.get("whisper_model", "large-v3")]
+        if settings.get("cpu_threads_per_replica"):
+            command += ["--threads-per-replica", str(settings["cpu_threads_per_replica"])]
+    return command
+
+def handle_job(job: Dict[str, Any], progress: Callable[[float, str], None],
+               token: CancellationToken) -> Optional[Dict[str, Any]]:
+    """
+    Voer één transcriptie job uit met het geladen model
+
+    Args:
+        job: Job met audio_path en options (settings, resume_key)
+        progress: Stuurt progress events naar de client
+        token: CancellationToken van de job
+
+    Returns:
+        Transcriptie resultaat of None bij een fout
+    """
+    options = job.get("options") or {}
+    settings = options.get("settings") or {}
+    processor = _get_processor()
+
+    language = settings.get("language", "en")
+    model_name = settings.get("whisper_model", "large-v3")
+    vad_settings = build_vad_settings(settings, whisperx_method="pyannote")  # Altijd pyannote voor WhisperX
+    vad_settings["whisper_model"] = model_name
+
+    # Zelfde model configuratie als de vorige job: geen herlading
+    # Replica's benchmarken niet: naast elkaar draaiende benchmarks geven vertekende resultaten
+    sample_path = None if _replica is not None else settings.get("auto_tune_sample") or job["audio_path"]
+    processor.resolve_inference(model_name, settings, sample_path)
+    model_config = processor.model_config_for(model_name, vad_settings)
+    processor.load_model_config(model_config)
+
+    token.raise_if_cancelled()
+    # TranscriptionCore werkt op een eigen tijdelijke kopie per job: parallelle workers botsen niet
+    return processor.transcribe_with_alignment(
+        job["audio_path"],
+        language=language,
+        progress_callback=progress,
+        vad_settings=vad_settings,
+        cancel_token=token,
+        resume_key=options.get("resume_key"),
+        chunk_seconds=settings.get("transcribe_chunk_seconds")
+    )
+
+def worker_main(conn, replica: Optional[Dict[str, Any]] = None):
+    """Target van een worker proces van de server (optioneel als CPU replica op eigen cores)"""
+    global _replica
+    if replica is not None:
+        _replica = replica
+        apply_replica(replica)
+    serve_jobs(conn, handle_job)
+
+def _replica_args(args) -> Optional[List[tuple]]:
+    """Worker argumenten voor --cpu-replicas (None = één worker op het standaard device)"""
+    if not args.cpu_replicas:
+        return None
+    replicas = None if args.cpu_replicas == "auto" else int(args.cpu_replicas)
+    plan = plan_cpu_replicas(args.model, replicas, args.threads_per_replica)
+    for replica in plan:
+        print(f"🧵 Replica {replica['index']}: {replica['threads']} threads op cores {replica['cores']}")
+    return [(replica,) for replica in plan]
+
+def handle_coordinator_job(job: Dict[str, Any], token: CancellationToken) -> Dict[str, str]:
+    """
+    Job van de coordinator: transcribeer van gedeelde opslag en stuur transcriptie en SRT terug
+
+    Er wordt niets naast de invoer geschreven: de audio wordt per job naar een
+    tijdelijk bestand op de lokale schijf gekopieerd (TranscriptionCore).
+
+    Args:
+        job: Lease van de coordinator (path is al naar deze machine vertaald)
+        token: Wordt geannuleerd als de lease verloren gaat
+
+    Returns:
+        Artefacten: naam -> inhoud
+    """
+    from core.subtitle_writers import render_subtitles
+    result = handle_job({"id": job["id"], "audio_path": job["path"], "options": job.get("options") or {}},
+                        lambda value, message: None, token)
+    if not result:
+        raise RuntimeError(f"Transcriptie gefaald voor {job['path']}")
+    return {
+        "srt": render_subtitles(result.get("segments", []), "srt"),
+        "transcript.json": json.dumps(result, ensure_ascii=False, default=str),
+    }
+
+def _parse_path_map(values: Optional[List[str]]) -> Dict[str, str]:
+    path_map = {}
+    for value in values or []:
+        source, _, target = value.partition("=")
+        if source and target:
+            path_map[source] = target
+    return path_map
+
+def _transcribe_files(args) -> int:
+    client = connect(spawn_command=SERVE_COMMAND)
+    if client is None:
+        print("❌ Transcriptie server niet bereikbaar")
+        return 1
+    settings = {"language": args.language, "whisper_model": args.model}
+    failed = 0
+    with client:
+        # Alles eerst indienen zodat meerdere workers (CPU replica's) parallel kunnen werken
+        job_ids = [client.submit(os.path.abspath(file_path), {"settings": settings}) for file_path in args.files]
+        for file_path, job_id in zip(args.files, job_ids):
+            print(f"🎤 Transcriberen: {os.path.basename(file_path)}")
+            result = client.wait(job_id, progress_callback=lambda value, message: print(f"   {value:.1f}% - {message}"))
+            if not result:
+                print(f"❌ Transcriptie gefaald voor {file_path}")
+                failed += 1
+                continue
+            output_path = os.path.splitext(file_path)[0] + ".transcript.json"
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, default=str)
+            print(f"✅ Transcriptie opgeslagen: {output_path}")
+    return 1 if failed else 0
+
+def main(argv=None) -> int:
+    """Command line: server starten of bestanden transcriberen zonder GUI"""
+    parser = argparse.ArgumentParser(description="Magic Time Studio transcriptie server")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Start de transcriptie server")
+    serve.add_argument("--cpu-replicas", help="Aantal CPU model replica's of 'auto' (voor machines zonder GPU)")
+    serve.add_argument("--threads-per-replica", type=int, help="Threads per CPU replica (standaard automatisch)")
+    serve.add_argument("--model", default="large-v3", help="Model voor de geheugenschatting van de replica's")
+    transcribe = commands.add_parser("transcribe", help="Transcribeer bestanden via de server")
+    transcribe.add_argument("files", nargs="+")
+    transcribe.add_argument("--language", default="en")
+    transcribe.add_argument("--model", default="large-v3")
+    commands.add_parser("stop", help="Stop een draaiende server")
+    coordinate = commands.add_parser("coordinate", help="Deel een batch uit aan workers op andere machines")
+    coordinate.add_argument("files", nargs="*", help="Bestanden op gedeelde opslag (leeg = bestaande queue hervatten)")
+    coordinate.add_argument("--host", default="127.0.0.1", help="0.0.0.0 om workers op andere machines toe te laten")
+    coordinate.add_argument("--port", type=int, default=DEFAULT_PORT)
+    coordinate.add_argument("--token", help="Gedeelde token (of MAGIC_TIME_COORDINATOR_TOKEN)")
+    coordinate.add_argument("--output-dir", help="Map voor SRT's en transcripties (standaard naast de bestanden)")
+    coordinate.add_argument("--language", default="en")
+    coordinate.add_argument("--model", default="large-v3")
+    work = commands.add_parser("work", help="Verwerk jobs van een coordinator")
+    work.add_argument("url", help="Bijv. http://render-01:8765")
+    work.add_argument("--token", help="Gedeelde token (of MAGIC_TIME_COORDINATOR_TOKEN)")
+    work.add_argument("--path-map", action="append", help="Prefix van de coordinator=prefix op deze machine")
+    work.add_argument("--lease-seconds", type=float, default=60.0)
+    work.add_argument("--exit-when-idle", action="store_true", help="Stop als de queue leeg is")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        print("🚀 Transcriptie server gestart")
+        TranscriptionServer(worker_main, worker_args=_replica_args(args)).serve_forever()
+        return 0
+    if args.command == "coordinate":
+        coordinator = Coordinator(LeaseQueue(), args.host, args.port, args.token, args.output_dir)
+        if args.files:
+            settings = {"language": args.language, "whisper_model": args.model}
+            coordinator.queue.add([os.path.abspath(path) for path in args.files], {"settings": settings})
+        print(f"🌐 Coordinator op {coordinator.url} (token: {coordinator.token})")
+        try:
+            coordinator.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.command == "work":
+        client = CoordinatorClient(args.url, args.token)
+        done = run_worker(client, handle_coordinator_job, lease_seconds=args.lease_seconds,
+                          path_map=_parse_path_map(args.path_map), exit_when_idle=args.exit_when_idle)
+        print(f"✅ {done} job(s) verwerkt")
+        return 0
+    if args.command == "stop":
+        client = connect()
+        if client is not None:
+            with client:
+                client.shutdown_server()
+        return 0
+    return _transcribe_files(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,8 +20,8 @@ class VADIntegration:
             # Probeer verschillende import methoden voor config
             try:
                 # Methode 1: Directe import
-                from core.config import ConfigManager
-                self.config_manager = ConfigManager()
+                from core.config import config_manager
+                self.config_manager = config_manager
             except ImportError:
                 try:
                     # Methode 2: Absolute import
@@ -29,8 +29,8 @@ class VADIntegration:
                     project_root = os.path.dirname(os.path.dirname(current_dir))
                     if project_root not in sys.path:
                         sys.path.insert(0, project_root)
-                    from core.config import ConfigManager
-                    self.config_manager = ConfigManager()
+                    from core.config import config_manager
+                    self.config_manager = config_manager
                 except ImportError:
                     # Methode 3: Fallback - gebruik standaard instellingen
                     print("ℹ️ Kon config niet laden, gebruik standaard VAD instellingen")
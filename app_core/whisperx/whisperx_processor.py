@@ -12,6 +12,8 @@ from .pipeline_fixes import initialize_pipeline_fixes
 from .model_manager import WhisperXModelManager
 from .transcription_core import TranscriptionCore
 from .vad_integration import VADIntegration
+from core.model_config import ModelConfig
+from core.inference_tuning import default_compute_type, resolve_inference_config
 
 class WhisperXProcessor:
     """WhisperX implementatie met word-level alignment voor accurate SRT"""
@@ -55,7 +57,8 @@ class WhisperXProcessor:
         
         # Initialiseer device en compute type
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.compute_type = "float16" if self.device == "cuda" else "int8"
+        self.compute_type = default_compute_type(self.device)
+        self.inference_config = None  # Resultaat van resolve_inference
         self.gpu_available = torch.cuda.is_available()
         
         # Initialiseer componenten
@@ -79,8 +82,6 @@ class WhisperXProcessor:
         
         # Markeer als geïnitialiseerd
         self._initialized = True
-        self._last_model_name = None
-        self._last_vad_settings = None
     
     def _setup_ffmpeg_for_whisperx(self):
         """Zorg ervoor dat FFmpeg beschikbaar is voor WhisperX"""
@@ -127,40 +128,72 @@ class WhisperXProcessor:
         except Exception as e:
             print(f"⚠️ Fout bij instellen FFmpeg voor WhisperX: {e}")
     
+    def use_cpu_replica(self, threads: int):
+        """Draai als CPU replica: CPU device met een vast aantal threads (aanroepen vóór het laden)"""
+        self.device = "cpu"
+        self.compute_type = default_compute_type(self.device)
+        self.model_manager.device = self.device
+        self.model_manager.compute_type = self.compute_type
+        self.model_manager.cpu_threads = int(threads)
+        torch.set_num_threads(int(threads))
+        print(f"🧵 CPU replica: {threads} threads")
+    
     def load_model(self, model_name: str = "large-v3", vad_settings: Dict[str, Any] = None) -> bool:
-        """Laad WhisperX model"""
-        # Controleer of we echt moeten laden
-        if (self._last_model_name == model_name and 
-            self.model_manager.is_loaded and 
-            self.model_manager.current_model == model_name):
-            print(f"✅ Model {model_name} is al geladen, skip loading")
-            return True
-            
-        self._last_model_name = model_name
+        """Laad WhisperX model (herlaadt alleen als de model configuratie verandert)"""
         return self.model_manager.load_model(model_name, vad_settings)
     
     def reload_model_with_vad_settings(self, model_name: str, vad_settings: Dict[str, Any]) -> bool:
         """Herlaad WhisperX model met VAD instellingen"""
-        # Controleer of we echt moeten herladen
-        if (self._last_model_name == model_name and 
-            self._last_vad_settings == vad_settings and
-            self.model_manager.is_loaded and 
-            self.model_manager.current_model == model_name):
-            print(f"✅ Model {model_name} hoeft niet te worden herladen - instellingen ongewijzigd")
-            return True
-            
-        self._last_model_name = model_name
-        self._last_vad_settings = vad_settings.copy() if vad_settings else None
         return self.model_manager.reload_model_with_vad_settings(model_name, vad_settings)
     
+    def resolve_inference(self, model_name: str, settings: Optional[Dict[str, Any]] = None,
+                          sample_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Bepaal batch_size en compute_type voor dit model op dit device
+        
+        Handmatige instellingen gaan voor; anders wordt het bewaarde tuning
+        resultaat gebruikt, of bij eerste gebruik een benchmark op sample_path.
+        """
+        benchmark = None
+        if sample_path:
+            from .auto_tuner import make_benchmark
+            benchmark = make_benchmark(model_name, self.device, sample_path)
+        try:
+            config = resolve_inference_config(model_name, self.device, settings, benchmark=benchmark)
+        finally:
+            if benchmark is not None:
+                benchmark.release()
+        self.model_manager.batch_size = config["batch_size"]
+        self.inference_config = config
+        print(f"🔧 Inference: {config['compute_type']}, batch_size {config['batch_size']} ({config['source']})")
+        return config
+    
+    def model_config_for(self, model_name: str, vad_settings: Optional[Dict[str, Any]] = None) -> ModelConfig:
+        """Canonieke model configuratie voor dit device (met het gekozen compute type)"""
+        compute_type = (self.inference_config or {}).get("compute_type", self.compute_type)
+        return ModelConfig.from_settings(model_name, vad_settings, self.device, compute_type)
+    
+    def load_model_config(self, config: ModelConfig) -> bool:
+        """Zorg dat het model voor deze configuratie geladen is"""
+        return self.model_manager.load_model_config(config)
+    
     def transcribe_with_alignment(self, audio_path: str, language: Optional[str] = None, 
                                  progress_callback: Optional[Callable[[float, str], None]] = None,
-                                 vad_settings: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        """Transcribeer audio met WhisperX en word-level alignment"""
+                                 vad_settings: Optional[Dict[str, Any]] = None,
+                                 cancel_token=None, resume_key: Optional[str] = None,
+                                 chunk_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Transcribeer audio met WhisperX en word-level alignment (per venster annuleerbaar en hervatbaar)"""
         return self.transcription_core.transcribe_with_alignment(
-            audio_path, language, progress_callback, vad_settings
+            audio_path, language, progress_callback, vad_settings,
+            cancel_token, resume_key, chunk_seconds
         )
     
+    def transcribe_batch(self, audio_paths: List[str], language: str,
+                         vad_settings: Optional[Dict[str, Any]] = None,
+                         batch_size: Optional[int] = None) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Transcribeer meerdere korte bestanden in gedeelde GPU batches"""
+        return self.transcription_core.transcribe_batch(audio_paths, language, vad_settings, batch_size)
+    
     def create_accurate_srt(self, transcriptions: List[Dict[str, Any]], 
                            word_alignments: List[Dict[str, Any]] = None) -> str:
         """Genereer SRT met WhisperX word-level timing voor maximale accuracy"""
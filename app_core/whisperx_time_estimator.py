@@ -5,10 +5,11 @@ Berekent ETA voor WhisperX transcripties gebaseerd op audio lengte en model
 
 import os
 import platform
-import subprocess
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
+from core.media_probe import get_media_duration
+
 class TimeEstimator:
     """Berekent ETA voor WhisperX transcripties gebaseerd op audio lengte en model"""
     
@@ -74,23 +75,20 @@ class TimeEstimator:
             return None
     
     def get_audio_duration(self, audio_path: str) -> Optional[float]:
-        """Haal audio duur op in seconden"""
+        """Haal audio duur op in seconden (gecachede ffprobe metadata, librosa als fallback)"""
+        try:
+            duration = get_media_duration(audio_path)
+            if duration:
+                return duration
+        except Exception as e:
+            print(f"⚠️ Kon media metadata niet ophalen: {e}")
+        
         try:
             import librosa
             duration = librosa.get_duration(path=audio_path)
             return duration
         except ImportError:
-            # Fallback: probeer met ffprobe
-            try:
-                import subprocess
-                result = subprocess.run([
-                    "ffprobe", "-v", "quiet", "-show_entries", 
-                    "format=duration", "-of", "csv=p=0", audio_path
-                ], capture_output=True, text=True)
-                if result.returncode == 0:
-                    return float(result.stdout.strip())
-            except:
-                pass
+            pass
         except Exception as e:
             print(f"⚠️ Kon audio duur niet bepalen: {e}")
         
@@ -5,55 +5,23 @@ Beheert SRT conversie, timestamp formatting en andere utilities
 
 from typing import Dict, Any, List
 
-def convert_to_standard_format(whisperx_result: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Converteer WhisperX output naar standaard formaat"""
-    transcriptions = []
-    
-    for segment in whisperx_result["segments"]:
-        transcription = {
-            "start": segment["start"],
-            "end": segment["end"],
-            "text": segment["text"].strip(),
-            "words": segment.get("words", []),
-            "confidence": segment.get("avg_logprob", 0.0)
-        }
-        transcriptions.append(transcription)
-    
-    return transcriptions
+from core.subtitle_writers import seconds_to_ms, format_timestamp_ms, render_subtitles
+from core.transcript import Transcript
+
+def convert_to_standard_format(whisperx_result: Dict[str, Any]) -> Transcript:
+    """Converteer WhisperX output naar standaard formaat (kolomsgewijze Transcript)"""
+    # Segmenten gedragen zich als read-only dicts (start, end, text, words, confidence)
+    return Transcript.from_segments(whisperx_result["segments"])
 
 def create_accurate_srt(transcriptions: List[Dict[str, Any]], 
                        word_alignments: List[Dict[str, Any]] = None) -> str:
     """Genereer SRT met WhisperX word-level timing voor maximale accuracy"""
-    srt_content = ""
-    
-    for i, segment in enumerate(transcriptions, 1):
-        # Converteer seconden naar SRT timestamp formaat
-        start_time = seconds_to_srt_timestamp(segment["start"])
-        end_time = seconds_to_srt_timestamp(segment["end"])
-        
-        # Gebruik word-level timing als beschikbaar
-        if word_alignments and segment.get("words"):
-            # Bereken gemiddelde timing per woord voor betere accuracy
-            words = segment["words"]
-            if words:
-                # Gebruik eerste woord start en laatste woord end voor betere segmentatie
-                segment["start"] = words[0]["start"]
-                segment["end"] = words[-1]["end"]
-                start_time = seconds_to_srt_timestamp(segment["start"])
-                end_time = seconds_to_srt_timestamp(segment["end"])
-        
-        srt_content += f"{i}\n{start_time} --> {end_time}\n{segment['text']}\n\n"
-    
-    return srt_content
+    # Eerste woord start en laatste woord end als word-level timing beschikbaar is
+    return render_subtitles(transcriptions, "srt", use_word_timing=bool(word_alignments))
 
 def seconds_to_srt_timestamp(seconds: float) -> str:
     """Converteer seconden naar SRT timestamp formaat (HH:MM:SS,mmm)"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millisecs = int((seconds % 1) * 1000)
-    
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
+    return format_timestamp_ms(seconds_to_ms(seconds), "srt")
 
 def get_model_info(device: str, compute_type: str, gpu_available: bool, 
                   is_loaded: bool) -> Dict[str, Any]:
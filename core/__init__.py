@@ -5,9 +5,15 @@ Core modules voor Magic Time Studio
 # Import alle core modules - alleen de basis modules
 try:
     from . import subtitle_functions
+    from . import subtitle_writers
+    from . import subtitle_index
+    from . import transcript
+    from . import subtitle_layout
     from . import translation_functions
     from . import audio_functions
     from . import video_functions
+    from . import media_probe
+    from . import thumbnail_cache
     from . import whisper_functions
     from . import whisperx_srt_functions
     from . import file_functions
@@ -16,7 +22,26 @@ try:
     from . import file_search
     from . import file_operations
     from . import file_info
+    from . import file_collection
+    from . import duplicate_detector
+    from . import batch_packing
+    from . import ring_buffer
     from . import utils
+    from . import atomic_io
+    from . import config_snapshot
+    from . import model_config
+    from . import inference_tuning
+    from . import cancellation
+    from . import resume_state
+    from . import batch_manifest
+    from . import transcription_service
+    from . import cpu_replicas
+    from . import device_pool
+    from . import coordinator
+    from . import ffmpeg_runner
+    from . import subtitle_mux
+    from . import audio_extraction
+    from . import translation_backends
     from . import config
     from . import logging
     from . import diagnostics
@@ -0,0 +1,46 @@
+"""
+Atomair schrijven voor Magic Time Studio
+Bestanden via een tijdelijk bestand in dezelfde map, fsync en rename (crash-veilig)
+"""
+
+import os
+import tempfile
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+def write_file_atomic(file_path: str, content: str, prefix: Optional[str] = None) -> bool:
+    """
+    Schrijf een tekstbestand via een tijdelijk bestand en rename
+
+    Args:
+        file_path: Doelbestand
+        content: Tekst inhoud
+        prefix: Prefix van het tijdelijke bestand (standaard ".<bestandsnaam>.")
+
+    Returns:
+        True bij succes, False bij fout
+    """
+    directory = os.path.dirname(file_path) or "."
+    temp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        prefix = prefix if prefix is not None else f".{os.path.basename(file_path)}."
+        fd, temp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())  # Inhoud op schijf vóór de rename (crash-veilig)
+        os.replace(temp_path, file_path)
+        temp_path = None
+        return True
+    except Exception as e:
+        logger.error(f"Fout bij schrijven van {file_path}: {e}")
+        return False
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
@@ -0,0 +1,271 @@
+"""
+Audio extractie voor Magic Time Studio
+Kiest op basis van de gecachede probe het goedkoopste ffmpeg commando en meet de snelheid per bestand
+
+Drie manieren, van goedkoop naar duur:
+- reuse: de invoer is al een WAV met één 16 kHz mono PCM spoor; geen ffmpeg
+- copy: het gekozen spoor is al 16 kHz mono PCM; alleen demuxen (-c:a copy)
+- decode: alleen het gekozen spoor (-map 0:a:N) decoderen en resamplen
+
+Bij meerdere audio sporen wordt het spoor met de gevraagde taal gekozen. Voor
+een fragment (bijv. een benchmark) zoekt ffmpeg vóór de input (-ss) en
+stopt na -t seconden, in plaats van het hele bestand te decoderen.
+"""
+
+import os
+import time
+import wave
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Callable, Iterator
+import logging
+
+from .cancellation import CancellationToken
+from .media_probe import get_media_info
+from .ffmpeg_runner import run_ffmpeg
+from .subtitle_mux import language_code
+
+logger = logging.getLogger(__name__)
+
+# Formaat dat WhisperX verwacht
+SAMPLE_RATE = 16000
+CHANNELS = 1
+PCM_CODEC = "pcm_s16le"
+
+# Audio decoders gebruiken geen extra threads; de cores blijven vrij voor parallelle jobs
+AUDIO_THREADS = 1
+
+MODE_REUSE = "reuse"
+MODE_COPY = "copy"
+MODE_DECODE = "decode"
+
+def select_audio_stream(info: Dict[str, Any], language: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Kies het audio spoor om te transcriberen
+
+    Args:
+        info: Metadata uit core.media_probe
+        language: Gewenste taal ("en", "eng", ...); None of "auto" voor het eerste spoor
+
+    Returns:
+        Kopie van het spoor met "position" (N in -map 0:a:N), of None zonder audio
+    """
+    streams = (info or {}).get("audio_streams") or []
+    if not streams:
+        return None
+    position = 0
+    wanted = language_code(language) if language and language != "auto" else "und"
+    if wanted != "und":
+        for index, stream in enumerate(streams):
+            if language_code(stream.get("language")) == wanted:
+                position = index
+                break
+    return dict(streams[position], position=position)
+
+def is_whisper_pcm(stream: Dict[str, Any]) -> bool:
+    """True als een spoor al 16 kHz mono 16-bit PCM is"""
+    return (stream.get("codec") == PCM_CODEC and stream.get("sample_rate") == SAMPLE_RATE
+            and stream.get("channels") == CHANNELS)
+
+def plan_extraction(info: Dict[str, Any], input_path: str, output_path: str,
+                    language: Optional[str] = None, preview_seconds: Optional[float] = None,
+                    start: float = 0.0, reuse_input: bool = True) -> Dict[str, Any]:
+    """
+    Goedkoopste manier om 16 kHz mono WAV te krijgen
+
+    Args:
+        info: Metadata uit core.media_probe
+        input_path: Pad naar de video of audio
+        output_path: Pad voor de WAV (niet gebruikt bij reuse)
+        language: Taal voor de keuze van het audio spoor
+        preview_seconds: Alleen dit aantal seconden (None voor alles)
+        start: Begin van het fragment in seconden
+        reuse_input: Invoer die al het juiste formaat heeft direct gebruiken
+
+    Returns:
+        Dictionary met mode, stream, args (None bij reuse) en duration, of error
+    """
+    stream = select_audio_stream(info, language)
+    if stream is None:
+        return {"error": "Geen audio stream gevonden"}
+
+    duration = info.get("duration")
+    if duration is not None:
+        duration = max(duration - start, 0.0)
+    if preview_seconds:
+        duration = min(duration, preview_seconds) if duration is not None else preview_seconds
+
+    formats = (info.get("format_name") or "").split(",")
+    if (reuse_input and is_whisper_pcm(stream) and "wav" in formats
+            and len(info.get("audio_streams") or []) == 1 and not info.get("video")):
+        return {"mode": MODE_REUSE, "stream": stream, "args": None, "duration": duration}
+
+    args = ["-ss", f"{start:.3f}"] if start else []  # Vóór -i: snel zoeken in de container
+    args += ["-i", input_path, "-map", f"0:a:{stream['position']}"]
+    if preview_seconds:
+        args += ["-t", f"{preview_seconds:.3f}"]
+    if is_whisper_pcm(stream):
+        mode = MODE_COPY
+        args += ["-c:a", "copy"]
+    else:
+        mode = MODE_DECODE
+        args += ["-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-c:a", PCM_CODEC]
+    args += ["-f", "wav", "-y", output_path]
+    return {"mode": mode, "stream": stream, "args": args, "duration": duration}
+
+def fallback_plan(input_path: str, output_path: str, preview_seconds: Optional[float] = None,
+                  start: float = 0.0) -> Dict[str, Any]:
+    """
+    Decode plan zonder probe data (zoals vóór de probe cache: eerste audio spoor, alles decoderen)
+
+    Voor bestanden die ffprobe niet kan lezen maar ffmpeg wel.
+    """
+    args = ["-ss", f"{start:.3f}"] if start else []
+    args += ["-i", input_path, "-vn"]
+    if preview_seconds:
+        args += ["-t", f"{preview_seconds:.3f}"]
+    args += ["-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE), "-c:a", PCM_CODEC, "-f", "wav", "-y", output_path]
+    return {"mode": MODE_DECODE, "stream": {"position": 0, "language": None}, "args": args,
+            "duration": preview_seconds or None}
+
+def read_pcm(wav_path: str, start: float = 0.0, seconds: Optional[float] = None) -> bytes:
+    """
+    Lees 16-bit PCM samples uit een WAV bestand (optioneel een fragment)
+
+    Returns:
+        Ruwe little-endian int16 samples
+    """
+    with wave.open(wav_path, "rb") as wav:
+        rate = wav.getframerate()
+        first = min(int(start * rate), wav.getnframes())
+        wav.setpos(first)
+        frames = wav.getnframes() - first if seconds is None else int(seconds * rate)
+        return wav.readframes(frames)
+
+class ExtractionMetrics:
+    """Snelheid van audio extractie per bestand en in totaal (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, file_path: str, mode: str, media_seconds: Optional[float], elapsed: float):
+        """Registreer één extractie"""
+        with self._lock:
+            self.files += 1
+            self.modes[mode] = self.modes.get(mode, 0) + 1
+            self.media_seconds += media_seconds or 0.0
+            self.elapsed += elapsed
+            self.last = {"file": file_path, "mode": mode, "media_seconds": media_seconds, "elapsed": elapsed,
+                         "speed": media_seconds / elapsed if media_seconds and elapsed > 0 else None}
+
+    def reset(self):
+        """Zet de tellers terug naar nul"""
+        with self._lock:
+            self.files = 0
+            self.modes: Dict[str, int] = {}
+            self.media_seconds = 0.0
+            self.elapsed = 0.0
+            self.last: Optional[Dict[str, Any]] = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Overzicht voor logging en statistieken"""
+        with self._lock:
+            return {
+                "files": self.files,
+                "modes": dict(self.modes),
+                "media_seconds": self.media_seconds,
+                "elapsed": self.elapsed,
+                "speed": self.media_seconds / self.elapsed if self.elapsed > 0 else None,
+                "last": dict(self.last) if self.last else None,
+            }
+
+# Globale metrics voor alle extracties
+extraction_metrics = ExtractionMetrics()
+
+def extract_audio(input_path: str, output_path: str, language: Optional[str] = None,
+                  preview_seconds: Optional[float] = None, start: float = 0.0,
+                  reuse_input: bool = True, token: Optional[CancellationToken] = None,
+                  progress_callback: Optional[Callable[[float, str], None]] = None,
+                  ffmpeg_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extraheer audio als 16 kHz mono WAV met het goedkoopste commando
+
+    Args:
+        input_path: Pad naar de video of audio
+        output_path: Pad voor de WAV
+        language: Taal voor de keuze van het audio spoor
+        preview_seconds: Alleen dit aantal seconden (None voor alles)
+        start: Begin van het fragment in seconden
+        reuse_input: Invoer die al het juiste formaat heeft direct teruggeven
+        token: Optioneel CancellationToken
+        progress_callback: Optioneel, aangeroepen met (procent, bericht)
+        ffmpeg_path: Optioneel pad naar ffmpeg
+
+    Returns:
+        Dictionary met audio_path (bij reuse de invoer zelf), mode, stream,
+        media_seconds, elapsed en speed (x realtime), of error
+
+    Raises:
+        CancelledError: Als het token geannuleerd werd
+    """
+    info = get_media_info(input_path)
+    if info:
+        plan = plan_extraction(info, input_path, output_path, language, preview_seconds, start, reuse_input)
+    else:
+        logger.warning(f"Kan {input_path} niet proben, audio wordt volledig gedecodeerd")
+        plan = fallback_plan(input_path, output_path, preview_seconds, start)
+    if plan.get("error"):
+        return plan
+
+    started = time.monotonic()
+    audio_path = input_path
+    media_seconds = plan["duration"]
+    if plan["mode"] != MODE_REUSE:
+        result = run_ffmpeg(plan["args"], duration=plan["duration"], token=token, threads=AUDIO_THREADS,
+                            progress_callback=progress_callback, ffmpeg_path=ffmpeg_path)
+        if result["returncode"] != 0 or not os.path.exists(output_path):
+            return {"error": result.get("error") or "FFmpeg gaf geen audio", "mode": plan["mode"]}
+        audio_path = output_path
+        media_seconds = result["out_time"] or media_seconds
+    elapsed = time.monotonic() - started
+
+    extraction_metrics.record(input_path, plan["mode"], media_seconds, elapsed)
+    speed = media_seconds / elapsed if media_seconds and elapsed > 0 else None
+    track = plan["stream"].get("language") or "und"
+    logger.info(f"Audio {plan['mode']} {os.path.basename(input_path)} (spoor {plan['stream']['position']}, "
+                f"{track}): {media_seconds or 0:.0f}s in {elapsed:.1f}s"
+                + (f" ({speed:.0f}x realtime)" if speed else ""))
+    return {"audio_path": audio_path, "mode": plan["mode"], "stream": plan["stream"],
+            "media_seconds": media_seconds, "elapsed": elapsed, "speed": speed}
+
+@contextmanager
+def audio_work_copy(audio_path: str) -> Iterator[str]:
+    """
+    Eigen kopie van een audio bestand in de lokale temp map, verwijderd na afloop
+
+    Elke job krijgt een uniek pad (mkstemp), zodat parallelle replica's,
+    worker processen en workers op gedeelde opslag elkaars audio niet
+    overschrijven. Als kopiëren mislukt wordt het origineel gebruikt.
+
+    Yields:
+        Pad naar de kopie (of het origineel)
+    """
+    extension = os.path.splitext(audio_path)[1] or ".wav"
+    fd, copy_path = tempfile.mkstemp(prefix="whisperx_audio_", suffix=extension)
+    os.close(fd)
+    try:
+        try:
+            shutil.copyfile(audio_path, copy_path)
+        except OSError as e:
+            logger.warning(f"Kan {audio_path} niet kopiëren, gebruik origineel: {e}")
+            yield audio_path
+        else:
+            yield copy_path
+    finally:
+        try:
+            os.remove(copy_path)
+        except OSError:
+            pass
@@ -6,18 +6,26 @@ Bevat alle audio-gerelateerde functionaliteit
 import os
 import subprocess
 import tempfile
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Callable
 import logging
 
+from .media_probe import get_media_info
+from .ffmpeg_runner import run_ffmpeg, TIMEOUT_FACTOR_ENCODE
+from .audio_extraction import extract_audio
+
 logger = logging.getLogger(__name__)
 
-def extract_audio_from_video(video_path: str, output_dir: Optional[str] = None) -> Optional[str]:
+def extract_audio_from_video(video_path: str, output_dir: Optional[str] = None,
+                             progress_callback: Optional[Callable[[float, str], None]] = None,
+                             language: Optional[str] = None) -> Optional[str]:
     """
     Extraheer audio uit een video bestand
     
     Args:
         video_path: Pad naar het video bestand
         output_dir: Uitvoer directory (optioneel)
+        progress_callback: Optioneel, aangeroepen met (procent, bericht)
+        language: Taal van het audio spoor bij meerdere sporen (optioneel)
     
     Returns:
         Pad naar het geëxtraheerde audio bestand of None bij fout
@@ -35,29 +43,18 @@ def extract_audio_from_video(video_path: str, output_dir: Optional[str] = None)
         base_name = os.path.splitext(os.path.basename(video_path))[0]
         audio_path = os.path.join(output_dir, f"{base_name}_audio.wav")
         
-        # FFmpeg commando voor audio extractie
-        cmd = [
-            "ffmpeg", "-i", video_path,
-            "-vn",  # Geen video
-            "-acodec", "pcm_s16le",  # PCM 16-bit
-            "-ar", "16000",  # 16kHz sample rate
-            "-ac", "1",  # Mono
-            "-y",  # Overschrijf bestaand bestand
-            audio_path
-        ]
-        
-        # Voer FFmpeg uit
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        # Goedkoopste commando op basis van de probe (16kHz mono PCM WAV);
+        # de timeout schaalt met de duur van de video
+        result = extract_audio(video_path, audio_path, language, reuse_input=False,
+                               progress_callback=progress_callback)
         
-        if result.returncode == 0 and os.path.exists(audio_path):
+        if not result.get("error") and os.path.exists(audio_path):
             logger.info(f"Audio succesvol geëxtraheerd: {audio_path}")
             return audio_path
-        else:
-            logger.error(f"FFmpeg fout: {result.stderr}")
-            return None
+        return None
             
     except subprocess.TimeoutExpired:
-        logger.error("Audio extractie timeout (5 minuten)")
+        logger.error("Audio extractie timeout (geen voortgang of trager dan realtime)")
         return None
     except Exception as e:
         logger.error(f"Fout bij audio extractie: {e}")
@@ -65,7 +62,7 @@ def extract_audio_from_video(video_path: str, output_dir: Optional[str] = None)
 
 def get_audio_duration(audio_path: str) -> Optional[float]:
     """
-    Bepaal de duur van een audio bestand
+    Bepaal de duur van een audio bestand (gecached op pad, grootte en mtime)
     
     Args:
         audio_path: Pad naar het audio bestand
@@ -74,21 +71,8 @@ def get_audio_duration(audio_path: str) -> Optional[float]:
         Duur in seconden of None bij fout
     """
     try:
-        cmd = [
-            "ffprobe", "-v", "quiet",
-            "-show_entries", "format=duration",
-            "-of", "csv=p=0",
-            audio_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            duration = float(result.stdout.strip())
-            return duration
-        else:
-            logger.error(f"FFprobe fout: {result.stderr}")
-            return None
+        info = get_media_info(audio_path)
+        return info.get("duration") if info else None
             
     except Exception as e:
         logger.error(f"Fout bij bepalen audio duur: {e}")
@@ -107,20 +91,18 @@ def convert_audio_format(input_path: str, output_path: str, format_type: str = "
         True bij succes, False bij fout
     """
     try:
-        cmd = [
-            "ffmpeg", "-i", input_path,
+        args = [
+            "-i", input_path,
             "-y",  # Overschrijf bestaand bestand
             output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        result = run_ffmpeg(args, timeout_factor=TIMEOUT_FACTOR_ENCODE)
         
-        if result.returncode == 0 and os.path.exists(output_path):
+        if result["returncode"] == 0 and os.path.exists(output_path):
             logger.info(f"Audio succesvol geconverteerd naar {format_type}")
             return True
-        else:
-            logger.error(f"FFmpeg conversie fout: {result.stderr}")
-            return False
+        return False
             
     except Exception as e:
         logger.error(f"Fout bij audio conversie: {e}")
@@ -142,21 +124,19 @@ def normalize_audio(audio_path: str, output_path: Optional[str] = None) -> Optio
             base_name = os.path.splitext(audio_path)[0]
             output_path = f"{base_name}_normalized.wav"
         
-        cmd = [
-            "ffmpeg", "-i", audio_path,
+        args = [
+            "-i", audio_path,
             "-af", "loudnorm=I=-16:TP=-1.5:LRA=11",  # EBU R128 standaard
             "-y",
             output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        result = run_ffmpeg(args, timeout_factor=TIMEOUT_FACTOR_ENCODE)
         
-        if result.returncode == 0 and os.path.exists(output_path):
+        if result["returncode"] == 0 and os.path.exists(output_path):
             logger.info(f"Audio succesvol genormaliseerd: {output_path}")
             return output_path
-        else:
-            logger.error(f"FFmpeg normalisatie fout: {result.stderr}")
-            return None
+        return None
             
     except Exception as e:
         logger.error(f"Fout bij audio normalisatie: {e}")
@@ -180,6 +160,7 @@ def split_audio_by_silence(audio_path: str, output_dir: str, silence_threshold:
         
         base_name = os.path.splitext(os.path.basename(audio_path))[0]
         
+        # Bewust direct: de silencedetect regels staan op stderr en worden volledig gelezen
         cmd = [
             "ffmpeg", "-i", audio_path,
             "-af", f"silencedetect=noise={silence_threshold}dB:d=0.5",
@@ -0,0 +1,229 @@
+"""
+Batch manifest voor Magic Time Studio
+Crash-veilige registratie per bestand van afgeronde stappen en hun tussenresultaten
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections.abc import Mapping
+from typing import Optional, Dict, List, Any, Iterable
+import logging
+
+from .media_probe import file_signature
+from .atomic_io import write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+# Stappen van de pipeline in volgorde
+STAGE_AUDIO = "audio"
+STAGE_TRANSCRIBE = "transcribe"
+STAGE_TRANSLATE = "translate"
+STAGE_SRT = "srt"
+STAGES = (STAGE_AUDIO, STAGE_TRANSCRIBE, STAGE_TRANSLATE, STAGE_SRT)
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+MANIFEST_PREFIX = ".magic_time_batch_"
+
+def batch_id(files: Iterable[str]) -> str:
+    """Vaste id voor een batch: dezelfde bestanden (in willekeurige volgorde) geven dezelfde id"""
+    paths = sorted(os.path.abspath(path) for path in files)
+    return hashlib.sha1("\n".join(paths).encode("utf-8")).hexdigest()[:12]
+
+def _json_default(value):
+    """Zet numpy getallen, views (bijv. core.transcript) en andere onbekende waarden om naar JSON"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "__iter__"):
+        return list(value)
+    return str(value)
+
+def write_json_atomic(file_path: str, data: Any) -> bool:
+    """Schrijf JSON via een tijdelijk bestand en rename"""
+    try:
+        content = json.dumps(data, ensure_ascii=False, default=_json_default)
+    except Exception as e:
+        logger.error(f"Kan {file_path} niet serialiseren: {e}")
+        return False
+    return write_file_atomic(file_path, content)
+
+def load_json(file_path: str) -> Optional[Any]:
+    """Lees een JSON bestand (None als het ontbreekt of beschadigd is)"""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Kan {file_path} niet laden: {e}")
+        return None
+
+class BatchManifest:
+    """
+    Manifest per batch als JSON-lines bestand
+
+    Elke statuswijziging is één regel die direct op schijf gezet wordt
+    (append + fsync); de laatste regel per (bestand, stap) geldt. Een
+    afgebroken laatste regel na een crash wordt bij het laden afgekapt.
+    Een stap telt als afgerond zolang het bronbestand niet veranderd is en
+    alle artefacten nog bestaan.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.artifact_dir = os.path.splitext(path)[0]
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._loaded = False
+
+    @classmethod
+    def for_batch(cls, files: List[str], output_dir: Optional[str] = None) -> "BatchManifest":
+        """
+        Manifest voor een lijst bestanden
+
+        Args:
+            files: Bestanden van de batch
+            output_dir: Output map (standaard de map van het eerste bestand, waar de SRT's komen)
+
+        Returns:
+            BatchManifest
+        """
+        if not output_dir:
+            output_dir = os.path.dirname(os.path.abspath(files[0])) if files else os.getcwd()
+        return cls(os.path.join(output_dir, f"{MANIFEST_PREFIX}{batch_id(files)}.jsonl"))
+
+    def load(self) -> int:
+        """
+        Lees het manifest (eenmalig)
+
+        Returns:
+            Aantal bestanden met minstens één geregistreerde stap
+        """
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                if os.path.exists(self.path):
+                    self._replay()
+            return len(self._entries)
+
+    def _replay(self):
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            complete = data.rfind(b"\n") + 1
+            if complete < len(data):
+                self._repair_tail(data[complete:], complete)
+            for line in data[:complete].splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Onvolledige regel in manifest overgeslagen: {self.path}")
+                    continue
+                self._entries.setdefault(record["file"], {})[record["stage"]] = record
+        except Exception as e:
+            logger.warning(f"Kan manifest niet laden {self.path}: {e}")
+
+    def _repair_tail(self, tail: bytes, complete: int):
+        """
+        Herstel een laatste regel zonder newline (crash tijdens het schrijven)
+
+        Zonder herstel zou de volgende record() aan de afgebroken regel vastgeplakt
+        worden en daardoor ook verloren gaan. Een nog leesbare regel krijgt zijn
+        newline, een afgebroken regel wordt afgekapt.
+        """
+        try:
+            record = json.loads(tail)
+        except ValueError:
+            record = None
+        with open(self.path, "r+b") as f:
+            if record is not None:
+                f.seek(0, os.SEEK_END)
+                f.write(b"\n")
+                self._entries.setdefault(record["file"], {})[record["stage"]] = record
+            else:
+                logger.warning(f"Afgebroken laatste regel uit manifest verwijderd: {self.path}")
+                f.truncate(complete)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, file_path: str, stage: str, status: str = STATUS_DONE,
+               artifacts: Optional[Dict[str, str]] = None, **extra) -> bool:
+        """
+        Registreer de status van een stap voor een bestand
+
+        Args:
+            file_path: Bronbestand
+            stage: Een van STAGES
+            status: STATUS_DONE of STATUS_FAILED
+            artifacts: Naam -> pad van (atomair geschreven) tussenresultaten
+            **extra: Extra velden (bijv. error)
+
+        Returns:
+            True als de regel op schijf staat
+        """
+        self.load()
+        file_path = os.path.abspath(file_path)
+        record = {"file": file_path, "stage": stage, "status": status,
+                  "signature": file_signature(file_path), "artifacts": artifacts or {},
+                  "time": time.time()}
+        record.update(extra)
+        line = json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
+        with self._lock:
+            self._entries.setdefault(file_path, {})[stage] = record
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                return True
+            except Exception as e:
+                logger.error(f"Kan manifest niet bijwerken {self.path}: {e}")
+                return False
+
+    def get(self, file_path: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Laatste registratie van een stap (of None)"""
+        self.load()
+        with self._lock:
+            record = self._entries.get(os.path.abspath(file_path), {}).get(stage)
+            return dict(record) if record else None
+
+    def is_done(self, file_path: str, stage: str) -> bool:
+        """True als de stap afgerond is, het bronbestand ongewijzigd is en de artefacten bestaan"""
+        record = self.get(file_path, stage)
+        if not record or record.get("status") != STATUS_DONE:
+            return False
+        signature = file_signature(file_path)
+        if signature is None or list(signature) != list(record.get("signature") or []):
+            return False
+        return all(os.path.exists(path) for path in record.get("artifacts", {}).values())
+
+    def artifact(self, file_path: str, stage: str, name: str) -> Optional[str]:
+        """Pad van een artefact van een afgeronde stap (of None)"""
+        if not self.is_done(file_path, stage):
+            return None
+        return self.get(file_path, stage)["artifacts"].get(name)
+
+    def artifact_path(self, file_path: str, name: str) -> str:
+        """Pad voor een nieuw artefact van een bestand in de artefact map van de batch"""
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        digest = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.artifact_dir, f"{base_name}_{digest}.{name}")
+
+    def completed(self, files: Iterable[str], stage: str) -> List[str]:
+        """Bestanden waarvoor een stap afgerond is"""
+        return [path for path in files if self.is_done(path, stage)]
+
+    def compact(self) -> bool:
+        """Herschrijf het manifest met alleen de laatste regel per (bestand, stap)"""
+        self.load()
+        with self._lock:
+            lines = [json.dumps(record, ensure_ascii=False, default=_json_default)
+                     for stages in self._entries.values() for record in stages.values()]
+        return write_file_atomic(self.path, "\n".join(lines) + ("\n" if lines else ""))
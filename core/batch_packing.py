@@ -0,0 +1,208 @@
+"""
+Batch packing voor Magic Time Studio
+Plant korte bestanden in gedeelde inference batches en verdeelt de resultaten weer per bestand
+"""
+
+import math
+import bisect
+from typing import Optional, Dict, List, Any, Iterable, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bestanden tot deze duur komen in aanmerking voor batching (seconden)
+SHORT_FILE_SECONDS = 60.0
+
+# Maximale hoeveelheid audio per batch (seconden, zonder stilte tussen bestanden)
+MAX_BATCH_SECONDS = 300.0
+
+# Maximaal aantal bestanden per batch
+MAX_BATCH_FILES = 16
+
+# Lange bestanden worden in vensters van deze duur getranscribeerd (seconden)
+TRANSCRIBE_CHUNK_SECONDS = 600.0
+
+# Zoekbereik rond een venstergrens voor het stilste punt (seconden)
+QUIET_SEARCH_SECONDS = 5.0
+
+def plan_batches(items: Iterable[Tuple[str, Optional[float]]],
+                 max_batch_seconds: float = MAX_BATCH_SECONDS,
+                 max_files: int = MAX_BATCH_FILES,
+                 short_file_seconds: float = SHORT_FILE_SECONDS) -> Tuple[List[List[str]], List[str]]:
+    """
+    Verdeel bestanden over batches van korte bestanden
+
+    De volgorde van de invoer blijft behouden. Bestanden zonder bekende duur
+    of langer dan short_file_seconds worden los verwerkt, net als batches
+    die maar één bestand zouden bevatten.
+
+    Args:
+        items: (pad, duur in seconden) paren
+        max_batch_seconds: Maximale som van de duur per batch
+        max_files: Maximaal aantal bestanden per batch
+        short_file_seconds: Grens voor een kort bestand
+
+    Returns:
+        Tuple (batches, losse bestanden)
+    """
+    batches: List[List[str]] = []
+    singles: List[str] = []
+    current: List[str] = []
+    current_seconds = 0.0
+
+    def close_batch():
+        if len(current) > 1:
+            batches.append(list(current))
+        else:
+            singles.extend(current)
+        current.clear()
+
+    for path, duration in items:
+        if not duration or duration <= 0 or duration > short_file_seconds:
+            singles.append(path)
+            continue
+        if current and (current_seconds + duration > max_batch_seconds or len(current) >= max(1, max_files)):
+            close_batch()
+            current_seconds = 0.0
+        current.append(path)
+        current_seconds += duration
+    close_batch()
+    return batches, singles
+
+def layout_spans(durations: List[float], gap_seconds: float) -> List[Tuple[float, float]]:
+    """
+    Posities van elk bestand in de samengevoegde audio
+
+    Tussen bestanden komt gap_seconds stilte. Met een gap van minstens de
+    VAD chunk grootte kan geen VAD chunk twee bestanden overspannen.
+
+    Args:
+        durations: Duur per bestand in seconden
+        gap_seconds: Stilte tussen bestanden in seconden
+
+    Returns:
+        Lijst van (start, einde) in seconden
+    """
+    spans = []
+    offset = 0.0
+    for duration in durations:
+        spans.append((offset, offset + duration))
+        offset += duration + gap_seconds
+    return spans
+
+def _shift_words(words: List[Dict[str, Any]], offset: float, end: float) -> List[Dict[str, Any]]:
+    shifted = []
+    for word in words:
+        word = dict(word)
+        for key in ("start", "end"):
+            if isinstance(word.get(key), (int, float)):
+                word[key] = round(min(max(word[key] - offset, 0.0), end), 3)
+        shifted.append(word)
+    return shifted
+
+def split_segments(segments: List[Dict[str, Any]],
+                   spans: List[Tuple[float, float]]) -> List[List[Dict[str, Any]]]:
+    """
+    Verdeel segmenten van de samengevoegde audio terug per bestand
+
+    Een segment hoort bij het bestand waarin zijn midden valt; tijden worden
+    relatief aan dat bestand gemaakt en binnen de bestandsduur gehouden.
+    Segmenten die in de stilte tussen bestanden vallen worden overgeslagen.
+
+    Args:
+        segments: WhisperX segmenten met start en end (samengevoegde tijdlijn)
+        spans: Resultaat van layout_spans
+
+    Returns:
+        Lijst met per bestand een lijst segmenten
+    """
+    per_file: List[List[Dict[str, Any]]] = [[] for _ in spans]
+    starts = [start for start, _ in spans]
+    for segment in segments:
+        start = segment.get("start")
+        end = segment.get("end")
+        if not isinstance(start, (int, float)) or not isinstance(end, (int, float)):
+            continue
+        middle = (start + end) / 2
+        index = bisect.bisect_right(starts, middle) - 1
+        if index < 0:
+            continue
+        offset, file_end = spans[index]
+        if middle > file_end:
+            logger.debug(f"Segment {start:.2f}-{end:.2f} valt in stilte tussen bestanden")
+            continue
+        duration = file_end - offset
+        shifted = dict(segment)
+        shifted["start"] = round(min(max(start - offset, 0.0), duration), 3)
+        shifted["end"] = round(min(max(end - offset, 0.0), duration), 3)
+        if isinstance(segment.get("words"), list):
+            shifted["words"] = _shift_words(segment["words"], offset, duration)
+        per_file[index].append(shifted)
+    return per_file
+
+def gap_for_chunk_size(chunk_size: Optional[float]) -> float:
+    """Stilte tussen bestanden voor een VAD chunk grootte (minstens één volle chunk)"""
+    try:
+        return max(1.0, float(math.ceil(float(chunk_size))))
+    except (TypeError, ValueError):
+        return 30.0
+
+def plan_chunks(duration: float, chunk_seconds: Optional[float] = TRANSCRIBE_CHUNK_SECONDS) -> List[Tuple[float, float]]:
+    """
+    Verdeel een lang bestand in transcriptie vensters
+
+    Een laatste venster korter dan een kwart venster wordt bij het vorige
+    gevoegd. Zonder (geldige) venstergrootte is het hele bestand één venster.
+
+    Args:
+        duration: Duur van het bestand in seconden
+        chunk_seconds: Gewenste vensterduur in seconden (0 of None = niet opdelen)
+
+    Returns:
+        Lijst van (start, end) in seconden
+    """
+    if not chunk_seconds or chunk_seconds <= 0 or duration <= chunk_seconds:
+        return [(0.0, float(duration))]
+    bounds = []
+    start = 0.0
+    while start < duration:
+        end = min(start + chunk_seconds, duration)
+        if duration - end < chunk_seconds / 4:
+            end = float(duration)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+def quiet_boundary(frame_energy, frame_seconds: float, target: float,
+                   search_seconds: float = QUIET_SEARCH_SECONDS) -> float:
+    """
+    Stilste punt rond een venstergrens zodat er niet midden in een woord gesneden wordt
+
+    Args:
+        frame_energy: Energie per frame (reeks getallen)
+        frame_seconds: Duur van één frame
+        target: Gewenste grens in seconden
+        search_seconds: Zoekbereik aan beide kanten van de grens
+
+    Returns:
+        Grens in seconden (target als er geen frames in het bereik zijn)
+    """
+    first = max(0, int((target - search_seconds) / frame_seconds))
+    last = min(len(frame_energy), int((target + search_seconds) / frame_seconds) + 1)
+    if first >= last:
+        return target
+    quietest = min(range(first, last), key=lambda index: frame_energy[index])
+    return round((quietest + 0.5) * frame_seconds, 3)
+
+def offset_segments(segments: List[Dict[str, Any]], offset: float) -> List[Dict[str, Any]]:
+    """Verschuif segmenten van een venster naar de tijdlijn van het hele bestand"""
+    shifted_segments = []
+    for segment in segments:
+        shifted = dict(segment)
+        for key in ("start", "end"):
+            if isinstance(shifted.get(key), (int, float)):
+                shifted[key] = round(shifted[key] + offset, 3)
+        if isinstance(segment.get("words"), list):
+            shifted["words"] = _shift_words(segment["words"], -offset, math.inf)
+        shifted_segments.append(shifted)
+    return shifted_segments
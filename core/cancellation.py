@@ -0,0 +1,222 @@
+"""
+Coöperatieve annulering voor Magic Time Studio
+Cancellation token met pauze/hervatten, een gedeelde model lock en eigen subprocessen
+"""
+
+import time
+import threading
+import subprocess
+import weakref
+from typing import Optional, List, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Hoe vaak een lopend subproces op annulering wordt gecontroleerd (seconden)
+POLL_INTERVAL = 0.1
+
+# Wachttijd tussen terminate en kill (seconden)
+TERMINATE_TIMEOUT = 2.0
+
+# Lock rond het gedeelde (GPU) model; pauze geeft deze vrij
+model_lock = threading.RLock()
+
+# Alle subprocessen die via run_process/start_process zijn gestart
+_children = weakref.WeakSet()
+_children_lock = threading.Lock()
+
+class CancelledError(Exception):
+    """Werk is geannuleerd via een CancellationToken"""
+
+class CancellationToken:
+    """
+    Token dat door alle stappen van een verwerking wordt doorgegeven
+
+    Stappen roepen checkpoint() aan tussen chunks; annuleren stopt daardoor
+    binnen één chunk en beëindigt alleen subprocessen die via dit token zijn
+    gestart. Tijdens een pauze blokkeert checkpoint() en wordt een
+    meegegeven lock (bijv. model_lock) vrijgegeven.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._lock = threading.Lock()
+        self._processes: List[subprocess.Popen] = []
+
+    @property
+    def cancelled(self) -> bool:
+        """True als annuleren is aangevraagd"""
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        """True als het werk gepauzeerd is"""
+        return not self._running.is_set() and not self.cancelled
+
+    def cancel(self):
+        """Annuleer het werk en beëindig de eigen subprocessen"""
+        self._cancelled.set()
+        self._running.set()  # Gepauzeerde stappen wakker maken zodat ze kunnen stoppen
+        self.terminate_processes()
+
+    def pause(self):
+        """Pauzeer bij het volgende checkpoint"""
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        """Hervat gepauzeerd werk"""
+        self._running.set()
+
+    def raise_if_cancelled(self):
+        """Gooi CancelledError als annuleren is aangevraagd"""
+        if self._cancelled.is_set():
+            raise CancelledError()
+
+    def checkpoint(self, lock: Optional[Any] = None):
+        """
+        Controleer op annulering en wacht tijdens een pauze
+
+        Args:
+            lock: Optionele lock die de aanroeper vasthoudt; wordt tijdens de
+                  pauze vrijgegeven en daarna opnieuw verkregen
+        """
+        self.raise_if_cancelled()
+        if self._running.is_set():
+            return
+        released = False
+        if lock is not None:
+            try:
+                lock.release()
+                released = True
+            except RuntimeError:
+                pass
+        try:
+            self._running.wait()
+        finally:
+            if released:
+                lock.acquire()
+        self.raise_if_cancelled()
+
+    def wait(self, timeout: float) -> bool:
+        """Slaap maximaal timeout seconden; True als er ondertussen geannuleerd is"""
+        return self._cancelled.wait(timeout)
+
+    def register_process(self, process: subprocess.Popen):
+        """Koppel een subproces aan dit token (wordt bij cancel beëindigd)"""
+        with self._lock:
+            self._processes.append(process)
+        if self.cancelled:
+            terminate_process(process)
+
+    def unregister_process(self, process: subprocess.Popen):
+        """Ontkoppel een afgerond subproces"""
+        with self._lock:
+            if process in self._processes:
+                self._processes.remove(process)
+
+    def terminate_processes(self):
+        """Beëindig alle subprocessen van dit token"""
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            terminate_process(process)
+
+def terminate_process(process: subprocess.Popen, timeout: float = TERMINATE_TIMEOUT):
+    """Beëindig één subproces: eerst terminate, na timeout kill"""
+    try:
+        if process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    except Exception as e:
+        logger.warning(f"Kon subproces {getattr(process, 'pid', '?')} niet stoppen: {e}")
+
+def start_process(cmd: List[str], token: Optional[CancellationToken] = None, **popen_kwargs) -> subprocess.Popen:
+    """
+    Start een subproces dat als eigen kind geregistreerd wordt
+
+    Args:
+        cmd: Commando als lijst
+        token: Optioneel token waaraan het proces gekoppeld wordt
+        **popen_kwargs: Extra argumenten voor subprocess.Popen
+
+    Returns:
+        Popen object
+    """
+    process = subprocess.Popen(cmd, **popen_kwargs)
+    with _children_lock:
+        _children.add(process)
+    if token is not None:
+        token.register_process(process)
+    return process
+
+def run_process(cmd: List[str], token: Optional[CancellationToken] = None,
+                timeout: Optional[float] = None, **popen_kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run met annulering: stopt het proces zodra het token geannuleerd wordt
+
+    Uitvoer wordt altijd opgevangen (stdout en stderr).
+
+    Args:
+        cmd: Commando als lijst
+        token: Optioneel CancellationToken
+        timeout: Optionele timeout in seconden
+        **popen_kwargs: Extra argumenten voor subprocess.Popen (bijv. text=True)
+
+    Returns:
+        CompletedProcess
+
+    Raises:
+        CancelledError: Als het token geannuleerd werd
+        subprocess.TimeoutExpired: Bij overschrijden van de timeout
+    """
+    if token is not None:
+        token.raise_if_cancelled()
+    popen_kwargs.setdefault("stdout", subprocess.PIPE)
+    popen_kwargs.setdefault("stderr", subprocess.PIPE)
+    process = start_process(cmd, token, **popen_kwargs)
+    deadline = time.monotonic() + timeout if timeout else None
+    try:
+        while True:
+            try:
+                stdout, stderr = process.communicate(timeout=POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                if token is not None and token.cancelled:
+                    terminate_process(process)
+                    process.communicate()
+                    raise CancelledError()
+                if deadline is not None and time.monotonic() > deadline:
+                    process.kill()
+                    process.communicate()
+                    raise subprocess.TimeoutExpired(cmd, timeout)
+    finally:
+        if token is not None:
+            token.unregister_process(process)
+    if token is not None and token.cancelled and process.returncode != 0:
+        # Beëindigd door cancel() vanuit een andere thread
+        raise CancelledError()
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+def running_children() -> List[subprocess.Popen]:
+    """Subprocessen die door deze applicatie gestart zijn en nog draaien"""
+    with _children_lock:
+        return [process for process in _children if process.poll() is None]
+
+def terminate_children() -> int:
+    """
+    Beëindig alle nog draaiende subprocessen die via start_process gestart zijn
+
+    Returns:
+        Aantal beëindigde processen
+    """
+    children = running_children()
+    for process in children:
+        terminate_process(process)
+    return len(children)
@@ -12,6 +12,8 @@ try:
     # Gebruik absolute imports om import fouten te voorkomen
     import core.logging as logging_module
     import core.utils as utils_module
+    from core.config_snapshot import ConfigSnapshot, DebouncedEnvWriter
+    from core.atomic_io import write_file_atomic
     
     # Setup logging
     logging_module.setup_logging()
@@ -35,6 +37,8 @@ try:
                 'charts_panel': True,
                 'completed_files_panel': True
             }
+            self._snapshot = None  # Gecachede snapshot, vervalt bij elke wijziging
+            self._env_writer = DebouncedEnvWriter(self.get_whisper_config_path, create_missing=False)
             self._load_config()
             self._load_panel_config()
         
@@ -58,6 +62,7 @@ try:
                                     self.config[key] = value
                 except Exception as e:
                     print(f"⚠️ Fout bij laden config bestand: {e}")
+            self._snapshot = None
         
         def _get_config_file_path(self):
             """Krijg het pad naar het configuratie bestand"""
@@ -113,38 +118,29 @@ try:
                     print(f"⚠️ Fout bij opslaan panel configuratie: {e}")
         
         def _save_to_env_file(self, key: str, value):
-            """Sla configuratie op in .env bestand"""
-            try:
-                env_file = self.get_whisper_config_path()
-                if env_file and os.path.exists(env_file):
-                    # Lees bestaande .env bestand
-                    with open(env_file, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                    
-                    # Zoek naar bestaande key en update deze
-                    key_found = False
-                    for i, line in enumerate(lines):
-                        if line.strip().startswith(f"{key}="):
-                            lines[i] = f"{key}={value}\n"
-                            key_found = True
-                            break
-                    
-                    # Voeg nieuwe key toe als deze niet bestond
-                    if not key_found:
-                        lines.append(f"{key}={value}\n")
-                    
-                    # Schrijf bijgewerkte .env bestand
-                    with open(env_file, 'w', encoding='utf-8') as f:
-                        f.writelines(lines)
-                    
-                    # Alleen in debug mode tonen
-                    if os.environ.get('DEBUG', 'false').lower() == 'true':
-                        print(f"✅ Configuratie opgeslagen in .env bestand: {key}={value}")
-                    
-            except Exception as e:
-                print(f"⚠️ Fout bij opslaan in .env bestand: {e}")
-                import traceback
-                traceback.print_exc()
+            """Plan opslag in .env bestand (gebundeld en atomair na korte wachttijd)"""
+            self._env_writer.queue(key, value)
+            
+            # Alleen in debug mode tonen
+            if os.environ.get('DEBUG', 'false').lower() == 'true':
+                print(f"✅ Configuratie gepland voor .env bestand: {key}={value}")
+        
+        def flush_env_file(self):
+            """Schrijf geplande .env wijzigingen direct weg"""
+            return self._env_writer.flush()
+        
+        # Snapshot
+        def snapshot(self) -> ConfigSnapshot:
+            """Onveranderlijke snapshot van alle configuratie (gecachet tot de volgende wijziging)"""
+            snapshot = self._snapshot
+            if snapshot is None:
+                snapshot = ConfigSnapshot(self.get_all())
+                self._snapshot = snapshot
+            return snapshot
+        
+        def _changed(self, key: str, value):
+            """Verval de snapshot na een wijziging"""
+            self._snapshot = None
         
         def get(self, key: str, default=None):
             """Krijg een configuratie waarde"""
@@ -156,13 +152,16 @@ try:
         
         def set(self, key: str, value):
             """Zet een configuratie waarde"""
+            if self.config.get(key) == value and key in self.config:
+                return
             self.config[key] = value
             # Niet automatisch naar .env bestand opslaan om dubbele opslag te voorkomen
+            self._changed(key, value)
         
         def set_json(self, key: str, value):
             """Zet een configuratie waarde als JSON (voor complexe data types)"""
             import json
-            self.config[key] = json.dumps(value, ensure_ascii=False)
+            self.set(key, json.dumps(value, ensure_ascii=False))
         
         def get_json(self, key: str, default=None):
             """Krijg een configuratie waarde als JSON (voor complexe data types)"""
@@ -205,27 +204,27 @@ try:
         
         def set_env(self, key: str, value):
             """Zet een environment variabele"""
+            if self.env_vars.get(key) == value and os.environ.get(key) == value:
+                return
             self.env_vars[key] = value
             os.environ[key] = value
+            self._changed(key, value)
         
         def get_all(self):
             """Krijg alle configuratie"""
             return {**self.env_vars, **self.config}
         
         def save_config(self):
-            """Sla configuratie op naar bestand"""
+            """Sla configuratie op naar bestand (atomair via tijdelijk bestand)"""
             config_file = self._get_config_file_path()
             if config_file:
-                try:
-                    os.makedirs(os.path.dirname(config_file), exist_ok=True)
-                    with open(config_file, 'w', encoding='utf-8') as f:
-                        for key, value in self.config.items():
-                            f.write(f"{key}={value}\n")
+                content = "".join(f"{key}={value}\n" for key, value in self.config.items())
+                if write_file_atomic(config_file, content):
                     # Alleen in debug mode tonen
                     if os.environ.get('DEBUG', 'false').lower() == 'true':
                         print(f"✅ Configuratie opgeslagen naar: {config_file}")
-                except Exception as e:
-                    print(f"⚠️ Fout bij opslaan configuratie: {e}")
+                else:
+                    print(f"⚠️ Fout bij opslaan configuratie: {config_file}")
         
         def get_project_root(self):
             """Krijg project root directory"""
@@ -284,7 +283,7 @@ try:
         
         def set_theme(self, theme: str):
             """Stel thema in"""
-            self.config['theme'] = theme
+            self.set('theme', theme)
         
         def get_language(self):
             """Krijg huidige taal"""
@@ -292,7 +291,7 @@ try:
         
         def set_language(self, language: str):
             """Stel taal in"""
-            self.config['language'] = language
+            self.set('language', language)
         
         def load_configuration(self):
             """Laad configuratie"""
@@ -302,6 +301,7 @@ try:
         def save_configuration(self):
             """Sla configuratie op"""
             self.save_config()
+            self.flush_env_file()
             self._save_panel_config()
     
     config_manager = ConfigManager()
@@ -463,4 +463,16 @@ except ImportError as e:
         
         def set_language(self, language: str):
             """Stel taal in (vereenvoudigde implementatie)"""
-            pass 
\ No newline at end of file
+            pass
+        
+        def snapshot(self):
+            """Snapshot van de environment (vereenvoudigde implementatie)"""
+            try:
+                from core.config_snapshot import ConfigSnapshot
+                return ConfigSnapshot(dict(os.environ))
+            except ImportError:
+                return dict(os.environ)
+        
+        def flush_env_file(self):
+            """Schrijf .env wijzigingen weg (dummy implementatie)"""
+            return True
@@ -0,0 +1,192 @@
+"""
+Configuratie snapshots en env-bestand writer voor Magic Time Studio
+Onveranderlijke instellingen per verwerking en gebundelde, atomaire schrijfacties
+"""
+
+import os
+import json
+import threading
+from collections.abc import Mapping
+from typing import Optional, Dict, Any, Callable, Iterator
+import logging
+
+from .atomic_io import write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+# Wachttijd voordat gebundelde wijzigingen naar schijf gaan (seconden)
+ENV_WRITE_DELAY = 0.5
+
+class ConfigSnapshot(Mapping):
+    """
+    Onveranderlijke kopie van de configuratie
+
+    Bedoeld om één keer per verwerking te maken en door te geven; lezen
+    raakt nooit de schijf en wijzigingen tijdens de verwerking hebben geen
+    invloed op lopend werk.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Optional[Dict[str, Any]] = None):
+        self._values = dict(values or {})
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"ConfigSnapshot({len(self._values)} waarden)"
+
+    def get_env(self, key: str, default: str = "") -> str:
+        """Waarde als string (zelfde gedrag als ConfigManager.get_env)"""
+        return self._values.get(key, default)
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        """Waarde als integer"""
+        value = self._values.get(key, default)
+        try:
+            return int(value) if value is not None else default
+        except (ValueError, TypeError):
+            return default
+
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        """Waarde als float"""
+        value = self._values.get(key, default)
+        try:
+            return float(value) if value is not None else default
+        except (ValueError, TypeError):
+            return default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """Waarde als boolean"""
+        value = self._values.get(key, default)
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            return value.lower() in ('true', '1', 'yes', 'on')
+        try:
+            return bool(int(value)) if value is not None else default
+        except (ValueError, TypeError):
+            return default
+
+    def get_json(self, key: str, default=None):
+        """Waarde als JSON"""
+        value = self._values.get(key)
+        if value is None:
+            return default
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return default
+
+def update_env_file(file_path: str, updates: Dict[str, Any]) -> bool:
+    """
+    Werk meerdere keys in een .env bestand bij in één lees- en schrijfactie
+
+    Bestaande regels (ook commentaar) blijven staan; onbekende keys worden
+    achteraan toegevoegd.
+
+    Args:
+        file_path: Pad naar het .env bestand
+        updates: Dictionary key -> waarde
+
+    Returns:
+        True bij succes, False bij fout
+    """
+    if not updates:
+        return True
+    try:
+        lines = []
+        if os.path.exists(file_path):
+            with open(file_path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+        remaining = dict(updates)
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#") or "=" not in stripped:
+                continue
+            key = stripped.split("=", 1)[0].strip()
+            if key in remaining:
+                lines[i] = f"{key}={remaining.pop(key)}"
+        lines.extend(f"{key}={value}" for key, value in remaining.items())
+
+        return write_file_atomic(file_path, "\n".join(lines) + "\n")
+    except Exception as e:
+        logger.error(f"Fout bij bijwerken van {file_path}: {e}")
+        return False
+
+class DebouncedEnvWriter:
+    """
+    Bundelt wijzigingen voor een .env bestand
+
+    Elke wijziging herstart een korte timer; pas als er even niets meer
+    verandert worden alle wijzigingen in één atomaire schrijfactie opgeslagen.
+
+    Args:
+        path_provider: Callable die het pad naar het .env bestand geeft (of None)
+        delay: Wachttijd na de laatste wijziging (seconden)
+        create_missing: Maak het bestand aan als het nog niet bestaat; anders
+                        blijven de wijzigingen gepland tot het bestand er is
+    """
+
+    def __init__(self, path_provider: Callable[[], Optional[str]], delay: float = ENV_WRITE_DELAY,
+                 create_missing: bool = True):
+        self._path_provider = path_provider
+        self.delay = delay
+        self.create_missing = create_missing
+        self._pending: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self.write_count = 0
+
+    @property
+    def pending(self) -> Dict[str, Any]:
+        """Kopie van nog niet geschreven wijzigingen"""
+        with self._lock:
+            return dict(self._pending)
+
+    def queue(self, key: str, value: Any):
+        """Plan een wijziging (schrijven gebeurt na de wachttijd)"""
+        with self._lock:
+            self._pending[key] = value
+            if self._timer is not None:
+                self._timer.cancel()
+            # Geen daemon: bij afsluiten binnen de wachttijd wordt de wijziging nog geschreven
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """
+        Schrijf alle geplande wijzigingen direct weg
+
+        Returns:
+            True bij succes of als er niets te schrijven was; False als er geen
+            (bestaand) bestand is, de wijzigingen blijven dan gepland
+        """
+        file_path = self._path_provider()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return True
+            if not file_path or (not self.create_missing and not os.path.exists(file_path)):
+                logger.info(f"Geen .env bestand ({file_path}); {len(self._pending)} wijziging(en) blijven gepland")
+                return False
+            updates, self._pending = self._pending, {}
+
+        success = update_env_file(file_path, updates)
+        if success:
+            self.write_count += 1
+        else:
+            # Opnieuw proberen bij de volgende flush (nieuwere waarden gaan voor)
+            with self._lock:
+                self._pending = {**updates, **self._pending}
+        return success
@@ -0,0 +1,464 @@
+"""
+Gedistribueerde batch verwerking voor Magic Time Studio
+Coordinator met een HTTP API en workers op andere machines die jobs leasen
+
+Eén instantie (de coordinator) beheert de batch queue; workers halen met
+een lease een job op, lezen de invoer van gedeelde opslag en sturen
+transcriptie en SRT terug. Een worker die geen heartbeat meer stuurt
+verliest zijn lease en de job gaat terug in de queue. Alleen de standaard
+library (http.server, urllib) is nodig.
+"""
+
+import os
+import re
+import json
+import hmac
+import time
+import uuid
+import socket
+import secrets
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, List, Any, Callable, Tuple
+import logging
+
+from .atomic_io import write_file_atomic
+from .cancellation import CancelledError, CancellationToken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+DEFAULT_LEASE_SECONDS = 60.0
+# Grenzen voor lease_seconds van een worker (te kort geeft onnodig herplannen, te lang blokkeert de job)
+MIN_LEASE_SECONDS = 5.0
+MAX_LEASE_SECONDS = 3600.0
+MAX_ATTEMPTS = 3
+TOKEN_HEADER = "X-Magic-Time-Token"
+TOKEN_ENV = "MAGIC_TIME_COORDINATOR_TOKEN"
+QUEUE_FILENAME = "coordinator_queue.json"
+
+# Maximale grootte van een request (transcripties van lange films passen ruim)
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+JOB_QUEUED = "queued"
+JOB_LEASED = "leased"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# Toegestane artefact namen: bestandsextensie achter de naam van de invoer (geen paden)
+ARTIFACT_NAME = re.compile(r"^[A-Za-z0-9_-]+(\.[A-Za-z0-9_-]+)*$")
+
+def default_worker_id() -> str:
+    """Unieke worker naam: host en proces id"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def lease_seconds(value: Any, minimum: float = MIN_LEASE_SECONDS, maximum: float = MAX_LEASE_SECONDS) -> float:
+    """
+    Lease duur van een worker, begrensd tot minimum..maximum
+
+    Raises:
+        ValueError: Als de waarde geen getal is
+    """
+    seconds = float(value or DEFAULT_LEASE_SECONDS)
+    if seconds != seconds:  # NaN
+        raise ValueError("lease_seconds moet een getal zijn")
+    return min(max(seconds, minimum), maximum)
+
+def map_path(path: str, path_map: Optional[Dict[str, str]] = None) -> str:
+    """
+    Vertaal een pad van de coordinator naar het mount punt van deze worker
+
+    Args:
+        path: Pad zoals de coordinator het kent
+        path_map: Prefix van de coordinator -> prefix op deze machine
+
+    Returns:
+        Pad op deze machine (ongewijzigd als geen prefix past)
+    """
+    for source, target in sorted((path_map or {}).items(), key=lambda item: -len(item[0])):
+        if path == source or path.startswith(source.rstrip("/\\") + "/") or path.startswith(source.rstrip("/\\") + "\\"):
+            rest = path[len(source.rstrip("/\\")):].lstrip("/\\")
+            return os.path.join(target, *re.split(r"[/\\]", rest)) if rest else target
+    return path
+
+class LeaseQueue:
+    """
+    Persistente job queue met leases
+
+    Een geleasde job hoort bij één worker tot de lease verloopt; verlopen
+    leases gaan terug in de queue (of falen na MAX_ATTEMPTS). Tijden zijn
+    wandkloktijden zodat leases een herstart van de coordinator overleven.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_attempts: int = MAX_ATTEMPTS):
+        if path is None:
+            from .media_probe import get_cache_dir
+            path = os.path.join(get_cache_dir(), QUEUE_FILENAME)
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._jobs: List[Dict[str, Any]] = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._jobs = json.load(f)
+            except Exception as e:
+                logger.warning(f"Kan coordinator queue niet laden {self.path}: {e}")
+                self._jobs = []
+
+    def _save(self):
+        write_file_atomic(self.path, json.dumps(self._jobs, ensure_ascii=False))
+
+    def _find(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return next((job for job in self._jobs if job["id"] == job_id), None)
+
+    def _expire(self, now: float):
+        for job in self._jobs:
+            if job["status"] == JOB_LEASED and job["lease_expires"] < now:
+                logger.warning(f"Lease van {job['worker']} op job {job['id']} verlopen")
+                self._release(job, "lease verlopen")
+
+    def _release(self, job: Dict[str, Any], error: str):
+        job["worker"] = None
+        job["lease_expires"] = None
+        job["error"] = error
+        job["status"] = JOB_FAILED if job["attempts"] >= self.max_attempts else JOB_QUEUED
+
+    def add(self, paths: List[str], options: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Voeg bestanden toe; geeft de job ids terug"""
+        jobs = [{"id": uuid.uuid4().hex, "path": path, "options": options or {}, "status": JOB_QUEUED,
+                 "worker": None, "lease_expires": None, "attempts": 0, "error": None,
+                 "artifacts": {}, "created": time.time()} for path in paths]
+        with self._lock:
+            self._jobs.extend(jobs)
+            self._save()
+        return [job["id"] for job in jobs]
+
+    def lease(self, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        """Geef de volgende job aan een worker (None als de queue leeg is)"""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            for job in self._jobs:
+                if job["status"] == JOB_QUEUED:
+                    job.update(status=JOB_LEASED, worker=worker, lease_expires=now + lease_seconds,
+                               attempts=job["attempts"] + 1)
+                    self._save()
+                    return dict(job)
+            return None
+
+    def heartbeat(self, job_id: str, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Verleng een lease; False als de worker de job niet (meer) heeft"""
+        with self._lock:
+            self._expire(time.time())
+            job = self._find(job_id)
+            if job is None or job["status"] != JOB_LEASED or job["worker"] != worker:
+                return False
+            job["lease_expires"] = time.time() + lease_seconds
+            self._save()
+            return True
+
+    def complete(self, job_id: str, worker: str, artifacts: Optional[Dict[str, str]] = None) -> bool:
+        """Markeer een job als klaar (alleen door de worker die de lease heeft)"""
+        with self._lock:
+            job = self._find(job_id)
+            if job is None or job["status"] != JOB_LEASED or job["worker"] != worker:
+                return False
+            job.update(status=JOB_DONE, worker=None, lease_expires=None, artifacts=artifacts or {},
+                       error=None, finished=time.time())
+            self._save()
+            return True
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        """Geef een mislukte job terug; opnieuw in de queue tot MAX_ATTEMPTS"""
+        with self._lock:
+            job = self._find(job_id)
+            if job is None or job["status"] != JOB_LEASED or job["worker"] != worker:
+                return False
+            self._release(job, error)
+            self._save()
+            return True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Kopie van een job (of None)"""
+        with self._lock:
+            job = self._find(job_id)
+            return dict(job) if job else None
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """Kopie van alle jobs (verlopen leases zijn al teruggezet)"""
+        with self._lock:
+            self._expire(time.time())
+            return [dict(job) for job in self._jobs]
+
+    def counts(self) -> Dict[str, int]:
+        """Aantal jobs per status"""
+        counts = {JOB_QUEUED: 0, JOB_LEASED: 0, JOB_DONE: 0, JOB_FAILED: 0}
+        for job in self.jobs():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+class Coordinator:
+    """
+    HTTP API rond een LeaseQueue
+
+    Endpoints (JSON, met de gedeelde token in de X-Magic-Time-Token header):
+        POST /jobs        {"files": [...], "options": {...}}
+        POST /lease       {"worker": ..., "lease_seconds": ...}
+        POST /heartbeat   {"worker": ..., "job_id": ...}
+        POST /complete    {"worker": ..., "job_id": ..., "artifacts": {"srt": "...", ...}}
+        POST /fail        {"worker": ..., "job_id": ..., "error": ...}
+        GET  /status
+
+    Args:
+        queue: LeaseQueue (standaard in de cache map)
+        host: Adres om op te luisteren (standaard alleen lokaal; "0.0.0.0" voor andere machines)
+        port: Poort (0 = vrije poort)
+        token: Gedeelde token (standaard uit MAGIC_TIME_COORDINATOR_TOKEN of willekeurig)
+        output_dir: Map voor teruggestuurde artefacten (standaard naast het invoerbestand)
+        lease_bounds: Minimale en maximale lease_seconds die een worker mag vragen
+    """
+
+    def __init__(self, queue: Optional[LeaseQueue] = None, host: str = "127.0.0.1",
+                 port: int = DEFAULT_PORT, token: Optional[str] = None, output_dir: Optional[str] = None,
+                 lease_bounds: Tuple[float, float] = (MIN_LEASE_SECONDS, MAX_LEASE_SECONDS)):
+        self.queue = queue or LeaseQueue()
+        self.lease_bounds = lease_bounds
+        self.token = token or os.environ.get(TOKEN_ENV) or secrets.token_hex(16)
+        self.output_dir = output_dir
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def write_artifacts(self, job: Dict[str, Any], artifacts: Dict[str, str]) -> Dict[str, str]:
+        """
+        Schrijf teruggestuurde artefacten atomair weg
+
+        Args:
+            job: Job waar de artefacten bij horen
+            artifacts: Naam (bijv. "srt" of "transcript.json") -> inhoud
+
+        Returns:
+            Naam -> geschreven pad
+        """
+        output_dir = job["options"].get("output_dir") or self.output_dir or os.path.dirname(job["path"])
+        base_name = os.path.splitext(os.path.basename(job["path"]))[0]
+        written = {}
+        for name, content in (artifacts or {}).items():
+            if not ARTIFACT_NAME.match(name) or not isinstance(content, str):
+                logger.warning(f"Ongeldig artefact '{name}' van job {job['id']} genegeerd")
+                continue
+            path = os.path.join(output_dir, f"{base_name}.{name}")
+            if write_file_atomic(path, content):
+                written[name] = path
+        return written
+
+    def _handle(self, method: str, path: str, body: Dict[str, Any]):
+        """Verwerk één API aanroep; geeft (status code, antwoord) terug"""
+        if method == "GET" and path == "/status":
+            return 200, {"counts": self.queue.counts(), "jobs": self.queue.jobs()}
+        if method != "POST":
+            return 404, {"error": "onbekend endpoint"}
+        if not isinstance(body, dict):
+            return 400, {"error": "body moet een JSON object zijn"}
+        if path == "/jobs":
+            files = body.get("files") or []
+            return 200, {"job_ids": self.queue.add([str(path) for path in files], body.get("options"))}
+        if path == "/lease":
+            job = self.queue.lease(str(body.get("worker")), lease_seconds(body.get("lease_seconds"), *self.lease_bounds))
+            return 200, {"job": job}
+        worker, job_id = str(body.get("worker")), str(body.get("job_id"))
+        if path == "/heartbeat":
+            ok = self.queue.heartbeat(job_id, worker, lease_seconds(body.get("lease_seconds"), *self.lease_bounds))
+            return 200, {"ok": ok}
+        if path == "/complete":
+            job = self.queue.get(job_id)
+            if job is None or job["status"] != JOB_LEASED or job["worker"] != worker:
+                return 409, {"ok": False, "error": "lease verloren"}
+            written = self.write_artifacts(job, body.get("artifacts") or {})
+            return 200, {"ok": self.queue.complete(job_id, worker, written), "artifacts": written}
+        if path == "/fail":
+            return 200, {"ok": self.queue.fail(job_id, worker, str(body.get("error") or "onbekende fout"))}
+        return 404, {"error": "onbekend endpoint"}
+
+    def _make_handler(self):
+        coordinator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, payload: Dict[str, Any]):
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _dispatch(self, method: str):
+                if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), coordinator.token):
+                    return self._reply(403, {"error": "ongeldige token"})
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    return self._reply(413, {"error": "request te groot"})
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                    status, payload = coordinator._handle(method, self.path.split("?")[0], body)
+                except (ValueError, TypeError) as e:
+                    status, payload = 400, {"error": str(e)}
+                self._reply(status, payload)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, format, *args):
+                logger.debug("coordinator: " + format % args)
+
+        return Handler
+
+    def serve_forever(self):
+        """Beantwoord requests tot shutdown()"""
+        logger.info(f"Coordinator luistert op {self.url}")
+        self._server.serve_forever(poll_interval=0.2)
+
+    def start(self) -> threading.Thread:
+        """Start serve_forever in een achtergrond thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="coordinator", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def shutdown(self):
+        """Stop de coordinator (de queue blijft op schijf)"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+class CoordinatorClient:
+    """HTTP client voor de coordinator API"""
+
+    def __init__(self, url: str, token: Optional[str] = None, timeout: float = 30.0):
+        self.url = url.rstrip("/")
+        self.token = token or os.environ.get(TOKEN_ENV, "")
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json", TOKEN_HEADER: self.token})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read() or b"{}")
+        except urllib.error.HTTPError as e:
+            try:
+                return json.loads(e.read() or b"{}")
+            except ValueError:
+                return {"ok": False, "error": f"HTTP {e.code}"}
+
+    def submit(self, files: List[str], options: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Voeg bestanden toe aan de batch queue"""
+        return self._request("POST", "/jobs", {"files": files, "options": options or {}}).get("job_ids", [])
+
+    def lease(self, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        """Vraag een job aan (None als er niets te doen is)"""
+        return self._request("POST", "/lease", {"worker": worker, "lease_seconds": lease_seconds}).get("job")
+
+    def heartbeat(self, job_id: str, worker: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """Verleng de lease; False als de job aan een andere worker gegeven is"""
+        return bool(self._request("POST", "/heartbeat", {"worker": worker, "job_id": job_id,
+                                                         "lease_seconds": lease_seconds}).get("ok"))
+
+    def complete(self, job_id: str, worker: str, artifacts: Dict[str, str]) -> bool:
+        """Stuur de artefacten terug en rond de job af"""
+        return bool(self._request("POST", "/complete", {"worker": worker, "job_id": job_id,
+                                                        "artifacts": artifacts}).get("ok"))
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        """Meld een mislukte job"""
+        return bool(self._request("POST", "/fail", {"worker": worker, "job_id": job_id, "error": error}).get("ok"))
+
+    def status(self) -> Dict[str, Any]:
+        """Aantallen per status en alle jobs"""
+        return self._request("GET", "/status")
+
+def run_worker(client: CoordinatorClient, handle_job: Callable[[Dict[str, Any], CancellationToken], Dict[str, str]],
+               worker_id: Optional[str] = None, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+               poll_interval: float = 2.0, path_map: Optional[Dict[str, str]] = None,
+               exit_when_idle: bool = False, should_stop: Optional[Callable[[], bool]] = None) -> int:
+    """
+    Worker lus: lease, verwerk, stuur terug
+
+    Tijdens het verwerken stuurt een thread elke lease_seconds / 3 een
+    heartbeat; is de lease verloren (de coordinator dacht dat deze worker
+    dood was), dan wordt de job via het CancellationToken afgebroken.
+
+    Args:
+        client: CoordinatorClient
+        handle_job: Callable(job, token) -> artefacten (naam -> inhoud); job["path"] is al vertaald
+        worker_id: Naam van deze worker (standaard host-pid)
+        lease_seconds: Duur van een lease
+        poll_interval: Wachttijd als er geen job is
+        path_map: Prefix van de coordinator -> prefix op deze machine
+        exit_when_idle: Stop als er niets meer in de queue staat en niets geleasd is
+        should_stop: Optionele callable die True geeft om te stoppen
+
+    Returns:
+        Aantal afgeronde jobs
+    """
+    worker_id = worker_id or default_worker_id()
+    completed = 0
+    while not (should_stop and should_stop()):
+        try:
+            job = client.lease(worker_id, lease_seconds)
+        except OSError as e:
+            logger.warning(f"Coordinator niet bereikbaar: {e}")
+            time.sleep(poll_interval)
+            continue
+        if job is None:
+            if exit_when_idle:
+                counts = client.status().get("counts", {})
+                if not counts.get(JOB_QUEUED) and not counts.get(JOB_LEASED):
+                    break
+            time.sleep(poll_interval)
+            continue
+
+        token = CancellationToken()
+        finished = threading.Event()
+
+        def heartbeat():
+            while not finished.wait(lease_seconds / 3):
+                try:
+                    if not client.heartbeat(job["id"], worker_id, lease_seconds):
+                        logger.warning(f"Lease op job {job['id']} verloren, verwerking afgebroken")
+                        token.cancel()
+                        return
+                except OSError as e:
+                    logger.warning(f"Heartbeat mislukt: {e}")
+
+        beat = threading.Thread(target=heartbeat, name="coordinator-heartbeat", daemon=True)
+        beat.start()
+        try:
+            artifacts = handle_job(dict(job, path=map_path(job["path"], path_map)), token)
+            finished.set()
+            if client.complete(job["id"], worker_id, artifacts or {}):
+                completed += 1
+        except CancelledError:
+            pass  # Lease verloren: een andere worker doet de job opnieuw
+        except Exception as e:
+            logger.error(f"Job {job['id']} mislukt: {e}")
+            try:
+                client.fail(job["id"], worker_id, str(e))
+            except OSError:
+                pass  # Lease verloopt vanzelf
+        finally:
+            finished.set()
+            beat.join(timeout=1.0)
+    return completed
@@ -0,0 +1,190 @@
+"""
+CPU replica's voor Magic Time Studio
+Verdeelt de fysieke cores van een GPU-loze machine over meerdere model replica's
+
+Eén CTranslate2 model schaalt slecht voorbij een handvol threads; meerdere
+replica's die elk een eigen set fysieke cores (met de bijbehorende
+hyperthreads) krijgen, verwerken samen meer audio-uren per uur. Het aantal
+replica's wordt begrensd door de cores en door het vrije geheugen.
+"""
+
+import os
+import sys
+from typing import Optional, Dict, List, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Threads per replica als niets is ingesteld (sweet spot voor CTranslate2 int8)
+DEFAULT_THREADS_PER_REPLICA = 4
+
+# Geschat geheugen per replica in GB (int8 model, alignment model en audio buffers)
+MODEL_RAM_GB = {
+    "tiny": 0.6,
+    "base": 0.8,
+    "small": 1.4,
+    "medium": 2.8,
+    "large": 4.5,
+}
+DEFAULT_MODEL_RAM_GB = 4.5
+
+# Geheugen dat vrij blijft voor het systeem en de GUI
+RAM_RESERVE_GB = 2.0
+
+# Thread pools van numerieke libraries (gelezen bij het importeren van torch/ctranslate2)
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+def model_ram_gb(model_name: str) -> float:
+    """Geschat geheugen van één replica voor een model (large-v3, distil-large-v2, ... tellen als large)"""
+    name = (model_name or "").lower()
+    for size in ("large", "medium", "small", "base", "tiny"):
+        if size in name:
+            return MODEL_RAM_GB[size]
+    return DEFAULT_MODEL_RAM_GB
+
+def _allowed_cpus() -> List[int]:
+    """Logische CPU's waarop dit proces mag draaien"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    try:
+        import psutil
+        return sorted(psutil.Process().cpu_affinity())
+    except Exception:
+        return list(range(os.cpu_count() or 1))
+
+def physical_core_groups() -> List[List[int]]:
+    """
+    Logische CPU's gegroepeerd per fysieke core
+
+    Op Linux via de topologie in sysfs; elders worden de logische CPU's
+    op volgorde verdeeld over psutil.cpu_count(logical=False) cores.
+
+    Returns:
+        Lijst met per fysieke core de logische CPU ids (hyperthreads samen)
+    """
+    allowed = _allowed_cpus()
+    groups: Dict[tuple, List[int]] = {}
+    for cpu in allowed:
+        topology = f"/sys/devices/system/cpu/cpu{cpu}/topology"
+        try:
+            with open(os.path.join(topology, "physical_package_id")) as f:
+                package = int(f.read())
+            with open(os.path.join(topology, "core_id")) as f:
+                core = int(f.read())
+        except (OSError, ValueError):
+            groups = {}
+            break
+        groups.setdefault((package, core), []).append(cpu)
+    if groups:
+        return [sorted(cpus) for _, cpus in sorted(groups.items(), key=lambda item: min(item[1]))]
+
+    try:
+        import psutil
+        physical = psutil.cpu_count(logical=False) or len(allowed)
+    except Exception:
+        physical = len(allowed)
+    physical = max(1, min(physical, len(allowed)))
+    per_core = max(1, len(allowed) // physical)
+    return [allowed[index * per_core:(index + 1) * per_core] for index in range(physical)]
+
+def available_ram_gb() -> Optional[float]:
+    """Vrij geheugen in GB (None als het niet te bepalen is)"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available / (1024 ** 3)
+    except Exception:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 ** 3)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def plan_cpu_replicas(model_name: str, replicas: Optional[int] = None,
+                      threads_per_replica: Optional[int] = None,
+                      core_groups: Optional[List[List[int]]] = None,
+                      ram_gb: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Verdeel fysieke cores over model replica's
+
+    Zonder instellingen: zoveel replica's van DEFAULT_THREADS_PER_REPLICA
+    threads als de cores toelaten, begrensd door het vrije geheugen. Is het
+    geheugen de beperking, dan krijgt elke replica meer threads zodat geen
+    core ongebruikt blijft.
+
+    Args:
+        model_name: Whisper model (voor de geheugenschatting)
+        replicas: Vast aantal replica's (None = automatisch)
+        threads_per_replica: Vast aantal threads per replica (None = automatisch)
+        core_groups: Logische CPU's per fysieke core (standaard physical_core_groups())
+        ram_gb: Vrij geheugen in GB (standaard available_ram_gb())
+
+    Returns:
+        Lijst met per replica index, cores (logische CPU ids) en threads
+    """
+    groups = core_groups if core_groups is not None else physical_core_groups()
+    physical = max(1, len(groups))
+    if ram_gb is None:
+        ram_gb = available_ram_gb()
+
+    if replicas:
+        count = max(1, min(int(replicas), physical))
+    else:
+        threads = max(1, min(int(threads_per_replica or DEFAULT_THREADS_PER_REPLICA), physical))
+        count = max(1, physical // threads)
+        if ram_gb is not None:
+            by_ram = int((ram_gb - RAM_RESERVE_GB) // model_ram_gb(model_name))
+            count = max(1, min(count, by_ram))
+    threads = int(threads_per_replica) if threads_per_replica else physical // count
+    threads = max(1, min(threads, physical // count))
+
+    plan = []
+    for index in range(count):
+        cores = [cpu for group in groups[index * threads:(index + 1) * threads] for cpu in group]
+        plan.append({"index": index, "cores": cores, "threads": threads})
+    logger.info(f"CPU replica's: {count} x {threads} threads ({physical} fysieke cores, vrij geheugen {ram_gb} GB)")
+    return plan
+
+def thread_env(threads: int) -> Dict[str, str]:
+    """Omgevingsvariabelen die de thread pools van numerieke libraries op threads zetten"""
+    return {name: str(threads) for name in THREAD_ENV_VARS}
+
+def apply_replica(replica: Dict[str, Any]) -> bool:
+    """
+    Pin het huidige proces op de cores van een replica en beperk de thread pools
+
+    Moet aangeroepen worden voordat torch/ctranslate2 geïmporteerd worden;
+    een al geïmporteerde torch krijgt direct het juiste aantal threads.
+
+    Args:
+        replica: Element uit plan_cpu_replicas()
+
+    Returns:
+        True als de cores vastgezet zijn (niet op elk platform mogelijk)
+    """
+    threads = int(replica.get("threads") or 1)
+    os.environ.update(thread_env(threads))
+    if "torch" in sys.modules:
+        try:
+            sys.modules["torch"].set_num_threads(threads)
+        except Exception as e:
+            logger.warning(f"Kan torch threads niet instellen: {e}")
+
+    cores = replica.get("cores") or []
+    if not cores:
+        return False
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            # Op Linux geldt affinity per thread: ook al gestarte threads (OpenMP pools) vastzetten
+            tasks = os.listdir("/proc/self/task") if os.path.isdir("/proc/self/task") else ["0"]
+            for task in tasks:
+                try:
+                    os.sched_setaffinity(int(task), cores)
+                except ProcessLookupError:
+                    pass  # Thread is net gestopt
+        else:
+            import psutil
+            psutil.Process().cpu_affinity(cores)
+        return True
+    except Exception as e:
+        logger.warning(f"Kan replica {replica.get('index')} niet op cores {cores} vastzetten: {e}")
+        return False
@@ -0,0 +1,285 @@
+"""
+Device pool voor Magic Time Studio
+Eén model replica per device (GPU of CPU) en verdeling van bestanden over het minst belaste device
+
+Elk device krijgt een eigen thread die zijn replica laadt en de jobs voor dat
+device één voor één uitvoert; CUDA werk geeft de GIL vrij, dus replica's op
+verschillende GPU's rekenen echt parallel. Resultaten komen terug als futures,
+zodat de aanroeper ze in de volgorde van indienen kan ophalen.
+"""
+
+import queue
+import threading
+import subprocess
+from concurrent.futures import Future
+from typing import Optional, Dict, List, Any, Callable, Iterable, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+def split_device(device: str) -> Tuple[str, Optional[int]]:
+    """
+    Splits een device naam in type en index
+
+    Args:
+        device: Bijv. "cuda", "cuda:1" of "cpu"
+
+    Returns:
+        (type, index) met index None als er geen index in de naam staat
+    """
+    device_type, _, index = (device or "cpu").partition(":")
+    return device_type, int(index) if index.isdigit() else None
+
+def parse_devices(value: Any) -> List[str]:
+    """Devices uit een instelling: lijst, komma gescheiden tekst ("cuda:0,cuda:1") of "auto" """
+    if not value:
+        return []
+    if isinstance(value, str):
+        if value.strip().lower() == "auto":
+            return available_devices()
+        value = value.split(",")
+    return [str(device).strip() for device in value if str(device).strip()]
+
+def available_devices() -> List[str]:
+    """Alle CUDA devices ("cuda:0", "cuda:1", ...) of ["cpu"] zonder GPU"""
+    try:
+        import torch
+        count = torch.cuda.device_count() if torch.cuda.is_available() else 0
+    except Exception:
+        count = 0
+    return [f"cuda:{index}" for index in range(count)] or ["cpu"]
+
+def gpu_status() -> Dict[int, Dict[str, float]]:
+    """
+    Geheugen en belasting van alle GPU's via nvidia-smi (niet alleen GPU 0)
+
+    Returns:
+        Per GPU index memory_used en memory_total (MB) en utilization (%); leeg zonder nvidia-smi
+    """
+    try:
+        result = subprocess.run(
+            ["nvidia-smi", "--query-gpu=index,memory.used,memory.total,utilization.gpu",
+             "--format=csv,noheader,nounits"],
+            capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    status = {}
+    for line in result.stdout.splitlines() if result.returncode == 0 else []:
+        try:
+            index, used, total, utilization = [part.strip() for part in line.split(",")]
+            status[int(index)] = {"memory_used": float(used), "memory_total": float(total),
+                                  "utilization": float(utilization)}
+        except ValueError:
+            continue
+    return status
+
+class GpuMemorySampler:
+    """
+    Piek van het gebruikte geheugen van één GPU volgens nvidia-smi
+
+    torch.cuda.max_memory_allocated ziet alleen allocaties van torch; CTranslate2
+    (het model van WhisperX) alloceert zelf. nvidia-smi meet het hele device, dus
+    de piek wordt tijdens het blok periodiek bemonsterd.
+
+    Args:
+        index: GPU index
+        interval: Seconden tussen metingen
+        status: Functie zoals gpu_status (voor tests)
+    """
+
+    def __init__(self, index: int, interval: float = 0.25,
+                 status: Callable[[], Dict[int, Dict[str, float]]] = gpu_status):
+        self.index = index
+        self.interval = interval
+        self._status = status
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.peak_mb: Optional[float] = None
+
+    def used_mb(self) -> Optional[float]:
+        """Nu gebruikt geheugen in MB (None zonder nvidia-smi)"""
+        gpu = self._status().get(self.index)
+        return gpu["memory_used"] if gpu else None
+
+    def _sample(self):
+        used = self.used_mb()
+        if used is not None and (self.peak_mb is None or used > self.peak_mb):
+            self.peak_mb = used
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "GpuMemorySampler":
+        self.peak_mb = None
+        self._sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"gpu-memory-{self.index}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+class _Job:
+    def __init__(self, run: Callable, item: Any, cost: float):
+        self.run = run
+        self.item = item
+        self.cost = cost
+        self.future = Future()
+
+class DevicePool:
+    """
+    Pool met één replica per device
+
+    Args:
+        devices: Device namen, bijv. ["cuda:0", "cuda:1"] (meerdere "cpu" devices voor tests)
+        load_replica: Callable(device) -> replica; wordt op de thread van het device aangeroepen
+        speeds: Optionele relatieve snelheid per device (standaard gelijk)
+    """
+
+    def __init__(self, devices: List[str], load_replica: Callable[[str], Any],
+                 speeds: Optional[List[float]] = None):
+        if not devices:
+            raise ValueError("DevicePool heeft minstens één device nodig")
+        self.devices = list(devices)
+        self.speeds = list(speeds) if speeds else [1.0] * len(self.devices)
+        self.replicas: List[Any] = [None] * len(self.devices)
+        self._load_replica = load_replica
+        self._queues = [queue.Queue() for _ in self.devices]
+        self._loads = [0.0] * len(self.devices)  # Openstaande kosten per device
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+    def _start(self):
+        if self._threads:
+            return
+        for index, device in enumerate(self.devices):
+            thread = threading.Thread(target=self._device_loop, args=(index,), daemon=True,
+                                      name=f"device-pool-{device}")
+            thread.start()
+            self._threads.append(thread)
+
+    def _pick(self) -> Optional[int]:
+        """Device met de minste openstaande kosten ten opzichte van zijn snelheid (bij gelijkstand de laagste index)"""
+        candidates = [index for index in range(len(self.devices)) if index not in self._failed]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda index: (self._loads[index] / max(self.speeds[index], 1e-6), index))
+
+    def _dispatch(self, job: _Job):
+        with self._lock:
+            index = self._pick()
+            if index is not None:
+                self._loads[index] += job.cost
+                job.future.device = self.devices[index]
+                self._queues[index].put(job)  # Onder de lock: een falend device kan hem zo niet missen
+        if index is None:
+            job.future.set_exception(RuntimeError("Geen werkend device beschikbaar"))
+
+    def submit(self, run: Callable[[Any, Any], Any], item: Any, cost: float = 1.0) -> Future:
+        """
+        Voer run(replica, item) uit op het minst belaste device
+
+        Args:
+            run: Callable(replica, item) -> resultaat
+            item: Werk voor deze job (bijv. een bestandspad)
+            cost: Geschatte kosten (bijv. audio duur); bepaalt de belasting per device
+
+        Returns:
+            Future met het resultaat; future.device is het gekozen device
+        """
+        if self._closed:
+            raise RuntimeError("DevicePool is afgesloten")
+        self._start()
+        job = _Job(run, item, max(float(cost or 0.0), 0.0))
+        self._dispatch(job)
+        return job.future
+
+    def map(self, run: Callable[[Any, Any], Any], items: Iterable[Any],
+            costs: Optional[Iterable[float]] = None) -> List[Future]:
+        """
+        Dien meerdere items in; de duurste eerst zodat de devices gelijk eindigen
+
+        Returns:
+            Futures in de volgorde van items (ongeacht de volgorde van uitvoeren)
+        """
+        items = list(items)
+        costs = list(costs) if costs is not None else [1.0] * len(items)
+        futures: List[Optional[Future]] = [None] * len(items)
+        for position in sorted(range(len(items)), key=lambda position: -costs[position]):
+            futures[position] = self.submit(run, items[position], costs[position])
+        return futures
+
+    def _device_loop(self, index: int):
+        device = self.devices[index]
+        try:
+            self.replicas[index] = self._load_replica(device)
+        except Exception as e:
+            logger.error(f"Replica op {device} kon niet geladen worden: {e}")
+            with self._lock:
+                self._failed.add(index)
+                self._loads[index] = 0.0
+            # Al toegewezen jobs naar de andere devices
+            while True:
+                try:
+                    job = self._queues[index].get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None:
+                    self._dispatch(job)
+            return
+
+        while True:
+            job = self._queues[index].get()
+            if job is None:
+                break
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    try:
+                        job.future.set_result(job.run(self.replicas[index], job.item))
+                    except BaseException as e:
+                        job.future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._loads[index] = max(0.0, self._loads[index] - job.cost)
+
+    def loads(self) -> Dict[str, float]:
+        """Openstaande kosten per device"""
+        with self._lock:
+            return {device: self._loads[index] for index, device in enumerate(self.devices)}
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        Stop de device threads
+
+        Args:
+            wait: Wacht tot lopende jobs klaar zijn
+            cancel_pending: Annuleer jobs die nog niet gestart zijn
+        """
+        self._closed = True
+        for job_queue in self._queues:
+            if cancel_pending:
+                while True:
+                    try:
+                        job = job_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is not None:
+                        job.future.cancel()
+            job_queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
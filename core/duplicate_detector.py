@@ -0,0 +1,248 @@
+"""
+Duplicaat detectie voor Magic Time Studio
+Vindt dubbele invoerbestanden met getrapte hashing (grootte, steekproef, volledig)
+"""
+
+import os
+import mmap
+import hashlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, Iterable, Callable
+import logging
+
+from .file_collection import normalize_path
+from .media_probe import get_media_info, find_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+# Grootte van elk steekproef blok (begin, midden, einde)
+SAMPLE_BLOCK_SIZE = 1024 * 1024
+
+# Leesbuffer voor volledige hashes als mmap niet beschikbaar is
+READ_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Standaard aantal seconden audio voor de audio vingerafdruk
+AUDIO_FINGERPRINT_SECONDS = 30
+
+HASH_WORKERS = 4
+
+def _new_hash():
+    # blake2b is in hashlib ingebouwd en sneller dan md5/sha voor grote bestanden
+    return hashlib.blake2b(digest_size=16)
+
+def sample_hash(file_path: str, block_size: int = SAMPLE_BLOCK_SIZE) -> Optional[str]:
+    """
+    Hash van begin, midden en einde van een bestand (plus grootte)
+
+    Bestanden kleiner dan drie blokken worden volledig gehasht.
+
+    Args:
+        file_path: Pad naar het bestand
+        block_size: Grootte van elk blok in bytes
+
+    Returns:
+        Hex hash of None bij fout
+    """
+    try:
+        size = os.path.getsize(file_path)
+        hash_obj = _new_hash()
+        hash_obj.update(size.to_bytes(8, "little"))
+        with open(file_path, "rb", buffering=0) as f:
+            if size <= block_size * 3:
+                hash_obj.update(f.read())
+            else:
+                for offset in (0, (size - block_size) // 2, size - block_size):
+                    f.seek(offset)
+                    hash_obj.update(f.read(block_size))
+        return hash_obj.hexdigest()
+    except Exception as e:
+        logger.error(f"Fout bij steekproef hash van {file_path}: {e}")
+        return None
+
+def full_hash(file_path: str) -> Optional[str]:
+    """
+    Volledige hash van een bestand via mmap (grote reads als fallback)
+
+    Args:
+        file_path: Pad naar het bestand
+
+    Returns:
+        Hex hash of None bij fout
+    """
+    try:
+        hash_obj = _new_hash()
+        with open(file_path, "rb", buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            if size:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        hash_obj.update(mapped)
+                    return hash_obj.hexdigest()
+                except (OSError, ValueError):
+                    f.seek(0)
+            buffer = bytearray(READ_BUFFER_SIZE)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                hash_obj.update(view[:read])
+        return hash_obj.hexdigest()
+    except Exception as e:
+        logger.error(f"Fout bij volledige hash van {file_path}: {e}")
+        return None
+
+def audio_fingerprint(file_path: str, seconds: int = AUDIO_FINGERPRINT_SECONDS,
+                      ffmpeg_path: Optional[str] = None) -> Optional[str]:
+    """
+    Hash van de gedecodeerde eerste seconden audio (mono 16 kHz PCM)
+
+    Dezelfde audio in een andere container of met andere video geeft
+    dezelfde vingerafdruk.
+
+    Args:
+        file_path: Pad naar media bestand
+        seconds: Aantal seconden audio
+        ffmpeg_path: Optioneel pad naar ffmpeg
+
+    Returns:
+        Hex hash of None bij fout of zonder audio
+    """
+    cmd = [
+        ffmpeg_path or find_ffmpeg(), "-v", "error",
+        "-i", file_path, "-map", "0:a:0", "-t", str(seconds),
+        "-ac", "1", "-ar", "16000", "-f", "s16le", "-"
+    ]
+    try:
+        hash_obj = _new_hash()
+        received = 0
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            for chunk in iter(lambda: process.stdout.read(READ_BUFFER_SIZE), b""):
+                hash_obj.update(chunk)
+                received += len(chunk)
+        finally:
+            process.stdout.close()
+            process.wait(timeout=60)
+        if process.returncode != 0 or not received:
+            return None
+        return hash_obj.hexdigest()
+    except Exception as e:
+        logger.error(f"Fout bij audio vingerafdruk van {file_path}: {e}")
+        return None
+
+def _group_by(paths: List[str], key_func: Callable[[str], Any], executor: Optional[ThreadPoolExecutor],
+              should_stop=None) -> List[List[str]]:
+    """Groepeer paden op sleutel; alleen groepen met meer dan één pad blijven over"""
+    if should_stop and should_stop():
+        return []
+    keys = list(executor.map(key_func, paths)) if executor else [key_func(path) for path in paths]
+    groups: Dict[Any, List[str]] = {}
+    for path, key in zip(paths, keys):
+        if key is not None:
+            groups.setdefault(key, []).append(path)
+    return [group for group in groups.values() if len(group) > 1]
+
+def _rounded_duration(file_path: str) -> Optional[int]:
+    info = get_media_info(file_path)
+    duration = info.get("duration") if info else None
+    return round(duration) if duration else None
+
+def find_duplicates(paths: Iterable[str], audio_aware: bool = False,
+                    audio_seconds: int = AUDIO_FINGERPRINT_SECONDS,
+                    max_workers: int = HASH_WORKERS,
+                    sample_func: Callable[[str], Optional[str]] = sample_hash,
+                    full_func: Callable[[str], Optional[str]] = full_hash,
+                    audio_func: Optional[Callable[[str], Optional[str]]] = None,
+                    duration_func: Callable[[str], Optional[int]] = _rounded_duration,
+                    should_stop=None) -> List[Dict[str, Any]]:
+    """
+    Vind groepen identieke invoerbestanden
+
+    Getrapt: eerst op grootte (gratis), dan een steekproef hash van begin,
+    midden en einde, en alleen bij botsingen een volledige hash. Met
+    audio_aware worden overgebleven bestanden met dezelfde (afgeronde) duur
+    vergeleken op een hash van de gedecodeerde eerste seconden audio.
+
+    Args:
+        paths: Paden naar invoerbestanden (volgorde bepaalt het origineel)
+        audio_aware: Ook dezelfde audio in andere containers herkennen
+        audio_seconds: Aantal seconden audio voor de vingerafdruk
+        max_workers: Aantal threads voor hashing (I/O en hashlib geven de GIL vrij)
+        sample_func: Functie voor de steekproef hash
+        full_func: Functie voor de volledige hash
+        audio_func: Functie voor de audio vingerafdruk
+        duration_func: Functie voor de afgeronde duur
+        should_stop: Optionele callable; detectie stopt als deze True teruggeeft
+
+    Returns:
+        Lijst van groepen: dicts met original, duplicates en method ("bytes" of "audio")
+    """
+    unique_paths = []
+    seen = set()
+    for path in paths:
+        key = normalize_path(path)
+        if key not in seen and os.path.isfile(path):
+            seen.add(key)
+            unique_paths.append(path)
+    order = {path: index for index, path in enumerate(unique_paths)}
+
+    if audio_func is None:
+        audio_func = lambda path: audio_fingerprint(path, audio_seconds)
+
+    groups = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        # Trap 1: grootte
+        for size_group in _group_by(unique_paths, os.path.getsize, None, should_stop):
+            # Trap 2: steekproef hash
+            for sample_group in _group_by(size_group, sample_func, executor, should_stop):
+                # Trap 3: volledige hash alleen bij botsingen
+                for full_group in _group_by(sample_group, full_func, executor, should_stop):
+                    groups.append((full_group, "bytes"))
+
+        if audio_aware:
+            # Per byte-groep één vertegenwoordiger; overige bestanden blijven los
+            grouped = {path for group, _ in groups for path in group[1:]}
+            candidates = [path for path in unique_paths if path not in grouped]
+            for duration_group in _group_by(candidates, duration_func, executor, should_stop):
+                for audio_group in _group_by(duration_group, audio_func, executor, should_stop):
+                    merged = list(audio_group)
+                    for group, _ in groups:
+                        if group[0] in audio_group:
+                            merged.extend(group[1:])
+                    groups = [(group, method) for group, method in groups if group[0] not in audio_group]
+                    groups.append((merged, "audio"))
+
+    result = []
+    for group, method in groups:
+        group = sorted(group, key=order.get)
+        result.append({"original": group[0], "duplicates": group[1:], "method": method})
+    result.sort(key=lambda group: order[group["original"]])
+    return result
+
+def build_duplicate_map(groups: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Koppel elk duplicaat aan zijn origineel
+
+    Args:
+        groups: Resultaat van find_duplicates
+
+    Returns:
+        Dictionary duplicaat pad -> origineel pad
+    """
+    return {duplicate: group["original"] for group in groups for duplicate in group["duplicates"]}
+
+def format_duplicate_report(groups: List[Dict[str, Any]]) -> str:
+    """
+    Leesbaar overzicht van duplicaat groepen
+
+    Returns:
+        Tekst met één regel per groep
+    """
+    lines = []
+    for group in groups:
+        names = ", ".join(os.path.basename(path) for path in group["duplicates"])
+        method = "audio" if group["method"] == "audio" else "identiek"
+        lines.append(f"{os.path.basename(group['original'])} ({method}): {names}")
+    return "\n".join(lines)
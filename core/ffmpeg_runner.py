@@ -0,0 +1,284 @@
+"""
+FFmpeg runner voor Magic Time Studio
+Eén gedeelde runner voor alle ffmpeg aanroepen: voortgang via -progress, timeouts naar mediaduur en een globale limiet
+
+FFmpeg schrijft met "-progress pipe:1 -nostats" blokken key=value regels naar
+stdout; out_time_us (of out_time_ms, dat ondanks de naam ook microseconden
+bevat) ten opzichte van de mediaduur geeft de echte voortgang. Van stderr
+wordt alleen een korte staart bewaard, die bij een fout gelogd wordt. De
+timeout schaalt met de duur van de invoer; daarnaast stopt een job die te lang
+geen voortgang meer meldt.
+"""
+
+import os
+import time
+import queue
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, List, Any, Callable
+import logging
+
+from .cancellation import CancellationToken, CancelledError, start_process, terminate_process, POLL_INTERVAL
+from .media_probe import find_ffmpeg, get_media_duration
+
+logger = logging.getLogger(__name__)
+
+# Standaard maximaal aantal gelijktijdige ffmpeg processen (voor de hele applicatie)
+FFMPEG_CONCURRENCY = min(4, max(1, (os.cpu_count() or 2) // 2))
+
+# Vaste marge bovenop de geschaalde timeout (opstarten, openen van bestanden)
+TIMEOUT_BASE = 60.0
+
+# Timeout factor t.o.v. de mediaduur: 1.0 = minstens realtime snelheid
+TIMEOUT_FACTOR_COPY = 1.0
+TIMEOUT_FACTOR_ENCODE = 20.0
+
+# Stoppen als ffmpeg zo lang (seconden) geen voortgang meldt
+STALL_TIMEOUT = 120.0
+
+# Aantal bewaarde stderr regels (alleen gelogd bij een fout)
+STDERR_TAIL_LINES = 40
+
+def scaled_timeout(duration: Optional[float], factor: float = TIMEOUT_FACTOR_COPY,
+                   base: float = TIMEOUT_BASE) -> Optional[float]:
+    """
+    Timeout voor een job op basis van de mediaduur
+
+    Args:
+        duration: Duur van de invoer in seconden (None als onbekend)
+        factor: Seconden rekentijd per seconde media
+        base: Vaste marge in seconden
+
+    Returns:
+        Timeout in seconden, of None zonder duur (dan geldt alleen STALL_TIMEOUT)
+    """
+    if not duration or duration <= 0:
+        return None
+    return base + duration * factor
+
+def default_threads(concurrency: int = FFMPEG_CONCURRENCY) -> int:
+    """Threads per ffmpeg job: de cores verdeeld over de gelijktijdige jobs"""
+    return max(1, (os.cpu_count() or 1) // max(1, concurrency))
+
+def build_ffmpeg_command(args: List[str], ffmpeg_path: Optional[str] = None,
+                         threads: Optional[int] = None) -> List[str]:
+    """
+    Volledig ffmpeg commando met voortgang op stdout
+
+    Args:
+        args: FFmpeg argumenten (inputs, opties en als laatste het output pad)
+        ffmpeg_path: Optioneel pad naar ffmpeg
+        threads: Optioneel aantal threads voor decoderen en encoderen
+
+    Returns:
+        Commando als lijst
+    """
+    args = list(args)
+    if threads:
+        # Voor de eerste input geldt het voor de decoder, voor het output pad voor de encoder
+        if "-i" in args:
+            position = args.index("-i")
+            args[position:position] = ["-threads", str(threads)]
+        args[-1:-1] = ["-threads", str(threads)]
+    return [ffmpeg_path or find_ffmpeg(), "-hide_banner", "-nostdin", "-nostats",
+            "-progress", "pipe:1"] + args
+
+def input_path(args: List[str]) -> Optional[str]:
+    """Pad van de eerste input (-i) in de argumenten"""
+    if "-i" in args:
+        position = args.index("-i")
+        if position + 1 < len(args):
+            return args[position + 1]
+    return None
+
+def parse_progress_line(line: str, state: Dict[str, Any]) -> bool:
+    """
+    Verwerk één regel van -progress in de voortgang
+
+    Args:
+        line: Regel "key=value"
+        state: Voortgang tot nu toe; krijgt out_time (seconden), speed en done
+
+    Returns:
+        True aan het einde van een blok (progress=continue of progress=end)
+    """
+    key, _, value = line.strip().partition("=")
+    value = value.strip()
+    if key in ("out_time_us", "out_time_ms"):
+        # Beide in microseconden; "N/A" zolang er nog niets geschreven is
+        if value.lstrip("-").isdigit():
+            state["out_time"] = max(int(value), 0) / 1_000_000
+    elif key == "speed":
+        try:
+            state["speed"] = float(value.rstrip("x"))
+        except ValueError:
+            pass
+    elif key == "progress":
+        state["done"] = value == "end"
+        return True
+    return False
+
+def _read_lines(stream, target: queue.Queue, name: str):
+    for line in iter(stream.readline, ""):
+        target.put((name, line))
+    target.put((name, None))
+
+class FFmpegRunner:
+    """
+    Voert ffmpeg jobs uit met een globale limiet op het aantal gelijktijdige processen
+
+    Args:
+        max_concurrent: Maximaal aantal gelijktijdige ffmpeg processen
+        ffmpeg_path: Optioneel pad naar ffmpeg
+    """
+
+    def __init__(self, max_concurrent: int = FFMPEG_CONCURRENCY, ffmpeg_path: Optional[str] = None):
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.ffmpeg_path = ffmpeg_path
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrent)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def run(self, args: List[str], duration: Optional[float] = None,
+            progress_callback: Optional[Callable[[float, str], None]] = None,
+            token: Optional[CancellationToken] = None, threads: Optional[int] = None,
+            timeout_factor: float = TIMEOUT_FACTOR_COPY, stall_timeout: float = STALL_TIMEOUT,
+            timeout: Optional[float] = None, ffmpeg_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Voer één ffmpeg job uit (wacht op een vrije plek onder de limiet)
+
+        Args:
+            args: FFmpeg argumenten zonder executable (laatste argument is het output pad)
+            duration: Mediaduur in seconden (standaard via de probe cache van de eerste input)
+            progress_callback: Optioneel, aangeroepen met (procent, bericht)
+            token: Optioneel CancellationToken; annuleren stopt ffmpeg
+            threads: Threads voor deze job (standaard default_threads())
+            timeout_factor: Seconden rekentijd per seconde media
+            stall_timeout: Maximale tijd zonder voortgang in seconden
+            timeout: Vaste timeout in seconden (overschrijft de geschaalde timeout)
+            ffmpeg_path: Optioneel pad naar ffmpeg voor deze job
+
+        Returns:
+            Dictionary met returncode, elapsed, out_time en speed (x realtime);
+            bij een fout ook error en stderr_tail
+
+        Raises:
+            CancelledError: Als het token geannuleerd werd
+            subprocess.TimeoutExpired: Bij overschrijden van de timeout of zonder voortgang
+        """
+        if token is not None:
+            token.raise_if_cancelled()
+        if duration is None and input_path(args):
+            try:
+                duration = get_media_duration(input_path(args))
+            except Exception:
+                duration = None
+        timeout = timeout or scaled_timeout(duration, timeout_factor)
+        cmd = build_ffmpeg_command(args, ffmpeg_path or self.ffmpeg_path,
+                                   threads or default_threads(self.max_concurrent))
+
+        with self._semaphore:
+            return self._run_process(cmd, duration, progress_callback, token, timeout, stall_timeout)
+
+    def _run_process(self, cmd: List[str], duration: Optional[float],
+                     progress_callback: Optional[Callable[[float, str], None]],
+                     token: Optional[CancellationToken], timeout: Optional[float],
+                     stall_timeout: float) -> Dict[str, Any]:
+        if token is not None:
+            token.raise_if_cancelled()
+        started = time.monotonic()
+        process = start_process(cmd, token, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, encoding="utf-8", errors="replace")
+        lines: queue.Queue = queue.Queue()
+        readers = [threading.Thread(target=_read_lines, args=(stream, lines, name), daemon=True)
+                   for stream, name in ((process.stdout, "stdout"), (process.stderr, "stderr"))]
+        for reader in readers:
+            reader.start()
+
+        stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+        state = {"out_time": 0.0, "speed": None, "done": False}
+        open_streams = 2
+        last_progress = started
+        try:
+            while open_streams:
+                try:
+                    name, line = lines.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    name, line = None, ""
+                now = time.monotonic()
+                if token is not None and token.cancelled:
+                    terminate_process(process)
+                    raise CancelledError()
+                if (timeout is not None and now - started > timeout) or now - last_progress > stall_timeout:
+                    process.kill()
+                    logger.error(f"FFmpeg timeout na {now - started:.0f}s: {' '.join(cmd)}")
+                    raise subprocess.TimeoutExpired(cmd, timeout or stall_timeout)
+                if line is None:
+                    open_streams -= 1
+                elif name == "stderr":
+                    stderr_tail.append(line.rstrip())
+                elif name == "stdout" and parse_progress_line(line, state):
+                    last_progress = now
+                    if progress_callback and duration:
+                        percent = min(100.0, 100.0 * state["out_time"] / duration)
+                        speed = f" ({state['speed']:.1f}x)" if state["speed"] else ""
+                        progress_callback(percent, f"FFmpeg {percent:.0f}%{speed}")
+            process.wait()
+        finally:
+            if token is not None:
+                token.unregister_process(process)
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        if token is not None and token.cancelled and process.returncode != 0:
+            raise CancelledError()
+
+        elapsed = time.monotonic() - started
+        result = {"returncode": process.returncode, "elapsed": elapsed, "out_time": state["out_time"],
+                  "speed": state["out_time"] / elapsed if elapsed > 0 else None}
+        if process.returncode != 0:
+            result["error"] = f"FFmpeg gefaald (code {process.returncode})"
+            result["stderr_tail"] = "\n".join(stderr_tail)
+            logger.error(f"{result['error']}: {' '.join(cmd)}\n{result['stderr_tail']}")
+        return result
+
+    def submit(self, args: List[str], **kwargs) -> Future:
+        """
+        Voer een job op de achtergrond uit (zelfde argumenten als run())
+
+        Returns:
+            Future met het resultaat van run()
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                                    thread_name_prefix="ffmpeg-runner")
+            return self._executor.submit(self.run, args, **kwargs)
+
+    def shutdown(self, wait: bool = True):
+        """Stop de achtergrond threads van submit()"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+_runner: Optional[FFmpegRunner] = None
+_runner_lock = threading.Lock()
+
+def get_ffmpeg_runner() -> FFmpegRunner:
+    """Gedeelde runner (limiet via MAGIC_TIME_FFMPEG_CONCURRENCY, standaard FFMPEG_CONCURRENCY)"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            try:
+                concurrency = int(os.environ.get("MAGIC_TIME_FFMPEG_CONCURRENCY", FFMPEG_CONCURRENCY))
+            except ValueError:
+                concurrency = FFMPEG_CONCURRENCY
+            _runner = FFmpegRunner(concurrency)
+        return _runner
+
+def run_ffmpeg(args: List[str], **kwargs) -> Dict[str, Any]:
+    """FFmpegRunner.run() via de gedeelde runner"""
+    return get_ffmpeg_runner().run(args, **kwargs)
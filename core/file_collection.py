@@ -0,0 +1,191 @@
+"""
+Bestandencollectie voor Magic Time Studio
+Geordende set van paden met O(1) lidmaatschap en een basename index
+"""
+
+import os
+from typing import Optional, Dict, List, Iterable, Iterator, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm')
+
+# Aantal paden per chunk bij het scannen van mappen
+SCAN_CHUNK_SIZE = 500
+
+def normalize_path(file_path: str) -> str:
+    """
+    Normaliseer een pad voor vergelijking (absoluut, case volgens OS)
+
+    Args:
+        file_path: Pad naar bestand
+
+    Returns:
+        Genormaliseerde sleutel
+    """
+    return os.path.normcase(os.path.abspath(file_path))
+
+class FileCollection:
+    """
+    Geordende collectie van bestandspaden
+
+    Paden staan in een dict op genormaliseerd pad (O(1) lidmaatschap en
+    duplicaat check) met een lijst voor de volgorde. Een secundaire index op
+    basename (exact, zonder extensie en lowercase) maakt zoeken op naam O(1).
+    """
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self._paths: List[str] = []
+        self._keys: Dict[str, str] = {}
+        self._by_name: Dict[str, List[str]] = {}
+        self.add_many(paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __contains__(self, file_path: str) -> bool:
+        return normalize_path(file_path) in self._keys
+
+    def __getitem__(self, index: int) -> str:
+        return self._paths[index]
+
+    def paths(self) -> List[str]:
+        """Kopie van alle paden in volgorde"""
+        return list(self._paths)
+
+    def _name_keys(self, file_path: str) -> Tuple[str, str, str]:
+        basename = os.path.basename(file_path)
+        return ("=" + basename, "~" + os.path.splitext(basename)[0], "i" + basename.lower())
+
+    def add(self, file_path: str) -> bool:
+        """
+        Voeg een pad toe als het nog niet in de collectie staat
+
+        Returns:
+            True als het pad is toegevoegd
+        """
+        key = normalize_path(file_path)
+        if key in self._keys:
+            return False
+        self._keys[key] = file_path
+        self._paths.append(file_path)
+        for name_key in self._name_keys(file_path):
+            self._by_name.setdefault(name_key, []).append(file_path)
+        return True
+
+    def add_many(self, paths: Iterable[str]) -> List[str]:
+        """
+        Voeg meerdere paden toe (duplicaten worden overgeslagen)
+
+        Returns:
+            Lijst van daadwerkelijk toegevoegde paden
+        """
+        return [file_path for file_path in paths if self.add(file_path)]
+
+    def remove(self, file_path: str) -> Optional[int]:
+        """
+        Verwijder een pad
+
+        Returns:
+            Oude rij index of None als het pad niet gevonden is
+        """
+        stored = self._keys.pop(normalize_path(file_path), None)
+        if stored is None:
+            return None
+        for name_key in self._name_keys(stored):
+            entries = self._by_name.get(name_key)
+            if entries:
+                entries.remove(stored)
+                if not entries:
+                    del self._by_name[name_key]
+        index = self._paths.index(stored)
+        del self._paths[index]
+        return index
+
+    def pop(self, index: int) -> str:
+        """Verwijder en retourneer het pad op rij index"""
+        file_path = self._paths[index]
+        self.remove(file_path)
+        return file_path
+
+    def clear(self):
+        """Wis de collectie"""
+        self._paths.clear()
+        self._keys.clear()
+        self._by_name.clear()
+
+    def index_of(self, file_path: str) -> int:
+        """Rij index van een pad (-1 als niet gevonden)"""
+        stored = self._keys.get(normalize_path(file_path))
+        return self._paths.index(stored) if stored is not None else -1
+
+    def find_by_basename(self, filename: str, fuzzy: bool = True) -> Optional[str]:
+        """
+        Zoek een pad op bestandsnaam via de basename index
+
+        Volgorde: exacte naam, naam zonder extensie, hoofdletterongevoelig.
+
+        Args:
+            filename: Bestandsnaam (zonder map)
+            fuzzy: Ook zonder extensie en hoofdletterongevoelig zoeken
+
+        Returns:
+            Eerste overeenkomend pad of None
+        """
+        exact_key, stem_key, lower_key = self._name_keys(filename)
+        for name_key in ((exact_key, stem_key, lower_key) if fuzzy else (exact_key,)):
+            entries = self._by_name.get(name_key)
+            if entries:
+                return entries[0]
+        return None
+
+def iter_scan_directory(folder: str, extensions: Iterable[str] = VIDEO_EXTENSIONS,
+                        chunk_size: int = SCAN_CHUNK_SIZE,
+                        should_stop=None) -> Iterator[List[str]]:
+    """
+    Scan een map recursief met os.scandir en lever paden in chunks
+
+    Args:
+        folder: Map om te scannen
+        extensions: Toegestane extensies (lowercase, met punt)
+        chunk_size: Aantal paden per chunk
+        should_stop: Optionele callable; scan stopt als deze True teruggeeft
+
+    Yields:
+        Lijsten van bestandspaden
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    chunk = []
+    stack = [folder]
+
+    while stack:
+        if should_stop and should_stop():
+            return
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirectories = []
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.path)
+                        elif entry.name.lower().endswith(extensions) and entry.is_file():
+                            chunk.append(entry.path)
+                            if len(chunk) >= chunk_size:
+                                yield chunk
+                                chunk = []
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Kan map niet lezen: {directory} ({e})")
+            continue
+
+        # Omgekeerd op de stack zodat submappen in alfabetische volgorde komen
+        stack.extend(sorted(subdirectories, reverse=True))
+
+    if chunk:
+        yield chunk
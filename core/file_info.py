@@ -103,7 +103,8 @@ def get_file_hash(file_path: str, algorithm: str = "md5") -> Optional[str]:
         hash_obj = hashlib.new(algorithm)
         
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            # Grote reads; voor duplicaat detectie zie duplicate_detector
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
                 hash_obj.update(chunk)
         
         return hash_obj.hexdigest()
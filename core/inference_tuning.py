@@ -0,0 +1,228 @@
+"""
+Inference tuning voor Magic Time Studio
+Kiest batch_size en compute_type per (model, device) via een korte benchmark en bewaart het resultaat
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Optional, Dict, List, Any, Callable, Iterable
+import logging
+
+from .media_probe import get_cache_dir
+from .atomic_io import write_file_atomic
+from .device_pool import split_device
+
+logger = logging.getLogger(__name__)
+
+TUNING_FILENAME = "inference_tuning.json"
+
+# Kandidaten per device (ctranslate2 compute types)
+CANDIDATE_COMPUTE_TYPES = {
+    "cuda": ("float16", "int8_float16", "int8"),
+    "cpu": ("int8", "float32"),
+}
+CANDIDATE_BATCH_SIZES = (4, 8, 16, 32)
+
+# Standaardwaarden zonder tuning resultaat
+DEFAULT_BATCH_SIZE = {"cuda": 16, "cpu": 8}
+
+# Waarde in de instellingen voor automatische keuze
+AUTO = "auto"
+
+def default_compute_type(device: str) -> str:
+    """Standaard compute type voor een device (float16 op GPU, int8 op CPU; "cuda:1" telt als GPU)"""
+    return "float16" if split_device(device)[0] == "cuda" else "int8"
+
+def default_inference_config(device: str) -> Dict[str, Any]:
+    """Standaard batch_size en compute_type zonder benchmark"""
+    return {
+        "compute_type": default_compute_type(device),
+        "batch_size": DEFAULT_BATCH_SIZE.get(split_device(device)[0], 8),
+        "source": "default",
+    }
+
+def select_best(measurements: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Kies de snelste geslaagde meting (bij gelijke snelheid het laagste geheugengebruik)
+
+    Args:
+        measurements: Dicts met compute_type, batch_size, throughput, peak_memory_mb en ok
+
+    Returns:
+        Beste meting of None
+    """
+    best = None
+    for measurement in measurements:
+        if not measurement.get("ok"):
+            continue
+        key = (round(measurement.get("throughput", 0.0), 3), -(measurement.get("peak_memory_mb") or 0.0))
+        if best is None or key > best[0]:
+            best = (key, measurement)
+    return best[1] if best else None
+
+def autotune(benchmark: Callable[[str, int], Dict[str, Any]], device: str,
+             compute_types: Optional[Iterable[str]] = None,
+             batch_sizes: Optional[Iterable[int]] = None,
+             memory_limit_mb: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Benchmark combinaties van compute_type en batch_size
+
+    Per compute type worden oplopende batch sizes geprobeerd; bij een fout
+    (bijv. out of memory) of boven memory_limit_mb worden grotere batch
+    sizes voor dat compute type overgeslagen.
+
+    Args:
+        benchmark: Callable(compute_type, batch_size) -> dict met audio_seconds,
+                   seconds en optioneel peak_memory_mb; een exception telt als mislukt
+        device: "cuda" of "cpu"
+        compute_types: Te proberen compute types (standaard per device)
+        batch_sizes: Te proberen batch sizes
+        memory_limit_mb: Optionele grens voor piekgeheugen (device geheugen volgens nvidia-smi;
+                         zonder meting wordt er niet op geheugen beperkt)
+
+    Returns:
+        Dictionary met compute_type, batch_size, throughput, peak_memory_mb en measurements
+    """
+    measurements: List[Dict[str, Any]] = []
+    for compute_type in compute_types or CANDIDATE_COMPUTE_TYPES.get(split_device(device)[0], ("int8",)):
+        for batch_size in sorted(batch_sizes or CANDIDATE_BATCH_SIZES):
+            measurement = {"compute_type": compute_type, "batch_size": batch_size, "ok": False,
+                           "throughput": 0.0, "peak_memory_mb": None}
+            try:
+                result = benchmark(compute_type, batch_size) or {}
+                seconds = max(float(result.get("seconds", 0.0)), 1e-6)
+                measurement["throughput"] = float(result.get("audio_seconds", 0.0)) / seconds
+                measurement["peak_memory_mb"] = result.get("peak_memory_mb")
+                measurement["ok"] = True
+            except Exception as e:
+                measurement["error"] = str(e)
+                logger.info(f"Benchmark {compute_type}/{batch_size} mislukt: {e}")
+            measurements.append(measurement)
+
+            over_limit = (memory_limit_mb and measurement["peak_memory_mb"]
+                          and measurement["peak_memory_mb"] > memory_limit_mb)
+            if over_limit:
+                measurement["ok"] = False
+            if not measurement["ok"]:
+                break
+
+    best = select_best(measurements)
+    if best is None:
+        result = default_inference_config(device)
+    else:
+        result = {"compute_type": best["compute_type"], "batch_size": best["batch_size"],
+                  "throughput": best["throughput"], "peak_memory_mb": best["peak_memory_mb"],
+                  "source": "tuned"}
+    result["measurements"] = measurements
+    result["tuned_at"] = time.time()
+    return result
+
+class TuningStore:
+    """Persistente tuning resultaten per (model, device) in een JSON bestand"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_cache_dir(), TUNING_FILENAME)
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @staticmethod
+    def _key(model_name: str, device: str) -> str:
+        return f"{model_name}|{device}"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._entries = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Kan tuning resultaten niet laden: {e}")
+        return self._entries
+
+    def get(self, model_name: str, device: str) -> Optional[Dict[str, Any]]:
+        """Bewaard resultaat voor (model, device) of None"""
+        with self._lock:
+            entry = self._load().get(self._key(model_name, device))
+            return dict(entry) if entry else None
+
+    def set(self, model_name: str, device: str, result: Dict[str, Any]) -> bool:
+        """Bewaar een resultaat (atomair weggeschreven)"""
+        with self._lock:
+            entries = self._load()
+            entries[self._key(model_name, device)] = dict(result)
+            content = json.dumps(entries, indent=2)
+        return write_file_atomic(self.path, content)
+
+    def clear(self, model_name: Optional[str] = None, device: Optional[str] = None) -> bool:
+        """Verwijder één resultaat of alles (om opnieuw te tunen)"""
+        with self._lock:
+            entries = self._load()
+            if model_name and device:
+                entries.pop(self._key(model_name, device), None)
+            else:
+                entries.clear()
+            content = json.dumps(entries, indent=2)
+        return write_file_atomic(self.path, content)
+
+def _manual_value(settings: Optional[Dict[str, Any]], key: str):
+    value = (settings or {}).get(key)
+    if value is None or str(value).strip().lower() in ("", AUTO):
+        return None
+    return value
+
+def resolve_inference_config(model_name: str, device: str,
+                             settings: Optional[Dict[str, Any]] = None,
+                             store: Optional[TuningStore] = None,
+                             benchmark: Optional[Callable[[str, int], Dict[str, Any]]] = None
+                             ) -> Dict[str, Any]:
+    """
+    Bepaal batch_size en compute_type voor een model op een device
+
+    Volgorde: handmatige instelling (whisper_batch_size / whisper_compute_type,
+    "auto" = automatisch), bewaard tuning resultaat, nieuwe benchmark (alleen
+    als benchmark is opgegeven en auto_tune_inference niet uit staat), standaard.
+
+    Args:
+        model_name: Whisper model naam
+        device: "cuda", "cuda:<index>" of "cpu"
+        settings: Instellingen uit de UI
+        store: TuningStore (standaard in de cache map)
+        benchmark: Optionele benchmark functie voor autotune
+
+    Returns:
+        Dictionary met compute_type, batch_size en source
+    """
+    settings = settings or {}
+    store = store or TuningStore()
+
+    config = store.get(model_name, device)
+    if config is None and split_device(device)[1] is not None:
+        config = store.get(model_name, split_device(device)[0])  # "cuda:1" zonder eigen meting: die van "cuda"
+    if config is None and benchmark is not None and settings.get("auto_tune_inference", True):
+        print(f"⏱️ Benchmark batch_size/compute_type voor {model_name} op {device}...")
+        config = autotune(benchmark, device, memory_limit_mb=settings.get("auto_tune_memory_limit_mb"))
+        if config.get("source") == "tuned":
+            store.set(model_name, device, config)
+            print(f"✅ Beste configuratie: {config['compute_type']}, batch_size {config['batch_size']} "
+                  f"({config['throughput']:.1f}x realtime)")
+    if config is None:
+        config = default_inference_config(device)
+
+    result = {"compute_type": config["compute_type"], "batch_size": int(config["batch_size"]),
+              "source": config.get("source", "default")}
+
+    manual_compute_type = _manual_value(settings, "whisper_compute_type")
+    manual_batch_size = _manual_value(settings, "whisper_batch_size")
+    if manual_compute_type:
+        result["compute_type"] = str(manual_compute_type).lower()
+        result["source"] = "manual"
+    if manual_batch_size:
+        try:
+            result["batch_size"] = max(1, int(manual_batch_size))
+            result["source"] = "manual"
+        except (TypeError, ValueError):
+            logger.warning(f"Ongeldige batch_size instelling: {manual_batch_size}")
+    return result
@@ -11,23 +11,28 @@ from logging.handlers import RotatingFileHandler
 def setup_logging():
     """Setup logging configuratie"""
     try:
-        # Maak logs directory
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
+        handlers = [logging.StreamHandler(sys.stdout)]
+        
+        # Tests en hun worker processen schrijven niet in logs/ van de repository
+        # (pytest laadt core al bij het verzamelen; de variabele erven kind processen)
+        if "pytest" in sys.modules:
+            os.environ["MAGIC_TIME_FILE_LOGGING"] = "0"
+        if os.environ.get("MAGIC_TIME_FILE_LOGGING", "1") != "0":
+            # Maak logs directory
+            log_dir = Path("logs")
+            log_dir.mkdir(exist_ok=True)
+            handlers.insert(0, RotatingFileHandler(
+                log_dir / "magic_time_studio.log",
+                maxBytes=10*1024*1024,  # 10MB
+                backupCount=5,
+                encoding='utf-8'  # UTF-8 encoding voor emoji support
+            ))
         
         # Configureer logging
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                RotatingFileHandler(
-                    log_dir / "magic_time_studio.log",
-                    maxBytes=10*1024*1024,  # 10MB
-                    backupCount=5,
-                    encoding='utf-8'  # UTF-8 encoding voor emoji support
-                ),
-                logging.StreamHandler(sys.stdout)
-            ]
+            handlers=handlers
         )
         
         print("✅ Logging geconfigureerd")
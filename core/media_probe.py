@@ -0,0 +1,394 @@
+"""
+Media probe service voor Magic Time Studio
+Eén ffprobe JSON aanroep per bestand met een persistente metadata cache
+"""
+
+import os
+import json
+import shutil
+import subprocess
+import threading
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, Iterable, Callable, Tuple
+import logging
+
+from .file_collection import normalize_path
+
+logger = logging.getLogger(__name__)
+
+# Standaard aantal gelijktijdige ffprobe processen
+PROBE_WORKERS = 4
+
+# Timeout per ffprobe aanroep in seconden
+PROBE_TIMEOUT = 30
+
+CACHE_FILENAME = "media_probe.json"
+
+def get_cache_dir() -> str:
+    """
+    Map voor persistente caches (MAGIC_TIME_CACHE_DIR of ~/.magic_time_studio/cache)
+
+    Returns:
+        Pad naar de cache map
+    """
+    return os.environ.get("MAGIC_TIME_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".magic_time_studio", "cache")
+
+def _find_executable(name: str) -> str:
+    for candidate in (os.path.join("assets", f"{name}.exe"), f"{name}.exe"):
+        if os.path.exists(candidate):
+            return os.path.abspath(candidate)
+    return shutil.which(name) or name
+
+def find_ffprobe() -> str:
+    """
+    Zoek de ffprobe executable (assets map eerst, dan PATH)
+
+    Returns:
+        Pad of commando naam
+    """
+    return _find_executable("ffprobe")
+
+def find_ffmpeg() -> str:
+    """
+    Zoek de ffmpeg executable (assets map eerst, dan PATH)
+
+    Returns:
+        Pad of commando naam
+    """
+    return _find_executable("ffmpeg")
+
+def file_signature(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Signatuur van een bestand voor cache validatie
+
+    Returns:
+        Tuple (grootte, mtime in ns) of None als het bestand niet bestaat
+    """
+    try:
+        stat = os.stat(file_path)
+        return (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        return None
+
+def _to_float(value) -> Optional[float]:
+    try:
+        result = float(value)
+        return result if result == result else None
+    except (TypeError, ValueError):
+        return None
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """Parse een ffprobe frame rate zoals '30000/1001'"""
+    if not rate:
+        return None
+    numerator, _, denominator = str(rate).partition("/")
+    num = _to_float(numerator)
+    den = _to_float(denominator) if denominator else 1.0
+    if not num or not den:
+        return None
+    return round(num / den, 3)
+
+def parse_probe_output(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Zet ffprobe JSON (-show_format -show_streams) om naar compacte metadata
+
+    Args:
+        data: Geparste ffprobe output
+
+    Returns:
+        Dictionary met duration, bit_rate, format_name, video en audio_streams
+    """
+    format_info = data.get("format") or {}
+    streams = data.get("streams") or []
+
+    duration = _to_float(format_info.get("duration"))
+    video = None
+    audio_streams = []
+    subtitle_streams = []
+
+    for stream in streams:
+        codec_type = stream.get("codec_type")
+        tags = stream.get("tags") or {}
+        if codec_type == "video" and video is None:
+            if (stream.get("disposition") or {}).get("attached_pic"):
+                continue
+            video = {
+                "index": stream.get("index"),
+                "codec": stream.get("codec_name"),
+                "width": _to_int(stream.get("width")),
+                "height": _to_int(stream.get("height")),
+                "fps": _parse_rate(stream.get("avg_frame_rate")) or _parse_rate(stream.get("r_frame_rate")),
+            }
+        elif codec_type == "audio":
+            audio_streams.append({
+                "index": stream.get("index"),
+                "codec": stream.get("codec_name"),
+                "channels": _to_int(stream.get("channels")),
+                "channel_layout": stream.get("channel_layout"),
+                "sample_rate": _to_int(stream.get("sample_rate")),
+                "bit_rate": _to_int(stream.get("bit_rate")),
+                "language": tags.get("language"),
+            })
+        elif codec_type == "subtitle":
+            subtitle_streams.append({
+                "index": stream.get("index"),
+                "codec": stream.get("codec_name"),
+                "language": tags.get("language"),
+            })
+
+        # Sommige containers hebben alleen duur op stream niveau
+        if duration is None:
+            duration = _to_float(stream.get("duration"))
+
+    return {
+        "duration": duration,
+        "bit_rate": _to_int(format_info.get("bit_rate")),
+        "format_name": format_info.get("format_name"),
+        "video": video,
+        "audio_streams": audio_streams,
+        "subtitle_streams": subtitle_streams,
+    }
+
+def run_ffprobe(file_path: str, ffprobe_path: Optional[str] = None,
+                timeout: int = PROBE_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """
+    Voer één ffprobe aanroep uit (format en streams als JSON)
+
+    Args:
+        file_path: Pad naar media bestand
+        ffprobe_path: Optioneel pad naar ffprobe
+        timeout: Timeout in seconden
+
+    Returns:
+        Geparste ffprobe JSON of None bij fout
+    """
+    cmd = [
+        ffprobe_path or find_ffprobe(), "-v", "quiet",
+        "-print_format", "json",
+        "-show_format", "-show_streams",
+        file_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0:
+            logger.error(f"FFprobe fout voor {file_path}: {result.stderr}")
+            return None
+        return json.loads(result.stdout)
+    except Exception as e:
+        logger.error(f"Fout bij ffprobe van {file_path}: {e}")
+        return None
+
+class MediaProbeCache:
+    """
+    Persistente metadata cache op (pad, grootte, mtime)
+
+    Entries staan in geheugen in een dict op genormaliseerd pad en worden als
+    één JSON bestand bewaard. Een gewijzigd bestand (andere grootte of mtime)
+    wordt automatisch opnieuw geprobed.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, ffprobe_path: Optional[str] = None,
+                 probe_func: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None):
+        self.cache_path = cache_path or os.path.join(get_cache_dir(), CACHE_FILENAME)
+        self.ffprobe_path = ffprobe_path
+        self._probe_func = probe_func
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._loaded = False
+        self.probe_count = 0
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if isinstance(entries, dict):
+                    self._entries = entries
+        except Exception as e:
+            logger.warning(f"Kan media cache niet laden: {e}")
+            self._entries = {}
+
+    def _probe(self, file_path: str) -> Optional[Dict[str, Any]]:
+        if self._probe_func is not None:
+            return self._probe_func(file_path)
+        data = run_ffprobe(file_path, self.ffprobe_path)
+        return parse_probe_output(data) if data is not None else None
+
+    def get_cached(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Metadata uit de cache zonder te proben
+
+        Returns:
+            Metadata dict of None als er geen geldige entry is
+        """
+        signature = file_signature(file_path)
+        if signature is None:
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(normalize_path(file_path))
+        if entry and (entry.get("size"), entry.get("mtime_ns")) == signature:
+            return entry.get("info")
+        return None
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Metadata van een bestand (uit cache of met één ffprobe aanroep)
+
+        Args:
+            file_path: Pad naar media bestand
+
+        Returns:
+            Metadata dict of None bij fout
+        """
+        info = self.get_cached(file_path)
+        if info is not None:
+            return info
+
+        signature = file_signature(file_path)
+        if signature is None:
+            logger.error(f"Media bestand bestaat niet: {file_path}")
+            return None
+
+        info = self._probe(file_path)
+        if info is None:
+            return None
+
+        with self._lock:
+            self.probe_count += 1
+            self._entries[normalize_path(file_path)] = {
+                "size": signature[0], "mtime_ns": signature[1], "info": info}
+            self._dirty = True
+        return info
+
+    def probe_many(self, paths: Iterable[str], max_workers: int = PROBE_WORKERS,
+                   progress_callback: Optional[Callable[[str, Optional[Dict[str, Any]]], None]] = None
+                   ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Probe meerdere bestanden gelijktijdig; alleen ontbrekende of gewijzigde
+        bestanden starten een ffprobe proces
+
+        Args:
+            paths: Paden naar media bestanden
+            max_workers: Maximaal aantal gelijktijdige ffprobe processen
+            progress_callback: Optioneel, aangeroepen per bestand met (pad, metadata)
+
+        Returns:
+            Dictionary pad -> metadata (None bij fout)
+        """
+        results = {}
+        pending = []
+        for file_path in dict.fromkeys(paths):
+            info = self.get_cached(file_path)
+            if info is not None:
+                results[file_path] = info
+                if progress_callback:
+                    progress_callback(file_path, info)
+            else:
+                pending.append(file_path)
+
+        if pending:
+            # ffprobe draait als eigen proces; threads wachten alleen op de output
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+                futures = {executor.submit(self.get, file_path): file_path for file_path in pending}
+                for future in as_completed(futures):
+                    file_path = futures[future]
+                    try:
+                        info = future.result()
+                    except Exception as e:
+                        logger.error(f"Fout bij proben van {file_path}: {e}")
+                        info = None
+                    results[file_path] = info
+                    if progress_callback:
+                        progress_callback(file_path, info)
+            self.save()
+
+        return results
+
+    def invalidate(self, file_path: str):
+        """Verwijder de entry van een bestand"""
+        with self._lock:
+            self._ensure_loaded()
+            if self._entries.pop(normalize_path(file_path), None) is not None:
+                self._dirty = True
+
+    def save(self) -> bool:
+        """
+        Schrijf de cache atomair weg (alleen als er wijzigingen zijn)
+
+        Returns:
+            True bij succes of als er niets te schrijven was
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            cache_dir = os.path.dirname(self.cache_path) or "."
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=".media_probe_", dir=cache_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.cache_path)
+            return True
+        except Exception as e:
+            logger.warning(f"Kan media cache niet opslaan: {e}")
+            with self._lock:
+                self._dirty = True
+            return False
+
+_default_cache: Optional[MediaProbeCache] = None
+_default_lock = threading.Lock()
+
+def get_probe_cache() -> MediaProbeCache:
+    """Gedeelde media probe cache"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = MediaProbeCache()
+        return _default_cache
+
+def get_media_info(file_path: str, save: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Metadata van een bestand via de gedeelde cache
+
+    Args:
+        file_path: Pad naar media bestand
+        save: Cache direct opslaan na een nieuwe probe
+
+    Returns:
+        Metadata dict of None bij fout
+    """
+    cache = get_probe_cache()
+    info = cache.get(file_path)
+    if save and info is not None:
+        cache.save()
+    return info
+
+def get_media_duration(file_path: str) -> Optional[float]:
+    """
+    Duur van een media bestand in seconden via de gedeelde cache
+
+    Returns:
+        Duur in seconden of None
+    """
+    info = get_media_info(file_path)
+    return info.get("duration") if info else None
+
+def probe_many(paths: Iterable[str], max_workers: int = PROBE_WORKERS,
+               progress_callback=None) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Probe meerdere bestanden gelijktijdig via de gedeelde cache (zie MediaProbeCache.probe_many)"""
+    return get_probe_cache().probe_many(paths, max_workers, progress_callback)
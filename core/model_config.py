@@ -0,0 +1,192 @@
+"""
+Model configuratie voor Magic Time Studio
+Canonieke, hashbare sleutel voor geladen WhisperX modellen en herlaad metrics
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# UI namen en WhisperX namen naar WhisperX VAD methode
+VAD_METHOD_MAP = {
+    "Silero (snel)": "silero",
+    "Pyannote (nauwkeurig)": "pyannote",
+    "Energie-gebaseerd": "auditok",
+    "silero": "silero",
+    "pyannote": "pyannote",
+    "auditok": "auditok",
+}
+
+DEFAULT_VAD_METHOD = "pyannote"
+
+# Standaard VAD instellingen (zelfde waarden als de instellingen panelen)
+DEFAULT_VAD_SETTINGS = {
+    "vad_enabled": True,
+    "vad_method": "Pyannote (nauwkeurig)",
+    "vad_threshold": 0.5,
+    "vad_onset": 0.5,
+    "vad_chunk_size": 30,
+    "vad_min_speech": 0.5,
+    "vad_min_silence": 0.5,
+}
+
+# VAD opties als VAD uit staat (WhisperX heeft altijd een VAD nodig)
+FALLBACK_VAD_METHOD = "silero"
+FALLBACK_VAD_OPTIONS = (("chunk_size", 30), ("vad_offset", 0.5), ("vad_onset", 0.5))
+
+def build_vad_settings(settings: Optional[Dict[str, Any]],
+                       whisperx_method: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Bouw het VAD instellingen dict uit de verwerking instellingen
+
+    Eén plek voor de defaults, zodat alle aanroepers dezelfde sleutels en
+    waarden doorgeven.
+
+    Args:
+        settings: Instellingen uit de UI (mag None zijn)
+        whisperx_method: Optioneel vaste WhisperX VAD methode
+
+    Returns:
+        Dictionary met VAD instellingen
+    """
+    settings = settings or {}
+    vad_settings = {key: settings.get(key, default) for key, default in DEFAULT_VAD_SETTINGS.items()}
+    method = whisperx_method or settings.get("vad_method_whisperx")
+    if method:
+        vad_settings["vad_method_whisperx"] = method
+    if "vad_offset" in settings:
+        vad_settings["vad_offset"] = settings["vad_offset"]
+    return vad_settings
+
+def resolve_vad_method(vad_settings: Optional[Dict[str, Any]]) -> str:
+    """WhisperX VAD methode uit de instellingen (expliciete WhisperX naam gaat voor)"""
+    vad_settings = vad_settings or {}
+    method = vad_settings.get("vad_method_whisperx") or vad_settings.get("vad_method")
+    return VAD_METHOD_MAP.get(method, DEFAULT_VAD_METHOD)
+
+def _to_float(value, default: float) -> float:
+    try:
+        return round(float(value), 3)
+    except (TypeError, ValueError):
+        return default
+
+def _to_int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def normalize_vad_options(vad_settings: Optional[Dict[str, Any]]) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Genormaliseerde WhisperX vad_options als gesorteerde tuple
+
+    Floats worden afgerond zodat 0.5 en 0.5000001 dezelfde sleutel geven.
+    Zonder eigen offset wordt de onset gebruikt.
+
+    Args:
+        vad_settings: VAD instellingen dict
+
+    Returns:
+        Tuple van (optie, waarde) paren, gesorteerd op naam
+    """
+    vad_settings = vad_settings or {}
+    onset = _to_float(vad_settings.get("vad_onset", 0.5), 0.5)
+    options = {
+        "chunk_size": _to_int(vad_settings.get("vad_chunk_size", 30), 30),
+        "vad_onset": onset,
+        "vad_offset": _to_float(vad_settings.get("vad_offset", onset), onset),
+    }
+    min_speech = _to_float(vad_settings.get("vad_min_speech"), 0.0)
+    if min_speech:
+        options["min_speech_duration_ms"] = int(round(min_speech * 1000))
+    min_silence = _to_float(vad_settings.get("vad_min_silence"), 0.0)
+    if min_silence:
+        options["min_silence_duration_ms"] = int(round(min_silence * 1000))
+    return tuple(sorted(options.items()))
+
+@dataclass(frozen=True)
+class ModelConfig:
+    """Alles wat bepaalt welk WhisperX model geladen moet zijn (bruikbaar als dict sleutel)"""
+    model_name: str
+    device: str
+    compute_type: str
+    vad_method: str
+    vad_options: Tuple[Tuple[str, Any], ...]
+
+    @classmethod
+    def from_settings(cls, model_name: str, vad_settings: Optional[Dict[str, Any]],
+                      device: str, compute_type: str) -> "ModelConfig":
+        """
+        Maak een ModelConfig uit model naam en VAD instellingen
+
+        Args:
+            model_name: Whisper model naam
+            vad_settings: VAD instellingen dict (None of uitgeschakeld geeft de fallback VAD)
+            device: "cuda" of "cpu"
+            compute_type: Gewenst compute type (half precision wordt op CPU int8)
+
+        Returns:
+            ModelConfig
+        """
+        if device == "cpu" and compute_type in ("float16", "int8_float16"):
+            # Half precision bestaat niet op CPU
+            compute_type = "int8"
+        if vad_settings and vad_settings.get("vad_enabled", True):
+            vad_method = resolve_vad_method(vad_settings)
+            vad_options = normalize_vad_options(vad_settings)
+        else:
+            vad_method = FALLBACK_VAD_METHOD
+            vad_options = FALLBACK_VAD_OPTIONS
+        return cls(model_name, device, compute_type, vad_method, vad_options)
+
+    def vad_options_dict(self) -> Dict[str, Any]:
+        """vad_options als dict voor whisperx.load_model"""
+        return dict(self.vad_options)
+
+    def describe(self) -> str:
+        """Korte beschrijving voor logging"""
+        return f"{self.model_name} op {self.device} ({self.compute_type}, VAD {self.vad_method})"
+
+class ModelReloadMetrics:
+    """Telt geladen modellen en vermeden herladingen (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.avoided_reloads = 0
+        self.last_config: Optional[ModelConfig] = None
+
+    def record_load(self, config: ModelConfig):
+        """Registreer een echte model load"""
+        with self._lock:
+            self.loads += 1
+            self.last_config = config
+
+    def record_avoided(self, config: Optional[ModelConfig] = None):
+        """Registreer een herlading die niet nodig was"""
+        with self._lock:
+            self.avoided_reloads += 1
+            if config is not None:
+                self.last_config = config
+
+    def reset(self):
+        """Zet de tellers terug naar nul"""
+        with self._lock:
+            self.loads = 0
+            self.avoided_reloads = 0
+            self.last_config = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Overzicht voor logging en statistieken"""
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "avoided_reloads": self.avoided_reloads,
+                "current": self.last_config.describe() if self.last_config else None,
+            }
+
+# Globale metrics voor alle model managers
+reload_metrics = ModelReloadMetrics()
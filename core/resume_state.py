@@ -0,0 +1,99 @@
+"""
+Hervatbare voortgang voor Magic Time Studio
+Bewaart per bestand de resultaten van afgeronde chunks zodat een gestopte verwerking verder kan
+"""
+
+import os
+import json
+import hashlib
+from typing import Optional, Dict, List, Any
+import logging
+
+from .media_probe import get_cache_dir, file_signature
+from .atomic_io import write_file_atomic
+
+logger = logging.getLogger(__name__)
+
+RESUME_DIRNAME = "resume"
+
+def get_resume_dir() -> str:
+    """Map voor hervat bestanden in de cache map"""
+    return os.path.join(get_cache_dir(), RESUME_DIRNAME)
+
+def resume_key(file_path: str, *parts: Any) -> Optional[str]:
+    """
+    Sleutel voor een bestand plus de instellingen die het resultaat bepalen
+
+    Verandert als het bestand (grootte of mtime) of een van de delen verandert.
+
+    Returns:
+        Hex sleutel of None als het bestand niet bestaat
+    """
+    signature = file_signature(file_path)
+    if signature is None:
+        return None
+    text = "|".join([os.path.abspath(file_path), str(signature[0]), str(signature[1])] + [str(part) for part in parts])
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+class ChunkCheckpoint:
+    """
+    Resultaten van afgeronde chunks voor één bestand
+
+    Na elke chunk wordt het bestand atomair herschreven; bij hervatten
+    begint de verwerking bij de eerste niet afgeronde chunk.
+    """
+
+    def __init__(self, key: str, resume_dir: Optional[str] = None):
+        self.key = key
+        self.path = os.path.join(resume_dir or get_resume_dir(), f"{key}.json")
+        self.completed = 0
+        self.segments: List[Dict[str, Any]] = []
+        self.language: Optional[str] = None
+        self.boundaries: List[int] = []
+
+    def load(self) -> bool:
+        """
+        Laad eerder bewaarde voortgang
+
+        Returns:
+            True als er voortgang gevonden is
+        """
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.completed = int(data.get("completed", 0))
+            self.segments = list(data.get("segments", []))
+            self.language = data.get("language")
+            self.boundaries = list(data.get("boundaries", []))
+            return self.completed > 0
+        except Exception as e:
+            logger.warning(f"Kan hervat bestand niet laden {self.path}: {e}")
+            return False
+
+    def add_chunk(self, segments: List[Dict[str, Any]], language: Optional[str] = None) -> bool:
+        """Registreer een afgeronde chunk en schrijf de voortgang weg"""
+        self.segments.extend(segments)
+        self.completed += 1
+        if language and not self.language:
+            self.language = language
+        return self.save()
+
+    def save(self) -> bool:
+        """Schrijf de voortgang atomair weg"""
+        content = json.dumps({
+            "completed": self.completed,
+            "segments": self.segments,
+            "language": self.language,
+            "boundaries": self.boundaries,
+        }, ensure_ascii=False)
+        return write_file_atomic(self.path, content)
+
+    def clear(self):
+        """Verwijder de voortgang (na een volledig afgeronde verwerking)"""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError as e:
+            logger.warning(f"Kan hervat bestand niet verwijderen {self.path}: {e}")
@@ -0,0 +1,60 @@
+"""
+Ring buffer voor Magic Time Studio
+Vaste grootte met lopende min/max, gebruikt door de real-time grafieken
+"""
+
+from collections import deque
+
+
+class RingBuffer:
+    """
+    Ring buffer met vaste grootte en lopende min/max
+
+    Min en max worden bijgehouden met monotone deques, zodat toevoegen en
+    opvragen amortized O(1) zijn in plaats van O(n) per sample.
+    """
+
+    __slots__ = ("maxlen", "values", "_count", "_min", "_max")
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.values = deque(maxlen=maxlen)
+        self._count = 0
+        self._min = deque()  # (index, waarde), oplopend
+        self._max = deque()  # (index, waarde), aflopend
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def append(self, value: float):
+        """Voeg waarde toe (oudste waarde valt weg als de buffer vol is)"""
+        index = self._count
+        self._count += 1
+        self.values.append(value)
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((index, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((index, value))
+
+        oldest = self._count - self.maxlen
+        if self._min[0][0] < oldest:
+            self._min.popleft()
+        if self._max[0][0] < oldest:
+            self._max.popleft()
+
+    def min(self) -> float:
+        return self._min[0][1]
+
+    def max(self) -> float:
+        return self._max[0][1]
+
+    def last(self) -> float:
+        return self.values[-1]
+
+    def clear(self):
+        self.values.clear()
+        self._min.clear()
+        self._max.clear()
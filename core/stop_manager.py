@@ -1,6 +1,10 @@
 """
 Stop Manager voor Magic Time Studio
 Beheert het stoppen van processen en opruimen van temp bestanden
+
+Alleen eigen subprocessen worden gestopt: processen die via
+core.cancellation gestart zijn en kinderen van het huidige proces.
+Andere processen op het systeem (ook andere Python processen) blijven ongemoeid.
 """
 
 import os
@@ -12,6 +16,8 @@ import time
 import threading
 from typing import List, Optional
 
+from .cancellation import terminate_children
+
 # Lazy import om circulaire import te voorkomen
 _config_manager = None
 
@@ -51,43 +57,29 @@ class StopManager:
         self.main_window = window
     
     def stop_all_processes(self):
-        """Stop alle processen en ruim temp bestanden op binnen 5 seconden"""
-        print("🛑 StopManager: Stop alle processen binnen 5 seconden...")
+        """Stop de verwerking en eigen subprocessen en ruim temp bestanden op"""
+        print("🛑 StopManager: Stop verwerking en eigen subprocessen...")
         start_time = time.time()
         
-        # Stop processing thread eerst
+        # Stop processing thread eerst; het cancellation token stopt binnen één chunk
+        # en beëindigt de subprocessen die de thread zelf gestart heeft
         if self.processing_thread and hasattr(self.processing_thread, 'isRunning') and self.processing_thread.isRunning():
             print("🛑 Stop processing thread...")
             try:
                 self.processing_thread.stop()
-                # Wacht maximaal 0.5 seconde voor processing thread (verlaagd van 1s)
                 if hasattr(self.processing_thread, 'wait'):
-                    self.processing_thread.wait(500)
+                    self.processing_thread.wait(self._stop_timeout * 1000)
                 print("✅ Processing thread gestopt")
             except Exception as e:
                 print(f"⚠️ Fout bij stoppen processing thread: {e}")
         
-        # Stop alle processen parallel voor snellere stop
-        stop_threads = []
-        
-        # Stop Whisper processen in aparte thread
-        whisper_thread = threading.Thread(target=self._stop_whisper_processes, daemon=True)
-        whisper_thread.start()
-        stop_threads.append(whisper_thread)
-        
-        # Stop LibreTranslate processen in aparte thread
-        libretranslate_thread = threading.Thread(target=self._stop_libretranslate_processes, daemon=True)
-        libretranslate_thread.start()
-        stop_threads.append(libretranslate_thread)
-        
-        # Stop FFmpeg processen in aparte thread
-        ffmpeg_thread = threading.Thread(target=self._stop_ffmpeg_processes, daemon=True)
-        ffmpeg_thread.start()
-        stop_threads.append(ffmpeg_thread)
-        
-        # Wacht tot alle stop threads klaar zijn (max 0.5 seconde, verlaagd van 1s)
-        for thread in stop_threads:
-            thread.join(timeout=0.5)
+        # Eigen subprocessen die nog draaien
+        stopped = terminate_children()
+        if stopped:
+            print(f"🛑 {stopped} eigen subproces(sen) gestopt")
+        self._stop_whisper_processes()
+        self._stop_libretranslate_processes()
+        self._stop_ffmpeg_processes()
         
         # Ruim temp bestanden op
         cleanup_thread = threading.Thread(target=self._cleanup_temp_files, daemon=True)
@@ -107,110 +99,39 @@ class StopManager:
         elapsed_time = time.time() - start_time
         print(f"✅ StopManager: Alle processen gestopt en temp bestanden opgeruimd in {elapsed_time:.1f}s")
         
-        # Als er nog steeds processen draaien, forceer stop (verlaagd van 2s naar 1s)
+        # Als er nog eigen subprocessen draaien, forceer stop
         if elapsed_time > 1.0:
-            print("⚠️ StopManager: Stop duurde te lang, forceer stop van resterende processen...")
+            print("⚠️ StopManager: Stop duurde te lang, forceer stop van resterende subprocessen...")
             self.force_kill_processes()
-        
-        # Forceer stop van alle Python processen die nog draaien
-        try:
-            import psutil
-            current_process = psutil.Process()
-            children = current_process.children(recursive=True)
-            for child in children:
-                try:
-                    cmdline = " ".join(child.cmdline()).lower()
-                    if any(keyword in cmdline for keyword in ["ffmpeg", "whisper", "python", "faster-whisper"]):
-                        print(f"💀 Forceer stop van subproces: {child.pid} - {cmdline[:50]}")
-                        child.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-        except Exception as e:
-            print(f"⚠️ Fout bij forceer stop van subprocessen: {e}")
-        
-        # Forceer stop van alle processen met relevante keywords
-        try:
-            import psutil
-            keywords = ["whisper", "faster-whisper", "ffmpeg", "libretranslate", "translate", "python"]
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = proc.info.get('cmdline', [])
-                    cmdline_str = " ".join(cmdline).lower()
-                    
-                    if any(keyword in cmdline_str for keyword in keywords):
-                        print(f"💀 Forceer stop van proces: {proc.info['pid']} - {proc.info['name']}")
-                        proc.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-        except Exception as e:
-            print(f"⚠️ Fout bij forceer stop van processen: {e}")
     
     def emergency_cuda_stop(self):
         """Noodstop voor CUDA/GPU processen - gebruik alleen als laatste redmiddel"""
         try:
-            print("🚨 EMERGENCY CUDA STOP - Forceer stop van alle GPU processen...")
+            print("🚨 EMERGENCY CUDA STOP - Forceer stop van eigen GPU processen...")
             
             # Stop alle CUDA context
             self._stop_cuda_context()
             
             # Forceer GPU reset via nvidia-smi
             try:
-                import subprocess
-                
-                # Windows
-                if os.name == 'nt':
-                    try:
-                        # Forceer GPU reset
-                        result = subprocess.run([
-                            'nvidia-smi', '--gpu-reset', '--force'
-                        ], capture_output=True, text=True, timeout=10)
-                        
-                        if result.returncode == 0:
-                            print("✅ GPU emergency reset succesvol")
-                        else:
-                            print(f"⚠️ GPU emergency reset gefaald: {result.stderr}")
-                            
-                    except FileNotFoundError:
-                        print("⚠️ nvidia-smi niet gevonden")
-                    except subprocess.TimeoutExpired:
-                        print("⚠️ GPU emergency reset timeout")
+                result = subprocess.run([
+                    'nvidia-smi', '--gpu-reset', '--force'
+                ], capture_output=True, text=True, timeout=10)
                 
-                # Linux/Mac
+                if result.returncode == 0:
+                    print("✅ GPU emergency reset succesvol")
                 else:
-                    try:
-                        # Forceer GPU reset
-                        result = subprocess.run([
-                            'nvidia-smi', '--gpu-reset', '--force'
-                        ], capture_output=True, text=True, timeout=10)
-                        
-                        if result.returncode == 0:
-                            print("✅ GPU emergency reset succesvol")
-                        else:
-                            print(f"⚠️ GPU emergency reset gefaald: {result.stderr}")
-                            
-                    except FileNotFoundError:
-                        print("⚠️ nvidia-smi niet gevonden")
-                    except subprocess.TimeoutExpired:
-                        print("⚠️ GPU emergency reset timeout")
-                        
+                    print(f"⚠️ GPU emergency reset gefaald: {result.stderr}")
+                    
+            except FileNotFoundError:
+                print("⚠️ nvidia-smi niet gevonden")
+            except subprocess.TimeoutExpired:
+                print("⚠️ GPU emergency reset timeout")
             except Exception as e:
                 print(f"⚠️ Fout bij GPU emergency reset: {e}")
             
-            # Forceer stop van alle GPU processen
-            self._force_kill_gpu_processes()
-            
-            # Als laatste redmiddel: forceer stop van alle Python processen
-            try:
-                import psutil
-                for proc in psutil.process_iter(['pid', 'name']):
-                    try:
-                        if proc.info['name'] == 'python.exe' or proc.info['name'] == 'python':
-                            print(f"💀 Emergency stop Python proces: {proc.info['pid']}")
-                            proc.kill()
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-            except Exception as e:
-                print(f"⚠️ Fout bij emergency Python stop: {e}")
+            # Forceer stop van alle eigen subprocessen
+            self.force_kill_processes()
             
             print("🚨 Emergency CUDA stop voltooid")
             
@@ -250,69 +171,55 @@ class StopManager:
             print(f"⚠️ Fout bij ophalen GPU status: {e}")
     
     def force_kill_processes(self):
-        """Forceer het stoppen van alle processen"""
-        print("💀 Forceer stop van alle processen...")
+        """Forceer het stoppen van alle eigen subprocessen"""
+        print("💀 Forceer stop van eigen subprocessen...")
+        terminate_children()
+        for child in self._own_children():
+            try:
+                print(f"💀 Forceer stop van subproces: {child.pid} - {' '.join(child.cmdline()[:3])}")
+                child.kill()
+            except Exception:
+                pass  # Proces bestaat niet meer of geen toegang
+    
+    def _own_children(self, keywords: Optional[List[str]] = None) -> list:
+        """
+        Kinderen van het huidige proces (recursief), optioneel gefilterd op keywords
+        
+        Args:
+            keywords: Optionele keywords die in de command line moeten voorkomen
         
+        Returns:
+            Lijst van psutil.Process objecten (leeg zonder psutil)
+        """
         try:
             import psutil
-            current_process = psutil.Process()
-            
-            # Zoek naar alle child processen
-            children = current_process.children(recursive=True)
-            for child in children:
-                try:
-                    cmdline = child.cmdline()
-                    print(f"💀 Forceer stop van proces: {child.pid} - {' '.join(cmdline[:3])}")
-                    child.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-            
-            # Zoek ook naar processen met relevante keywords
-            keywords = ["whisper", "faster-whisper", "ffmpeg", "libretranslate", "translate", "python"]
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = proc.info.get('cmdline', [])
-                    cmdline_str = " ".join(cmdline).lower()
-                    
-                    if any(keyword in cmdline_str for keyword in keywords):
-                        print(f"💀 Forceer stop van proces: {proc.info['pid']} - {proc.info['name']}")
-                        proc.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-                    
+        except ImportError:
+            return []
+        try:
+            children = psutil.Process().children(recursive=True)
         except Exception as e:
-            print(f"⚠️ Kon processen niet forceer stoppen: {e}")
+            print(f"⚠️ Kon subprocessen niet opvragen: {e}")
+            return []
+        if not keywords:
+            return children
+        matching = []
+        for child in children:
+            try:
+                cmdline_str = " ".join(child.cmdline()).lower()
+            except Exception:
+                continue  # Proces bestaat niet meer of geen toegang
+            if any(keyword in cmdline_str for keyword in keywords):
+                matching.append(child)
+        return matching
     
     def _stop_whisper_processes(self):
-        """Stop alle Whisper processen die mogelijk vastlopen - inclusief CUDA/GPU processen"""
+        """Stop eigen Whisper subprocessen en geef CUDA geheugen vrij"""
         try:
-            print("🛑 StopManager: Stop alle Whisper processen (inclusief CUDA/GPU)...")
+            print("🛑 StopManager: Stop eigen Whisper processen...")
             
-            # Stop CUDA context eerst om GPU processen te bevrijden
+            # Geef CUDA geheugen vrij
             self._stop_cuda_context()
-            
-            # Zoek naar Python processen die Whisper gebruiken
-            try:
-                import psutil
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                    try:
-                        cmdline = proc.info['cmdline']
-                        if cmdline and any('whisper' in arg.lower() for arg in cmdline):
-                            print(f"🛑 StopManager: Stop Whisper proces {proc.info['pid']}")
-                            proc.terminate()
-                            proc.wait(timeout=2)  # Verlaagd van 5s naar 2s
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
-                        pass
-            except ImportError:
-                print("🛑 StopManager: psutil niet beschikbaar, gebruik alternatieve methode")
-                # Alternatieve methode zonder psutil
-                try:
-                    if os.name == 'nt':  # Windows
-                        os.system('taskkill /f /im python.exe 2>nul')
-                    else:  # Linux/Mac
-                        os.system('pkill -f whisper 2>/dev/null')
-                except:
-                    pass
+            self._stop_subprocesses_by_keywords(["whisper"])
             
             print("✅ StopManager: Whisper processen gestopt")
             
@@ -364,200 +271,49 @@ class StopManager:
             except Exception as e:
                 print(f"⚠️ StopManager: Fout bij TensorFlow stop: {e}")
             
-            # Forceer CUDA processen te stoppen via nvidia-smi (als beschikbaar)
-            self._force_stop_cuda_processes()
-            
         except Exception as e:
             print(f"⚠️ StopManager: Fout bij stoppen CUDA context: {e}")
     
-    def _force_stop_cuda_processes(self):
-        """Forceer stop van CUDA/GPU processen via nvidia-smi"""
-        try:
-            print("🛑 StopManager: Forceer stop van CUDA/GPU processen...")
-            
-            # Probeer nvidia-smi te gebruiken om GPU processen te stoppen
-            try:
-                import subprocess
-                
-                # Windows: gebruik nvidia-smi
-                if os.name == 'nt':
-                    # Zoek naar nvidia-smi in PATH
-                    try:
-                        # Stop alle processen op alle GPU's
-                        result = subprocess.run([
-                            'nvidia-smi', '--gpu-reset'
-                        ], capture_output=True, text=True, timeout=5)
-                        
-                        if result.returncode == 0:
-                            print("✅ GPU reset succesvol uitgevoerd")
-                        else:
-                            print(f"⚠️ GPU reset gefaald: {result.stderr}")
-                            
-                    except FileNotFoundError:
-                        print("⚠️ nvidia-smi niet gevonden in PATH")
-                    except subprocess.TimeoutExpired:
-                        print("⚠️ GPU reset timeout, forceer stop...")
-                        # Forceer stop van alle Python processen die GPU gebruiken
-                        self._force_kill_gpu_processes()
-                
-                # Linux/Mac: gebruik nvidia-smi
-                else:
-                    try:
-                        # Stop alle processen op alle GPU's
-                        result = subprocess.run([
-                            'nvidia-smi', '--gpu-reset'
-                        ], capture_output=True, text=True, timeout=5)
-                        
-                        if result.returncode == 0:
-                            print("✅ GPU reset succesvol uitgevoerd")
-                        else:
-                            print(f"⚠️ GPU reset gefaald: {result.stderr}")
-                            
-                    except FileNotFoundError:
-                        print("⚠️ nvidia-smi niet gevonden in PATH")
-                    except subprocess.TimeoutExpired:
-                        print("⚠️ GPU reset timeout, forceer stop...")
-                        # Forceer stop van alle Python processen die GPU gebruiken
-                        self._force_kill_gpu_processes()
-                        
-            except Exception as e:
-                print(f"⚠️ Fout bij nvidia-smi: {e}")
-                # Fallback: forceer stop van GPU processen
-                self._force_kill_gpu_processes()
-                
-        except Exception as e:
-            print(f"⚠️ StopManager: Fout bij forceer stop CUDA processen: {e}")
-    
-    def _force_kill_gpu_processes(self):
-        """Forceer stop van alle processen die GPU gebruiken"""
-        try:
-            print("💀 StopManager: Forceer stop van GPU processen...")
-            
-            import psutil
-            
-            # Zoek naar processen die GPU gebruiken
-            gpu_keywords = [
-                "cuda", "gpu", "nvidia", "whisper", "faster-whisper", 
-                "torch", "tensorflow", "tensorrt", "cudnn"
-            ]
-            
-            killed_count = 0
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = proc.info.get('cmdline', [])
-                    cmdline_str = " ".join(cmdline).lower()
-                    
-                    # Check of proces GPU keywords bevat
-                    if any(keyword in cmdline_str for keyword in gpu_keywords):
-                        print(f"💀 Forceer stop GPU proces: {proc.info['pid']} - {proc.info['name']}")
-                        proc.kill()
-                        killed_count += 1
-                        
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-            
-            print(f"✅ {killed_count} GPU processen geforceerd gestopt")
-            
-        except Exception as e:
-            print(f"⚠️ StopManager: Fout bij forceer stop GPU processen: {e}")
-    
     def force_stop_whisper(self):
-        """Forceer stop van alle Whisper processen"""
+        """Forceer stop van eigen Whisper subprocessen"""
         try:
-            print("🛑 StopManager: Forceer stop van alle Whisper processen...")
-            
-            # Gebruik agressievere methode
-            try:
-                import psutil
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                    try:
-                        cmdline = proc.info['cmdline']
-                        if cmdline and any('whisper' in arg.lower() for arg in cmdline):
-                            print(f"🛑 StopManager: Forceer stop Whisper proces {proc.info['pid']}")
-                            proc.kill()
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        pass
-            except ImportError:
-                # Alternatieve methode
-                if os.name == 'nt':  # Windows
-                    os.system('taskkill /f /im python.exe /f 2>nul')
-                else:  # Linux/Mac
-                    os.system('pkill -9 -f whisper 2>/dev/null')
-            
-            print("✅ StopManager: Alle Whisper processen geforceerd gestopt")
-            
+            print("🛑 StopManager: Forceer stop van eigen Whisper processen...")
+            self._force_stop_processes_by_keywords(["whisper"])
+            print("✅ StopManager: Whisper processen geforceerd gestopt")
         except Exception as e:
             print(f"⚠️ StopManager: Fout bij geforceerd stoppen: {e}")
     
     def _stop_libretranslate_processes(self):
-        """Stop LibreTranslate processen"""
-        try:
-            import requests
-            # Probeer LibreTranslate te stoppen als het draait
-            config_mgr = _get_config_manager()
-            translator_url = config_mgr.get_env("LIBRETRANSLATE_SERVER", "") if config_mgr else ""
-            if translator_url:
-                try:
-                    response = requests.get(f"http://{translator_url}/health", timeout=1)
-                    if response.status_code == 200:
-                        print("🛑 LibreTranslate is actief, maar kan niet gestopt worden via API")
-                except:
-                    pass  # LibreTranslate draait niet of is niet bereikbaar
-        except Exception as e:
-            print(f"⚠️ Kon LibreTranslate status niet controleren: {e}")
-        
-        # Stop LibreTranslate subprocessen
-        self._stop_subprocesses_by_keywords(["libretranslate", "translate"])
-        self._force_stop_processes_by_keywords(["libretranslate", "translate"])
+        """Stop eigen LibreTranslate subprocessen (een externe server blijft draaien)"""
+        self._stop_subprocesses_by_keywords(["libretranslate"])
     
     def _stop_ffmpeg_processes(self):
-        """Stop FFmpeg processen"""
+        """Stop eigen FFmpeg subprocessen"""
         self._stop_subprocesses_by_keywords(["ffmpeg"])
-        self._force_stop_processes_by_keywords(["ffmpeg"])
     
     def _stop_subprocesses_by_keywords(self, keywords: List[str]):
-        """Stop subprocessen op basis van keywords in command line"""
-        try:
-            import psutil
-            current_process = psutil.Process()
-            
-            # Zoek naar child processen van de huidige applicatie
-            children = current_process.children(recursive=True)
-            for child in children:
+        """Stop eigen subprocessen op basis van keywords in command line"""
+        for child in self._own_children(keywords):
+            try:
+                import psutil
+                print(f"🛑 Stop subproces: {child.pid} - {' '.join(child.cmdline()[:3])}")
+                child.terminate()
                 try:
-                    # Controleer of het een relevant proces is
-                    cmdline = child.cmdline()
-                    cmdline_str = " ".join(cmdline).lower()
-                    
-                    if any(keyword in cmdline_str for keyword in keywords):
-                        print(f"🛑 Stop subproces: {child.pid} - {' '.join(cmdline[:3])}")
-                        child.terminate()
-                        try:
-                            child.wait(timeout=1)  # Wacht 1 seconde
-                        except psutil.TimeoutExpired:
-                            print(f"⚠️ Forceer stop van proces {child.pid}")
-                            child.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass  # Proces bestaat niet meer of geen toegang
-        except Exception as e:
-            print(f"⚠️ Kon subprocessen niet stoppen: {e}")
+                    child.wait(timeout=1)  # Wacht 1 seconde
+                except psutil.TimeoutExpired:
+                    print(f"⚠️ Forceer stop van proces {child.pid}")
+                    child.kill()
+            except Exception:
+                pass  # Proces bestaat niet meer of geen toegang
     
     def _force_stop_processes_by_keywords(self, keywords: List[str]):
-        """Forceer stop van processen op basis van keywords"""
-        try:
-            import psutil
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = proc.info.get('cmdline', [])
-                    cmdline_str = " ".join(cmdline).lower()
-                    
-                    if any(keyword in cmdline_str for keyword in keywords):
-                        print(f"💀 Forceer stop van proces: {proc.info['pid']} - {proc.info['name']}")
-                        proc.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-        except Exception as e:
-            print(f"⚠️ Kon processen niet forceer stoppen: {e}")
+        """Forceer stop van eigen subprocessen op basis van keywords"""
+        for child in self._own_children(keywords):
+            try:
+                print(f"💀 Forceer stop van subproces: {child.pid}")
+                child.kill()
+            except Exception:
+                pass  # Proces bestaat niet meer of geen toegang
     
     def _cleanup_temp_files(self):
         """Ruim alle temp bestanden op"""
@@ -8,6 +8,14 @@ import re
 from typing import Optional, Dict, List, Any, Tuple
 import logging
 
+from .subtitle_writers import (
+    seconds_to_ms,
+    format_timestamp_ms,
+    write_subtitle_file,
+    escape_ass_text as _escape_ass_text
+)
+from .subtitle_index import CueIndex, load_cue_index
+
 logger = logging.getLogger(__name__)
 
 def create_srt_content(transcriptions: List[Dict[str, Any]], 
@@ -55,19 +63,8 @@ def create_srt_content(transcriptions: List[Dict[str, Any]],
             except Exception as e:
                 logger.warning(f"WhisperX SRT functies gefaald: {e}, gebruik standaard SRT generatie")
         
-        # Standaard SRT generatie als fallback
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for i, segment in enumerate(transcriptions, 1):
-                start_time = format_timestamp(segment.get("start", 0))
-                end_time = format_timestamp(segment.get("end", 0))
-                text = segment.get("text", "").strip()
-                
-                if not text:  # Skip lege segmenten
-                    continue
-                
-                f.write(f"{i}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{text}\n\n")
+        # Standaard SRT generatie als fallback (streaming writer)
+        write_subtitle_file(transcriptions, output_path, "srt")
         
         logger.info(f"Standaard SRT bestand aangemaakt: {output_path}")
         return True
@@ -93,24 +90,8 @@ def create_vtt_content(transcriptions: List[Dict[str, Any]],
             logger.error("Geen transcripties om te verwerken")
             return False
         
-        # Maak output directory als deze niet bestaat
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("WEBVTT\n\n")
-            
-            for i, segment in enumerate(transcriptions, 1):
-                start_time = format_vtt_timestamp(segment.get("start", 0))
-                end_time = format_vtt_timestamp(segment.get("end", 0))
-                text = segment.get("text", "").strip()
-                
-                if not text:  # Skip lege segmenten
-                    continue
-                
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{text}\n\n")
+        # Streaming writer maakt de output directory zelf aan
+        write_subtitle_file(transcriptions, output_path, "vtt")
         
         logger.info(f"VTT bestand aangemaakt: {output_path}")
         return True
@@ -140,39 +121,14 @@ def create_whisperx_srt_content(transcriptions: List[Dict[str, Any]],
             logger.error("Geen transcripties om te verwerken")
             return False
         
-        # Maak output directory als deze niet bestaat
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        
-        # Implementeer WhisperX SRT generatie direct om circulaire import te voorkomen
-        srt_content = ""
-        
-        for i, segment in enumerate(transcriptions, 1):
-            # Converteer seconden naar SRT timestamp formaat
-            start_time = format_timestamp(segment.get("start", 0))
-            end_time = format_timestamp(segment.get("end", 0))
-            
-            # Gebruik word-level timing als beschikbaar voor betere accuracy
-            if word_alignments and segment.get("words"):
-                words = segment["words"]
-                if words:
-                    # Gebruik eerste woord start en laatste woord end voor betere segmentatie
-                    segment_start = words[0].get("start", segment.get("start", 0))
-                    segment_end = words[-1].get("end", segment.get("end", 0))
-                    start_time = format_timestamp(segment_start)
-                    end_time = format_timestamp(segment_end)
-            
-            text = segment.get("text", "").strip()
-            if not text:  # Skip lege segmenten
-                continue
-            
-            # Voeg segment toe aan SRT
-            srt_content += f"{i}\n{start_time} --> {end_time}\n{text}\n\n"
-        
-        # Schrijf naar bestand
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(srt_content)
+        # Schrijf direct naar bestand - word-level timing (eerste woord start,
+        # laatste woord end) als alignments beschikbaar zijn
+        write_subtitle_file(
+            transcriptions, 
+            output_path, 
+            "srt", 
+            use_word_timing=bool(word_alignments)
+        )
         
         logger.info(f"WhisperX SRT bestand aangemaakt: {output_path}")
         return True
@@ -199,74 +155,8 @@ def create_ass_content(transcriptions: List[Dict[str, Any]],
             logger.error("Geen transcripties om te verwerken")
             return False
         
-        # Maak output directory als deze niet bestaat
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        
-        # Standaard stijl configuratie
-        default_style = {
-            "name": "Default",
-            "fontname": "Arial",
-            "fontsize": "20",
-            "primary_colour": "&H00FFFFFF",
-            "secondary_colour": "&H000000FF",
-            "outline_colour": "&H00000000",
-            "back_colour": "&H80000000",
-            "bold": "0",
-            "italic": "0",
-            "underline": "0",
-            "strikeout": "0",
-            "scale_x": "100",
-            "scale_y": "100",
-            "spacing": "0",
-            "angle": "0",
-            "border_style": "1",
-            "outline": "2",
-            "shadow": "2",
-            "alignment": "2",
-            "margin_l": "10",
-            "margin_r": "10",
-            "margin_v": "10"
-        }
-        
-        if style_config:
-            default_style.update(style_config)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # ASS header
-            f.write("[Script Info]\n")
-            f.write("Title: Magic Time Studio Generated Subtitles\n")
-            f.write("ScriptType: v4.00+\n")
-            f.write("WrapStyle: 0\n")
-            f.write("ScaledBorderAndShadow: yes\n")
-            f.write("YCbCr Matrix: TV.601\n\n")
-            
-            # Stijlen sectie
-            f.write("[V4+ Styles]\n")
-            f.write("Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n")
-            
-            style_line = f"Style: {default_style['name']}, {default_style['fontname']}, {default_style['fontsize']}, {default_style['primary_colour']}, {default_style['secondary_colour']}, {default_style['outline_colour']}, {default_style['back_colour']}, {default_style['bold']}, {default_style['italic']}, {default_style['underline']}, {default_style['strikeout']}, {default_style['scale_x']}, {default_style['scale_y']}, {default_style['spacing']}, {default_style['angle']}, {default_style['border_style']}, {default_style['outline']}, {default_style['shadow']}, {default_style['alignment']}, {default_style['margin_l']}, {default_style['margin_r']}, {default_style['margin_v']}, 1\n"
-            f.write(style_line)
-            f.write("\n")
-            
-            # Events sectie
-            f.write("[Events]\n")
-            f.write("Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n")
-            
-            for segment in transcriptions:
-                start_time = format_ass_timestamp(segment.get("start", 0))
-                end_time = format_ass_timestamp(segment.get("end", 0))
-                text = segment.get("text", "").strip()
-                
-                if not text:  # Skip lege segmenten
-                    continue
-                
-                # Escape speciale karakters voor ASS
-                text = escape_ass_text(text)
-                
-                event_line = f"Dialogue: 0, {start_time}, {end_time}, {default_style['name']}, , 0, 0, 0, , {text}\n"
-                f.write(event_line)
+        # Standaard stijl wordt in de ASS writer aangevuld met style_config
+        write_subtitle_file(transcriptions, output_path, "ass", style_config=style_config)
         
         logger.info(f"ASS bestand aangemaakt: {output_path}")
         return True
@@ -286,13 +176,7 @@ def format_timestamp(seconds: float) -> str:
         Geformatteerde timestamp string (HH:MM:SS,mmm)
     """
     try:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        milliseconds = int((secs % 1) * 1000)
-        secs = int(secs)
-        
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+        return format_timestamp_ms(seconds_to_ms(seconds), "srt")
     except Exception as e:
         logger.error(f"Fout bij formatteren timestamp: {e}")
         return "00:00:00,000"
@@ -308,13 +192,7 @@ def format_vtt_timestamp(seconds: float) -> str:
         Geformatteerde timestamp string (HH:MM:SS.mmm)
     """
     try:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        milliseconds = int((secs % 1) * 1000)
-        secs = int(secs)
-        
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{milliseconds:03d}"
+        return format_timestamp_ms(seconds_to_ms(seconds), "vtt")
     except Exception as e:
         logger.error(f"Fout bij formatteren VTT timestamp: {e}")
         return "00:00:00.000"
@@ -330,13 +208,7 @@ def format_ass_timestamp(seconds: float) -> str:
         Geformatteerde timestamp string (H:MM:SS.cc)
     """
     try:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        centiseconds = int((secs % 1) * 100)
-        secs = int(secs)
-        
-        return f"{hours}:{minutes:02d}:{secs:02d}.{centiseconds:02d}"
+        return format_timestamp_ms(seconds_to_ms(seconds), "ass")
     except Exception as e:
         logger.error(f"Fout bij formatteren ASS timestamp: {e}")
         return "0:00:00.00"
@@ -351,19 +223,7 @@ def escape_ass_text(text: str) -> str:
     Returns:
         Geëscapte tekst
     """
-    # ASS speciale karakters
-    replacements = {
-        "\\": "\\\\",
-        "{": "\\{",
-        "}": "\\}",
-        "\n": "\\N",
-        "\r": "\\N"
-    }
-    
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-    
-    return text
+    return _escape_ass_text(text)
 
 def merge_subtitle_files(subtitle_files: List[str], output_path: str, 
                         format_type: str = "srt") -> bool:
@@ -383,41 +243,26 @@ def merge_subtitle_files(subtitle_files: List[str], output_path: str,
             logger.error("Geen ondertitel bestanden om samen te voegen")
             return False
         
-        all_transcriptions = []
-        current_time_offset = 0.0
+        if format_type not in ("srt", "vtt", "ass"):
+            logger.error(f"Onbekend ondertitel formaat: {format_type}")
+            return False
         
+        # Lees alle bestanden als kolomsgewijze cue index
+        indexes = []
         for subtitle_file in subtitle_files:
             if not os.path.exists(subtitle_file):
                 logger.warning(f"Ondertitel bestand bestaat niet: {subtitle_file}")
                 continue
             
-            # Lees ondertitel bestand
-            transcriptions = read_subtitle_file(subtitle_file, format_type)
-            if not transcriptions:
-                continue
-            
-            # Pas tijd offset toe
-            for segment in transcriptions:
-                segment["start"] += current_time_offset
-                segment["end"] += current_time_offset
-            
-            all_transcriptions.extend(transcriptions)
-            
-            # Bereken volgende tijd offset
-            if transcriptions:
-                max_end_time = max(segment["end"] for segment in transcriptions)
-                current_time_offset = max_end_time
-        
-        # Sla samengevoegde ondertitels op
-        if format_type == "srt":
-            return create_srt_content(all_transcriptions, output_path)
-        elif format_type == "vtt":
-            return create_vtt_content(all_transcriptions, output_path)
-        elif format_type == "ass":
-            return create_ass_content(all_transcriptions, output_path)
-        else:
-            logger.error(f"Onbekend ondertitel formaat: {format_type}")
-            return False
+            index = load_cue_index(subtitle_file, format_type)
+            if index is not None and len(index):
+                indexes.append(index)
+        
+        # Elk bestand start na de laatste eindtijd van het vorige (gehele ms)
+        merged = CueIndex.merge(indexes, sequential=True)
+        merged.write(output_path, format_type)
+        logger.info(f"{len(merged)} cues samengevoegd naar {output_path}")
+        return True
         
     except Exception as e:
         logger.error(f"Fout bij samenvoegen ondertitel bestanden: {e}")
@@ -451,7 +296,7 @@ def read_subtitle_file(file_path: str, format_type: str) -> Optional[List[Dict[s
 
 def read_srt_file(file_path: str) -> Optional[List[Dict[str, Any]]]:
     """
-    Lees een SRT ondertitel bestand
+    Lees een SRT ondertitel bestand (één regex pass via CueIndex)
     
     Args:
         file_path: Pad naar het SRT bestand
@@ -459,44 +304,8 @@ def read_srt_file(file_path: str) -> Optional[List[Dict[str, Any]]]:
     Returns:
         Lijst van transcriptie segmenten of None bij fout
     """
-    try:
-        transcriptions = []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Split op dubbele newlines om segmenten te scheiden
-        segments = content.strip().split('\n\n')
-        
-        for segment in segments:
-            lines = segment.strip().split('\n')
-            if len(lines) < 3:
-                continue
-            
-            try:
-                # Parse timestamp regel
-                timestamp_line = lines[1]
-                start_time, end_time = parse_srt_timestamp(timestamp_line)
-                
-                # Haal tekst op
-                text = '\n'.join(lines[2:]).strip()
-                
-                if start_time is not None and end_time is not None and text:
-                    transcriptions.append({
-                        "start": start_time,
-                        "end": end_time,
-                        "text": text
-                    })
-                    
-            except Exception as e:
-                logger.warning(f"Fout bij parsen SRT segment: {e}")
-                continue
-        
-        return transcriptions
-        
-    except Exception as e:
-        logger.error(f"Fout bij lezen SRT bestand: {e}")
-        return None
+    index = load_cue_index(file_path, "srt")
+    return index.to_segments() if index is not None else None
 
 def parse_srt_timestamp(timestamp_line: str) -> Tuple[Optional[float], Optional[float]]:
     """
@@ -560,7 +369,7 @@ def parse_timestamp_to_seconds(timestamp: str) -> Optional[float]:
 
 def read_vtt_file(file_path: str) -> Optional[List[Dict[str, Any]]]:
     """
-    Lees een WebVTT ondertitel bestand
+    Lees een WebVTT ondertitel bestand (één regex pass via CueIndex)
     
     Args:
         file_path: Pad naar het VTT bestand
@@ -568,53 +377,8 @@ def read_vtt_file(file_path: str) -> Optional[List[Dict[str, Any]]]:
     Returns:
         Lijst van transcriptie segmenten of None bij fout
     """
-    try:
-        transcriptions = []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Skip header regels
-        i = 0
-        while i < len(lines) and not lines[i].strip().startswith('-->'):
-            i += 1
-        
-        # Parse segmenten
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            if '-->' in line:
-                try:
-                    # Parse timestamp regel
-                    start_time, end_time = parse_vtt_timestamp(line)
-                    
-                    # Haal tekst op
-                    text_lines = []
-                    i += 1
-                    while i < len(lines) and lines[i].strip() and not '-->' in lines[i]:
-                        text_lines.append(lines[i].strip())
-                        i += 1
-                    
-                    text = ' '.join(text_lines).strip()
-                    
-                    if start_time is not None and end_time is not None and text:
-                        transcriptions.append({
-                            "start": start_time,
-                            "end": end_time,
-                            "text": text
-                        })
-                        
-                except Exception as e:
-                    logger.warning(f"Fout bij parsen VTT segment: {e}")
-                    i += 1
-            else:
-                i += 1
-        
-        return transcriptions
-        
-    except Exception as e:
-        logger.error(f"Fout bij lezen VTT bestand: {e}")
-        return None
+    index = load_cue_index(file_path, "vtt")
+    return index.to_segments() if index is not None else None
 
 def parse_vtt_timestamp(timestamp_line: str) -> Tuple[Optional[float], Optional[float]]:
     """
@@ -646,7 +410,7 @@ def parse_vtt_timestamp(timestamp_line: str) -> Tuple[Optional[float], Optional[
 
 def read_ass_file(file_path: str) -> Optional[List[Dict[str, Any]]]:
     """
-    Lees een ASS/SSA ondertitel bestand
+    Lees een ASS/SSA ondertitel bestand (één regex pass via CueIndex)
     
     Args:
         file_path: Pad naar het ASS bestand
@@ -654,63 +418,8 @@ def read_ass_file(file_path: str) -> Optional[List[Dict[str, Any]]]:
     Returns:
         Lijst van transcriptie segmenten of None bij fout
     """
-    try:
-        transcriptions = []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        # Zoek naar Events sectie
-        events_start = -1
-        for i, line in enumerate(lines):
-            if line.strip() == '[Events]':
-                events_start = i
-                break
-        
-        if events_start == -1:
-            logger.error("Events sectie niet gevonden in ASS bestand")
-            return None
-        
-        # Skip format regel
-        i = events_start + 2
-        
-        # Parse events
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            if line.startswith('[') or not line:
-                break
-            
-            if line.startswith('Dialogue:'):
-                try:
-                    # Parse dialogue regel
-                    parts = line.split(',', 9)  # Split op eerste 9 komma's
-                    if len(parts) >= 10:
-                        start_time_str = parts[1].strip()
-                        end_time_str = parts[2].strip()
-                        text = parts[9].strip()
-                        
-                        # Parse timestamps
-                        start_time = parse_ass_timestamp(start_time_str)
-                        end_time = parse_ass_timestamp(end_time_str)
-                        
-                        if start_time is not None and end_time is not None and text:
-                            transcriptions.append({
-                                "start": start_time,
-                                "end": end_time,
-                                "text": text
-                            })
-                            
-                except Exception as e:
-                    logger.warning(f"Fout bij parsen ASS event: {e}")
-            
-            i += 1
-        
-        return transcriptions
-        
-    except Exception as e:
-        logger.error(f"Fout bij lezen ASS bestand: {e}")
-        return None
+    index = load_cue_index(file_path, "ass")
+    return index.to_segments() if index is not None else None
 
 def is_whisperx_srt_available() -> bool:
     """
@@ -0,0 +1,352 @@
+"""
+Ondertitel parser en cue index voor Magic Time Studio
+Leest SRT, VTT en ASS bestanden in één pass en slaat cues kolomsgewijs op
+"""
+
+import os
+import re
+from array import array
+from bisect import bisect_right
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple
+import logging
+
+from .subtitle_writers import create_writer, open_subtitle_file
+
+logger = logging.getLogger(__name__)
+
+# Eén gecompileerde multi-line regex per formaat, toegepast op de hele inhoud
+_TIMESTAMP = r"(?:(\d+):)?(\d{1,2}):(\d{2})[,.](\d{1,3})"
+
+_SRT_VTT_CUE_RE = re.compile(
+    r"^[ \t]*" + _TIMESTAMP + r"[ \t]*-->[ \t]*" + _TIMESTAMP + r"[^\n]*\n"
+    r"((?:[^\n]*\S[^\n]*(?:\n|$))*)",
+    re.MULTILINE
+)
+
+_ASS_DIALOGUE_RE = re.compile(
+    r"^Dialogue:[^,\n]*,[ \t]*(\d+):(\d{2}):(\d{2})\.(\d{1,2})[ \t]*,"
+    r"[ \t]*(\d+):(\d{2}):(\d{2})\.(\d{1,2})[ \t]*,"
+    r"(?:[^,\n]*,){6}([^\n]*)$",
+    re.MULTILINE
+)
+
+_EXTENSION_FORMATS = {
+    ".srt": "srt",
+    ".vtt": "vtt",
+    ".ass": "ass",
+    ".ssa": "ass",
+}
+
+def _timestamp_ms(hours: Optional[str], minutes: str, seconds: str, fraction: str) -> int:
+    """Converteer regex groepen naar milliseconden (fractie wordt rechts aangevuld)"""
+    ms = int(fraction.ljust(3, "0")[:3])
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + ms
+
+def detect_subtitle_format(file_path: str) -> Optional[str]:
+    """
+    Bepaal ondertitel formaat op basis van de extensie
+
+    Args:
+        file_path: Pad naar het ondertitel bestand
+
+    Returns:
+        srt, vtt, ass of None als onbekend
+    """
+    return _EXTENSION_FORMATS.get(os.path.splitext(file_path)[1].lower())
+
+class CueIndex:
+    """
+    Kolomsgewijze opslag van ondertitel cues
+
+    Start- en eindtijden staan als gehele milliseconden in array('q') kolommen,
+    alle teksten in één string buffer met offsets. Cues zijn gesorteerd op
+    starttijd; met een max-segmentboom over de eindtijden wordt de actieve cue
+    op tijdstip t in O(log n) gevonden, ook als lange cues andere overlappen.
+    Een tijdverschuiving wordt als offset bewaard (O(1)) en pas bij samenvoegen
+    of schrijven toegepast.
+    """
+
+    def __init__(self, starts: array = None, ends: array = None,
+                 text_offsets: array = None, text_buffer: str = "", offset_ms: int = 0):
+        self.starts = starts if starts is not None else array('q')
+        self.ends = ends if ends is not None else array('q')
+        self.text_offsets = text_offsets if text_offsets is not None else array('q', [0])
+        self.text_buffer = text_buffer
+        self.offset_ms = offset_ms
+        self._end_tree = None  # Lazy max-segmentboom over eindtijden voor overlappende cues
+
+    @classmethod
+    def from_cues(cls, cues: Iterable[Tuple[int, int, str]]) -> "CueIndex":
+        """
+        Bouw een index uit (start_ms, end_ms, tekst) tuples
+
+        Args:
+            cues: Iterable van cues
+
+        Returns:
+            CueIndex instantie
+        """
+        starts = array('q')
+        ends = array('q')
+        texts = []
+        for start_ms, end_ms, text in cues:
+            starts.append(start_ms)
+            ends.append(end_ms)
+            texts.append(text)
+
+        # Sorteer alleen als de cues niet al op volgorde staan
+        if any(starts[i] > starts[i + 1] for i in range(len(starts) - 1)):
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            starts = array('q', (starts[i] for i in order))
+            ends = array('q', (ends[i] for i in order))
+            texts = [texts[i] for i in order]
+
+        text_offsets = array('q', [0])
+        position = 0
+        for text in texts:
+            position += len(text)
+            text_offsets.append(position)
+
+        return cls(starts, ends, text_offsets, "".join(texts))
+
+    @classmethod
+    def parse(cls, content: str, format_type: str) -> "CueIndex":
+        """
+        Parse ondertitel inhoud in één pass
+
+        Args:
+            content: Volledige inhoud van het bestand
+            format_type: srt, vtt of ass
+
+        Returns:
+            CueIndex instantie
+        """
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+
+        if format_type in ("srt", "vtt"):
+            # SRT behoudt regelovergangen, VTT voegt tekstregels samen (zoals voorheen)
+            joiner = "\n" if format_type == "srt" else " "
+            cues = []
+            for match in _SRT_VTT_CUE_RE.finditer(content):
+                groups = match.groups()
+                lines = [line.strip() for line in groups[8].split("\n") if line.strip()]
+                if not lines:
+                    continue
+                cues.append((_timestamp_ms(*groups[0:4]), _timestamp_ms(*groups[4:8]), joiner.join(lines)))
+            return cls.from_cues(cues)
+
+        if format_type == "ass":
+            cues = []
+            for match in _ASS_DIALOGUE_RE.finditer(content):
+                groups = match.groups()
+                text = groups[8].strip()
+                if not text:
+                    continue
+                start_ms = _timestamp_ms(groups[0], groups[1], groups[2], groups[3].ljust(2, "0") + "0")
+                end_ms = _timestamp_ms(groups[4], groups[5], groups[6], groups[7].ljust(2, "0") + "0")
+                cues.append((start_ms, end_ms, text))
+            return cls.from_cues(cues)
+
+        raise ValueError(f"Onbekend ondertitel formaat: {format_type}")
+
+    @classmethod
+    def from_file(cls, file_path: str, format_type: Optional[str] = None) -> "CueIndex":
+        """
+        Lees een ondertitel bestand in één keer en bouw de index
+
+        Args:
+            file_path: Pad naar het ondertitel bestand
+            format_type: srt, vtt of ass (optioneel, anders op basis van extensie)
+
+        Returns:
+            CueIndex instantie
+        """
+        format_type = format_type or detect_subtitle_format(file_path)
+        if not format_type:
+            raise ValueError(f"Onbekend ondertitel formaat: {file_path}")
+        with open(file_path, 'r', encoding='utf-8-sig') as f:
+            content = f.read()
+        return cls.parse(content, format_type)
+
+    @classmethod
+    def merge(cls, indexes: List["CueIndex"], sequential: bool = True) -> "CueIndex":
+        """
+        Voeg meerdere indexen samen tot één index
+
+        Args:
+            indexes: Lijst van CueIndex instanties
+            sequential: Plaats elke index na het einde van de vorige
+                (zoals merge_subtitle_files), anders alleen de eigen offsets
+
+        Returns:
+            Nieuwe samengevoegde CueIndex
+        """
+        starts = array('q')
+        ends = array('q')
+        text_offsets = array('q', [0])
+        buffers = []
+        buffer_length = 0
+        time_offset = 0
+
+        for index in indexes:
+            if not len(index):
+                continue
+            shift = index.offset_ms + (time_offset if sequential else 0)
+            starts.extend(map(shift.__add__, index.starts))
+            ends.extend(map(shift.__add__, index.ends))
+            text_offsets.extend(map(buffer_length.__add__, index.text_offsets[1:]))
+            buffers.append(index.text_buffer)
+            buffer_length += len(index.text_buffer)
+            if sequential:
+                time_offset = max(time_offset, max(index.ends) + shift)
+
+        merged = cls(starts, ends, text_offsets, "".join(buffers))
+        if not sequential:
+            # Onafhankelijke tijdlijnen kunnen door elkaar lopen - sorteer opnieuw
+            merged = cls.from_cues(merged.iter_cues())
+        return merged
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def shift(self, offset_ms: int) -> "CueIndex":
+        """Verschuif alle cues in O(1) (offset wordt bij gebruik toegepast)"""
+        self.offset_ms += offset_ms
+        return self
+
+    def text(self, i: int) -> str:
+        """Tekst van cue i"""
+        return self.text_buffer[self.text_offsets[i]:self.text_offsets[i + 1]]
+
+    def cue(self, i: int) -> Tuple[int, int, str]:
+        """Cue i als (start_ms, end_ms, tekst) met offset toegepast"""
+        return self.starts[i] + self.offset_ms, self.ends[i] + self.offset_ms, self.text(i)
+
+    def iter_cues(self) -> Iterator[Tuple[int, int, str]]:
+        """Itereer over alle cues als (start_ms, end_ms, tekst)"""
+        for i in range(len(self.starts)):
+            yield self.cue(i)
+
+    @property
+    def end_ms(self) -> int:
+        """Laatste eindtijd in milliseconden (0 als leeg)"""
+        return max(self.ends) + self.offset_ms if len(self.ends) else 0
+
+    def find_cue_at(self, time_ms: int) -> int:
+        """
+        Zoek de cue die actief is op tijdstip time_ms
+
+        Args:
+            time_ms: Tijdstip in milliseconden
+
+        Returns:
+            Index van de actieve cue of -1
+        """
+        local_ms = time_ms - self.offset_ms
+        i = bisect_right(self.starts, local_ms) - 1
+        if i < 0:
+            return -1
+
+        tree = self._end_tree
+        if tree is None or len(tree) != 2 * self._tree_size(len(self.ends)):
+            tree = self._build_end_tree()
+        size = len(tree) // 2
+
+        # Laatste cue in [0, i] die na local_ms eindigt (ook een eerdere, langere cue):
+        # verzamel de knopen die [0, i] dekken, doorloop ze van rechts naar links
+        # en daal af in de eerste knoop met een eindtijd na local_ms
+        left, right = size, size + i + 1
+        left_nodes, right_nodes = [], []
+        while left < right:
+            if left & 1:
+                left_nodes.append(left)
+                left += 1
+            if right & 1:
+                right -= 1
+                right_nodes.append(right)
+            left >>= 1
+            right >>= 1
+        for node in right_nodes + left_nodes[::-1]:
+            if tree[node] > local_ms:
+                while node < size:
+                    node = 2 * node + 1 if tree[2 * node + 1] > local_ms else 2 * node
+                return node - size
+        return -1
+
+    @staticmethod
+    def _tree_size(count: int) -> int:
+        size = 1
+        while size < count:
+            size *= 2
+        return size
+
+    def _build_end_tree(self) -> array:
+        """Max-segmentboom over de eindtijden (bladeren vanaf index size)"""
+        size = self._tree_size(len(self.ends))
+        tree = array('q', [-1]) * (2 * size)
+        tree[size:size + len(self.ends)] = self.ends
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._end_tree = tree
+        return tree
+
+    def cue_at(self, seconds: float) -> Optional[Dict[str, Any]]:
+        """
+        Haal de actieve cue op tijdstip seconds op als segment dict
+
+        Args:
+            seconds: Tijdstip in seconden
+
+        Returns:
+            Segment dict of None als er geen cue actief is
+        """
+        i = self.find_cue_at(int(round(seconds * 1000)))
+        if i < 0:
+            return None
+        start_ms, end_ms, text = self.cue(i)
+        return {"start": start_ms / 1000, "end": end_ms / 1000, "text": text}
+
+    def to_segments(self) -> List[Dict[str, Any]]:
+        """Converteer naar de klassieke lijst van segment dicts (in seconden)"""
+        return [
+            {"start": start_ms / 1000, "end": end_ms / 1000, "text": text}
+            for start_ms, end_ms, text in self.iter_cues()
+        ]
+
+    def write(self, output_path: str, format_type: str = "srt",
+              style_config: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Schrijf de index direct (zonder tussenliggende dicts) naar een bestand
+
+        Args:
+            output_path: Pad naar het output bestand
+            format_type: srt, vtt of ass
+            style_config: ASS stijl configuratie (optioneel)
+
+        Returns:
+            Aantal geschreven cues
+        """
+        with open_subtitle_file(output_path) as f:
+            writer = create_writer(f, format_type, style_config)
+            writer.write_header()
+            for start_ms, end_ms, text in self.iter_cues():
+                writer.write_cue(start_ms, end_ms, text)
+            return writer.cue_count
+
+def load_cue_index(file_path: str, format_type: Optional[str] = None) -> Optional[CueIndex]:
+    """
+    Laad een ondertitel bestand als CueIndex
+
+    Args:
+        file_path: Pad naar het ondertitel bestand
+        format_type: srt, vtt of ass (optioneel)
+
+    Returns:
+        CueIndex of None bij fout
+    """
+    try:
+        return CueIndex.from_file(file_path, format_type)
+    except Exception as e:
+        logger.error(f"Fout bij lezen ondertitel bestand {file_path}: {e}")
+        return None
@@ -0,0 +1,239 @@
+"""
+Ondertitel layout engine voor Magic Time Studio
+Herverdeelt segmenten over leesbare cues op basis van word-level timing
+"""
+
+import math
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple, Union
+import logging
+
+from .subtitle_writers import seconds_to_ms
+
+logger = logging.getLogger(__name__)
+
+# Standaard layout (gangbare broadcast richtlijnen)
+DEFAULT_LAYOUT = {
+    "max_chars_per_line": 42,   # Maximaal aantal tekens per regel
+    "max_lines": 2,             # Maximaal aantal regels per cue
+    "max_duration": 7.0,        # Maximale cue duur in seconden
+    "min_duration": 1.0,        # Minimale cue duur in seconden (indien ruimte)
+    "min_gap": 0.08,            # Minimale pauze tussen cues in seconden
+    "max_cps": 17.0,            # Maximale leessnelheid (tekens per seconde)
+    "max_pause": 1.0,           # Splits cue bij een stilte tussen woorden
+}
+
+LAYOUT_PRESETS = {
+    "standard": {},
+    "compact": {"max_chars_per_line": 32, "max_duration": 5.0, "max_cps": 15.0},
+    "fast": {"max_duration": 6.0, "max_cps": 20.0},
+}
+
+_SENTENCE_END = (".", "!", "?", "…")
+
+def resolve_layout(layout: Union[None, str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Bepaal de layout instellingen
+
+    Args:
+        layout: None/"off" (geen re-flow), preset naam of dict met overrides
+
+    Returns:
+        Volledige layout dict of None als re-flow uit staat
+    """
+    if not layout or layout in ("off", "none"):
+        return None
+    resolved = dict(DEFAULT_LAYOUT)
+    if isinstance(layout, str):
+        if layout not in LAYOUT_PRESETS:
+            logger.warning(f"Onbekende ondertitel layout: {layout}, gebruik standard")
+        resolved.update(LAYOUT_PRESETS.get(layout, {}))
+    else:
+        resolved.update(layout)
+    return resolved
+
+class _LineBuffer:
+    """Houdt regels van de huidige cue bij (greedy regelafbreking)"""
+
+    __slots__ = ("max_chars", "max_lines", "lines", "line_length", "chars")
+
+    def __init__(self, max_chars: int, max_lines: int):
+        self.max_chars = max_chars
+        self.max_lines = max_lines
+        self.lines = []
+        self.line_length = 0
+        self.chars = 0
+
+    def fits(self, word: str) -> bool:
+        """Past het woord nog in de cue (op de huidige of een nieuwe regel)?"""
+        if not self.lines:
+            return True
+        if self.line_length + 1 + len(word) <= self.max_chars:
+            return True
+        return len(self.lines) < self.max_lines
+
+    def add(self, word: str):
+        if self.lines and self.line_length + 1 + len(word) <= self.max_chars:
+            self.lines[-1].append(word)
+            self.line_length += 1 + len(word)
+        else:
+            self.lines.append([word])
+            self.line_length = len(word)
+        self.chars += len(word)
+
+    def text(self) -> str:
+        return "\n".join(" ".join(line) for line in self.lines)
+
+    def ends_sentence(self) -> bool:
+        return bool(self.lines) and self.lines[-1][-1].endswith(_SENTENCE_END)
+
+def _segment_text(segment: Dict[str, Any], text_key: str) -> str:
+    text = segment.get(text_key)
+    if text is None:
+        text = segment.get("text")
+    return (text or "").strip()
+
+def _iter_word_cues(words: Iterable[Dict[str, Any]], seg_start: int, seg_end: int,
+                    layout: Dict[str, Any]) -> Iterator[Tuple[int, int, str]]:
+    """Groepeer woorden greedy tot cues (lineair in het aantal woorden)"""
+    max_duration = seconds_to_ms(layout["max_duration"])
+    min_duration = seconds_to_ms(layout["min_duration"])
+    max_pause = seconds_to_ms(layout["max_pause"])
+
+    buffer = _LineBuffer(layout["max_chars_per_line"], layout["max_lines"])
+    cue_start = cue_end = seg_start
+
+    for word in words:
+        token = (word.get("word") or "").strip()
+        if not token:
+            continue
+
+        # Woorden zonder timing (bijv. getallen) erven de vorige eindtijd
+        start = word.get("start")
+        end = word.get("end")
+        start = seconds_to_ms(start) if start is not None and not math.isnan(start) else cue_end
+        end = seconds_to_ms(end) if end is not None and not math.isnan(end) else start
+        start = min(max(start, seg_start), seg_end)
+        end = min(max(end, start), seg_end)
+
+        if buffer.lines and (
+            start - cue_end >= max_pause
+            or end - cue_start > max_duration
+            or not buffer.fits(token)
+            or (buffer.ends_sentence() and cue_end - cue_start >= min_duration)
+        ):
+            yield cue_start, cue_end, buffer.text()
+            buffer = _LineBuffer(layout["max_chars_per_line"], layout["max_lines"])
+
+        if not buffer.lines:
+            cue_start = start
+        buffer.add(token)
+        cue_end = end
+
+    if buffer.lines:
+        yield cue_start, cue_end, buffer.text()
+
+def _iter_text_cues(text: str, seg_start: int, seg_end: int,
+                    layout: Dict[str, Any]) -> Iterator[Tuple[int, int, str]]:
+    """Splits tekst zonder woord timing; tijd wordt verdeeld naar aantal tekens"""
+    tokens = text.split()
+    total_chars = sum(len(token) for token in tokens)
+    if not total_chars:
+        return
+
+    duration = max(seg_end - seg_start, 0)
+    chunks_needed = max(1, math.ceil(duration / seconds_to_ms(layout["max_duration"])))
+    budget = min(layout["max_chars_per_line"] * layout["max_lines"],
+                 math.ceil(total_chars / chunks_needed))
+
+    buffer = _LineBuffer(layout["max_chars_per_line"], layout["max_lines"])
+    consumed = 0
+    cue_start = seg_start
+    for token in tokens:
+        if buffer.lines and (not buffer.fits(token) or buffer.chars + len(token) > budget):
+            consumed += buffer.chars
+            cue_end = seg_start + duration * consumed // total_chars
+            yield cue_start, cue_end, buffer.text()
+            cue_start = cue_end
+            buffer = _LineBuffer(layout["max_chars_per_line"], layout["max_lines"])
+        buffer.add(token)
+
+    if buffer.lines:
+        yield cue_start, seg_end, buffer.text()
+
+def _finalize_cue(start: int, end: int, text: str, next_start: Optional[int],
+                  layout: Dict[str, Any]) -> Dict[str, Any]:
+    """Pas leessnelheid, minimale duur en minimale gap toe"""
+    chars = len(text) - text.count("\n")
+    required = max(seconds_to_ms(layout["min_duration"]),
+                   int(math.ceil(chars * 1000 / layout["max_cps"])) if layout["max_cps"] else 0)
+    target = min(start + required, start + seconds_to_ms(layout["max_duration"]))
+    end = max(end, target)
+
+    if next_start is not None:
+        limit = next_start - seconds_to_ms(layout["min_gap"])
+        end = min(end, limit) if limit > start else min(end, next_start)
+
+    return {"start": start / 1000, "end": max(end, start) / 1000, "text": text}
+
+def iter_reflowed_segments(segments: Iterable[Dict[str, Any]],
+                           layout: Union[None, str, Dict[str, Any]] = "standard",
+                           text_key: str = "text",
+                           use_words: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Herverdeel segmenten over leesbare cues in één lineaire pass
+
+    Met word timing worden woorden greedy gegroepeerd tot cues binnen de
+    limieten (tekens per regel, regels, duur, pauzes, zinseinde). Zonder word
+    timing (of voor vertaalde tekst) wordt de tekst gesplitst en de tijd
+    verdeeld naar aantal tekens. Daarna worden leessnelheid (CPS), minimale
+    duur en minimale gap toegepast met één cue vooruitkijken.
+
+    Args:
+        segments: Iterable van transcriptie segmenten (dicts of Transcript)
+        layout: Preset naam, dict met overrides of None/"off"
+        text_key: Veld met de tekst (bijv. "text" of "original_text")
+        use_words: Gebruik word timing (alleen zinvol als woorden bij text_key horen)
+
+    Yields:
+        Segment dicts met start, end (seconden) en text (regels met \\n)
+    """
+    resolved = resolve_layout(layout)
+    pending = None
+
+    for segment in segments:
+        text = _segment_text(segment, text_key)
+        if not text:
+            continue
+
+        seg_start = seconds_to_ms(segment.get("start", 0))
+        seg_end = max(seconds_to_ms(segment.get("end", 0)), seg_start)
+
+        if resolved is None:
+            cues = iter(((seg_start, seg_end, text),))
+        else:
+            words = segment.get("words") if use_words else None
+            if words and any(word.get("start") is not None for word in words):
+                cues = _iter_word_cues(words, seg_start, seg_end, resolved)
+            else:
+                cues = _iter_text_cues(text, seg_start, seg_end, resolved)
+
+        for cue in cues:
+            if pending is not None:
+                yield (_finalize_cue(*pending, cue[0], resolved) if resolved
+                       else {"start": pending[0] / 1000, "end": pending[1] / 1000, "text": pending[2]})
+            pending = cue
+
+    if pending is not None:
+        yield (_finalize_cue(*pending, None, resolved) if resolved
+               else {"start": pending[0] / 1000, "end": pending[1] / 1000, "text": pending[2]})
+
+def reflow_segments(segments: Iterable[Dict[str, Any]],
+                    layout: Union[None, str, Dict[str, Any]] = "standard",
+                    text_key: str = "text", use_words: bool = True) -> List[Dict[str, Any]]:
+    """
+    Herverdeel segmenten over leesbare cues (zie iter_reflowed_segments)
+
+    Returns:
+        Lijst van segment dicts
+    """
+    return list(iter_reflowed_segments(segments, layout, text_key, use_words))
@@ -0,0 +1,319 @@
+"""
+Ondertitel muxing voor Magic Time Studio
+Alle SRT sporen van een video in één ffmpeg stream-copy, met meerdere mux jobs tegelijk binnen een I/O budget
+
+Muxen kopieert alle streams (geen hercodering) en is daardoor schijf
+gebonden: het aantal gelijktijdige jobs en de totale grootte van de
+bestanden die tegelijk gelezen worden zijn begrensd. In-place muxen schrijft
+naar een tijdelijk bestand in dezelfde map en vervangt het origineel met een
+rename, zodat er geen tweede volledige kopie naast de video blijft staan.
+"""
+
+import os
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, List, Any, Callable, Iterable
+import logging
+
+from .cancellation import CancellationToken, CancelledError
+from .media_probe import get_media_info
+from .ffmpeg_runner import run_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+# Ondertitel codec per container (SRT bestanden worden bij het muxen omgezet)
+SUBTITLE_CODECS = {
+    ".mkv": "srt",
+    ".webm": "webvtt",
+    ".mp4": "mov_text",
+    ".m4v": "mov_text",
+    ".mov": "mov_text",
+}
+
+# Containers zonder tekst ondertitels (avi, wmv, ...) worden naar MKV geschreven
+FALLBACK_CONTAINER = ".mkv"
+
+# Standaard aantal gelijktijdige mux jobs
+MUX_WORKERS = 2
+
+# Standaard maximale totale grootte van tegelijk gemuxte bestanden in MB
+MUX_IO_BUDGET_MB = 8192
+
+# ISO 639-1 -> ISO 639-2 voor de language metadata van ondertitel sporen
+LANGUAGE_CODES = {
+    "nl": "nld", "en": "eng", "de": "deu", "fr": "fra", "es": "spa", "it": "ita",
+    "pt": "por", "ru": "rus", "ja": "jpn", "ko": "kor", "zh": "zho", "ar": "ara",
+    "tr": "tur", "pl": "pol", "sv": "swe", "da": "dan", "no": "nor", "fi": "fin",
+    "cs": "ces", "el": "ell", "hu": "hun", "uk": "ukr", "hi": "hin",
+}
+
+# Bibliografische ISO 639-2/B codes (o.a. in MKV tags) -> terminologische codes
+BIBLIOGRAPHIC_CODES = {"dut": "nld", "ger": "deu", "fre": "fra", "chi": "zho", "cze": "ces", "gre": "ell"}
+
+def language_code(language: Optional[str]) -> str:
+    """
+    ISO 639-2 code voor de metadata van een spoor
+
+    Args:
+        language: Taal code ("nl", "NL", "nld", ...)
+
+    Returns:
+        Drieletterige code, "und" als de taal onbekend is
+    """
+    language = (language or "").strip().lower()
+    if len(language) == 3 and language.isalpha():
+        return BIBLIOGRAPHIC_CODES.get(language, language)
+    return LANGUAGE_CODES.get(language.split("-")[0].split("_")[0], "und")
+
+def subtitle_codec(output_path: str) -> str:
+    """Ondertitel codec voor de container van een output pad"""
+    return SUBTITLE_CODECS.get(os.path.splitext(output_path)[1].lower(), SUBTITLE_CODECS[FALLBACK_CONTAINER])
+
+def mux_output_path(video_path: str, in_place: bool = False, suffix: str = "_subtitled") -> str:
+    """
+    Output pad voor een gemuxte video
+
+    De container van de invoer blijft behouden; alleen containers zonder
+    tekst ondertitels krijgen FALLBACK_CONTAINER (en dus nooit in-place).
+
+    Args:
+        video_path: Pad naar de video
+        in_place: Origineel vervangen
+        suffix: Toevoeging aan de naam als er niet in-place geschreven wordt
+
+    Returns:
+        Pad voor de gemuxte video
+    """
+    base, extension = os.path.splitext(video_path)
+    if extension.lower() not in SUBTITLE_CODECS:
+        return base + suffix + FALLBACK_CONTAINER
+    return video_path if in_place else base + suffix + extension
+
+def build_mux_command(video_path: str, tracks: List[Dict[str, Any]], output_path: str,
+                      existing_subtitles: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+    """
+    FFmpeg argumenten die alle streams kopiëren en alle sporen in één keer toevoegen
+
+    Bestaande ondertitels in een taal die opnieuw wordt toegevoegd vallen weg,
+    zodat opnieuw muxen geen dubbele sporen oplevert.
+
+    Args:
+        video_path: Pad naar de video
+        tracks: Sporen met "path", "language" en optioneel "title"
+        output_path: Pad voor de gemuxte video (bepaalt de ondertitel codec)
+        existing_subtitles: subtitle_streams uit core.media_probe (met "language")
+
+    Returns:
+        Argumenten voor core.ffmpeg_runner (zonder executable)
+    """
+    codec = subtitle_codec(output_path)
+    cmd = ["-y", "-i", video_path]
+    for track in tracks:
+        cmd += ["-i", track["path"]]
+
+    new_languages = {language_code(track.get("language")) for track in tracks}
+    cmd += ["-map", "0"]
+    kept = 0
+    for index, stream in enumerate(existing_subtitles or []):
+        if language_code(stream.get("language")) in new_languages - {"und"}:
+            cmd += ["-map", f"-0:s:{index}"]
+        else:
+            kept += 1
+    for input_index in range(1, len(tracks) + 1):
+        cmd += ["-map", f"{input_index}:s:0"]
+
+    # Alles kopiëren; alleen de nieuwe sporen krijgen de codec van de container
+    cmd += ["-c", "copy", "-ignore_unknown"]
+    for offset, track in enumerate(tracks):
+        stream = kept + offset
+        cmd += [f"-c:s:{stream}", codec, f"-metadata:s:s:{stream}", f"language={language_code(track.get('language'))}"]
+        if track.get("title"):
+            cmd += [f"-metadata:s:s:{stream}", f"title={track['title']}"]
+    cmd.append(output_path)
+    return cmd
+
+def _fsync_file(file_path: str):
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def mux_subtitles(video_path: str, tracks: List[Dict[str, Any]], output_path: Optional[str] = None,
+                  in_place: bool = False, token: Optional[CancellationToken] = None,
+                  timeout: Optional[float] = None, ffmpeg_path: Optional[str] = None,
+                  existing_subtitles: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Voeg ondertitel sporen toe aan een video met één ffmpeg aanroep
+
+    Args:
+        video_path: Pad naar de video
+        tracks: Sporen met "path", "language" en optioneel "title"
+        output_path: Optioneel output pad (standaard mux_output_path())
+        in_place: Origineel vervangen via een tijdelijk bestand en rename
+        token: Optioneel CancellationToken; annuleren stopt ffmpeg
+        timeout: Optionele timeout in seconden
+        ffmpeg_path: Optioneel pad naar ffmpeg
+        existing_subtitles: Bestaande ondertitel streams (standaard via de probe cache)
+
+    Returns:
+        Dictionary met output_path en tracks, of error
+
+    Raises:
+        CancelledError: Als het token geannuleerd werd
+    """
+    tracks = [track for track in tracks if track.get("path") and os.path.exists(track["path"])]
+    if not tracks:
+        return {"error": "Geen ondertitel bestanden om toe te voegen"}
+
+    output_path = output_path or mux_output_path(video_path, in_place)
+    replace = os.path.abspath(output_path) == os.path.abspath(video_path)
+    if existing_subtitles is None:
+        info = get_media_info(video_path) or {}
+        existing_subtitles = info.get("subtitle_streams") or []
+
+    target = output_path
+    if replace:
+        # Tijdelijk bestand in dezelfde map (zelfde bestandssysteem: rename is atomair)
+        fd, target = tempfile.mkstemp(prefix=".mux_", suffix=os.path.splitext(video_path)[1],
+                                      dir=os.path.dirname(os.path.abspath(video_path)))
+        os.close(fd)
+
+    args = build_mux_command(video_path, tracks, target, existing_subtitles)
+    try:
+        # Stream-copy: de timeout schaalt met de duur van de video
+        result = run_ffmpeg(args, token=token, timeout=timeout, ffmpeg_path=ffmpeg_path)
+        if result["returncode"] != 0 or not os.path.exists(target):
+            return {"error": result.get("error") or "FFmpeg mux gaf geen output"}
+        if replace:
+            _fsync_file(target)  # Inhoud op schijf vóór de rename (crash-veilig)
+            os.replace(target, video_path)
+            target = None
+        logger.info(f"{len(tracks)} ondertitel spo(o)r(en) toegevoegd: {output_path}")
+        return {"output_path": output_path, "tracks": tracks}
+    except CancelledError:
+        raise
+    except subprocess.TimeoutExpired:
+        return {"error": "FFmpeg mux timeout"}
+    except Exception as e:
+        logger.error(f"Fout bij muxen van {video_path}: {e}")
+        return {"error": str(e)}
+    finally:
+        if replace and target and os.path.exists(target):
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+
+class _IOBudget:
+    """Begrenst de totale grootte van tegelijk gemuxte bestanden (een te groot bestand mag alleen)"""
+
+    def __init__(self, limit_bytes: int):
+        self.limit = max(int(limit_bytes), 1)
+        self.used = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size: int) -> int:
+        size = min(max(int(size), 0), self.limit)
+        with self._condition:
+            self._condition.wait_for(lambda: self.used == 0 or self.used + size <= self.limit)
+            self.used += size
+        return size
+
+    def release(self, size: int):
+        with self._condition:
+            self.used -= size
+            self._condition.notify_all()
+
+class SubtitleMuxer:
+    """
+    Mux jobs op de achtergrond met een maximum aan gelijktijdige jobs en een I/O budget
+
+    Args:
+        max_workers: Maximaal aantal gelijktijdige ffmpeg processen
+        io_budget_mb: Maximale totale grootte van tegelijk gemuxte bestanden
+        in_place: Standaard voor in-place muxen
+        token: Optioneel CancellationToken voor alle jobs
+        ffmpeg_path: Optioneel pad naar ffmpeg
+    """
+
+    def __init__(self, max_workers: int = MUX_WORKERS, io_budget_mb: float = MUX_IO_BUDGET_MB,
+                 in_place: bool = False, token: Optional[CancellationToken] = None,
+                 ffmpeg_path: Optional[str] = None):
+        self.max_workers = max(1, int(max_workers))
+        self.in_place = in_place
+        self.token = token
+        self.ffmpeg_path = ffmpeg_path
+        self._budget = _IOBudget(float(io_budget_mb) * 1024 * 1024)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="subtitle-mux")
+
+    def _run(self, video_path: str, tracks: List[Dict[str, Any]], output_path: Optional[str],
+             in_place: bool) -> Dict[str, Any]:
+        try:
+            size = os.path.getsize(video_path)
+        except OSError:
+            size = 0
+        reserved = self._budget.acquire(size)
+        try:
+            return mux_subtitles(video_path, tracks, output_path, in_place, self.token,
+                                 ffmpeg_path=self.ffmpeg_path)
+        finally:
+            self._budget.release(reserved)
+
+    def submit(self, video_path: str, tracks: List[Dict[str, Any]], output_path: Optional[str] = None,
+               in_place: Optional[bool] = None) -> Future:
+        """
+        Plan een mux job in
+
+        Returns:
+            Future met het resultaat van mux_subtitles()
+        """
+        return self._executor.submit(self._run, video_path, tracks, output_path,
+                                     self.in_place if in_place is None else in_place)
+
+    def shutdown(self, wait: bool = True):
+        """Stop de muxer (lopende ffmpeg processen stoppen via het token)"""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+def mux_batch(jobs: Iterable[Dict[str, Any]], max_workers: int = MUX_WORKERS,
+              io_budget_mb: float = MUX_IO_BUDGET_MB, in_place: bool = False,
+              token: Optional[CancellationToken] = None, ffmpeg_path: Optional[str] = None,
+              progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+              ) -> Dict[str, Dict[str, Any]]:
+    """
+    Mux meerdere video's tegelijk
+
+    Args:
+        jobs: Dictionaries met "video", "tracks" en optioneel "output"
+        max_workers: Maximaal aantal gelijktijdige ffmpeg processen
+        io_budget_mb: Maximale totale grootte van tegelijk gemuxte bestanden
+        in_place: Originelen vervangen via tijdelijk bestand en rename
+        token: Optioneel CancellationToken
+        ffmpeg_path: Optioneel pad naar ffmpeg
+        progress_callback: Optioneel, aangeroepen per video met (pad, resultaat)
+
+    Returns:
+        Dictionary video pad -> resultaat (output_path of error)
+    """
+    results = {}
+    with SubtitleMuxer(max_workers, io_budget_mb, in_place, token, ffmpeg_path) as muxer:
+        futures = [(job["video"], muxer.submit(job["video"], job["tracks"], job.get("output"))) for job in jobs]
+        for video_path, future in futures:
+            try:
+                result = future.result()
+            except CancelledError:
+                result = {"error": "geannuleerd"}
+            except Exception as e:
+                result = {"error": str(e)}
+            results[video_path] = result
+            if progress_callback:
+                progress_callback(video_path, result)
+    return results
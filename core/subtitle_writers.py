@@ -0,0 +1,407 @@
+"""
+Streaming ondertitel writers voor Magic Time Studio
+Schrijft SRT, VTT en ASS bestanden in één pass over de segmenten
+"""
+
+import io
+import os
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Buffer grootte voor ondertitel bestanden (64 KB)
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Achtervoegsel van ondertitel bestanden die nog geschreven worden
+PARTIAL_SUFFIX = ".part"
+
+SUBTITLE_FORMATS = ("srt", "vtt", "ass")
+
+# Standaard ASS stijl (gelijk aan subtitle_functions.create_ass_content)
+DEFAULT_ASS_STYLE = {
+    "name": "Default",
+    "fontname": "Arial",
+    "fontsize": "20",
+    "primary_colour": "&H00FFFFFF",
+    "secondary_colour": "&H000000FF",
+    "outline_colour": "&H00000000",
+    "back_colour": "&H80000000",
+    "bold": "0",
+    "italic": "0",
+    "underline": "0",
+    "strikeout": "0",
+    "scale_x": "100",
+    "scale_y": "100",
+    "spacing": "0",
+    "angle": "0",
+    "border_style": "1",
+    "outline": "2",
+    "shadow": "2",
+    "alignment": "2",
+    "margin_l": "10",
+    "margin_r": "10",
+    "margin_v": "10"
+}
+
+def seconds_to_ms(seconds: float) -> int:
+    """
+    Converteer seconden naar gehele milliseconden (afgerond, nooit negatief)
+
+    Args:
+        seconds: Tijd in seconden
+
+    Returns:
+        Tijd in milliseconden
+    """
+    try:
+        ms = int(round(float(seconds) * 1000))
+    except (TypeError, ValueError):
+        return 0
+    return ms if ms > 0 else 0
+
+def format_timestamp_ms(ms: int, format_type: str = "srt") -> str:
+    """
+    Formatteer milliseconden als ondertitel timestamp
+
+    Alle rekenwerk gebeurt met gehele getallen zodat er geen afrondingsdrift
+    ontstaat (65.123s wordt altijd 00:01:05,123).
+
+    Args:
+        ms: Tijd in milliseconden
+        format_type: srt (HH:MM:SS,mmm), vtt (HH:MM:SS.mmm) of ass (H:MM:SS.cc)
+
+    Returns:
+        Geformatteerde timestamp string
+    """
+    if ms < 0:
+        ms = 0
+    if format_type == "ass":
+        centiseconds = (ms + 5) // 10
+        hours, rest = divmod(centiseconds, 360000)
+        minutes, rest = divmod(rest, 6000)
+        secs, cs = divmod(rest, 100)
+        return f"{hours}:{minutes:02d}:{secs:02d}.{cs:02d}"
+
+    hours, rest = divmod(ms, 3600000)
+    minutes, rest = divmod(rest, 60000)
+    secs, millis = divmod(rest, 1000)
+    separator = "." if format_type == "vtt" else ","
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+def escape_ass_text(text: str) -> str:
+    """
+    Escape speciale karakters voor ASS formaat
+
+    Args:
+        text: Tekst om te escapen
+
+    Returns:
+        Geëscapte tekst
+    """
+    return (text.replace("\\", "\\\\")
+                .replace("{", "\\{")
+                .replace("}", "\\}")
+                .replace("\r\n", "\\N")
+                .replace("\n", "\\N")
+                .replace("\r", "\\N"))
+
+class SubtitleWriter:
+    """Basis writer - schrijft cues direct naar een (gebufferde) stream"""
+
+    format_type = "srt"
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.cue_count = 0
+
+    def write_header(self):
+        """Schrijf bestand header (niet nodig voor SRT)"""
+        pass
+
+    def write_cue(self, start_ms: int, end_ms: int, text: str):
+        """Schrijf één cue"""
+        raise NotImplementedError
+
+class SRTWriter(SubtitleWriter):
+    """SRT writer"""
+
+    format_type = "srt"
+
+    def write_cue(self, start_ms: int, end_ms: int, text: str):
+        self.cue_count += 1
+        self.stream.write(
+            f"{self.cue_count}\n"
+            f"{format_timestamp_ms(start_ms, 'srt')} --> {format_timestamp_ms(end_ms, 'srt')}\n"
+            f"{text}\n\n"
+        )
+
+class VTTWriter(SubtitleWriter):
+    """WebVTT writer"""
+
+    format_type = "vtt"
+
+    def write_header(self):
+        self.stream.write("WEBVTT\n\n")
+
+    def write_cue(self, start_ms: int, end_ms: int, text: str):
+        self.cue_count += 1
+        self.stream.write(
+            f"{format_timestamp_ms(start_ms, 'vtt')} --> {format_timestamp_ms(end_ms, 'vtt')}\n"
+            f"{text}\n\n"
+        )
+
+class ASSWriter(SubtitleWriter):
+    """ASS/SSA writer"""
+
+    format_type = "ass"
+
+    def __init__(self, stream, style_config: Optional[Dict[str, Any]] = None):
+        super().__init__(stream)
+        self.style = dict(DEFAULT_ASS_STYLE)
+        if style_config:
+            self.style.update(style_config)
+
+    def write_header(self):
+        style = self.style
+        self.stream.write(
+            "[Script Info]\n"
+            "Title: Magic Time Studio Generated Subtitles\n"
+            "ScriptType: v4.00+\n"
+            "WrapStyle: 0\n"
+            "ScaledBorderAndShadow: yes\n"
+            "YCbCr Matrix: TV.601\n\n"
+            "[V4+ Styles]\n"
+            "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding\n"
+            f"Style: {style['name']}, {style['fontname']}, {style['fontsize']}, {style['primary_colour']}, {style['secondary_colour']}, {style['outline_colour']}, {style['back_colour']}, {style['bold']}, {style['italic']}, {style['underline']}, {style['strikeout']}, {style['scale_x']}, {style['scale_y']}, {style['spacing']}, {style['angle']}, {style['border_style']}, {style['outline']}, {style['shadow']}, {style['alignment']}, {style['margin_l']}, {style['margin_r']}, {style['margin_v']}, 1\n"
+            "\n"
+            "[Events]\n"
+            "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+        )
+
+    def write_cue(self, start_ms: int, end_ms: int, text: str):
+        self.cue_count += 1
+        self.stream.write(
+            f"Dialogue: 0, {format_timestamp_ms(start_ms, 'ass')}, {format_timestamp_ms(end_ms, 'ass')}, "
+            f"{self.style['name']}, , 0, 0, 0, , {escape_ass_text(text)}\n"
+        )
+
+WRITER_CLASSES = {
+    "srt": SRTWriter,
+    "vtt": VTTWriter,
+    "ass": ASSWriter,
+}
+
+def create_writer(stream, format_type: str = "srt",
+                  style_config: Optional[Dict[str, Any]] = None) -> SubtitleWriter:
+    """
+    Maak een writer voor het opgegeven formaat
+
+    Args:
+        stream: Tekst stream om naar te schrijven
+        format_type: srt, vtt of ass
+        style_config: ASS stijl configuratie (optioneel)
+
+    Returns:
+        SubtitleWriter instantie
+    """
+    format_type = (format_type or "srt").lower()
+    if format_type not in WRITER_CLASSES:
+        raise ValueError(f"Onbekend ondertitel formaat: {format_type}")
+    if format_type == "ass":
+        return ASSWriter(stream, style_config)
+    return WRITER_CLASSES[format_type](stream)
+
+def segment_times_ms(segment: Dict[str, Any], use_word_timing: bool = False) -> Tuple[int, int]:
+    """
+    Bepaal start en einde van een segment in milliseconden
+
+    Args:
+        segment: Transcriptie segment
+        use_word_timing: Gebruik eerste/laatste woord timing als beschikbaar
+
+    Returns:
+        Tuple met (start_ms, end_ms)
+    """
+    start = segment.get("start", 0)
+    end = segment.get("end", 0)
+    if use_word_timing:
+        words = segment.get("words")
+        if words:
+            start = words[0].get("start", start)
+            end = words[-1].get("end", end)
+    return seconds_to_ms(start), seconds_to_ms(end)
+
+def iter_segment_cues(segments: Iterable[Dict[str, Any]], text_key: str = "text",
+                      use_word_timing: bool = False) -> Iterator[Tuple[int, int, str]]:
+    """
+    Zet segmenten om naar (start_ms, end_ms, tekst) cues
+
+    Lege segmenten worden overgeslagen. Met use_word_timing worden de start van
+    het eerste woord en het einde van het laatste woord gebruikt.
+
+    Args:
+        segments: Iterable van transcriptie segmenten
+        text_key: Veld met de tekst (bijv. "text" of "original_text")
+        use_word_timing: Gebruik word-level timing als beschikbaar
+
+    Yields:
+        Tuple met (start_ms, end_ms, tekst)
+    """
+    for start_ms, end_ms, (text,) in iter_segment_rows(segments, [text_key], use_word_timing):
+        text = (text or "").strip()
+        if text:
+            yield start_ms, end_ms, text
+
+def iter_segment_rows(segments: Iterable[Dict[str, Any]], text_keys: List[str],
+                      use_word_timing: bool = False) -> Iterator[Tuple[int, int, List[Optional[str]]]]:
+    """
+    Lever per segment (start_ms, end_ms, [tekst per text_key])
+
+    Kolomsgewijze transcripties (core.transcript.Transcript) leveren hun rijen
+    zelf via iter_rows(), zonder tussenliggende dicts. Ontbreekt een text_key
+    in een segment, dan wordt "text" gebruikt.
+
+    Args:
+        segments: Iterable van transcriptie segmenten of een Transcript
+        text_keys: Velden met tekst, één per output
+        use_word_timing: Gebruik word-level timing als beschikbaar
+
+    Yields:
+        Tuple met (start_ms, end_ms, teksten)
+    """
+    if hasattr(segments, "iter_rows"):
+        yield from segments.iter_rows(text_keys, use_word_timing)
+        return
+
+    for segment in segments:
+        start_ms, end_ms = segment_times_ms(segment, use_word_timing)
+        texts = []
+        for text_key in text_keys:
+            text = segment.get(text_key)
+            if text is None:
+                text = segment.get("text")
+            texts.append(text)
+        yield start_ms, end_ms, texts
+
+def open_subtitle_file(output_path: str):
+    """
+    Open een ondertitel bestand met een grote schrijfbuffer
+
+    Args:
+        output_path: Pad naar het output bestand
+
+    Returns:
+        Geopende tekst file handle
+    """
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
+    return open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+
+def write_subtitles(segments: Iterable[Dict[str, Any]], outputs: List[Dict[str, Any]],
+                    use_word_timing: bool = False) -> Dict[str, int]:
+    """
+    Schrijf meerdere ondertitel bestanden in één pass over de segmenten
+
+    Elke output is een dict met:
+        path: pad naar het output bestand
+        format: srt, vtt of ass (standaard srt)
+        text_key: veld met de tekst, bijv. "text" (vertaald) of "original_text"
+        style_config: ASS stijl (optioneel)
+
+    Args:
+        segments: Iterable van transcriptie segmenten (mag een generator zijn)
+        outputs: Lijst van output beschrijvingen
+        use_word_timing: Gebruik word-level timing als beschikbaar
+
+    Returns:
+        Dictionary met per output pad het aantal geschreven cues
+    """
+    handles = []
+    # Schrijf naar .part bestanden en hernoem pas als alles geschreven is,
+    # zodat een crash nooit een half ondertitel bestand achterlaat
+    temp_paths = [output["path"] + PARTIAL_SUFFIX for output in outputs]
+    completed = False
+    try:
+        targets = []
+        for output, temp_path in zip(outputs, temp_paths):
+            handle = open_subtitle_file(temp_path)
+            handles.append(handle)
+            writer = create_writer(handle, output.get("format", "srt"), output.get("style_config"))
+            writer.write_header()
+            targets.append((writer, output.get("text_key", "text")))
+
+        text_keys = [text_key for _, text_key in targets]
+        for start_ms, end_ms, texts in iter_segment_rows(segments, text_keys, use_word_timing):
+            for (writer, _), text in zip(targets, texts):
+                text = (text or "").strip()
+                if text:
+                    writer.write_cue(start_ms, end_ms, text)
+
+        for handle in handles:
+            handle.flush()
+            os.fsync(handle.fileno())
+            handle.close()
+        for output, temp_path in zip(outputs, temp_paths):
+            os.replace(temp_path, output["path"])
+        completed = True
+        return {output["path"]: writer.cue_count for output, (writer, _) in zip(outputs, targets)}
+    finally:
+        for handle in handles:
+            handle.close()
+        if not completed:
+            for temp_path in temp_paths:
+                if os.path.exists(temp_path):
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+
+def write_subtitle_file(segments: Iterable[Dict[str, Any]], output_path: str,
+                        format_type: str = "srt", text_key: str = "text",
+                        use_word_timing: bool = False,
+                        style_config: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Schrijf één ondertitel bestand
+
+    Args:
+        segments: Iterable van transcriptie segmenten
+        output_path: Pad naar het output bestand
+        format_type: srt, vtt of ass
+        text_key: Veld met de tekst
+        use_word_timing: Gebruik word-level timing als beschikbaar
+        style_config: ASS stijl configuratie (optioneel)
+
+    Returns:
+        Aantal geschreven cues
+    """
+    counts = write_subtitles(
+        segments,
+        [{"path": output_path, "format": format_type, "text_key": text_key, "style_config": style_config}],
+        use_word_timing=use_word_timing
+    )
+    return counts.get(output_path, 0)
+
+def render_subtitles(segments: Iterable[Dict[str, Any]], format_type: str = "srt",
+                     text_key: str = "text", use_word_timing: bool = False,
+                     style_config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Render ondertitels naar een string (voor functies die content teruggeven)
+
+    Args:
+        segments: Iterable van transcriptie segmenten
+        format_type: srt, vtt of ass
+        text_key: Veld met de tekst
+        use_word_timing: Gebruik word-level timing als beschikbaar
+        style_config: ASS stijl configuratie (optioneel)
+
+    Returns:
+        Ondertitel content string
+    """
+    buffer = io.StringIO()
+    writer = create_writer(buffer, format_type, style_config)
+    writer.write_header()
+    for start_ms, end_ms, text in iter_segment_cues(segments, text_key, use_word_timing):
+        writer.write_cue(start_ms, end_ms, text)
+    return buffer.getvalue()
@@ -0,0 +1,150 @@
+"""
+Test bestand voor audio extractie
+Controleert de keuze van het audio spoor, het goedkoopste commando per invoer, fragmenten en de snelheidsmetingen
+"""
+
+import sys
+import os
+import wave
+import stat
+import struct
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.audio_extraction import (select_audio_stream, plan_extraction, fallback_plan, extract_audio, read_pcm,
+                                   ExtractionMetrics, MODE_REUSE, MODE_COPY, MODE_DECODE)
+
+# Nep ffmpeg: schrijft de argumenten weg en maakt het output bestand (laatste argument)
+FAKE_FFMPEG = """#!/bin/sh
+echo "$@" > "$FAKE_FFMPEG_ARGS"
+for last; do :; done
+printf 'RIFF' > "$last"
+echo progress=end
+"""
+
+def _stream(codec, sample_rate, channels, language=None):
+    return {"codec": codec, "sample_rate": sample_rate, "channels": channels, "language": language}
+
+def test_select_stream():
+    """Test de keuze van het audio spoor op taal"""
+    print("🔍 Test keuze audio spoor...")
+
+    info = {"audio_streams": [_stream("aac", 48000, 6, "eng"), _stream("aac", 48000, 2, "dut")]}
+    assert select_audio_stream(info, "nl")["position"] == 1  # "dut" is de B-code van "nld"
+    assert select_audio_stream(info, "eng")["position"] == 0
+    assert select_audio_stream(info, "auto")["position"] == 0
+    assert select_audio_stream(info, "fr")["position"] == 0  # Onbekende taal: eerste spoor
+    assert select_audio_stream({"audio_streams": []}, "nl") is None
+    print("✅ Keuze audio spoor werkt")
+
+def test_plan_extraction():
+    """Test reuse, copy en decode met en zonder fragment"""
+    print("🔍 Test extractie plan...")
+
+    wav = {"format_name": "wav", "duration": 60.0, "video": None,
+           "audio_streams": [_stream("pcm_s16le", 16000, 1)]}
+    plan = plan_extraction(wav, "in.wav", "out.wav")
+    assert plan["mode"] == MODE_REUSE and plan["args"] is None and plan["duration"] == 60.0
+    assert plan_extraction(wav, "in.wav", "out.wav", reuse_input=False)["mode"] == MODE_COPY
+
+    mkv = {"format_name": "matroska,webm", "duration": 600.0, "video": {"codec": "h264"},
+           "audio_streams": [_stream("pcm_s16le", 16000, 1, "eng")]}
+    plan = plan_extraction(mkv, "in.mkv", "out.wav")
+    assert plan["mode"] == MODE_COPY
+    assert plan["args"] == ["-i", "in.mkv", "-map", "0:a:0", "-c:a", "copy", "-f", "wav", "-y", "out.wav"]
+
+    mp4 = {"format_name": "mov,mp4,m4a,3gp,3g2,mj2", "duration": 600.0, "video": {"codec": "h264"},
+           "audio_streams": [_stream("aac", 48000, 2, "eng"), _stream("aac", 48000, 2, "nld")]}
+    plan = plan_extraction(mp4, "in.mp4", "out.wav", language="nl", preview_seconds=30, start=120)
+    assert plan["mode"] == MODE_DECODE and plan["duration"] == 30
+    assert plan["args"][:4] == ["-ss", "120.000", "-i", "in.mp4"]  # Zoeken vóór de input
+    assert plan["args"][4:8] == ["-map", "0:a:1", "-t", "30.000"]
+    assert "-ar" in plan["args"] and plan["args"][plan["args"].index("-ar") + 1] == "16000"
+
+    assert plan_extraction({"audio_streams": []}, "in.mp4", "out.wav").get("error")
+    print("✅ Extractie plan werkt")
+
+def test_unprobeable_input():
+    """Test dat een bestand dat ffprobe niet kan lezen toch gedecodeerd wordt"""
+    print("🔍 Test invoer zonder probe...")
+
+    plan = fallback_plan("in.vob", "out.wav", preview_seconds=30, start=5)
+    assert plan["mode"] == MODE_DECODE and plan["duration"] == 30
+    assert plan["args"][:5] == ["-ss", "5.000", "-i", "in.vob", "-vn"]
+    assert plan["args"][-1] == "out.wav" and "-map" not in plan["args"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ffmpeg_path = os.path.join(temp_dir, "ffmpeg")
+        with open(ffmpeg_path, "w") as f:
+            f.write(FAKE_FFMPEG)
+        os.chmod(ffmpeg_path, os.stat(ffmpeg_path).st_mode | stat.S_IEXEC)
+        os.environ["FAKE_FFMPEG_ARGS"] = os.path.join(temp_dir, "args.txt")
+
+        input_path = os.path.join(temp_dir, "kapot.vob")
+        with open(input_path, "wb") as f:
+            f.write(os.urandom(256))  # Geen container die ffprobe herkent
+        output_path = os.path.join(temp_dir, "audio.wav")
+        result = extract_audio(input_path, output_path, ffmpeg_path=ffmpeg_path)
+        assert not result.get("error"), result
+        assert result["mode"] == MODE_DECODE and result["audio_path"] == output_path
+        with open(os.environ["FAKE_FFMPEG_ARGS"]) as f:
+            args = f.read().split()
+        assert "-vn" in args and args[args.index("-ar") + 1] == "16000"
+    print("✅ Invoer zonder probe werkt")
+
+def test_read_pcm_and_metrics():
+    """Test het lezen van een fragment en de snelheid per bestand"""
+    print("🔍 Test PCM fragment en metrics...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "audio.wav")
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes(struct.pack("<32000h", *range(32000)))
+        assert len(read_pcm(path)) == 64000
+        fragment = read_pcm(path, start=1.0, seconds=0.5)
+        assert struct.unpack("<8000h", fragment)[0] == 16000
+
+    metrics = ExtractionMetrics()
+    metrics.record("a.mp4", MODE_DECODE, 600.0, 2.0)
+    metrics.record("b.wav", MODE_REUSE, 60.0, 0.0)
+    summary = metrics.summary()
+    assert summary["files"] == 2 and summary["modes"] == {MODE_DECODE: 1, MODE_REUSE: 1}
+    assert summary["speed"] == 330.0 and summary["last"]["speed"] is None
+    metrics.reset()
+    assert metrics.summary()["files"] == 0
+    print("✅ PCM fragment en metrics werken")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start audio extractie test...\n")
+
+    tests = [("Keuze audio spoor", test_select_stream),
+             ("Extractie plan", test_plan_extraction),
+             ("PCM fragment en metrics", test_read_pcm_and_metrics)]
+    if os.name != "nt":  # Nep ffmpeg is een shell script
+        tests.append(("Invoer zonder probe", test_unprobeable_input))
+
+    results = {}
+    for name, test in tests:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
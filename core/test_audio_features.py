@@ -0,0 +1,152 @@
+"""
+Test bestand voor de audio feature engine van de Audio Analyzer Plugin
+Controleert feature vormen, downsampling naar weergave resolutie en de .npy cache
+"""
+
+import sys
+import os
+import math
+import tempfile
+import importlib.util
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+# Direct vanuit het bestand laden: de plugin packages importeren ook de GUI (PySide6)
+_FEATURES_PATH = os.path.join(project_root, "ui_pyside6", "features", "plugins", "audio_features.py")
+try:
+    import numpy as np
+    _spec = importlib.util.spec_from_file_location("audio_features", _FEATURES_PATH)
+    audio_features = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(audio_features)
+except ImportError as e:  # numpy en librosa zijn optioneel
+    audio_features = None
+    IMPORT_ERROR = e
+
+SAMPLE_RATE = 22050
+DURATION = 3
+FREQUENCY = 440.0
+DISPLAY_FRAMES = 40
+
+class _FakeEngine:
+    """Vervangt ffmpeg en de media probe door een synthetische sinus"""
+
+    def __init__(self, temp_dir):
+        t = np.arange(SAMPLE_RATE * DURATION, dtype=np.float32) / SAMPLE_RATE
+        self.signal = (0.5 * np.sin(2 * np.pi * FREQUENCY * t)).astype(np.float32)
+        self.temp_dir = temp_dir
+        self.decode_calls = 0
+        self._originals = {}
+
+    def iter_audio_blocks(self, audio_path, sample_rate=SAMPLE_RATE, block_seconds=1):
+        self.decode_calls += 1
+        block = sample_rate * block_seconds
+        for start in range(0, len(self.signal), block):
+            yield self.signal[start:start + block]
+
+    def __enter__(self):
+        patches = {
+            "iter_audio_blocks": self.iter_audio_blocks,
+            "get_media_info": lambda path: {"duration": len(self.signal) / SAMPLE_RATE},
+            "get_feature_cache_dir": lambda: os.path.join(self.temp_dir, "cache"),
+            "DISPLAY_FRAMES": DISPLAY_FRAMES,
+        }
+        for name, value in patches.items():
+            self._originals[name] = getattr(audio_features, name)
+            setattr(audio_features, name, value)
+        return self
+
+    def __exit__(self, *exc_info):
+        for name, value in self._originals.items():
+            setattr(audio_features, name, value)
+
+def _make_audio_file(temp_dir):
+    """Bestand voor de cache sleutel (de inhoud wordt niet gedecodeerd)"""
+    audio_path = os.path.join(temp_dir, "sine.wav")
+    with open(audio_path, "wb") as f:
+        f.write(b"sine")
+    return audio_path
+
+def test_feature_shapes():
+    """Test de vorm van alle features en de downsampling naar weergave resolutie"""
+    print("🔍 Test feature vormen en downsampling...")
+    if audio_features is None:
+        print(f"⏭️ Test overgeslagen, audio features niet importeerbaar: {IMPORT_ERROR}")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir, _FakeEngine(temp_dir) as engine:
+        results = audio_features.extract_features(_make_audio_file(temp_dir), use_cache=False)
+
+        total_frames = len(engine.signal) // audio_features.HOP_LENGTH + 1
+        factor = math.ceil(total_frames / DISPLAY_FRAMES)
+        columns = math.ceil(total_frames / factor)
+        assert factor > 1
+        assert columns <= DISPLAY_FRAMES
+        assert results["hop_length"] == audio_features.HOP_LENGTH * factor
+
+        assert results["mel_spectrogram"].shape == (audio_features.N_MELS, columns)
+        assert results["linear_spectrogram"].shape == (audio_features.N_FFT // 2 + 1, columns)
+        assert results["chroma"].shape == (12, columns)
+        assert results["mfcc"].shape == (audio_features.N_MFCC, columns)
+        for name in ("spectral_centroids", "spectral_rolloff", "zero_crossing_rate"):
+            assert results[name].shape == (columns,), name
+
+        assert results["sample_rate"] == SAMPLE_RATE
+        assert abs(results["duration"] - DURATION) < 1e-6
+        assert abs(results["peak_amplitude"] - 0.5) < 1e-3
+        assert abs(results["rms_energy"] - 0.5 / math.sqrt(2)) < 1e-3
+        # Een zuivere sinus: het zwaartepunt van het spectrum ligt rond de toon
+        assert abs(float(np.median(results["spectral_centroids"])) - FREQUENCY) < 100
+        assert np.argmax(results["chroma"].mean(axis=1)) == 9  # A
+    print("✅ Feature vormen en downsampling werken")
+
+def test_cache_hit():
+    """Test dat de tweede aanroep uit de cache komt zonder opnieuw te decoderen"""
+    print("🔍 Test feature cache...")
+    if audio_features is None:
+        print(f"⏭️ Test overgeslagen, audio features niet importeerbaar: {IMPORT_ERROR}")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir, _FakeEngine(temp_dir) as engine:
+        audio_path = _make_audio_file(temp_dir)
+        first = audio_features.extract_features(audio_path)
+        assert engine.decode_calls == 1
+
+        second = audio_features.extract_features(audio_path)
+        assert engine.decode_calls == 1
+        for name in audio_features.ARRAY_FEATURES:
+            assert isinstance(second[name], np.memmap), name
+            assert np.array_equal(np.asarray(second[name]), first[name]), name
+        assert second["hop_length"] == first["hop_length"]
+        assert second["duration"] == first["duration"]
+
+        # Zonder cache wordt altijd opnieuw berekend
+        audio_features.extract_features(audio_path, use_cache=False)
+        assert engine.decode_calls == 2
+        del second  # memmaps sluiten voor de temp map wordt opgeruimd
+    print("✅ Feature cache werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start audio features test...\n")
+
+    results = {}
+    for name, test in [("Feature vormen", test_feature_shapes),
+                       ("Feature cache", test_cache_hit)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
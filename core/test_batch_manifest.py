@@ -0,0 +1,141 @@
+"""
+Test bestand voor het batch manifest
+Controleert registratie van stappen, herstel na een afgebroken regel en ongeldig worden bij gewijzigde bronnen
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.batch_manifest import (BatchManifest, batch_id, write_json_atomic, load_json,
+                                 STAGE_TRANSCRIBE, STAGE_SRT, STATUS_FAILED)
+
+def _make_files(temp_dir, count):
+    paths = []
+    for index in range(count):
+        path = os.path.join(temp_dir, f"video_{index}.mp4")
+        with open(path, "wb") as f:
+            f.write(b"x" * (100 + index))
+        paths.append(path)
+    return paths
+
+def test_record_and_resume():
+    """Test dat afgeronde stappen na opnieuw laden overgeslagen worden"""
+    print("🔍 Test registreren en hervatten...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = _make_files(temp_dir, 3)
+        assert batch_id(files) == batch_id(list(reversed(files)))
+
+        manifest = BatchManifest.for_batch(files)
+        assert os.path.dirname(manifest.path) == temp_dir
+        assert manifest.load() == 0
+
+        transcript_path = manifest.artifact_path(files[0], "transcript.json")
+        assert write_json_atomic(transcript_path, {"segments": [{"start": 0.0, "end": 1.0, "text": "hallo"}]})
+        assert manifest.record(files[0], STAGE_TRANSCRIBE, artifacts={"transcript": transcript_path})
+        manifest.record(files[1], STAGE_TRANSCRIBE, STATUS_FAILED, error="CUDA out of memory")
+
+        # Crash midden in het schrijven van een regel
+        with open(manifest.path, "a", encoding="utf-8") as f:
+            f.write('{"file": "half')
+
+        resumed = BatchManifest.for_batch(files)
+        assert resumed.load() == 2
+        assert resumed.completed(files, STAGE_TRANSCRIBE) == [files[0]]
+        assert resumed.get(files[1], STAGE_TRANSCRIBE)["error"] == "CUDA out of memory"
+        path = resumed.artifact(files[0], STAGE_TRANSCRIBE, "transcript")
+        assert load_json(path)["segments"][0]["text"] == "hallo"
+        assert not resumed.is_done(files[0], STAGE_SRT)
+
+        # Compacteren laat alleen geldige, laatste regels over
+        assert resumed.compact()
+        with open(resumed.path, "r", encoding="utf-8") as f:
+            assert len(f.readlines()) == 2
+    print("✅ Registreren en hervatten werkt")
+
+def test_record_after_torn_line():
+    """Test dat de eerste registratie na een afgebroken regel niet verloren gaat"""
+    print("🔍 Test registreren na een afgebroken regel...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = _make_files(temp_dir, 3)
+        manifest = BatchManifest.for_batch(files)
+        manifest.record(files[0], STAGE_TRANSCRIBE, STATUS_FAILED)
+        with open(manifest.path, "a", encoding="utf-8") as f:
+            f.write('{"file": "half')
+
+        resumed = BatchManifest.for_batch(files)
+        assert resumed.record(files[1], STAGE_TRANSCRIBE)
+        reloaded = BatchManifest.for_batch(files)
+        assert reloaded.load() == 2
+        assert reloaded.is_done(files[1], STAGE_TRANSCRIBE)
+        with open(manifest.path, "r", encoding="utf-8") as f:
+            assert "half" not in f.read()
+
+        # Een volledige laatste regel zonder newline blijft behouden
+        with open(manifest.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            f.truncate()
+        resumed = BatchManifest.for_batch(files)
+        assert resumed.record(files[2], STAGE_TRANSCRIBE)
+        reloaded = BatchManifest.for_batch(files)
+        assert reloaded.load() == 3
+        assert reloaded.completed(files, STAGE_TRANSCRIBE) == files[1:]
+    print("✅ Registreren na een afgebroken regel werkt")
+
+def test_invalidation():
+    """Test dat een gewijzigde bron of verdwenen artefact de stap ongeldig maakt"""
+    print("🔍 Test ongeldig worden...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = _make_files(temp_dir, 2)
+        manifest = BatchManifest.for_batch(files, os.path.join(temp_dir, "output"))
+        for path in files:
+            artifact = manifest.artifact_path(path, "transcript.json")
+            write_json_atomic(artifact, {"segments": []})
+            manifest.record(path, STAGE_TRANSCRIBE, artifacts={"transcript": artifact})
+        assert manifest.completed(files, STAGE_TRANSCRIBE) == files
+
+        # Bronbestand gewijzigd
+        with open(files[0], "ab") as f:
+            f.write(b"extra")
+        future = time.time() + 10
+        os.utime(files[0], (future, future))
+        assert not manifest.is_done(files[0], STAGE_TRANSCRIBE)
+
+        # Artefact verwijderd
+        os.remove(manifest.artifact(files[1], STAGE_TRANSCRIBE, "transcript"))
+        assert not manifest.is_done(files[1], STAGE_TRANSCRIBE)
+        assert load_json(os.path.join(temp_dir, "bestaat_niet.json")) is None
+    print("✅ Ongeldig worden werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start batch manifest test...\n")
+
+    results = {}
+    for name, test in [("Registreren en hervatten", test_record_and_resume),
+                       ("Afgebroken regel", test_record_after_torn_line),
+                       ("Ongeldig worden", test_invalidation)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
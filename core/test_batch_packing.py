@@ -0,0 +1,81 @@
+"""
+Test bestand voor batch packing
+Controleert de planning van korte bestanden en het terugzetten van segmenten per bestand
+"""
+
+import sys
+import os
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.batch_packing import plan_batches, layout_spans, split_segments, gap_for_chunk_size
+
+def test_plan_batches():
+    """Test dat alleen korte bestanden gebundeld worden binnen de limieten"""
+    print("🔍 Test batch planning...")
+
+    items = [("a.mp4", 20), ("b.mp4", 30), ("lang.mp4", 3600), ("c.mp4", 40),
+             ("d.mp4", None), ("e.mp4", 10), ("f.mp4", 10), ("g.mp4", 10)]
+    batches, singles = plan_batches(items, max_batch_seconds=60, max_files=2)
+    assert batches == [["a.mp4", "b.mp4"], ["c.mp4", "e.mp4"], ["f.mp4", "g.mp4"]]
+    assert singles == ["lang.mp4", "d.mp4"]
+
+    # Een batch van één bestand wordt los verwerkt
+    batches, singles = plan_batches([("a.mp4", 50), ("b.mp4", 50)], max_batch_seconds=60)
+    assert batches == [] and singles == ["a.mp4", "b.mp4"]
+
+    batches, singles = plan_batches(items, max_batch_seconds=300, max_files=16)
+    assert batches == [["a.mp4", "b.mp4", "c.mp4", "e.mp4", "f.mp4", "g.mp4"]]
+    assert singles == ["lang.mp4", "d.mp4"]
+    print("✅ Batch planning werkt")
+
+def test_split_segments():
+    """Test dat segmenten met correcte tijden bij hun eigen bestand terechtkomen"""
+    print("\n🔍 Test segmenten terugzetten...")
+
+    gap = gap_for_chunk_size(30)
+    spans = layout_spans([12.0, 20.0, 5.0], gap)
+    assert spans == [(0.0, 12.0), (42.0, 62.0), (92.0, 97.0)]
+
+    segments = [
+        {"start": 0.5, "end": 4.0, "text": "eerste"},
+        {"start": 43.0, "end": 50.0, "text": "tweede",
+         "words": [{"word": "twee", "start": 43.0, "end": 43.4}, {"word": "de", "start": 49.0, "end": 50.0}]},
+        {"start": 60.0, "end": 63.0, "text": "einde"},
+        {"start": 75.0, "end": 76.0, "text": "ruis"},
+        {"start": 92.0, "end": 96.5, "text": "derde"},
+    ]
+    first, second, third = split_segments(segments, spans)
+    assert [s["text"] for s in first] == ["eerste"] and first[0]["start"] == 0.5
+    assert [(s["start"], s["end"]) for s in second] == [(1.0, 8.0), (18.0, 20.0)]
+    assert second[0]["words"][1] == {"word": "de", "start": 7.0, "end": 8.0}
+    assert third == [{"start": 0.0, "end": 4.5, "text": "derde"}]
+    # Origineel blijft ongewijzigd
+    assert segments[1]["start"] == 43.0 and segments[1]["words"][0]["start"] == 43.0
+    print("✅ Segmenten terugzetten werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start batch packing test...\n")
+
+    results = {}
+    for name, test in [("Batch planning", test_plan_batches),
+                       ("Segmenten terugzetten", test_split_segments)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
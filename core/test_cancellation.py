@@ -0,0 +1,138 @@
+"""
+Test bestand voor coöperatieve annulering
+Controleert stop/pauze via het cancellation token, het stoppen van eigen subprocessen en hervatten per venster
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.cancellation import CancellationToken, CancelledError, run_process, running_children
+from core.resume_state import ChunkCheckpoint, resume_key
+from core.batch_packing import plan_chunks, quiet_boundary, offset_segments
+
+def test_token_pause_and_cancel():
+    """Test dat pauze de lock vrijgeeft en annuleren gepauzeerd werk laat stoppen"""
+    print("🔍 Test pauze en annuleren...")
+
+    token = CancellationToken()
+    token.checkpoint()  # Niet gepauzeerd: direct door
+    lock = threading.Lock()
+    events = []
+
+    def worker():
+        with lock:
+            for index in range(3):
+                try:
+                    token.checkpoint(lock)
+                except CancelledError:
+                    events.append("cancelled")
+                    return
+                events.append(index)
+                time.sleep(0.05)
+
+    token.pause()
+    assert token.paused
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.1)
+    # De worker wacht en heeft de lock vrijgegeven voor ander werk
+    assert events == []
+    assert lock.acquire(timeout=1)
+    lock.release()
+
+    token.resume()
+    time.sleep(0.08)
+    token.cancel()
+    thread.join(timeout=2)
+    assert not thread.is_alive()
+    assert events[0] == 0 and events[-1] == "cancelled"
+    assert token.cancelled and not token.paused
+    print("✅ Pauze en annuleren werken")
+
+def test_run_process_cancel():
+    """Test dat annuleren alleen het eigen subproces beëindigt"""
+    print("🔍 Test annuleren van subproces...")
+
+    result = run_process([sys.executable, "-c", "print('ok')"], text=True)
+    assert result.returncode == 0 and result.stdout.strip() == "ok"
+
+    token = CancellationToken()
+    timer = threading.Timer(0.3, token.cancel)
+    timer.start()
+    start = time.monotonic()
+    try:
+        run_process([sys.executable, "-c", "import time; time.sleep(30)"], token=token)
+        assert False, "CancelledError verwacht"
+    except CancelledError:
+        pass
+    assert time.monotonic() - start < 5
+    assert running_children() == []
+    print("✅ Subproces gestopt binnen één poll interval")
+
+def test_chunk_plan_and_resume():
+    """Test vensterplanning, tijdverschuiving en hervatten vanaf het laatste venster"""
+    print("🔍 Test vensters en hervatten...")
+
+    assert plan_chunks(300, 600) == [(0.0, 300.0)]
+    assert plan_chunks(1300, 600) == [(0.0, 600.0), (600.0, 1300.0)]
+    assert plan_chunks(1500, 600) == [(0.0, 600.0), (600.0, 1200.0), (1200.0, 1500.0)]
+    assert plan_chunks(1500, 0) == [(0.0, 1500.0)]
+
+    energy = [1.0] * 100
+    energy[42] = 0.0
+    assert quiet_boundary(energy, 0.1, 5.0, search_seconds=1.0) == 4.25
+
+    shifted = offset_segments([{"start": 1.0, "end": 2.0, "words": [{"word": "hoi", "start": 1.5, "end": 1.9}]}], 600.0)
+    assert shifted[0]["start"] == 601.0 and shifted[0]["words"][0]["end"] == 601.9
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        media = os.path.join(temp_dir, "video.mp4")
+        with open(media, "wb") as f:
+            f.write(b"x" * 100)
+        key = resume_key(media, "large-v3", "nl")
+        assert key == resume_key(media, "large-v3", "nl") and key != resume_key(media, "tiny", "nl")
+
+        checkpoint = ChunkCheckpoint(key, temp_dir)
+        assert not checkpoint.load()
+        checkpoint.boundaries = [[0, 10], [10, 20]]
+        checkpoint.add_chunk([{"start": 0.0, "end": 1.0, "text": "een"}], "nl")
+
+        resumed = ChunkCheckpoint(key, temp_dir)
+        assert resumed.load()
+        assert resumed.completed == 1 and resumed.language == "nl"
+        assert resumed.boundaries == [[0, 10], [10, 20]] and resumed.segments[0]["text"] == "een"
+        resumed.clear()
+        assert not ChunkCheckpoint(key, temp_dir).load()
+    print("✅ Vensters en hervatten werken")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start annulering test...\n")
+
+    results = {}
+    for name, test in [("Pauze en annuleren", test_token_pause_and_cancel),
+                       ("Subproces annuleren", test_run_process_cancel),
+                       ("Vensters en hervatten", test_chunk_plan_and_resume)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
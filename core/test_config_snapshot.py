@@ -0,0 +1,133 @@
+"""
+Test bestand voor de configuratie snapshot
+Controleert onveranderlijke snapshots en gebundelde, atomaire .env writes (ook bij afsluiten)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import subprocess
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.config_snapshot import ConfigSnapshot, update_env_file, DebouncedEnvWriter
+
+def test_snapshot():
+    """Test dat een snapshot los staat van de bron en getypeerd leest"""
+    print("🔍 Test configuratie snapshot...")
+
+    values = {"WHISPER_MODEL": "large-v3", "BATCH_SIZE": "8", "VAD_THRESHOLD": "0.5",
+              "AUTO_DETECT_LANGUAGE": "true", "window_geometry": '{"width": 1200}'}
+    snapshot = ConfigSnapshot(values)
+    values["WHISPER_MODEL"] = "tiny"
+
+    assert snapshot["WHISPER_MODEL"] == "large-v3"
+    assert snapshot.get_int("BATCH_SIZE") == 8
+    assert snapshot.get_float("VAD_THRESHOLD") == 0.5
+    assert snapshot.get_bool("AUTO_DETECT_LANGUAGE") is True
+    assert snapshot.get_json("window_geometry") == {"width": 1200}
+    assert snapshot.get_int("WHISPER_MODEL", 3) == 3
+    assert snapshot.get_env("ONBEKEND", "en") == "en"
+    assert len(snapshot) == 5
+
+    try:
+        snapshot["WHISPER_MODEL"] = "tiny"
+        assert False, "snapshot mag niet wijzigbaar zijn"
+    except TypeError:
+        pass
+    print("✅ Configuratie snapshot werkt")
+
+def test_update_env_file():
+    """Test dat meerdere keys in één keer worden bijgewerkt met behoud van commentaar"""
+    print("\n🔍 Test .env bijwerken...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env_path = os.path.join(temp_dir, "whisper_config.env")
+        with open(env_path, "w", encoding="utf-8") as f:
+            f.write("# Whisper instellingen\nWHISPER_MODEL=large-v3\n\nDEFAULT_LANGUAGE=en\n")
+
+        assert update_env_file(env_path, {"DEFAULT_LANGUAGE": "nl", "BATCH_SIZE": 16})
+        with open(env_path, encoding="utf-8") as f:
+            content = f.read()
+        assert content == ("# Whisper instellingen\nWHISPER_MODEL=large-v3\n\n"
+                           "DEFAULT_LANGUAGE=nl\nBATCH_SIZE=16\n")
+        # Geen tijdelijke bestanden achtergelaten
+        assert os.listdir(temp_dir) == ["whisper_config.env"]
+    print("✅ .env bijwerken werkt")
+
+def test_debounced_writer():
+    """Test dat snelle wijzigingen in één schrijfactie terechtkomen"""
+    print("\n🔍 Test gebundelde .env writer...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env_path = os.path.join(temp_dir, "whisper_config.env")
+        writer = DebouncedEnvWriter(lambda: env_path, delay=0.05)
+
+        for i in range(20):
+            writer.queue("BATCH_SIZE", i)
+        writer.queue("DEFAULT_LANGUAGE", "nl")
+        assert writer.write_count == 0 and len(writer.pending) == 2
+
+        deadline = time.time() + 2
+        while writer.write_count == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert writer.write_count == 1 and not writer.pending
+        with open(env_path, encoding="utf-8") as f:
+            assert f.read() == "BATCH_SIZE=19\nDEFAULT_LANGUAGE=nl\n"
+
+        # Expliciete flush schrijft direct
+        writer.queue("BATCH_SIZE", 4)
+        assert writer.flush() and writer.write_count == 2
+        assert writer.flush() and writer.write_count == 2
+
+        # Zonder (bestaand) bestand wordt niets aangemaakt en blijven de wijzigingen gepland
+        missing_path = os.path.join(temp_dir, "ontbreekt.env")
+        for path in (None, missing_path):
+            skipping = DebouncedEnvWriter(lambda: path, delay=60, create_missing=False)
+            skipping.queue("BATCH_SIZE", 8)
+            assert not skipping.flush() and skipping.pending == {"BATCH_SIZE": 8}
+        assert not os.path.exists(missing_path)
+        open(missing_path, "w").close()
+        assert skipping.flush() and not skipping.pending
+        with open(missing_path, encoding="utf-8") as f:
+            assert f.read() == "BATCH_SIZE=8\n"
+
+        # Proces stopt binnen de wachttijd: de geplande wijziging wordt toch geschreven
+        exit_path = os.path.join(temp_dir, "afsluiten.env")
+        script = ("from core.config_snapshot import DebouncedEnvWriter\n"
+                  f"DebouncedEnvWriter(lambda: {exit_path!r}, delay=0.3).queue('BATCH_SIZE', 2)\n")
+        subprocess.run([sys.executable, "-c", script], cwd=project_root, check=True, timeout=30,
+                       env=dict(os.environ, MAGIC_TIME_FILE_LOGGING="0"), stdout=subprocess.DEVNULL)
+        with open(exit_path, encoding="utf-8") as f:
+            assert f.read() == "BATCH_SIZE=2\n"
+        assert os.listdir(temp_dir).count("afsluiten.env") == 1 and not [
+            name for name in os.listdir(temp_dir) if name.endswith(".tmp")]
+    print("✅ Gebundelde .env writer werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start configuratie snapshot test...\n")
+
+    results = {}
+    for name, test in [("Snapshot", test_snapshot),
+                       (".env bijwerken", test_update_env_file),
+                       ("Gebundelde writer", test_debounced_writer)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,178 @@
+"""
+Test bestand voor gedistribueerde batch verwerking
+Controleert leases, heartbeats, herplannen na een dode worker en het terugsturen van SRT's (meerdere lokale worker processen)
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import urllib.error
+import urllib.request
+import multiprocessing
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.coordinator import (LeaseQueue, Coordinator, CoordinatorClient, run_worker, map_path, lease_seconds,
+                              TOKEN_HEADER, MIN_LEASE_SECONDS, MAX_LEASE_SECONDS,
+                              JOB_QUEUED, JOB_LEASED, JOB_DONE, JOB_FAILED)
+
+def test_lease_queue():
+    """Test leases, heartbeats, verlopen leases en persistentie"""
+    print("🔍 Test lease queue...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "queue.json")
+        queue = LeaseQueue(path, max_attempts=2)
+        first, second = queue.add(["/share/a.mp4", "/share/b.mp4"])
+
+        job = queue.lease("w1", lease_seconds=0.1)
+        assert job["id"] == first and job["attempts"] == 1
+        assert queue.heartbeat(first, "w1", lease_seconds=0.1)
+        assert not queue.heartbeat(first, "w2")
+
+        # w1 stopt met heartbeats: de job gaat naar w2
+        time.sleep(0.15)
+        job = queue.lease("w2")
+        assert job["id"] == first and job["attempts"] == 2
+        assert not queue.complete(first, "w1")
+        assert queue.complete(first, "w2", {"srt": "/share/a.srt"})
+
+        # Na MAX_ATTEMPTS mislukte pogingen faalt de job definitief
+        assert queue.lease("w1")["id"] == second
+        assert queue.fail(second, "w1", "CUDA out of memory")
+        assert queue.lease("w1")["id"] == second
+        assert queue.fail(second, "w1", "CUDA out of memory")
+        assert queue.lease("w1") is None
+
+        counts = LeaseQueue(path).counts()
+        assert counts == {JOB_QUEUED: 0, JOB_LEASED: 0, JOB_DONE: 1, JOB_FAILED: 1}
+    print("✅ Lease queue werkt")
+
+def test_map_path():
+    """Test vertaling van gedeelde opslag paden per worker"""
+    print("🔍 Test pad vertaling...")
+
+    path_map = {"/mnt/share": "/media/share", "/mnt/share/films": "/films"}
+    assert map_path("/mnt/share/series/a.mp4", path_map) == os.path.join("/media/share", "series", "a.mp4")
+    assert map_path("/mnt/share/films/b.mp4", path_map) == os.path.join("/films", "b.mp4")
+    assert map_path("/mnt/shared/c.mp4", path_map) == "/mnt/shared/c.mp4"
+    assert map_path("/other/d.mp4", None) == "/other/d.mp4"
+    print("✅ Pad vertaling werkt")
+
+def test_request_validation():
+    """Test dat ongeldige bodies een 400 geven en lease_seconds begrensd wordt"""
+    print("🔍 Test validatie van requests...")
+
+    assert lease_seconds(None) == 60.0
+    assert lease_seconds(0.001) == MIN_LEASE_SECONDS and lease_seconds(1e12) == MAX_LEASE_SECONDS
+    for value in ("veel", "nan"):
+        try:
+            lease_seconds(value)
+            assert False, "ValueError verwacht"
+        except ValueError:
+            pass
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        coordinator = Coordinator(LeaseQueue(os.path.join(temp_dir, "queue.json")), port=0, token="geheim")
+        coordinator.start()
+        try:
+            for body in (b"[1, 2]", b"42", b'"tekst"', b"{kapot", b'{"worker": "w", "lease_seconds": "veel"}'):
+                request = urllib.request.Request(coordinator.url + "/lease", data=body, method="POST",
+                                                 headers={"Content-Type": "application/json", TOKEN_HEADER: "geheim"})
+                try:
+                    urllib.request.urlopen(request, timeout=5)
+                    assert False, f"400 verwacht voor {body!r}"
+                except urllib.error.HTTPError as e:
+                    assert e.code == 400, (body, e.code)
+
+            client = CoordinatorClient(coordinator.url, "geheim")
+            client.submit([os.path.join(temp_dir, "a.mp4")])
+            job = client.lease("w1", lease_seconds=1e9)
+            assert job["lease_expires"] - time.time() <= MAX_LEASE_SECONDS + 1
+        finally:
+            coordinator.shutdown()
+    print("✅ Validatie van requests werkt")
+
+def _handle_job(job, token):
+    marker = job["options"]["crash_marker"]
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)  # Worker machine valt weg met een lease
+    name = os.path.basename(job["path"])
+    return {"srt": f"1\n00:00:00,000 --> 00:00:01,000\n{name}\n",
+            "transcript.json": json.dumps({"segments": [{"start": 0.0, "end": 1.0, "text": name}]})}
+
+def worker_process(url, token):
+    """Worker proces voor de test (moet op module niveau staan voor spawn)"""
+    client = CoordinatorClient(url, token, timeout=5.0)
+    run_worker(client, _handle_job, lease_seconds=0.6, poll_interval=0.1, exit_when_idle=True)
+
+def test_distributed_workers():
+    """Test drie lokale workers waarvan er één wegvalt tijdens een job"""
+    print("🔍 Test coordinator met meerdere workers...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = []
+        for index in range(5):
+            path = os.path.join(temp_dir, f"video_{index}.mp4")
+            open(path, "wb").close()
+            files.append(path)
+
+        coordinator = Coordinator(LeaseQueue(os.path.join(temp_dir, "queue.json")), port=0, token="geheim",
+                                  lease_bounds=(0.5, 60.0))
+        coordinator.start()
+        try:
+            assert CoordinatorClient(coordinator.url, "fout").status().get("error") == "ongeldige token"
+            client = CoordinatorClient(coordinator.url, "geheim")
+            client.submit(files, {"crash_marker": os.path.join(temp_dir, "crashed")})
+
+            context = multiprocessing.get_context("spawn")
+            workers = [context.Process(target=worker_process, args=(coordinator.url, "geheim")) for _ in range(3)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join(timeout=60)
+            assert sorted(worker.exitcode for worker in workers) == [0, 0, 1]
+
+            status = client.status()
+            assert status["counts"][JOB_DONE] == 5, status["counts"]
+            assert sorted(job["attempts"] for job in status["jobs"]) == [1, 1, 1, 1, 2]
+            for path in files:
+                base = os.path.splitext(path)[0]
+                with open(base + ".srt", encoding="utf-8") as f:
+                    assert os.path.basename(path) in f.read()
+                with open(base + ".transcript.json", encoding="utf-8") as f:
+                    assert json.load(f)["segments"][0]["text"] == os.path.basename(path)
+        finally:
+            coordinator.shutdown()
+    print("✅ Coordinator met meerdere workers werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start coordinator test...\n")
+
+    results = {}
+    for name, test in [("Lease queue", test_lease_queue),
+                       ("Pad vertaling", test_map_path),
+                       ("Validatie van requests", test_request_validation),
+                       ("Meerdere workers", test_distributed_workers)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,196 @@
+"""
+Test bestand voor CPU replica's
+Controleert de verdeling van cores over replica's, het vastzetten op cores en parallelle workers in de server
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.cpu_replicas import plan_cpu_replicas, apply_replica, physical_core_groups, model_ram_gb
+from core.transcription_service import PersistentJobQueue, TranscriptionServer, TranscriptionClient, serve_jobs
+from core.audio_extraction import audio_work_copy
+
+def _groups(physical, threads_per_core=2):
+    """Nep topologie: hyperthread siblings als (core, core + physical) zoals op Linux"""
+    return [[core + sibling * physical for sibling in range(threads_per_core)] for core in range(physical)]
+
+def test_plan_replicas():
+    """Test automatische en handmatige verdeling over cores en geheugen"""
+    print("🔍 Test replica planning...")
+
+    # 32 fysieke cores, ruim geheugen: 8 replica's van 4 threads
+    plan = plan_cpu_replicas("large-v3", core_groups=_groups(32), ram_gb=128)
+    assert len(plan) == 8 and all(replica["threads"] == 4 for replica in plan)
+    assert plan[0]["cores"] == [0, 32, 1, 33, 2, 34, 3, 35]
+    all_cores = [cpu for replica in plan for cpu in replica["cores"]]
+    assert len(all_cores) == len(set(all_cores)) == 64
+
+    # Geheugen is de beperking: minder replica's, meer threads per replica
+    plan = plan_cpu_replicas("large-v3", core_groups=_groups(32), ram_gb=2.0 + 3 * model_ram_gb("large-v3"))
+    assert len(plan) == 3 and plan[0]["threads"] == 10
+    assert len(plan_cpu_replicas("tiny", core_groups=_groups(32), ram_gb=16)) == 8
+
+    # Handmatig aantal replica's of threads
+    assert [replica["threads"] for replica in plan_cpu_replicas("small", 2, core_groups=_groups(8), ram_gb=64)] == [4, 4]
+    plan = plan_cpu_replicas("small", threads_per_replica=2, core_groups=_groups(8), ram_gb=64)
+    assert len(plan) == 4 and plan[-1]["cores"] == [6, 14, 7, 15]
+
+    # Weinig cores of geheugen: altijd minstens één replica
+    assert len(plan_cpu_replicas("large-v3", core_groups=_groups(2), ram_gb=1)) == 1
+    assert physical_core_groups()
+    print("✅ Replica planning werkt")
+
+def test_apply_replica():
+    """Test dat het proces op de cores van de replica vastgezet wordt"""
+    print("🔍 Test vastzetten op cores...")
+
+    if not hasattr(os, "sched_getaffinity"):
+        print("⏭️ Geen affinity ondersteuning op dit platform")
+        return
+    original = os.sched_getaffinity(0)
+    saved_env = os.environ.get("OMP_NUM_THREADS")
+    try:
+        core = min(original)
+        assert apply_replica({"index": 0, "cores": [core], "threads": 1})
+        assert os.sched_getaffinity(0) == {core}
+        assert os.environ["OMP_NUM_THREADS"] == "1"
+    finally:
+        os.sched_setaffinity(0, original)
+        if saved_env is None:
+            os.environ.pop("OMP_NUM_THREADS", None)
+        else:
+            os.environ["OMP_NUM_THREADS"] = saved_env
+    print("✅ Vastzetten op cores werkt")
+
+def _handle_replica_job(job, progress, token):
+    time.sleep(0.5)
+    return {"pid": os.getpid(), "threads": os.environ.get("OMP_NUM_THREADS")}
+
+def replica_worker(conn, replica):
+    """Worker target met een replica argument (moet op module niveau staan voor spawn)"""
+    apply_replica(replica)
+    serve_jobs(conn, _handle_replica_job)
+
+def _handle_copy_job(job, progress, token):
+    # Zelfde stap als TranscriptionCore: werken op een kopie van de audio
+    with audio_work_copy(job["audio_path"]) as work_path:
+        time.sleep(0.5)  # De andere worker maakt intussen zijn kopie
+        with open(work_path, "rb") as f:
+            return {"pid": os.getpid(), "work_path": work_path, "content": f.read().decode()}
+
+def copy_worker(conn, replica):
+    """Worker target die de audio kopie van een job leest (module niveau voor spawn)"""
+    serve_jobs(conn, _handle_copy_job)
+
+def _connect(server):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            return TranscriptionClient(server.address, b"test")
+        except OSError:
+            time.sleep(0.05)
+    return None
+
+def test_parallel_replicas():
+    """Test dat jobs over de replica's van de server verdeeld worden"""
+    print("🔍 Test parallelle replica's...")
+
+    if sys.platform == "win32":
+        print("⏭️ Unix socket test overgeslagen op Windows")
+        return
+
+    allowed = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    replicas = [{"index": index, "cores": allowed, "threads": 1} for index in range(2)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server = TranscriptionServer(replica_worker, address=os.path.join(temp_dir, "t.sock"), authkey=b"test",
+                                     queue=PersistentJobQueue(os.path.join(temp_dir, "queue.json")),
+                                     worker_args=[(replica,) for replica in replicas])
+        server.start()
+        client = _connect(server)
+        try:
+            assert client is not None, "Server niet bereikbaar"
+            assert client.status()["workers"] == 2
+            # Workers eerst laten opstarten zodat de meting alleen de jobs telt
+            warmup = [client.submit(f"/media/warmup{index}.wav") for index in range(2)]
+            for job_id in warmup:
+                client.wait(job_id)
+
+            start = time.monotonic()
+            job_ids = [client.submit(f"/media/{index}.wav") for index in range(4)]
+            results = [client.wait(job_id) for job_id in job_ids]
+            elapsed = time.monotonic() - start
+            assert len({result["pid"] for result in results}) == 2
+            assert all(result["threads"] == "1" for result in results)
+            assert elapsed < 1.9, f"Jobs liepen niet parallel ({elapsed:.2f}s)"
+        finally:
+            if client is not None:
+                client.close()
+            server.shutdown()
+    print("✅ Parallelle replica's werken")
+
+def test_replicas_same_directory():
+    """Test dat parallelle workers met bestanden uit dezelfde map elk hun eigen audio kopie gebruiken"""
+    print("🔍 Test workers in dezelfde map...")
+
+    if sys.platform == "win32":
+        print("⏭️ Unix socket test overgeslagen op Windows")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for name in ("a", "b"):
+            path = os.path.join(temp_dir, f"{name}.wav")
+            with open(path, "w") as f:
+                f.write(name * 1000)
+            paths.append(path)
+        server = TranscriptionServer(copy_worker, address=os.path.join(temp_dir, "t.sock"), authkey=b"test",
+                                     queue=PersistentJobQueue(os.path.join(temp_dir, "queue.json")),
+                                     worker_args=[({"index": index},) for index in range(2)])
+        server.start()
+        client = _connect(server)
+        try:
+            assert client is not None, "Server niet bereikbaar"
+            job_ids = [client.submit(path) for path in paths]
+            results = [client.wait(job_id) for job_id in job_ids]
+            assert [result["content"] for result in results] == ["a" * 1000, "b" * 1000]
+            assert len({result["pid"] for result in results}) == 2
+            assert len({result["work_path"] for result in results}) == 2
+            assert not any(os.path.exists(result["work_path"]) for result in results)
+        finally:
+            if client is not None:
+                client.close()
+            server.shutdown()
+        assert sorted(name for name in os.listdir(temp_dir) if name.endswith(".wav")) == ["a.wav", "b.wav"]
+    print("✅ Workers in dezelfde map werken")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start CPU replica test...\n")
+
+    results = {}
+    for name, test in [("Replica planning", test_plan_replicas),
+                       ("Vastzetten op cores", test_apply_replica),
+                       ("Parallelle replica's", test_parallel_replicas),
+                       ("Workers in dezelfde map", test_replicas_same_directory)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
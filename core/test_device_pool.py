@@ -0,0 +1,167 @@
+"""
+Test bestand voor de device pool
+Controleert verdeling over het minst belaste device, volgorde van resultaten en uitval van een device (CPU devices als stand-in voor GPU's)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.device_pool import DevicePool, GpuMemorySampler, split_device, parse_devices
+from core.inference_tuning import default_compute_type, default_inference_config
+from core.audio_extraction import audio_work_copy
+
+def test_device_names():
+    """Test device namen met index"""
+    print("🔍 Test device namen...")
+
+    assert split_device("cuda:1") == ("cuda", 1)
+    assert split_device("cuda") == ("cuda", None)
+    assert split_device("cpu") == ("cpu", None)
+    assert parse_devices("cuda:0, cuda:1") == ["cuda:0", "cuda:1"]
+    assert parse_devices(["cpu:0", "cpu:1"]) == ["cpu:0", "cpu:1"]
+    assert parse_devices(None) == [] and parse_devices("auto")
+    assert default_compute_type("cuda:1") == "float16" and default_compute_type("cpu") == "int8"
+    assert default_inference_config("cuda:1")["batch_size"] == default_inference_config("cuda")["batch_size"]
+    print("✅ Device namen werken")
+
+def test_least_loaded_dispatch():
+    """Test dat elk device één replica laadt, de belasting gelijk verdeeld wordt en resultaten op volgorde komen"""
+    print("🔍 Test verdeling over devices...")
+
+    loaded = []
+
+    def load_replica(device):
+        loaded.append((device, threading.current_thread().name))
+        return {"device": device}
+
+    def run(replica, item):
+        time.sleep(item["cost"] * 0.02)
+        return (item["name"], replica["device"])
+
+    costs = [1, 8, 2, 2, 7, 3, 1, 4]
+    items = [{"name": f"file{index}", "cost": cost} for index, cost in enumerate(costs)]
+    with DevicePool(["cpu:0", "cpu:1"], load_replica) as pool:
+        futures = pool.map(run, items, costs)
+        results = [future.result(timeout=10) for future in futures]
+        assert pool.loads() == {"cpu:0": 0.0, "cpu:1": 0.0}
+
+    # Resultaten in volgorde van indienen, ongeacht welk device eerst klaar was
+    assert [name for name, _ in results] == [item["name"] for item in items]
+    assert sorted(device for device, _ in loaded) == ["cpu:0", "cpu:1"]
+    assert all(thread_name == f"device-pool-{device}" for device, thread_name in loaded)
+
+    # Langste eerst naar het minst belaste device: beide devices krijgen 14 eenheden
+    per_device = {}
+    for cost, future in zip(costs, futures):
+        per_device[future.device] = per_device.get(future.device, 0) + cost
+    assert per_device == {"cpu:0": 14, "cpu:1": 14}, per_device
+    print("✅ Verdeling over devices werkt")
+
+def test_failed_device():
+    """Test dat jobs van een device waarvan de replica niet laadt naar de andere devices gaan"""
+    print("🔍 Test uitval van een device...")
+
+    def load_replica(device):
+        if device == "cpu:1":
+            time.sleep(0.05)  # Jobs zijn al toegewezen voordat het laden mislukt
+            raise RuntimeError("CUDA out of memory")
+        return device
+
+    pool = DevicePool(["cpu:0", "cpu:1"], load_replica)
+    futures = [pool.submit(lambda replica, item: (item, replica), index) for index in range(6)]
+    results = [future.result(timeout=10) for future in futures]
+    assert results == [(index, "cpu:0") for index in range(6)]
+    pool.shutdown()
+
+    broken = DevicePool(["cpu:0"], lambda device: 1 / 0)
+    try:
+        broken.submit(lambda replica, item: item, "x").result(timeout=10)
+        assert False, "RuntimeError verwacht"
+    except RuntimeError:
+        pass
+    broken.shutdown()
+    print("✅ Uitval van een device werkt")
+
+def test_gpu_memory_sampler():
+    """Test dat de piek van het device geheugen tijdens een blok gemeten wordt"""
+    print("🔍 Test GPU geheugen meting...")
+
+    readings = iter([1000.0, 1500.0, 6200.0, 3000.0])
+
+    def fake_status():
+        # Na de laatste meting blijft het geheugen op 1200 MB
+        return {1: {"memory_used": next(readings, 1200.0), "memory_total": 24000.0, "utilization": 90.0}}
+
+    sampler = GpuMemorySampler(1, interval=0.01, status=fake_status)
+    with sampler:
+        time.sleep(0.2)  # Kortstondige piek die voor en na het blok niet zichtbaar is
+    assert sampler.peak_mb == 6200.0
+
+    # Zonder nvidia-smi (of onbekende GPU) is er geen meting
+    without = GpuMemorySampler(0, interval=0.01, status=lambda: {})
+    with without:
+        time.sleep(0.03)
+    assert without.peak_mb is None and without.used_mb() is None
+    print("✅ GPU geheugen meting werkt")
+
+def test_replicas_same_directory():
+    """Test dat twee replica's met bestanden uit dezelfde map elk hun eigen audio kopie gebruiken"""
+    print("🔍 Test replica's in dezelfde map...")
+
+    both_copied = threading.Barrier(2, timeout=5)
+
+    def run(replica, path):
+        # Zelfde stap als TranscriptionCore: werken op een kopie van de audio
+        with audio_work_copy(path) as work_path:
+            both_copied.wait()  # Beide kopieën bestaan tegelijk
+            with open(work_path, "rb") as f:
+                return work_path, f.read()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for name in ("a", "b"):
+            path = os.path.join(temp_dir, f"{name}.wav")
+            with open(path, "wb") as f:
+                f.write(name.encode() * 1000)
+            paths.append(path)
+        with DevicePool(["cpu:0", "cpu:1"], lambda device: device) as pool:
+            results = [future.result(timeout=10) for future in pool.map(run, paths)]
+        assert [content for _, content in results] == [b"a" * 1000, b"b" * 1000]
+        work_paths = [work_path for work_path, _ in results]
+        assert len(set(work_paths)) == 2 and not any(os.path.exists(path) for path in work_paths)
+        assert sorted(os.listdir(temp_dir)) == ["a.wav", "b.wav"]
+    print("✅ Replica's in dezelfde map werken")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start device pool test...\n")
+
+    results = {}
+    for name, test in [("Device namen", test_device_names),
+                       ("Verdeling over devices", test_least_loaded_dispatch),
+                       ("Uitval van een device", test_failed_device),
+                       ("GPU geheugen meting", test_gpu_memory_sampler),
+                       ("Replica's in dezelfde map", test_replicas_same_directory)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
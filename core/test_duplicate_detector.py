@@ -0,0 +1,96 @@
+"""
+Test bestand voor de duplicaat detectie
+Controleert getrapte hashing, grote bestanden en audio-bewuste groepering
+"""
+
+import sys
+import os
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.duplicate_detector import (find_duplicates, build_duplicate_map, sample_hash,
+                                     full_hash, SAMPLE_BLOCK_SIZE)
+
+def _write(path: str, data: bytes) -> str:
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+def test_tiered_hashing():
+    """Test dat alleen botsingen een volledige hash krijgen"""
+    print("🔍 Test getrapte hashing...")
+
+    full_calls = []
+    def counting_full_hash(path):
+        full_calls.append(os.path.basename(path))
+        return full_hash(path)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        block = SAMPLE_BLOCK_SIZE
+        original = bytes(range(256)) * (block * 4 // 256)
+        a = _write(os.path.join(temp_dir, "aflevering.mkv"), original)
+        b = _write(os.path.join(temp_dir, "kopie.mp4"), original)
+        # Zelfde grootte, verschil buiten de steekproef blokken
+        changed = bytearray(original)
+        changed[block + 10] ^= 0xFF
+        c = _write(os.path.join(temp_dir, "bijna.mp4"), bytes(changed))
+        d = _write(os.path.join(temp_dir, "anders.mp4"), b"klein bestand")
+
+        assert sample_hash(a) == sample_hash(c) and full_hash(a) != full_hash(c)
+
+        groups = find_duplicates([a, b, c, d, b], full_func=counting_full_hash)
+        assert groups == [{"original": a, "duplicates": [b], "method": "bytes"}]
+        assert sorted(full_calls) == ["aflevering.mkv", "bijna.mp4", "kopie.mp4"]
+        assert build_duplicate_map(groups) == {b: a}
+    print("✅ Getrapte hashing werkt")
+
+def test_audio_aware():
+    """Test audio-bewuste groepering over verschillende containers"""
+    print("\n🔍 Test audio-bewuste groepering...")
+
+    audio_calls = []
+    def fake_audio(path):
+        audio_calls.append(os.path.basename(path))
+        return "aflevering" if "aflevering" in path else path
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        a = _write(os.path.join(temp_dir, "aflevering.mkv"), b"mkv data")
+        b = _write(os.path.join(temp_dir, "aflevering.mp4"), b"andere mp4 container")
+        c = _write(os.path.join(temp_dir, "aflevering_kopie.mp4"), b"andere mp4 container")
+        d = _write(os.path.join(temp_dir, "film.mp4"), b"film")
+        e = _write(os.path.join(temp_dir, "lang.mp4"), b"lange film")
+        durations = {a: 60, b: 60, c: 60, d: 60, e: 7200}
+
+        groups = find_duplicates([a, b, c, d, e], audio_aware=True, audio_func=fake_audio,
+                                 duration_func=durations.get)
+        assert groups == [{"original": a, "duplicates": [b, c], "method": "audio"}]
+        # Kopie valt al op bytes af en bestand met andere duur wordt niet gedecodeerd
+        assert sorted(audio_calls) == ["aflevering.mkv", "aflevering.mp4", "film.mp4"]
+    print("✅ Audio-bewuste groepering werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start duplicaat detectie test...\n")
+
+    results = {}
+    for name, test in [("Getrapte hashing", test_tiered_hashing),
+                       ("Audio-bewust", test_audio_aware)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
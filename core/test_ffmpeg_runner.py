@@ -0,0 +1,170 @@
+"""
+Test bestand voor de ffmpeg runner
+Controleert voortgang uit -progress, stderr staart bij fouten, timeouts zonder voortgang en de globale limiet (met een nep ffmpeg script)
+"""
+
+import sys
+import os
+import stat
+import time
+import tempfile
+import threading
+import subprocess
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.ffmpeg_runner import (FFmpegRunner, build_ffmpeg_command, parse_progress_line,
+                                scaled_timeout, input_path)
+from core.cancellation import CancellationToken, CancelledError
+
+# Nep ffmpeg; gedrag via FAKE_FFMPEG_MODE, start/einde in FAKE_FFMPEG_LOG
+FAKE_FFMPEG = """#!/bin/sh
+echo "start" >> "$FAKE_FFMPEG_LOG"
+case "$FAKE_FFMPEG_MODE" in
+  fail)
+    i=0; while [ $i -lt 100 ]; do echo "regel $i" >&2; i=$((i+1)); done
+    exit 3 ;;
+  stall)
+    sleep 5 ;;
+  slow)
+    sleep 0.3 ;;
+  *)
+    for us in N/A 500000 1000000 2000000; do
+      printf 'frame=0\\nout_time_us=%s\\nout_time_ms=%s\\nspeed=4.0x\\n' $us $us
+      if [ $us = 2000000 ]; then echo progress=end; else echo progress=continue; fi
+      echo "waarschuwing" >&2
+    done ;;
+esac
+echo "end" >> "$FAKE_FFMPEG_LOG"
+"""
+
+def _fake_ffmpeg(directory):
+    path = os.path.join(directory, "ffmpeg")
+    with open(path, "w") as f:
+        f.write(FAKE_FFMPEG)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    os.environ["FAKE_FFMPEG_LOG"] = os.path.join(directory, "ffmpeg.log")
+    return path
+
+def test_command_and_parsing():
+    """Test commando opbouw, threads, timeouts en het parsen van -progress"""
+    print("🔍 Test commando en progress parsing...")
+
+    args = ["-y", "-i", "in.mp4", "-vn", "out.wav"]
+    cmd = build_ffmpeg_command(args, "ffmpeg", threads=3)
+    assert cmd[:6] == ["ffmpeg", "-hide_banner", "-nostdin", "-nostats", "-progress", "pipe:1"]
+    assert cmd[6:] == ["-y", "-threads", "3", "-i", "in.mp4", "-vn", "-threads", "3", "out.wav"]
+    assert input_path(args) == "in.mp4" and input_path(["out.wav"]) is None
+
+    assert scaled_timeout(None) is None and scaled_timeout(0) is None
+    assert scaled_timeout(3600, factor=1.0, base=60) == 3660
+    assert scaled_timeout(3600, factor=10.0) > scaled_timeout(3600)
+
+    state = {"out_time": 0.0, "speed": None, "done": False}
+    assert not parse_progress_line("out_time_us=N/A\n", state) and state["out_time"] == 0.0
+    assert not parse_progress_line("out_time_ms=1500000\n", state) and state["out_time"] == 1.5
+    assert not parse_progress_line("speed=12.5x\n", state) and state["speed"] == 12.5
+    assert parse_progress_line("progress=continue\n", state) and not state["done"]
+    assert parse_progress_line("progress=end\n", state) and state["done"]
+    print("✅ Commando en progress parsing werken")
+
+def test_progress_and_failure():
+    """Test voortgang in procenten en de stderr staart bij een fout"""
+    print("🔍 Test voortgang en fouten...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        runner = FFmpegRunner(2, ffmpeg_path=_fake_ffmpeg(temp_dir))
+
+        events = []
+        os.environ["FAKE_FFMPEG_MODE"] = "ok"
+        result = runner.run(["-i", "in.mp4", "out.wav"], duration=2.0,
+                            progress_callback=lambda percent, message: events.append((percent, message)))
+        assert result["returncode"] == 0 and "error" not in result and "stderr_tail" not in result
+        assert [percent for percent, _ in events] == [0.0, 25.0, 50.0, 100.0]
+        assert events[-1][1] == "FFmpeg 100% (4.0x)"
+        assert result["out_time"] == 2.0 and result["speed"] > 0
+
+        os.environ["FAKE_FFMPEG_MODE"] = "fail"
+        result = runner.run(["-i", "in.mp4", "out.wav"], duration=2.0)
+        assert result["returncode"] == 3 and "code 3" in result["error"]
+        tail = result["stderr_tail"].splitlines()
+        assert len(tail) == 40 and tail[-1] == "regel 99"
+    print("✅ Voortgang en fouten werken")
+
+def test_stall_and_cancel():
+    """Test stoppen zonder voortgang en annuleren via een token"""
+    print("🔍 Test timeout en annuleren...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        runner = FFmpegRunner(2, ffmpeg_path=_fake_ffmpeg(temp_dir))
+        os.environ["FAKE_FFMPEG_MODE"] = "stall"
+
+        started = time.monotonic()
+        try:
+            runner.run(["-i", "in.mp4", "out.wav"], duration=2.0, stall_timeout=0.5)
+            assert False, "TimeoutExpired verwacht"
+        except subprocess.TimeoutExpired:
+            pass
+        assert time.monotonic() - started < 3
+
+        token = CancellationToken()
+        threading.Timer(0.3, token.cancel).start()
+        started = time.monotonic()
+        try:
+            runner.run(["-i", "in.mp4", "out.wav"], duration=2.0, token=token)
+            assert False, "CancelledError verwacht"
+        except CancelledError:
+            pass
+        assert time.monotonic() - started < 3
+    print("✅ Timeout en annuleren werken")
+
+def test_concurrency_limit():
+    """Test dat nooit meer dan max_concurrent ffmpeg processen tegelijk lopen"""
+    print("🔍 Test globale limiet...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        runner = FFmpegRunner(2, ffmpeg_path=_fake_ffmpeg(temp_dir))
+        os.environ["FAKE_FFMPEG_MODE"] = "slow"
+        futures = [runner.submit(["-i", "in.mp4", f"out{index}.wav"], duration=1.0) for index in range(3)]
+        # Ook directe aanroepen tellen mee voor de limiet
+        assert runner.run(["-i", "in.mp4", "out3.wav"], duration=1.0)["returncode"] == 0
+        assert all(future.result(timeout=10)["returncode"] == 0 for future in futures)
+        runner.shutdown()
+
+        running = peak = 0
+        with open(os.environ["FAKE_FFMPEG_LOG"], encoding="utf-8") as f:
+            for line in f:
+                running += 1 if line.strip() == "start" else -1
+                peak = max(peak, running)
+        assert peak == 2, peak
+    print("✅ Globale limiet werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start ffmpeg runner test...\n")
+
+    results = {}
+    tests = [("Commando en parsing", test_command_and_parsing)]
+    if os.name != "nt":  # Nep ffmpeg is een shell script
+        tests += [("Voortgang en fouten", test_progress_and_failure),
+                  ("Timeout en annuleren", test_stall_and_cancel),
+                  ("Globale limiet", test_concurrency_limit)]
+    for name, test in tests:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,98 @@
+"""
+Test bestand voor de bestandencollectie
+Controleert lidmaatschap, basename index en de chunked map scan
+"""
+
+import sys
+import os
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.file_collection import FileCollection, iter_scan_directory
+
+def test_collection_membership():
+    """Test volgorde, duplicaten en verwijderen"""
+    print("🔍 Test collectie lidmaatschap...")
+
+    collection = FileCollection()
+    first = os.path.join("media", "a", "Film.mp4")
+    second = os.path.join("media", "b", "Serie.S01E01.mkv")
+    added = collection.add_many([first, second, first, os.path.join("media", "a", ".", "Film.mp4")])
+    assert added == [first, second]
+    assert len(collection) == 2 and first in collection
+    assert collection.paths() == [first, second]
+
+    assert collection.remove(first) == 0
+    assert first not in collection and collection[0] == second
+    assert collection.remove(first) is None
+    assert collection.pop(0) == second and len(collection) == 0
+    print("✅ Collectie lidmaatschap werkt")
+
+def test_basename_index():
+    """Test zoeken op naam: exact, zonder extensie en hoofdletterongevoelig"""
+    print("\n🔍 Test basename index...")
+
+    first = os.path.join("media", "a", "Film.mp4")
+    second = os.path.join("media", "b", "Film.mkv")
+    collection = FileCollection([first, second])
+
+    assert collection.find_by_basename("Film.mkv") == second
+    assert collection.find_by_basename("Film.srt") == first
+    assert collection.find_by_basename("film.MP4") == first
+    assert collection.find_by_basename("film.MP4", fuzzy=False) is None
+
+    collection.remove(first)
+    assert collection.find_by_basename("Film.mp4") == second
+    assert collection.index_of(second) == 0
+    print("✅ Basename index werkt")
+
+def test_scan_directory_chunks():
+    """Test recursieve scan met extensie filter en chunks"""
+    print("\n🔍 Test map scan...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        expected = set()
+        for sub in ("", "x", os.path.join("x", "y")):
+            directory = os.path.join(temp_dir, sub)
+            os.makedirs(directory, exist_ok=True)
+            for name in ("een.mp4", "twee.MKV", "notities.txt"):
+                path = os.path.join(directory, name)
+                open(path, "w").close()
+                if not name.endswith(".txt"):
+                    expected.add(path)
+
+        chunks = list(iter_scan_directory(temp_dir, chunk_size=4))
+        assert [len(chunk) for chunk in chunks] == [4, 2]
+        assert {path for chunk in chunks for path in chunk} == expected
+
+        assert list(iter_scan_directory(temp_dir, should_stop=lambda: True)) == []
+        assert list(iter_scan_directory(os.path.join(temp_dir, "bestaat_niet"))) == []
+    print("✅ Map scan werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start bestandencollectie test...\n")
+
+    results = {}
+    for name, test in [("Lidmaatschap", test_collection_membership),
+                       ("Basename index", test_basename_index),
+                       ("Map scan", test_scan_directory_chunks)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
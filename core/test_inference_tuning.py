@@ -0,0 +1,98 @@
+"""
+Test bestand voor inference tuning
+Controleert de keuze van batch_size/compute_type, opslag per (model, device) en handmatige instellingen
+"""
+
+import sys
+import os
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.inference_tuning import autotune, resolve_inference_config, TuningStore, default_inference_config
+
+def fake_benchmark(calls):
+    """Benchmark waarbij int8_float16/16 het snelst is en batch 32 niet in het geheugen past"""
+    speeds = {("float16", 4): 10, ("float16", 8): 14, ("float16", 16): 18,
+              ("int8_float16", 4): 12, ("int8_float16", 8): 16, ("int8_float16", 16): 20,
+              ("int8", 4): 8, ("int8", 8): 9, ("int8", 16): 9.5}
+
+    def benchmark(compute_type, batch_size):
+        calls.append((compute_type, batch_size))
+        if batch_size >= 32:
+            raise RuntimeError("CUDA out of memory")
+        return {"audio_seconds": 30.0, "seconds": 30.0 / speeds[(compute_type, batch_size)],
+                "peak_memory_mb": batch_size * 100.0}
+    return benchmark
+
+def test_autotune():
+    """Test dat de snelste geslaagde combinatie gekozen wordt"""
+    print("🔍 Test autotune...")
+
+    calls = []
+    result = autotune(fake_benchmark(calls), "cuda")
+    assert (result["compute_type"], result["batch_size"]) == ("int8_float16", 16)
+    assert result["source"] == "tuned" and round(result["throughput"]) == 20
+    assert len(result["measurements"]) == 12 and len(calls) == 12
+
+    # Geheugengrens sluit grote batches uit
+    limited = autotune(fake_benchmark([]), "cuda", memory_limit_mb=1000)
+    assert (limited["compute_type"], limited["batch_size"]) == ("int8_float16", 8)
+
+    # Alles mislukt: standaardwaarden
+    def failing(compute_type, batch_size):
+        raise RuntimeError("geen model")
+    assert autotune(failing, "cpu")["compute_type"] == default_inference_config("cpu")["compute_type"]
+    print("✅ Autotune werkt")
+
+def test_resolve_and_store():
+    """Test dat tuning één keer per (model, device) gebeurt en handmatig voorgaat"""
+    print("\n🔍 Test opslag en handmatige instellingen...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store_path = os.path.join(temp_dir, "tuning.json")
+        calls = []
+        config = resolve_inference_config("large-v3", "cuda", {}, TuningStore(store_path), fake_benchmark(calls))
+        assert config == {"compute_type": "int8_float16", "batch_size": 16, "source": "tuned"}
+        first_calls = len(calls)
+
+        # Nieuwe store leest het bewaarde resultaat; geen nieuwe benchmark
+        config = resolve_inference_config("large-v3", "cuda", {}, TuningStore(store_path), fake_benchmark(calls))
+        assert config["batch_size"] == 16 and len(calls) == first_calls
+
+        manual = resolve_inference_config("large-v3", "cuda",
+                                          {"whisper_batch_size": "8", "whisper_compute_type": "auto"},
+                                          TuningStore(store_path))
+        assert manual == {"compute_type": "int8_float16", "batch_size": 8, "source": "manual"}
+
+        # Zonder benchmark en zonder resultaat: standaardwaarden
+        default = resolve_inference_config("tiny", "cpu", {}, TuningStore(store_path))
+        assert default == {"compute_type": "int8", "batch_size": 8, "source": "default"}
+        assert TuningStore(store_path).get("tiny", "cpu") is None
+    print("✅ Opslag en handmatige instellingen werken")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start inference tuning test...\n")
+
+    results = {}
+    for name, test in [("Autotune", test_autotune),
+                       ("Opslag en handmatig", test_resolve_and_store)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
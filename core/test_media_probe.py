@@ -0,0 +1,132 @@
+"""
+Test bestand voor de media probe cache
+Controleert parsing van ffprobe output, cache validatie en gelijktijdig proben
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.media_probe import MediaProbeCache, parse_probe_output
+
+FFPROBE_OUTPUT = {
+    "streams": [
+        {"index": 0, "codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080,
+         "avg_frame_rate": "30000/1001", "r_frame_rate": "30000/1001"},
+        {"index": 1, "codec_type": "audio", "codec_name": "aac", "channels": 6,
+         "channel_layout": "5.1", "sample_rate": "48000", "bit_rate": "384000",
+         "tags": {"language": "eng"}},
+        {"index": 2, "codec_type": "audio", "codec_name": "ac3", "channels": 2,
+         "sample_rate": "44100", "tags": {"language": "nld"}},
+        {"index": 3, "codec_type": "subtitle", "codec_name": "subrip", "tags": {"language": "nld"}},
+    ],
+    "format": {"format_name": "matroska,webm", "duration": "5400.250000", "bit_rate": "8000000"},
+}
+
+def test_parse_probe_output():
+    """Test omzetting van ffprobe JSON naar compacte metadata"""
+    print("🔍 Test ffprobe parsing...")
+
+    info = parse_probe_output(FFPROBE_OUTPUT)
+    assert info["duration"] == 5400.25 and info["bit_rate"] == 8000000
+    assert info["video"] == {"index": 0, "codec": "h264", "width": 1920, "height": 1080, "fps": 29.97}
+    assert [stream["language"] for stream in info["audio_streams"]] == ["eng", "nld"]
+    assert info["audio_streams"][0]["channels"] == 6 and info["audio_streams"][1]["sample_rate"] == 44100
+    assert info["subtitle_streams"][0]["codec"] == "subrip"
+
+    # Alleen audio, duur op stream niveau
+    audio_only = parse_probe_output({"streams": [{"codec_type": "audio", "duration": "12.5"}], "format": {}})
+    assert audio_only["video"] is None and audio_only["duration"] == 12.5
+    print("✅ FFprobe parsing werkt")
+
+def test_cache_invalidation():
+    """Test dat de cache per (pad, grootte, mtime) geldig blijft en persistent is"""
+    print("\n🔍 Test cache validatie...")
+
+    calls = []
+    def fake_probe(file_path):
+        calls.append(file_path)
+        return {"duration": float(os.path.getsize(file_path))}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        media_path = os.path.join(temp_dir, "film.mp4")
+        cache_path = os.path.join(temp_dir, "cache", "media_probe.json")
+        with open(media_path, "wb") as f:
+            f.write(b"x" * 10)
+
+        cache = MediaProbeCache(cache_path, probe_func=fake_probe)
+        assert cache.get(media_path)["duration"] == 10.0
+        assert cache.get(media_path)["duration"] == 10.0
+        assert len(calls) == 1 and cache.save()
+
+        # Nieuwe instantie leest de cache van schijf
+        reloaded = MediaProbeCache(cache_path, probe_func=fake_probe)
+        assert reloaded.get(media_path)["duration"] == 10.0 and len(calls) == 1
+
+        # Gewijzigd bestand wordt opnieuw geprobed
+        with open(media_path, "ab") as f:
+            f.write(b"y" * 5)
+        os.utime(media_path, (time.time() + 5, time.time() + 5))
+        assert reloaded.get_cached(media_path) is None
+        assert reloaded.get(media_path)["duration"] == 15.0 and len(calls) == 2
+
+        assert cache.get(os.path.join(temp_dir, "bestaat_niet.mp4")) is None
+    print("✅ Cache validatie werkt")
+
+def test_probe_many():
+    """Test gelijktijdig proben waarbij gecachede bestanden worden overgeslagen"""
+    print("\n🔍 Test gelijktijdig proben...")
+
+    calls = []
+    def fake_probe(file_path):
+        calls.append(file_path)
+        return None if file_path.endswith("kapot.mp4") else {"duration": 1.0}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for name in ["a.mp4", "b.mp4", "c.mp4", "kapot.mp4"]:
+            paths.append(os.path.join(temp_dir, name))
+            with open(paths[-1], "wb") as f:
+                f.write(b"data")
+
+        cache = MediaProbeCache(os.path.join(temp_dir, "media_probe.json"), probe_func=fake_probe)
+        cache.get(paths[0])
+        reported = []
+        results = cache.probe_many(paths + [paths[1]], max_workers=3,
+                                   progress_callback=lambda path, info: reported.append(path))
+
+        assert sorted(calls) == sorted(paths)
+        assert results[paths[3]] is None and all(results[path] for path in paths[:3])
+        assert sorted(reported) == sorted(paths)
+        assert os.path.exists(cache.cache_path) and cache.probe_count == 3
+    print("✅ Gelijktijdig proben werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start media probe test...\n")
+
+    results = {}
+    for name, test in [("FFprobe parsing", test_parse_probe_output),
+                       ("Cache validatie", test_cache_invalidation),
+                       ("Gelijktijdig proben", test_probe_many)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,78 @@
+"""
+Test bestand voor de model configuratie
+Controleert canonieke sleutels en het tellen van vermeden herladingen
+"""
+
+import sys
+import os
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.model_config import ModelConfig, ModelReloadMetrics, build_vad_settings
+
+def test_canonical_key():
+    """Test dat gelijke instellingen dezelfde sleutel geven en echte wijzigingen niet"""
+    print("🔍 Test canonieke model sleutel...")
+
+    ui_settings = {"whisper_model": "large-v3", "vad_method": "Pyannote (nauwkeurig)",
+                   "vad_onset": 0.5, "vad_chunk_size": 30, "language": "nl"}
+    base = ModelConfig.from_settings("large-v3", build_vad_settings(ui_settings), "cuda", "float16")
+
+    # Zelfde waarden in andere vorm (WhisperX naam, string, float ruis)
+    same = ModelConfig.from_settings("large-v3", build_vad_settings({
+        "vad_method_whisperx": "pyannote", "vad_onset": "0.5000001", "vad_chunk_size": "30",
+        "language": "en"}), "cuda", "float16")
+    assert base == same and hash(base) == hash(same)
+    assert len({base: 1, same: 2}) == 1
+
+    assert base != ModelConfig.from_settings("large-v3", build_vad_settings({**ui_settings, "vad_onset": 0.6}),
+                                             "cuda", "float16")
+    assert base != ModelConfig.from_settings("tiny", build_vad_settings(ui_settings), "cuda", "float16")
+    assert base.vad_options_dict()["vad_offset"] == 0.5
+
+    # Op CPU is het compute type altijd int8
+    cpu = ModelConfig.from_settings("tiny", None, "cpu", "float16")
+    assert cpu.compute_type == "int8" and cpu.vad_method == "silero"
+    print("✅ Canonieke model sleutel werkt")
+
+def test_reload_metrics():
+    """Test het tellen van loads en vermeden herladingen"""
+    print("\n🔍 Test herlaad metrics...")
+
+    metrics = ModelReloadMetrics()
+    config = ModelConfig.from_settings("tiny", build_vad_settings({}), "cpu", "int8")
+    metrics.record_load(config)
+    for _ in range(3):
+        metrics.record_avoided(config)
+    summary = metrics.summary()
+    assert summary["loads"] == 1 and summary["avoided_reloads"] == 3
+    assert summary["current"] == config.describe()
+    metrics.reset()
+    assert metrics.summary() == {"loads": 0, "avoided_reloads": 0, "current": None}
+    print("✅ Herlaad metrics werken")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start model configuratie test...\n")
+
+    results = {}
+    for name, test in [("Canonieke sleutel", test_canonical_key),
+                       ("Herlaad metrics", test_reload_metrics)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
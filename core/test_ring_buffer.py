@@ -0,0 +1,146 @@
+"""
+Test bestand voor de ring buffer van de real-time grafieken
+Controleert het doorlopen van de buffer, lopende min/max en samengevoegde repaints
+"""
+
+import sys
+import os
+import random
+import importlib.util
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.ring_buffer import RingBuffer
+
+def _load_chart_module():
+    """Laad real_time_chart direct: het features package importeert ook torch en de rest van de GUI"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    path = os.path.join(project_root, "ui_pyside6", "features", "real_time_chart.py")
+    spec = importlib.util.spec_from_file_location("real_time_chart", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return app, module
+
+def test_wraps():
+    """Test dat de oudste waarden wegvallen als de buffer vol is"""
+    print("🔍 Test doorlopen van de ring buffer...")
+    buffer = RingBuffer(3)
+    for value in (1, 2):
+        buffer.append(value)
+    assert len(buffer) == 2 and list(buffer.values) == [1, 2]
+
+    for value in (3, 4, 5):
+        buffer.append(value)
+    assert len(buffer) == 3
+    assert list(buffer.values) == [3, 4, 5]
+    assert buffer.last() == 5
+
+    buffer.clear()
+    assert len(buffer) == 0
+    buffer.append(7)
+    assert list(buffer.values) == [7] and buffer.min() == buffer.max() == 7
+    print("✅ Doorlopen van de ring buffer werkt")
+
+def test_min_max_after_eviction():
+    """Test dat min/max kloppen nadat de uiterste waarde uit de buffer is gevallen"""
+    print("🔍 Test lopende min/max...")
+    buffer = RingBuffer(3)
+    for value in (100, 50, 60):
+        buffer.append(value)
+    assert buffer.max() == 100 and buffer.min() == 50
+
+    buffer.append(70)  # 100 valt weg
+    assert buffer.max() == 70 and buffer.min() == 50
+    buffer.append(80)  # 50 valt weg
+    assert buffer.min() == 60 and buffer.max() == 80
+    buffer.append(-5)  # nieuw minimum, 60 valt weg
+    assert buffer.min() == -5 and buffer.max() == 80
+
+    # Gelijke waarden: het minimum blijft staan zolang één kopie in de buffer zit
+    buffer = RingBuffer(2)
+    for value in (1, 1, 2):
+        buffer.append(value)
+    assert buffer.min() == 1 and buffer.max() == 2
+    buffer.append(3)
+    assert buffer.min() == 2 and buffer.max() == 3
+
+    # Vergelijken met een volledige scan over een willekeurige reeks
+    rng = random.Random(7)
+    for maxlen in (1, 2, 5, 50):
+        buffer = RingBuffer(maxlen)
+        for _ in range(500):
+            buffer.append(rng.randint(-20, 20))
+            assert buffer.min() == min(buffer.values), maxlen
+            assert buffer.max() == max(buffer.values), maxlen
+    print("✅ Lopende min/max werkt")
+
+def test_repaints_coalesced():
+    """Test dat veel samples binnen het repaint interval één repaint geven"""
+    print("🔍 Test samengevoegde repaints...")
+    try:
+        app, chart_module = _load_chart_module()
+    except ImportError as e:
+        print(f"⏭️ Test overgeslagen, PySide6 niet beschikbaar: {e}")
+        return
+    from PySide6.QtTest import QTest
+
+    class CountingChart(chart_module.RealTimeChart):
+        paints = 0
+
+        def paintEvent(self, event):
+            CountingChart.paints += 1
+            super().paintEvent(event)
+
+    # Onzichtbare grafiek plant geen repaints
+    hidden = CountingChart("CPU Gebruik", max_points=10)
+    hidden.add_data_point(10)
+    assert not hidden._repaint_timer.isActive()
+
+    chart = CountingChart("CPU Gebruik", max_points=10)
+    chart.resize(200, 150)
+    chart.show()
+    QTest.qWait(2 * chart_module.REPAINT_INTERVAL_MS)
+    CountingChart.paints = 0
+
+    for value in range(50):
+        chart.add_data_point(value)
+    assert chart._repaint_timer.isActive()
+    assert CountingChart.paints == 0
+    QTest.qWait(4 * chart_module.REPAINT_INTERVAL_MS)
+    assert CountingChart.paints == 1, CountingChart.paints
+
+    assert len(chart.buffer) == 10 and len(chart.data_points) == 10
+    assert chart.buffer.min() == 40 and chart.buffer.max() == 49
+    chart.close()
+    hidden.deleteLater()
+    chart.deleteLater()
+    print("✅ Samengevoegde repaints werken")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start ring buffer test...\n")
+
+    results = {}
+    for name, test in [("Doorlopen", test_wraps),
+                       ("Min/max na wegvallen", test_min_max_after_eviction),
+                       ("Samengevoegde repaints", test_repaints_coalesced)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,138 @@
+"""
+Test bestand voor de ondertitel cue index
+Controleert één-pass parsing, cue lookup en samenvoegen
+"""
+
+import sys
+import os
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.subtitle_index import CueIndex
+from core.subtitle_writers import render_subtitles
+from core.subtitle_functions import read_srt_file, read_ass_file, merge_subtitle_files
+
+SRT_CONTENT = (
+    "\ufeff1\r\n00:00:01,000 --> 00:00:02,500\r\nHallo\r\nwereld\r\n\r\n"
+    "2\r\n00:00:03,5 --> 00:00:10,000 X:1\r\nLang\r\n\r\n"
+    "3\r\n00:00:04,000 --> 00:00:05,000\r\nOverlap\r\n"
+)
+
+VTT_CONTENT = (
+    "WEBVTT\n\nintro\n00:01.000 --> 00:02.000\nEerste\nregel\n\n"
+    "00:00:02.000 --> 00:00:03.000\nTweede\n"
+)
+
+SEGMENTS = [
+    {"start": 0.0, "end": 1.0, "text": "Een, twee"},
+    {"start": 1.0, "end": 2.25, "text": "Drie"},
+]
+
+def test_parse_formats():
+    """Test één-pass parsing van SRT, VTT en ASS"""
+    print("🔍 Test parsing...")
+
+    index = CueIndex.parse(SRT_CONTENT.lstrip("\ufeff"), "srt")
+    assert len(index) == 3
+    assert index.cue(0) == (1000, 2500, "Hallo\nwereld")
+    # Fractie wordt rechts aangevuld: ,5 is 500 ms
+    assert index.cue(1)[:2] == (3500, 10000)
+
+    index = CueIndex.parse(VTT_CONTENT, "vtt")
+    assert [index.cue(i) for i in range(len(index))] == [
+        (1000, 2000, "Eerste regel"), (2000, 3000, "Tweede")
+    ]
+
+    ass_content = render_subtitles(SEGMENTS, "ass")
+    index = CueIndex.parse(ass_content, "ass")
+    assert index.to_segments() == SEGMENTS
+    print("✅ Parsing werkt")
+
+def test_cue_lookup():
+    """Test O(log n) lookup inclusief overlappende cues en offset"""
+    print("\n🔍 Test cue lookup...")
+
+    index = CueIndex.parse(SRT_CONTENT, "srt")
+    assert index.find_cue_at(500) == -1
+    assert index.find_cue_at(1000) == 0
+    assert index.find_cue_at(2500) == -1
+    assert index.find_cue_at(4500) == 2
+    # Na de korte overlap is de lange cue weer actief
+    assert index.cue_at(6.0)["text"] == "Lang"
+    assert index.find_cue_at(10000) == -1
+
+    index.shift(1000)
+    assert index.find_cue_at(1500) == -1
+    assert index.cue_at(2.0)["text"] == "Hallo\nwereld"
+
+    # Lange cue over veel korte cues: zelfde antwoord als lineair zoeken (laatst gestarte actieve cue)
+    cues = [(0, 100000, "lang")] + [(start, start + 50 + start % 700, str(start)) for start in range(10, 99000, 97)]
+    index = CueIndex.from_cues(cues)
+    for time_ms in range(0, 101000, 131):
+        expected = max((i for i, (start, end, _) in enumerate(index.iter_cues()) if start <= time_ms < end),
+                       default=-1)
+        assert index.find_cue_at(time_ms) == expected, time_ms
+
+    # Aantallen rond machten van twee, inclusief de laatste cue
+    for count in (1, 2, 3, 4, 5, 7, 8, 9, 16):
+        index = CueIndex.from_cues([(i * 1000, i * 1000 + 500, str(i)) for i in range(count)])
+        assert [index.find_cue_at(i * 1000 + 100) for i in range(count)] == list(range(count)), count
+        assert index.find_cue_at(count * 1000 - 200) == -1
+    print("✅ Cue lookup werkt")
+
+def test_read_and_merge_files():
+    """Test read_*_file wrappers en samenvoegen via de index"""
+    print("\n🔍 Test lezen en samenvoegen...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        first = os.path.join(temp_dir, "a.srt")
+        second = os.path.join(temp_dir, "b.srt")
+        with open(first, "w", encoding="utf-8", newline="") as f:
+            f.write(SRT_CONTENT)
+        with open(second, "w", encoding="utf-8") as f:
+            f.write(render_subtitles(SEGMENTS, "srt"))
+
+        segments = read_srt_file(first)
+        assert segments[0] == {"start": 1.0, "end": 2.5, "text": "Hallo\nwereld"}
+
+        output = os.path.join(temp_dir, "merged.srt")
+        assert merge_subtitle_files([first, os.path.join(temp_dir, "missing.srt"), second], output)
+        merged = read_srt_file(output)
+        assert len(merged) == 5
+        assert merged[3] == {"start": 10.0, "end": 11.0, "text": "Een, twee"}
+        assert merged[4]["end"] == 12.25
+
+        ass_path = os.path.join(temp_dir, "c.ass")
+        with open(ass_path, "w", encoding="utf-8") as f:
+            f.write(render_subtitles(SEGMENTS, "ass"))
+        assert read_ass_file(ass_path) == SEGMENTS
+        assert read_srt_file(os.path.join(temp_dir, "missing.srt")) is None
+    print("✅ Lezen en samenvoegen werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start ondertitel index test...\n")
+
+    results = {}
+    for name, test in [("Parsing", test_parse_formats),
+                       ("Cue lookup", test_cue_lookup),
+                       ("Lezen en samenvoegen", test_read_and_merge_files)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
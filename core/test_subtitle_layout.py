@@ -0,0 +1,101 @@
+"""
+Test bestand voor de ondertitel layout engine
+Controleert re-flow op word timing, regelafbreking en timing limieten
+"""
+
+import sys
+import os
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.subtitle_layout import reflow_segments, resolve_layout
+from core.transcript import Transcript
+
+def _word_segment(start: float, words: list, step: float = 0.4) -> dict:
+    """Maak een segment met woorden op vaste afstand"""
+    word_dicts = []
+    for i, word in enumerate(words):
+        word_dicts.append({"word": word, "start": start + i * step, "end": start + i * step + step - 0.1})
+    return {"start": start, "end": word_dicts[-1]["end"], "text": " ".join(words), "words": word_dicts}
+
+def test_layout_resolution():
+    """Test presets en overrides"""
+    print("🔍 Test layout resolutie...")
+
+    assert resolve_layout(None) is None and resolve_layout("off") is None
+    assert resolve_layout("standard")["max_chars_per_line"] == 42
+    assert resolve_layout("compact")["max_chars_per_line"] == 32
+    assert resolve_layout({"max_lines": 1})["max_lines"] == 1
+    print("✅ Layout resolutie werkt")
+
+def test_word_reflow():
+    """Test dat een lang segment op word timing wordt gesplitst"""
+    print("\n🔍 Test word re-flow...")
+
+    words = ("dit is een heel lang segment dat veel te veel woorden bevat om "
+             "in een enkele ondertitel te passen zonder dat het onleesbaar wordt").split()
+    segment = _word_segment(10.0, words)
+    layout = {"max_chars_per_line": 20, "max_lines": 2, "max_duration": 4.0, "min_gap": 0.1}
+
+    cues = reflow_segments([segment], layout)
+    assert len(cues) > 1
+    assert " ".join(cue["text"].replace("\n", " ") for cue in cues) == " ".join(words)
+
+    for cue, next_cue in zip(cues, cues[1:] + [None]):
+        lines = cue["text"].split("\n")
+        assert len(lines) <= 2 and all(len(line) <= 20 for line in lines)
+        assert cue["end"] - cue["start"] <= 4.0 + 1e-9
+        if next_cue:
+            assert next_cue["start"] - cue["end"] >= 0.1 - 1e-9
+
+    # Eerste cue begint bij het eerste woord
+    assert cues[0]["start"] == 10.0
+
+    # Zelfde resultaat via de kolomsgewijze transcriptie
+    assert reflow_segments(Transcript.from_segments([segment]), layout) == cues
+    print("✅ Word re-flow werkt")
+
+def test_sentence_and_cps():
+    """Test splitsen op zinseinde en verlengen voor leessnelheid"""
+    print("\n🔍 Test zinseinde en CPS...")
+
+    segment = _word_segment(0.0, ["Hallo", "daar.", "Hoe", "gaat", "het?"], step=0.3)
+    cues = reflow_segments([segment], {"min_duration": 0.5, "max_cps": 10.0, "min_gap": 0.08})
+    assert [cue["text"] for cue in cues] == ["Hallo daar.", "Hoe gaat het?"]
+    # Verlenging voor leessnelheid stopt bij de minimale gap tot de volgende cue
+    assert cues[0]["end"] == 0.52
+    # "Hoe gaat het?" heeft 13 tekens: bij 10 CPS minimaal 1.3 seconden
+    assert abs((cues[1]["end"] - cues[1]["start"]) - 1.3) < 1e-9
+
+    # Zonder woorden (bijv. vertaalde tekst) wordt de tijd naar tekens verdeeld
+    text_segment = {"start": 0.0, "end": 12.0, "text": " ".join(["woord"] * 30)}
+    cues = reflow_segments([text_segment], {"max_duration": 5.0, "max_cps": 0})
+    assert len(cues) == 3 and cues[-1]["end"] == 12.0
+    print("✅ Zinseinde en CPS werken")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start ondertitel layout test...\n")
+
+    results = {}
+    for name, test in [("Layout resolutie", test_layout_resolution),
+                       ("Word re-flow", test_word_reflow),
+                       ("Zinseinde en CPS", test_sentence_and_cps)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
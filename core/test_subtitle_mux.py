@@ -0,0 +1,158 @@
+"""
+Test bestand voor ondertitel muxing
+Controleert het ffmpeg commando per container, in-place vervangen en het I/O budget (met een nep ffmpeg script)
+"""
+
+import sys
+import os
+import stat
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.subtitle_mux import (build_mux_command, mux_output_path, mux_subtitles, mux_batch,
+                               language_code, subtitle_codec)
+from core.ffmpeg_runner import get_ffmpeg_runner
+
+# Nep ffmpeg: logt start/einde, schrijft "MUXED" plus de eerste input naar het laatste argument
+FAKE_FFMPEG = """#!/bin/sh
+video=""; previous=""
+for last; do
+  if [ "$previous" = "-i" ] && [ -z "$video" ]; then video="$last"; fi
+  previous="$last"
+done
+echo "start $video" >> "$MUX_LOG"
+sleep 0.2
+if [ -n "$MUX_FAIL" ]; then echo "kapot" >&2; exit 1; fi
+{ echo MUXED; cat "$video"; } > "$last"
+echo "end $video" >> "$MUX_LOG"
+"""
+
+def _fake_ffmpeg(directory):
+    path = os.path.join(directory, "ffmpeg")
+    with open(path, "w") as f:
+        f.write(FAKE_FFMPEG)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    os.environ["MUX_LOG"] = os.path.join(directory, "mux.log")
+    return path
+
+def _write(path, content):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return path
+
+def test_mux_command():
+    """Test stream-copy, codec per container en alle sporen in één commando"""
+    print("🔍 Test mux commando...")
+
+    assert language_code("nl") == "nld" and language_code("EN") == "eng" and language_code("pt-BR") == "por"
+    assert language_code("nld") == "nld" and language_code("dut") == "nld" and language_code(None) == "und"
+    assert subtitle_codec("a.mkv") == "srt" and subtitle_codec("a.MP4") == "mov_text"
+    assert mux_output_path("/v/a.mkv") == "/v/a_subtitled.mkv"
+    assert mux_output_path("/v/a.mp4", in_place=True) == "/v/a.mp4"
+    assert mux_output_path("/v/a.avi", in_place=True) == "/v/a_subtitled.mkv"
+
+    tracks = [{"path": "a_NL.srt", "language": "nl"}, {"path": "a_DE.srt", "language": "de", "title": "Deutsch"}]
+    existing = [{"language": "eng"}, {"language": "nld"}]  # Oud Nederlands spoor van een eerdere run
+    cmd = build_mux_command("a.mkv", tracks, "out.mkv", existing)
+    assert cmd[:3] == ["-y", "-i", "a.mkv"]
+    assert cmd.count("-i") == 3
+    joined = " ".join(cmd)
+    assert "-map 0 -map -0:s:1 -map 1:s:0 -map 2:s:0 -c copy" in joined
+    # Eén bewaard spoor: de nieuwe sporen zijn ondertitel stream 1 en 2
+    assert "-c:s:1 srt -metadata:s:s:1 language=nld" in joined
+    assert "-c:s:2 srt -metadata:s:s:2 language=deu -metadata:s:s:2 title=Deutsch" in joined
+    assert cmd[-1] == "out.mkv"
+
+    cmd = build_mux_command("a.mp4", tracks[:1], "out.mp4", [])
+    assert "-c:s:0 mov_text" in " ".join(cmd) and "-0:s:0" not in cmd
+    print("✅ Mux commando werkt")
+
+def test_in_place():
+    """Test in-place muxen via tijdelijk bestand en rename, ook als ffmpeg faalt"""
+    print("🔍 Test in-place muxen...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ffmpeg = _fake_ffmpeg(temp_dir)
+        video = _write(os.path.join(temp_dir, "film.mkv"), "VIDEO\n")
+        srt = _write(os.path.join(temp_dir, "film_NL.srt"), "1\n00:00:00,000 --> 00:00:01,000\nHallo\n")
+        tracks = [{"path": srt, "language": "nl"}, {"path": os.path.join(temp_dir, "ontbreekt.srt")}]
+
+        os.environ["MUX_FAIL"] = "1"
+        try:
+            result = mux_subtitles(video, tracks, in_place=True, ffmpeg_path=ffmpeg, existing_subtitles=[])
+        finally:
+            del os.environ["MUX_FAIL"]
+        assert "error" in result
+        with open(video, encoding="utf-8") as f:
+            assert f.read() == "VIDEO\n"
+
+        result = mux_subtitles(video, tracks, in_place=True, ffmpeg_path=ffmpeg, existing_subtitles=[])
+        assert result["output_path"] == video and len(result["tracks"]) == 1
+        with open(video, encoding="utf-8") as f:
+            assert f.read() == "MUXED\nVIDEO\n"
+        assert not [name for name in os.listdir(temp_dir) if name.startswith(".mux_")]
+
+        assert "error" in mux_subtitles(video, [], ffmpeg_path=ffmpeg, existing_subtitles=[])
+    print("✅ In-place muxen werkt")
+
+def test_io_budget():
+    """Test gelijktijdige mux jobs en het I/O budget"""
+    print("🔍 Test I/O budget...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ffmpeg = _fake_ffmpeg(temp_dir)
+        log_path = os.environ["MUX_LOG"]
+        jobs = []
+        for index in range(3):
+            video = _write(os.path.join(temp_dir, f"video{index}.mp4"), "x" * 600 * 1024)
+            srt = _write(os.path.join(temp_dir, f"video{index}_NL.srt"), "1\n")
+            jobs.append({"video": video, "tracks": [{"path": srt, "language": "nl"}]})
+
+        def events():
+            with open(log_path, encoding="utf-8") as f:
+                events = [line.split()[0] for line in f]
+            os.remove(log_path)
+            return events
+
+        # Twee workers, ruim budget: twee jobs lopen tegelijk (als de globale ffmpeg limiet dat toelaat)
+        results = mux_batch(jobs, max_workers=2, io_budget_mb=10, ffmpeg_path=ffmpeg)
+        assert all(result["output_path"].endswith("_subtitled.mp4") for result in results.values())
+        expected = ["start", "start"] if get_ffmpeg_runner().max_concurrent >= 2 else ["start", "end"]
+        assert events()[:2] == expected
+
+        # Budget van 1 MB: nooit twee bestanden van 600 KB tegelijk
+        reported = []
+        mux_batch(jobs, max_workers=2, io_budget_mb=1, ffmpeg_path=ffmpeg,
+                  progress_callback=lambda path, result: reported.append(path))
+        assert events() == ["start", "end"] * 3
+        assert reported == [job["video"] for job in jobs]
+    print("✅ I/O budget werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start subtitle mux test...\n")
+
+    results = {}
+    tests = [("Mux commando", test_mux_command)]
+    if os.name != "nt":  # Nep ffmpeg is een shell script
+        tests += [("In-place muxen", test_in_place), ("I/O budget", test_io_budget)]
+    for name, test in tests:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
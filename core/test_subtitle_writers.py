@@ -0,0 +1,108 @@
+"""
+Test bestand voor de streaming ondertitel writers
+Controleert timestamp formattering en single-pass output
+"""
+
+import sys
+import os
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.subtitle_writers import (
+    seconds_to_ms,
+    format_timestamp_ms,
+    render_subtitles,
+    write_subtitles
+)
+
+TEST_SEGMENTS = [
+    {"start": 0.0, "end": 2.5, "text": "Hallo wereld", "original_text": "Hello world"},
+    {"start": 2.5, "end": 3.0, "text": "   ", "original_text": ""},
+    {"start": 65.123, "end": 3725.999, "text": "Lang {segment}", "original_text": "Long segment",
+     "words": [{"word": "Lang", "start": 65.2, "end": 65.5}, {"word": "segment", "start": 65.6, "end": 66.0}]},
+]
+
+def test_timestamp_formatting():
+    """Test integer-milliseconde timestamps zonder afrondingsdrift"""
+    print("🔍 Test timestamp formattering...")
+
+    assert seconds_to_ms(65.123) == 65123
+    assert seconds_to_ms(0.1 + 0.2) == 300
+    assert seconds_to_ms(-1.0) == 0
+    assert format_timestamp_ms(65123, "srt") == "00:01:05,123"
+    assert format_timestamp_ms(3725999, "vtt") == "01:02:05.999"
+    assert format_timestamp_ms(3725999, "ass") == "1:02:06.00"
+    assert format_timestamp_ms(1234, "ass") == "0:00:01.23"
+
+    # Oude float berekening gaf hier 00:00:04,099
+    assert format_timestamp_ms(seconds_to_ms(4.1), "srt") == "00:00:04,100"
+    print("✅ Timestamp formattering werkt")
+
+def test_render_srt():
+    """Test SRT rendering met opeenvolgende nummering en word timing"""
+    print("\n🔍 Test SRT rendering...")
+
+    content = render_subtitles(TEST_SEGMENTS, "srt")
+    assert content == (
+        "1\n00:00:00,000 --> 00:00:02,500\nHallo wereld\n\n"
+        "2\n00:01:05,123 --> 01:02:05,999\nLang {segment}\n\n"
+    )
+
+    content = render_subtitles(TEST_SEGMENTS, "srt", use_word_timing=True)
+    assert "00:01:05,200 --> 00:01:06,000" in content
+    print("✅ SRT rendering werkt")
+
+def test_single_pass_outputs():
+    """Test dat SRT, VTT en ASS (vertaald en origineel) in één pass worden geschreven"""
+    print("\n🔍 Test single-pass output...")
+
+    # Generator: kan maar één keer doorlopen worden
+    segments = (segment for segment in TEST_SEGMENTS)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outputs = [
+            {"path": os.path.join(temp_dir, "test_NL.srt"), "format": "srt", "text_key": "text"},
+            {"path": os.path.join(temp_dir, "test.srt"), "format": "srt", "text_key": "original_text"},
+            {"path": os.path.join(temp_dir, "sub", "test.vtt"), "format": "vtt"},
+            {"path": os.path.join(temp_dir, "test.ass"), "format": "ass"},
+        ]
+        counts = write_subtitles(segments, outputs)
+
+        assert list(counts.values()) == [2, 2, 2, 2]
+
+        with open(outputs[1]["path"], encoding="utf-8") as f:
+            assert "Hello world" in f.read()
+        with open(outputs[2]["path"], encoding="utf-8") as f:
+            assert f.read().startswith("WEBVTT\n\n00:00:00.000 --> 00:00:02.500\n")
+        with open(outputs[3]["path"], encoding="utf-8") as f:
+            assert "Dialogue: 0, 0:01:05.12, 1:02:06.00, Default, , 0, 0, 0, , Lang \\{segment\\}" in f.read()
+
+    print("✅ Single-pass output werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start ondertitel writers test...\n")
+
+    results = {}
+    for name, test in [("Timestamps", test_timestamp_formatting),
+                       ("SRT rendering", test_render_srt),
+                       ("Single-pass output", test_single_pass_outputs)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,95 @@
+"""
+Test bestand voor de thumbnail cache
+Controleert cache sleutels, seek positie en hergebruik van gecachede thumbnails
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.thumbnail_cache import thumbnail_key, choose_seek_time, get_thumbnail, get_cached_thumbnail
+
+def test_keys_and_seek():
+    """Test dat de sleutel verandert met grootte, mtime en afmeting"""
+    print("🔍 Test cache sleutels en seek positie...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "film.mp4")
+        with open(video_path, "wb") as f:
+            f.write(b"video")
+
+        key = thumbnail_key(video_path)
+        assert key == thumbnail_key(video_path)
+        assert key != thumbnail_key(video_path, 160, 120)
+
+        os.utime(video_path, (time.time() + 5, time.time() + 5))
+        assert key != thumbnail_key(video_path)
+        assert thumbnail_key(os.path.join(temp_dir, "bestaat_niet.mp4")) is None
+
+    assert choose_seek_time(None) == 1.0
+    assert choose_seek_time(3600.0) == 1.0
+    assert choose_seek_time(0.5) == 0.25
+    print("✅ Cache sleutels en seek positie werken")
+
+def test_disk_cache():
+    """Test dat een thumbnail één keer gegenereerd en daarna hergebruikt wordt"""
+    print("\n🔍 Test schijf cache...")
+
+    calls = []
+    def fake_generator(file_path, output_path, seek_seconds):
+        calls.append(seek_seconds)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(b"jpeg")
+        return True
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "media", "film.mp4")
+        cache_dir = os.path.join(temp_dir, "thumbnails")
+        os.makedirs(os.path.dirname(video_path))
+        with open(video_path, "wb") as f:
+            f.write(b"video")
+
+        assert get_cached_thumbnail(video_path, cache_dir=cache_dir) is None
+        thumbnail_path = get_thumbnail(video_path, cache_dir=cache_dir, generator=fake_generator)
+        assert thumbnail_path and thumbnail_path.startswith(cache_dir)
+        assert get_thumbnail(video_path, cache_dir=cache_dir, generator=fake_generator) == thumbnail_path
+        assert get_cached_thumbnail(video_path, cache_dir=cache_dir) == thumbnail_path
+        assert len(calls) == 1
+
+        # Niets naast de video geschreven
+        assert os.listdir(os.path.dirname(video_path)) == ["film.mp4"]
+
+        # Mislukte generatie levert geen cache entry op
+        assert get_thumbnail(video_path, 100, 100, cache_dir=cache_dir,
+                             generator=lambda *args: False) is None
+    print("✅ Schijf cache werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start thumbnail cache test...\n")
+
+    results = {}
+    for name, test in [("Sleutels en seek", test_keys_and_seek),
+                       ("Schijf cache", test_disk_cache)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
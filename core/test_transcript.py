@@ -0,0 +1,120 @@
+"""
+Test bestand voor de kolomsgewijze transcriptie
+Controleert dict-compatibiliteit, vertaling, serialisatie en SRT output
+"""
+
+import sys
+import os
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.transcript import Transcript
+from core.subtitle_writers import render_subtitles, write_subtitles
+from core.whisperx_srt_functions import validate_whisperx_transcriptions
+
+WHISPERX_SEGMENTS = [
+    {"start": 0.0, "end": 1.5, "text": " Hello world ", "avg_logprob": -0.25,
+     "words": [{"word": "Hello", "start": 0.1, "end": 0.5, "score": 0.9},
+               {"word": "world", "start": 0.6, "end": 1.4, "score": 0.8}]},
+    {"start": 2.0, "end": 3.0, "text": "   ", "avg_logprob": -1.0, "words": []},
+    {"start": 3.0, "end": 4.25, "text": "2024 rocks", "avg_logprob": -0.5,
+     "words": [{"word": "2024"}, {"word": "rocks", "start": 3.6, "end": 4.0, "score": 0.7}]},
+]
+
+def test_dict_compatibility():
+    """Test dat segment views zich als dicts gedragen"""
+    print("🔍 Test dict compatibiliteit...")
+
+    transcript = Transcript.from_segments(WHISPERX_SEGMENTS)
+    assert len(transcript) == 3 and transcript.word_count == 4
+
+    segment = transcript[0]
+    assert segment["text"] == "Hello world"
+    assert segment["confidence"] == -0.25
+    assert segment.get("original_text") is None and "original_text" not in segment
+    assert segment["words"][1]["word"] == "world"
+
+    # Ontbrekende woord timing wordt niet als key getoond
+    word = transcript[-1]["words"][0]
+    assert dict(word) == {"word": "2024"} and word.get("start", 3.0) == 3.0
+
+    copied = transcript[2].copy()
+    assert isinstance(copied, dict)
+    assert copied["words"][1] == {"word": "rocks", "start": 3.6, "end": 4.0, "score": 0.7}
+    print("✅ Dict compatibiliteit werkt")
+
+def test_translation_and_srt():
+    """Test vertaling met gedeelde kolommen en SRT output zonder dicts"""
+    print("\n🔍 Test vertaling en SRT output...")
+
+    transcript = Transcript.from_segments(WHISPERX_SEGMENTS)
+    translated = transcript.with_texts(["Hallo wereld", "", "2024 rockt"], target_language="nl")
+    assert translated.starts is transcript.starts
+    assert translated[0]["original_text"] == "Hello world"
+    assert translated[0]["target_language"] == "nl"
+
+    content = render_subtitles(translated, "srt", use_word_timing=True)
+    assert content == (
+        "1\n00:00:00,100 --> 00:00:01,400\nHallo wereld\n\n"
+        "2\n00:00:03,000 --> 00:00:04,000\n2024 rockt\n\n"
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        outputs = [
+            {"path": os.path.join(temp_dir, "test_NL.srt"), "format": "srt", "text_key": "text"},
+            {"path": os.path.join(temp_dir, "test.srt"), "format": "srt", "text_key": "original_text"},
+        ]
+        counts = write_subtitles(translated, outputs)
+        assert list(counts.values()) == [2, 2]
+        with open(outputs[1]["path"], encoding="utf-8") as f:
+            assert "Hello world" in f.read()
+
+    subset = transcript.take([0, 2])
+    assert [segment["text"] for segment in subset] == ["Hello world", "2024 rocks"]
+    assert subset[1]["words"][1]["word"] == "rocks"
+    print("✅ Vertaling en SRT output werken")
+
+def test_serialization_and_validation():
+    """Test binaire serialisatie en kolomsgewijze validatie"""
+    print("\n🔍 Test serialisatie en validatie...")
+
+    transcript = Transcript.from_segments(WHISPERX_SEGMENTS).with_texts(["Één", "", "Twee"])
+    restored = Transcript.from_bytes(transcript.to_bytes())
+    assert restored.to_list() == transcript.to_list()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_path = os.path.join(temp_dir, "cache", "test.mtt")
+        assert transcript.save(cache_path)
+        assert Transcript.load(cache_path).to_list() == transcript.to_list()
+
+    assert not validate_whisperx_transcriptions(transcript)
+    assert validate_whisperx_transcriptions(transcript.take([0, 2]))
+    print("✅ Serialisatie en validatie werken")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start transcriptie test...\n")
+
+    results = {}
+    for name, test in [("Dict compatibiliteit", test_dict_compatibility),
+                       ("Vertaling en SRT", test_translation_and_srt),
+                       ("Serialisatie", test_serialization_and_validation)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
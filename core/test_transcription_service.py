@@ -0,0 +1,182 @@
+"""
+Test bestand voor de transcriptie service
+Controleert de persistente queue, progress events, annuleren, herstarten na een crash van de worker
+en het ophalen van resultaten na een verbroken verbinding
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.cancellation import CancelledError, CancellationToken
+from core.transcription_service import (PersistentJobQueue, TranscriptionServer, TranscriptionClient,
+                                        serve_jobs, JOB_QUEUED)
+
+def _handle_fake_job(job, progress, token):
+    """Nep transcriptie: crasht één keer als crash_marker nog niet bestaat"""
+    options = job["options"]
+    marker = options.get("crash_marker")
+    if marker and not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(3)  # Harde crash zoals een CUDA fout in native code
+    for step in range(options.get("steps", 2)):
+        token.checkpoint()
+        progress((step + 1) / options.get("steps", 2), f"stap {step + 1}")
+        time.sleep(options.get("delay", 0.0))
+    return {"segments": [{"start": 0.0, "end": 1.0, "text": os.path.basename(job["audio_path"])}],
+            "pid": os.getpid()}
+
+def fake_worker(conn):
+    """Worker target voor de test (moet op module niveau staan voor spawn)"""
+    serve_jobs(conn, _handle_fake_job)
+
+def test_persistent_queue():
+    """Test dat lopende jobs na een herstart weer in de wachtrij staan"""
+    print("🔍 Test persistente queue...")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "queue.json")
+        queue = PersistentJobQueue(path)
+        first = queue.add("a.wav", {"language": "nl"})
+        second = queue.add("b.wav")
+        running = queue.next()
+        assert running["id"] == first["id"] and running["attempts"] == 1
+        assert queue.cancel(second["id"]) and not queue.cancel(first["id"])
+
+        reloaded = PersistentJobQueue(path)
+        jobs = reloaded.pending()
+        assert len(jobs) == 1 and jobs[0]["status"] == JOB_QUEUED and jobs[0]["attempts"] == 1
+        reloaded.finish(first["id"])
+        assert len(PersistentJobQueue(path)) == 0
+
+        # Resultaat zonder client blijft na een herstart bewaard en wordt niet opnieuw ingepland
+        third = reloaded.add("c.wav")
+        reloaded.next()
+        assert reloaded.result(third["id"]) is None
+        reloaded.store_result(third["id"], {"type": "result", "result": {"segments": []}})
+        reloaded = PersistentJobQueue(path)
+        assert reloaded.next() is None and len(reloaded) == 0 and reloaded.pending() == []
+        assert third["id"] in reloaded and reloaded.result(third["id"])["result"] == {"segments": []}
+        reloaded.finish(third["id"])
+        assert third["id"] not in PersistentJobQueue(path)
+    print("✅ Persistente queue werkt")
+
+def _start_server(temp_dir):
+    server = TranscriptionServer(fake_worker, address=os.path.join(temp_dir, "t.sock"), authkey=b"test",
+                                 queue=PersistentJobQueue(os.path.join(temp_dir, "queue.json")))
+    server.start()
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            return server, TranscriptionClient(server.address, b"test")
+        except OSError:
+            time.sleep(0.05)
+    raise AssertionError("Server niet bereikbaar")
+
+def test_server_jobs_and_restart():
+    """Test progress, hergebruik van de worker, annuleren en herstart na een crash"""
+    print("🔍 Test server, annuleren en crash herstel...")
+
+    if sys.platform == "win32":
+        print("⏭️ Unix socket test overgeslagen op Windows")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server, client = _start_server(temp_dir)
+        try:
+            progress = []
+            first = client.transcribe("/media/a.wav", {"steps": 3},
+                                      progress_callback=lambda value, message: progress.append(value))
+            assert first["segments"][0]["text"] == "a.wav"
+            assert progress == [1 / 3, 2 / 3, 1.0]
+
+            # Zelfde worker proces voor de volgende job (model blijft geladen)
+            second = client.transcribe("/media/b.wav")
+            assert second["pid"] == first["pid"]
+
+            # Annuleren van een lopende job
+            token = CancellationToken()
+            token.cancel()
+            try:
+                client.transcribe("/media/c.wav", {"steps": 50, "delay": 0.05}, cancel_token=token)
+                assert False, "CancelledError verwacht"
+            except CancelledError:
+                pass
+
+            # Crash van de worker: job wordt opnieuw uitgevoerd door een nieuwe worker
+            marker = os.path.join(temp_dir, "crashed")
+            third = client.transcribe("/media/d.wav", {"crash_marker": marker})
+            assert os.path.exists(marker)
+            assert third["segments"][0]["text"] == "d.wav" and third["pid"] != first["pid"]
+            assert server.restarts == 1
+            assert client.status()["jobs"] == []
+        finally:
+            client.close()
+            server.shutdown()
+    print("✅ Server, annuleren en crash herstel werken")
+
+def test_result_after_disconnect():
+    """Test dat een client het resultaat van een job uit een verbroken sessie ophaalt"""
+    print("🔍 Test resultaat na verbroken verbinding...")
+
+    if sys.platform == "win32":
+        print("⏭️ Unix socket test overgeslagen op Windows")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server, client = _start_server(temp_dir)
+        try:
+            # Job is al klaar voordat een nieuwe client zich koppelt: resultaat is bewaard
+            finished = client.submit("/media/a.wav")
+            client.close()
+            deadline = time.monotonic() + 10
+            while finished not in server.queue or server.queue.result(finished) is None:
+                assert time.monotonic() < deadline, "Job niet afgerond"
+                time.sleep(0.05)
+            client = TranscriptionClient(server.address, b"test")
+            assert client.result(finished)["segments"][0]["text"] == "a.wav"
+            assert len(server.queue) == 0
+
+            # Job loopt nog: de nieuwe client krijgt de resterende events
+            running = client.submit("/media/b.wav", {"steps": 10, "delay": 0.05})
+            client.close()
+            client = TranscriptionClient(server.address, b"test")
+            assert client.result(running)["segments"][0]["text"] == "b.wav"
+
+            # Onbekende job geeft een fout in plaats van eeuwig wachten
+            assert client.result("bestaat-niet") is None
+            assert client.status()["jobs"] == [] and len(server.queue) == 0
+        finally:
+            client.close()
+            server.shutdown()
+    print("✅ Resultaat na verbroken verbinding werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start transcriptie service test...\n")
+
+    results = {}
+    for name, test in [("Persistente queue", test_persistent_queue),
+                       ("Server en crash herstel", test_server_jobs_and_restart),
+                       ("Resultaat na verbroken verbinding", test_result_after_disconnect)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
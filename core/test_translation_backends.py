@@ -0,0 +1,135 @@
+"""
+Test bestand voor de vertaal backends
+Controleert het opsplitsen op limieten, de LibreTranslate backend tegen de stub server en hergebruik van verbindingen
+"""
+
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Voeg project root toe aan Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from core.translation_backends import (BackendCapabilities, TranslationBackend, LibreTranslateBackend,
+                                       StubTranslationServer, TranslationError, plan_batches, stub_translate,
+                                       backend_from_settings, get_backend)
+
+class _RecordingBackend(TranslationBackend):
+    """Backend die de requests onthoudt in plaats van te vertalen"""
+    name = "recording"
+    capabilities = BackendCapabilities(max_batch_size=3, max_chars=10)
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def _translate_chunk(self, texts, source, target):
+        self.chunks.append(list(texts))
+        return [text.upper() for text in texts]
+
+def test_plan_batches():
+    """Test opsplitsen op aantal teksten en tekens"""
+    print("🔍 Test opsplitsen in batches...")
+
+    capabilities = BackendCapabilities(max_batch_size=2, max_chars=10)
+    assert plan_batches(["a", "b", "c"], capabilities) == [[0, 1], [2]]
+    assert plan_batches(["12345", "123456", "1"], capabilities) == [[0], [1, 2]]
+    # Een te lange tekst krijgt een eigen request
+    assert plan_batches(["x" * 50, "y"], capabilities) == [[0], [1]]
+    assert plan_batches([], capabilities) == []
+
+    backend = _RecordingBackend()
+    texts = ["een", "", "twee", "  ", "drie", "vier", "vijfvijf"]
+    translated = backend.translate_batch(texts, "nl", "en")
+    assert translated == ["EEN", "", "TWEE", "  ", "DRIE", "VIER", "VIJFVIJF"]
+    assert backend.chunks == [["een", "twee"], ["drie", "vier"], ["vijfvijf"]]
+    print("✅ Opsplitsen in batches werkt")
+
+def test_stub_server():
+    """Test de LibreTranslate backend tegen de stub server"""
+    print("🔍 Test stub server...")
+
+    server = StubTranslationServer(char_limit=100)
+    server.start()
+    backend = LibreTranslateBackend(server.url + "/translate", max_chars=100)
+    try:
+        texts = [f"zin {index}" for index in range(120)]
+        translated = backend.translate_batch(texts, "nl", "en")
+        assert translated == [stub_translate(text, "en") for text in texts]
+        # Batches blijven onder de tekenlimiet van de server
+        assert backend._request("GET", "/status")["requests"] > 120 * 6 // 100
+        assert backend.translate("hallo", "nl", "de") == "[de] hallo"
+        assert backend.detect("hallo")[0] == "en"
+        assert any(language["code"] == "nl" for language in backend.languages())
+
+        # Onbekende doeltaal en te lange invoer geven een TranslationError
+        for text, target in [("hallo", "xx"), ("x" * 200, "en")]:
+            try:
+                backend.translate(text, "nl", target)
+                assert False, "TranslationError verwacht"
+            except TranslationError:
+                pass
+    finally:
+        backend.close()
+        server.shutdown()
+    print("✅ Stub server werkt")
+
+def test_connection_reuse():
+    """Test batches, keep-alive verbindingen en gedeelde backends bij parallelle talen"""
+    print("🔍 Test hergebruik van verbindingen...")
+
+    server = StubTranslationServer()
+    server.start()
+    connections = []
+    original = server._server.RequestHandlerClass.setup
+
+    def setup(handler):
+        connections.append(threading.get_ident())
+        original(handler)
+
+    server._server.RequestHandlerClass.setup = setup
+    try:
+        backend = get_backend("libretranslate", url=server.url)
+        assert backend_from_settings({"translator": "libretranslate", "libretranslate_server": server.url}) is backend
+        assert backend_from_settings({"translator": "none"}) is None
+
+        texts = [f"regel {index}" for index in range(200)]
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(lambda target: backend.translate_batch(texts, "en", target), ["nl", "de", "fr"]))
+        assert results[1][5] == "[de] regel 5"
+
+        # 200 teksten in batches van 50: 4 requests per taal, maximaal één verbinding per thread
+        status = backend._request("GET", "/status")
+        assert status["requests"] == 12 and status["texts"] == 600
+        assert len(connections) <= 3
+    finally:
+        backend.close()
+        server.shutdown()
+    print("✅ Hergebruik van verbindingen werkt")
+
+def main():
+    """Hoofdfunctie voor het testen"""
+    print("🚀 Start vertaal backends test...\n")
+
+    results = {}
+    for name, test in [("Opsplitsen in batches", test_plan_batches),
+                       ("Stub server", test_stub_server),
+                       ("Hergebruik van verbindingen", test_connection_reuse)]:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {name} gefaald: {e}")
+            results[name] = False
+
+    print("\n📊 Test resultaten samenvatting:")
+    for name, passed in results.items():
+        print(f"   - {name}: {'✅' if passed else '❌'}")
+
+    return all(results.values())
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
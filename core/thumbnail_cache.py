@@ -0,0 +1,157 @@
+"""
+Thumbnail cache voor Magic Time Studio
+Genereert video thumbnails met snelle input seeking en bewaart ze op schijf
+"""
+
+import os
+import hashlib
+import subprocess
+import tempfile
+from typing import Optional, Callable
+import logging
+
+from .file_collection import normalize_path
+from .media_probe import get_cache_dir, get_probe_cache, file_signature, find_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_WIDTH = 320
+THUMBNAIL_HEIGHT = 240
+
+# Timeout per ffmpeg aanroep in seconden
+THUMBNAIL_TIMEOUT = 10
+
+def get_thumbnail_dir() -> str:
+    """Map met gecachede thumbnails"""
+    return os.path.join(get_cache_dir(), "thumbnails")
+
+def thumbnail_key(file_path: str, width: int = THUMBNAIL_WIDTH,
+                  height: int = THUMBNAIL_HEIGHT) -> Optional[str]:
+    """
+    Cache sleutel op (pad, grootte, mtime, afmeting)
+
+    Returns:
+        Hex sleutel of None als het bestand niet bestaat
+    """
+    signature = file_signature(file_path)
+    if signature is None:
+        return None
+    raw = f"{normalize_path(file_path)}|{signature[0]}|{signature[1]}|{width}x{height}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def choose_seek_time(duration: Optional[float]) -> float:
+    """
+    Kies het tijdstip voor de thumbnail (1 seconde, niet voorbij het einde)
+
+    Args:
+        duration: Duur in seconden (None als onbekend)
+
+    Returns:
+        Seek positie in seconden
+    """
+    if duration is None:
+        return 1.0
+    return max(0.0, min(1.0, duration / 2))
+
+def generate_thumbnail(file_path: str, output_path: str, seek_seconds: float = 1.0,
+                       width: int = THUMBNAIL_WIDTH, height: int = THUMBNAIL_HEIGHT,
+                       ffmpeg_path: Optional[str] = None,
+                       timeout: int = THUMBNAIL_TIMEOUT) -> bool:
+    """
+    Genereer één thumbnail; -ss staat vóór -i zodat ffmpeg op keyframes seekt
+    in plaats van tot het tijdstip te decoderen
+
+    Args:
+        file_path: Pad naar video bestand
+        output_path: Pad naar JPEG output (wordt atomair geschreven)
+        seek_seconds: Tijdstip in seconden
+        width: Maximale breedte
+        height: Maximale hoogte
+        ffmpeg_path: Optioneel pad naar ffmpeg
+        timeout: Timeout in seconden
+
+    Returns:
+        True bij succes, False bij fout
+    """
+    output_dir = os.path.dirname(output_path) or "."
+    temp_path = None
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".thumb_", suffix=".jpg", dir=output_dir)
+        os.close(fd)
+
+        cmd = [
+            ffmpeg_path or find_ffmpeg(), "-v", "error",
+            "-ss", f"{seek_seconds:.3f}",
+            "-i", file_path,
+            "-frames:v", "1",
+            "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease",
+            "-y", temp_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+
+        if result.returncode == 0 and os.path.getsize(temp_path) > 0:
+            os.replace(temp_path, output_path)
+            temp_path = None
+            return True
+        logger.error(f"FFmpeg thumbnail fout voor {file_path}: {result.stderr}")
+        return False
+    except Exception as e:
+        logger.error(f"Fout bij genereren thumbnail van {file_path}: {e}")
+        return False
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+def get_cached_thumbnail(file_path: str, width: int = THUMBNAIL_WIDTH,
+                         height: int = THUMBNAIL_HEIGHT,
+                         cache_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Pad naar een gecachede thumbnail zonder te genereren
+
+    Returns:
+        Pad naar JPEG of None
+    """
+    key = thumbnail_key(file_path, width, height)
+    if key is None:
+        return None
+    thumbnail_path = os.path.join(cache_dir or get_thumbnail_dir(), key[:2], key + ".jpg")
+    return thumbnail_path if os.path.exists(thumbnail_path) else None
+
+def get_thumbnail(file_path: str, width: int = THUMBNAIL_WIDTH, height: int = THUMBNAIL_HEIGHT,
+                  cache_dir: Optional[str] = None,
+                  generator: Optional[Callable[[str, str, float], bool]] = None) -> Optional[str]:
+    """
+    Thumbnail uit de schijf cache of nieuw gegenereerd
+
+    Args:
+        file_path: Pad naar video bestand
+        width: Maximale breedte
+        height: Maximale hoogte
+        cache_dir: Optionele cache map (standaard in de gebruikers cache)
+        generator: Optionele functie (pad, output, seek) -> bool
+
+    Returns:
+        Pad naar JPEG of None bij fout
+    """
+    key = thumbnail_key(file_path, width, height)
+    if key is None:
+        logger.error(f"Video bestand bestaat niet: {file_path}")
+        return None
+
+    thumbnail_path = os.path.join(cache_dir or get_thumbnail_dir(), key[:2], key + ".jpg")
+    if os.path.exists(thumbnail_path):
+        return thumbnail_path
+
+    # Alleen een al bekende duur gebruiken; proben kost een extra proces
+    info = get_probe_cache().get_cached(file_path)
+    seek_seconds = choose_seek_time(info.get("duration") if info else None)
+
+    if generator is not None:
+        success = generator(file_path, thumbnail_path, seek_seconds)
+    else:
+        success = generate_thumbnail(file_path, thumbnail_path, seek_seconds, width, height)
+    return thumbnail_path if success and os.path.exists(thumbnail_path) else None
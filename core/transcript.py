@@ -0,0 +1,465 @@
+"""
+Compacte transcriptie opslag voor Magic Time Studio
+Slaat segmenten en woorden kolomsgewijs op in plaats van als lijsten van dicts
+"""
+
+import json
+import math
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Optional, Dict, List, Any, Iterable, Iterator, Tuple
+import logging
+
+from .subtitle_writers import seconds_to_ms
+
+logger = logging.getLogger(__name__)
+
+# Binair formaat: magic, header lengte (uint32), JSON header, kolommen, tekst buffers
+TRANSCRIPT_MAGIC = b"MTTRANS1"
+
+_MISSING = float("nan")
+
+def _time_or_missing(value: Any) -> float:
+    """Converteer een tijd naar float (NaN als ontbrekend)"""
+    try:
+        return float(value) if value is not None else _MISSING
+    except (TypeError, ValueError):
+        return _MISSING
+
+class TextColumn:
+    """Teksten als één string buffer met offsets (offsets[i]:offsets[i+1])"""
+
+    __slots__ = ("offsets", "buffer")
+
+    def __init__(self, offsets: array = None, buffer: str = ""):
+        self.offsets = offsets if offsets is not None else array('q', [0])
+        self.buffer = buffer
+
+    @classmethod
+    def from_strings(cls, texts: Iterable[str]) -> "TextColumn":
+        """Bouw een kolom uit een iterable van strings"""
+        texts = list(texts)
+        offsets = array('q', [0])
+        position = 0
+        for text in texts:
+            position += len(text)
+            offsets.append(position)
+        return cls(offsets, "".join(texts))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        buffer = self.buffer
+        offsets = self.offsets
+        for i in range(len(offsets) - 1):
+            yield buffer[offsets[i]:offsets[i + 1]]
+
+class WordView(Mapping):
+    """Read-only dict-achtige view op één woord (compatibel met segment["words"])"""
+
+    __slots__ = ("_transcript", "_index")
+
+    def __init__(self, transcript: "Transcript", index: int):
+        self._transcript = transcript
+        self._index = index
+
+    def _values(self) -> Dict[str, Any]:
+        t = self._transcript
+        i = self._index
+        values = {"word": t.word_texts[i]}
+        for key, column in (("start", t.word_starts), ("end", t.word_ends), ("score", t.word_scores)):
+            value = column[i]
+            if not math.isnan(value):
+                values[key] = value
+        return values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values())
+
+    def __len__(self) -> int:
+        return len(self._values())
+
+    def copy(self) -> Dict[str, Any]:
+        return self._values()
+
+    def __repr__(self) -> str:
+        return f"WordView({self._values()!r})"
+
+class SegmentView(Mapping):
+    """
+    Read-only dict-achtige view op één segment
+
+    Ondersteunt segment["text"], segment.get("words"), "original_text" in segment
+    en segment.copy() (geeft een gewone dict), zodat bestaande code blijft werken.
+    """
+
+    __slots__ = ("_transcript", "_index")
+
+    def __init__(self, transcript: "Transcript", index: int):
+        self._transcript = transcript
+        self._index = index
+
+    def _keys(self) -> Tuple[str, ...]:
+        t = self._transcript
+        keys = ("start", "end", "text", "words", "confidence")
+        if t.original_texts is not None:
+            keys += ("original_text",)
+        if t.source_language is not None:
+            keys += ("source_language",)
+        if t.target_language is not None:
+            keys += ("target_language",)
+        return keys
+
+    def __getitem__(self, key: str) -> Any:
+        t = self._transcript
+        i = self._index
+        if key == "start":
+            return t.starts[i]
+        if key == "end":
+            return t.ends[i]
+        if key == "text":
+            return t.texts[i]
+        if key == "words":
+            return t.segment_words(i)
+        if key == "confidence":
+            return t.confidences[i]
+        if key == "original_text" and t.original_texts is not None:
+            return t.original_texts[i]
+        if key == "source_language" and t.source_language is not None:
+            return t.source_language
+        if key == "target_language" and t.target_language is not None:
+            return t.target_language
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys()
+
+    def copy(self) -> Dict[str, Any]:
+        """Materialiseer als gewone dict (woorden als dicts)"""
+        values = {key: self[key] for key in self._keys()}
+        values["words"] = [word.copy() for word in values["words"]]
+        return values
+
+    def __repr__(self) -> str:
+        return f"SegmentView({self.copy()!r})"
+
+class Transcript(Sequence):
+    """
+    Kolomsgewijze transcriptie
+
+    Segmenten: start, end, confidence (array('d')) en tekst offsets in één buffer.
+    Woorden: start, end, score (NaN als ontbrekend) en tekst in één buffer;
+    word_bounds[i]:word_bounds[i+1] zijn de woorden van segment i.
+    Indexeren geeft SegmentView objecten die zich als (read-only) dicts gedragen.
+    """
+
+    def __init__(self, starts: array, ends: array, confidences: array, texts: TextColumn,
+                 word_bounds: array, word_starts: array, word_ends: array, word_scores: array,
+                 word_texts: TextColumn, original_texts: Optional[TextColumn] = None,
+                 source_language: Optional[str] = None, target_language: Optional[str] = None):
+        self.starts = starts
+        self.ends = ends
+        self.confidences = confidences
+        self.texts = texts
+        self.word_bounds = word_bounds
+        self.word_starts = word_starts
+        self.word_ends = word_ends
+        self.word_scores = word_scores
+        self.word_texts = word_texts
+        self.original_texts = original_texts
+        self.source_language = source_language
+        self.target_language = target_language
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict[str, Any]]) -> "Transcript":
+        """
+        Bouw een transcriptie uit WhisperX of standaard segment dicts
+
+        Args:
+            segments: Iterable van segmenten (text wordt gestript, confidence
+                uit "confidence" of WhisperX "avg_logprob")
+
+        Returns:
+            Transcript instantie
+        """
+        if isinstance(segments, Transcript):
+            return segments
+
+        starts, ends, confidences = array('d'), array('d'), array('d')
+        word_bounds = array('q', [0])
+        word_starts, word_ends, word_scores = array('d'), array('d'), array('d')
+        texts, word_texts, original_texts = [], [], []
+
+        for segment in segments:
+            starts.append(float(segment.get("start", 0.0)))
+            ends.append(float(segment.get("end", 0.0)))
+            confidences.append(float(segment.get("confidence", segment.get("avg_logprob", 0.0)) or 0.0))
+            texts.append((segment.get("text") or "").strip())
+            original_texts.append(segment.get("original_text"))
+
+            for word in segment.get("words") or ():
+                word_texts.append(word.get("word", ""))
+                word_starts.append(_time_or_missing(word.get("start")))
+                word_ends.append(_time_or_missing(word.get("end")))
+                word_scores.append(_time_or_missing(word.get("score")))
+            word_bounds.append(len(word_starts))
+
+        originals = None
+        if original_texts and all(text is not None for text in original_texts):
+            originals = TextColumn.from_strings(original_texts)
+
+        return cls(starts, ends, confidences, TextColumn.from_strings(texts),
+                   word_bounds, word_starts, word_ends, word_scores,
+                   TextColumn.from_strings(word_texts), originals)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [SegmentView(self, j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("segment index buiten bereik")
+        return SegmentView(self, i)
+
+    def __iter__(self) -> Iterator[SegmentView]:
+        for i in range(len(self.starts)):
+            yield SegmentView(self, i)
+
+    @property
+    def word_count(self) -> int:
+        """Totaal aantal woorden"""
+        return len(self.word_starts)
+
+    def segment_words(self, i: int) -> List[WordView]:
+        """Woorden van segment i als views"""
+        return [WordView(self, j) for j in range(self.word_bounds[i], self.word_bounds[i + 1])]
+
+    def text_column(self, text_key: str = "text") -> TextColumn:
+        """Tekst kolom voor "text" of "original_text" (valt terug op "text")"""
+        if text_key == "original_text" and self.original_texts is not None:
+            return self.original_texts
+        return self.texts
+
+    def with_texts(self, texts: Iterable[str], keep_original: bool = True,
+                   source_language: Optional[str] = None,
+                   target_language: Optional[str] = None) -> "Transcript":
+        """
+        Maak een nieuwe transcriptie met andere teksten (bijv. een vertaling)
+
+        Alle tijd- en woordkolommen worden gedeeld, alleen de tekst buffer is nieuw.
+
+        Args:
+            texts: Nieuwe tekst per segment (zelfde aantal als segmenten)
+            keep_original: Bewaar huidige teksten als "original_text"
+            source_language: Bron taal code (optioneel)
+            target_language: Doel taal code (optioneel)
+
+        Returns:
+            Nieuwe Transcript instantie
+        """
+        new_texts = TextColumn.from_strings(texts)
+        if len(new_texts) != len(self):
+            raise ValueError(f"Verwacht {len(self)} teksten, kreeg {len(new_texts)}")
+        return Transcript(self.starts, self.ends, self.confidences, new_texts,
+                          self.word_bounds, self.word_starts, self.word_ends, self.word_scores,
+                          self.word_texts, self.texts if keep_original else self.original_texts,
+                          source_language or self.source_language,
+                          target_language or self.target_language)
+
+    def take(self, indices: Iterable[int]) -> "Transcript":
+        """
+        Selecteer een subset van segmenten (met hun woorden)
+
+        Args:
+            indices: Segment indexen in gewenste volgorde
+
+        Returns:
+            Nieuwe Transcript instantie
+        """
+        indices = list(indices)
+        bounds = self.word_bounds
+        word_index = [j for i in indices for j in range(bounds[i], bounds[i + 1])]
+        word_bounds = array('q', [0])
+        for i in indices:
+            word_bounds.append(word_bounds[-1] + bounds[i + 1] - bounds[i])
+
+        return Transcript(
+            array('d', (self.starts[i] for i in indices)),
+            array('d', (self.ends[i] for i in indices)),
+            array('d', (self.confidences[i] for i in indices)),
+            TextColumn.from_strings(self.texts[i] for i in indices),
+            word_bounds,
+            array('d', (self.word_starts[j] for j in word_index)),
+            array('d', (self.word_ends[j] for j in word_index)),
+            array('d', (self.word_scores[j] for j in word_index)),
+            TextColumn.from_strings(self.word_texts[j] for j in word_index),
+            TextColumn.from_strings(self.original_texts[i] for i in indices)
+            if self.original_texts is not None else None,
+            self.source_language, self.target_language
+        )
+
+    def times_ms(self, i: int, use_word_timing: bool = False) -> Tuple[int, int]:
+        """Start en einde van segment i in milliseconden (optioneel via woorden)"""
+        start = self.starts[i]
+        end = self.ends[i]
+        if use_word_timing:
+            first, last = self.word_bounds[i], self.word_bounds[i + 1]
+            if last > first:
+                if not math.isnan(self.word_starts[first]):
+                    start = self.word_starts[first]
+                if not math.isnan(self.word_ends[last - 1]):
+                    end = self.word_ends[last - 1]
+        return seconds_to_ms(start), seconds_to_ms(end)
+
+    def iter_rows(self, text_keys: List[str], use_word_timing: bool = False) -> Iterator[Tuple[int, int, List[str]]]:
+        """
+        Lever (start_ms, end_ms, [tekst per text_key]) zonder tussenliggende dicts
+
+        Gebruikt door de ondertitel writers voor single-pass output.
+        """
+        columns = [self.text_column(key) for key in text_keys]
+        for i in range(len(self.starts)):
+            start_ms, end_ms = self.times_ms(i, use_word_timing)
+            yield start_ms, end_ms, [column[i] for column in columns]
+
+    def validate(self) -> Optional[str]:
+        """
+        Valideer timing en tekst kolomsgewijs
+
+        Returns:
+            None als geldig, anders een foutmelding voor het eerste foute segment
+        """
+        for i, (start, end) in enumerate(zip(self.starts, self.ends)):
+            if start >= end:
+                return f"Segment {i+1} heeft ongeldige timing: start={start}, end={end}"
+        for i, text in enumerate(self.texts):
+            if not text.strip():
+                return f"Segment {i+1} heeft lege tekst"
+        return None
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Converteer naar de klassieke lijst van segment dicts"""
+        return [segment.copy() for segment in self]
+
+    def to_bytes(self) -> bytes:
+        """Serialiseer naar een compact binair formaat (voor caching)"""
+        columns = [
+            ("starts", self.starts), ("ends", self.ends), ("confidences", self.confidences),
+            ("text_offsets", self.texts.offsets), ("word_bounds", self.word_bounds),
+            ("word_starts", self.word_starts), ("word_ends", self.word_ends),
+            ("word_scores", self.word_scores), ("word_text_offsets", self.word_texts.offsets),
+        ]
+        buffers = [("texts", self.texts.buffer), ("word_texts", self.word_texts.buffer)]
+        if self.original_texts is not None:
+            columns.append(("original_text_offsets", self.original_texts.offsets))
+            buffers.append(("original_texts", self.original_texts.buffer))
+
+        encoded = [(name, buffer.encode("utf-8")) for name, buffer in buffers]
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "columns": [[name, column.typecode, len(column)] for name, column in columns],
+            "buffers": [[name, len(data)] for name, data in encoded],
+            "source_language": self.source_language,
+            "target_language": self.target_language,
+        }).encode("utf-8")
+
+        parts = [TRANSCRIPT_MAGIC, struct.pack("<I", len(header)), header]
+        parts.extend(column.tobytes() for _, column in columns)
+        parts.extend(data for _, data in encoded)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Transcript":
+        """Deserialiseer uit het formaat van to_bytes()"""
+        if not data.startswith(TRANSCRIPT_MAGIC):
+            raise ValueError("Geen geldig transcriptie bestand")
+        position = len(TRANSCRIPT_MAGIC)
+        (header_length,) = struct.unpack_from("<I", data, position)
+        position += 4
+        header = json.loads(data[position:position + header_length].decode("utf-8"))
+        position += header_length
+
+        columns = {}
+        for name, typecode, count in header["columns"]:
+            column = array(typecode)
+            size = column.itemsize * count
+            column.frombytes(data[position:position + size])
+            if header["byteorder"] != sys.byteorder:
+                column.byteswap()
+            columns[name] = column
+            position += size
+
+        buffers = {}
+        for name, size in header["buffers"]:
+            buffers[name] = data[position:position + size].decode("utf-8")
+            position += size
+
+        originals = None
+        if "original_texts" in buffers:
+            originals = TextColumn(columns["original_text_offsets"], buffers["original_texts"])
+
+        return cls(columns["starts"], columns["ends"], columns["confidences"],
+                   TextColumn(columns["text_offsets"], buffers["texts"]),
+                   columns["word_bounds"], columns["word_starts"], columns["word_ends"],
+                   columns["word_scores"], TextColumn(columns["word_text_offsets"], buffers["word_texts"]),
+                   originals, header.get("source_language"), header.get("target_language"))
+
+    def save(self, file_path: str) -> bool:
+        """
+        Sla de transcriptie binair op (via tijdelijk bestand)
+
+        Args:
+            file_path: Pad naar het cache bestand
+
+        Returns:
+            True bij succes, False bij fout
+        """
+        try:
+            directory = os.path.dirname(file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = file_path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(self.to_bytes())
+            os.replace(temp_path, file_path)
+            return True
+        except Exception as e:
+            logger.error(f"Fout bij opslaan transcriptie {file_path}: {e}")
+            return False
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional["Transcript"]:
+        """
+        Laad een binair opgeslagen transcriptie
+
+        Args:
+            file_path: Pad naar het cache bestand
+
+        Returns:
+            Transcript of None bij fout
+        """
+        try:
+            with open(file_path, "rb") as f:
+                return cls.from_bytes(f.read())
+        except Exception as e:
+            logger.error(f"Fout bij laden transcriptie {file_path}: {e}")
+            return None
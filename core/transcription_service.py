@@ -0,0 +1,731 @@
+"""
+Transcriptie service voor Magic Time Studio
+Lokale server met persistente job queue, bewaakte worker processen en een client (multiprocessing.connection)
+
+De server zelf laadt geen modellen: het zware werk gebeurt in een apart
+worker proces dat de modellen geladen houdt. Crasht de worker (CUDA OOM,
+fout in een native library), dan start de server een nieuwe worker en wordt
+de lopende job opnieuw ingepland; de queue staat op schijf en overleeft ook
+een herstart van de server zelf. GUI, CLI en meerdere GUI sessies kunnen
+tegelijk verbinden. Het resultaat van een job waarvan de client weg is
+blijft bewaard tot een client het met attach() of result() ophaalt.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue as queue_module
+import threading
+import subprocess
+import multiprocessing
+from multiprocessing.connection import Listener, Client
+from typing import Optional, Dict, List, Any, Callable, Iterator
+import logging
+
+from .media_probe import get_cache_dir
+from .atomic_io import write_file_atomic
+from .cancellation import CancelledError, CancellationToken
+
+logger = logging.getLogger(__name__)
+
+SOCKET_FILENAME = "transcription.sock"
+PIPE_NAME = r"\\.\pipe\magic_time_transcription"
+KEY_FILENAME = "transcription.key"
+QUEUE_FILENAME = "transcription_queue.json"
+
+# Aantal pogingen per job voordat een crashende job als mislukt geldt
+MAX_ATTEMPTS = 3
+
+# Wachttijd voor het herstarten van een gecrashte worker (seconden)
+RESTART_DELAY = 1.0
+
+# Berichten van client naar server
+MSG_SUBMIT = "submit"
+MSG_CANCEL = "cancel"
+MSG_STATUS = "status"
+MSG_ATTACH = "attach"
+MSG_SHUTDOWN = "shutdown"
+
+# Berichten tussen server en worker
+MSG_JOB = "job"
+
+# Events van server naar client (en van worker naar server)
+EVENT_ACCEPTED = "accepted"
+EVENT_STARTED = "started"
+EVENT_PROGRESS = "progress"
+EVENT_RESTARTED = "restarted"
+EVENT_RESULT = "result"
+EVENT_ERROR = "error"
+EVENT_STATUS = "status"
+
+FINAL_EVENTS = (EVENT_RESULT, EVENT_ERROR)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+
+def default_address() -> str:
+    """Adres van de lokale server: named pipe op Windows, Unix socket in de cache map elders"""
+    if sys.platform == "win32":
+        return PIPE_NAME
+    return os.path.join(get_cache_dir(), SOCKET_FILENAME)
+
+def load_authkey(path: Optional[str] = None) -> bytes:
+    """
+    Gedeelde sleutel voor server en clients (eenmalig aangemaakt, alleen leesbaar voor de gebruiker)
+
+    Args:
+        path: Pad naar het sleutelbestand (standaard in de cache map)
+
+    Returns:
+        Sleutel als bytes
+    """
+    path = path or os.path.join(get_cache_dir(), KEY_FILENAME)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_file_atomic(path, os.urandom(32).hex())
+        try:
+            os.chmod(path, 0o600)
+        except OSError:
+            pass
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read().strip().encode("ascii")
+
+class PersistentJobQueue:
+    """
+    Job queue die na elke wijziging atomair op schijf gezet wordt
+
+    Jobs die liepen toen de server stopte of crashte worden bij het laden
+    opnieuw ingepland. Afgeronde jobs zonder verbonden client blijven met hun
+    eind event staan tot een client het resultaat ophaalt (daarna finish()).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(get_cache_dir(), QUEUE_FILENAME)
+        self._lock = threading.Lock()
+        self._jobs: List[Dict[str, Any]] = []
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._jobs = json.load(f)
+                for job in self._jobs:
+                    if job["status"] != JOB_DONE:
+                        job["status"] = JOB_QUEUED
+            except Exception as e:
+                logger.warning(f"Kan job queue niet laden {self.path}: {e}")
+                self._jobs = []
+
+    def _save(self):
+        write_file_atomic(self.path, json.dumps(self._jobs, ensure_ascii=False, default=str))
+
+    def add(self, audio_path: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Voeg een job toe en geef hem terug"""
+        job = {"id": uuid.uuid4().hex, "audio_path": audio_path, "options": options or {},
+               "status": JOB_QUEUED, "attempts": 0, "submitted": time.time()}
+        with self._lock:
+            self._jobs.append(job)
+            self._save()
+            return dict(job)
+
+    def next(self) -> Optional[Dict[str, Any]]:
+        """Volgende wachtende job (wordt als lopend gemarkeerd) of None"""
+        with self._lock:
+            for job in self._jobs:
+                if job["status"] == JOB_QUEUED:
+                    job["status"] = JOB_RUNNING
+                    job["attempts"] += 1
+                    self._save()
+                    return dict(job)
+        return None
+
+    def requeue(self, job_id: str):
+        """Zet een lopende job terug in de wachtrij"""
+        with self._lock:
+            for job in self._jobs:
+                if job["id"] == job_id:
+                    job["status"] = JOB_QUEUED
+            self._save()
+
+    def finish(self, job_id: str):
+        """Verwijder een afgeronde (of definitief mislukte) job"""
+        with self._lock:
+            self._jobs = [job for job in self._jobs if job["id"] != job_id]
+            self._save()
+
+    def store_result(self, job_id: str, event: Dict[str, Any]):
+        """Bewaar het eind event van een job tot een client het ophaalt"""
+        with self._lock:
+            for job in self._jobs:
+                if job["id"] == job_id:
+                    job["status"] = JOB_DONE
+                    job["event"] = event
+            self._save()
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Bewaard eind event van een afgeronde job; None als de job niet klaar is"""
+        with self._lock:
+            for job in self._jobs:
+                if job["id"] == job_id and job["status"] == JOB_DONE:
+                    return dict(job["event"])
+        return None
+
+    def __contains__(self, job_id: str) -> bool:
+        with self._lock:
+            return any(job["id"] == job_id for job in self._jobs)
+
+    def cancel(self, job_id: str) -> bool:
+        """Verwijder een wachtende job; False als hij niet (meer) wacht"""
+        with self._lock:
+            for job in self._jobs:
+                if job["id"] == job_id and job["status"] == JOB_QUEUED:
+                    self._jobs.remove(job)
+                    self._save()
+                    return True
+        return False
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Kopie van alle wachtende en lopende jobs in volgorde"""
+        with self._lock:
+            return [dict(job) for job in self._jobs if job["status"] != JOB_DONE]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs if job["status"] != JOB_DONE)
+
+def serve_jobs(conn, handle_job: Callable[[Dict[str, Any], Callable[[float, str], None], Any], Any]):
+    """
+    Job lus voor in het worker proces
+
+    Een lees thread ontvangt jobs en cancel berichten; jobs worden één voor
+    één uitgevoerd met een eigen CancellationToken. Alles wat handle_job
+    tussen jobs bewaart (zoals geladen modellen) blijft geladen.
+
+    Args:
+        conn: Connection naar de server (argument van de worker target)
+        handle_job: Callable(job, progress, cancel_token) -> resultaat; progress(fractie, bericht)
+                    stuurt een progress event naar de client
+    """
+    jobs = queue_module.Queue()
+    state = {"token": None, "job_id": None}
+    cancelled_ids = set()  # Cancel kan binnenkomen voordat de job gestart is
+
+    def reader():
+        try:
+            while True:
+                message = conn.recv()
+                if message.get("type") == MSG_JOB:
+                    jobs.put(message["job"])
+                elif message.get("type") == MSG_CANCEL:
+                    cancelled_ids.add(message.get("job_id"))
+                    if state["token"] is not None and state["job_id"] == message.get("job_id"):
+                        state["token"].cancel()
+                elif message.get("type") == MSG_SHUTDOWN:
+                    break
+        except (EOFError, OSError):
+            pass
+        jobs.put(None)
+
+    threading.Thread(target=reader, name="worker-reader", daemon=True).start()
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        token = CancellationToken()
+        state["token"], state["job_id"] = token, job["id"]
+        if job["id"] in cancelled_ids:
+            token.cancel()
+
+        def progress(value: float, message: str = ""):
+            conn.send({"type": EVENT_PROGRESS, "progress": value, "message": message})
+
+        try:
+            result = handle_job(job, progress, token)
+            conn.send({"type": EVENT_RESULT, "result": result})
+        except CancelledError:
+            conn.send({"type": EVENT_ERROR, "error": "cancelled", "cancelled": True})
+        except Exception as e:
+            conn.send({"type": EVENT_ERROR, "error": str(e)})
+        finally:
+            state["token"], state["job_id"] = None, None
+    conn.close()
+
+class _WorkerSlot:
+    """Eén worker proces van de server met de job die het uitvoert"""
+
+    def __init__(self, index: int, args: tuple):
+        self.index = index
+        self.args = args
+        self.process = None
+        self.conn = None
+        self.send_lock = threading.Lock()
+        self.current: Optional[Dict[str, Any]] = None
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        conn = self.conn
+        if conn is None:
+            return False
+        try:
+            with self.send_lock:
+                conn.send(message)
+            return True
+        except (OSError, EOFError):
+            return False
+
+class TranscriptionServer:
+    """
+    Lokale transcriptie server
+
+    Args:
+        worker_target: Functie op module niveau die in het worker proces draait
+                       met als argumenten de Connection naar de server en worker_args[i]
+        address: Server adres (standaard default_address())
+        authkey: Gedeelde sleutel (standaard load_authkey())
+        queue: PersistentJobQueue (standaard in de cache map)
+        max_attempts: Pogingen per job bij crashende workers
+        worker_args: Extra argumenten per worker; het aantal bepaalt het aantal workers
+                     die jobs parallel uit de queue halen (standaard één worker zonder argumenten)
+    """
+
+    def __init__(self, worker_target: Callable, address: Optional[str] = None,
+                 authkey: Optional[bytes] = None, queue: Optional[PersistentJobQueue] = None,
+                 max_attempts: int = MAX_ATTEMPTS, worker_args: Optional[List[tuple]] = None):
+        self.worker_target = worker_target
+        self.address = address or default_address()
+        self.authkey = authkey if authkey is not None else load_authkey()
+        self.queue = queue or PersistentJobQueue()
+        self.max_attempts = max_attempts
+        self.restarts = 0
+        self._context = multiprocessing.get_context("spawn")  # Geen geërfde sockets of CUDA state
+        self._owners: Dict[str, Any] = {}
+        self._send_locks: Dict[int, threading.Lock] = {}
+        self._owners_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._listener = None
+        self._thread: Optional[threading.Thread] = None
+        self._workers = [_WorkerSlot(index, tuple(args)) for index, args in enumerate(worker_args or [()])]
+        self._cancel_requested = set()
+
+    # Verbindingen met clients
+
+    def _send(self, conn, event: Dict[str, Any]) -> bool:
+        lock = self._send_locks.setdefault(id(conn), threading.Lock())
+        try:
+            with lock:
+                conn.send(event)
+            return True
+        except (OSError, EOFError, ValueError):
+            return False
+
+    def _notify(self, job_id: str, event: Dict[str, Any]):
+        """Stuur een event naar de client die de job heeft ingediend (als die nog verbonden is)"""
+        event = dict(event, job_id=job_id)
+        with self._owners_lock:
+            conn = self._owners.get(job_id)
+            if event["type"] in FINAL_EVENTS:
+                self._owners.pop(job_id, None)
+        if conn is not None and not self._send(conn, event):
+            with self._owners_lock:
+                self._owners.pop(job_id, None)
+
+    def _complete(self, job_id: str, event: Dict[str, Any]):
+        """Bewaar het eind event en lever het af bij de client; het blijft staan als er geen client (meer) is"""
+        event = dict(event, job_id=job_id)
+        self.queue.store_result(job_id, event)
+        while True:
+            with self._owners_lock:
+                conn = self._owners.pop(job_id, None)
+            if conn is None:
+                return
+            if self._send(conn, event):
+                self.queue.finish(job_id)
+                return
+            # Verbinding verbroken; intussen kan een andere client zich gekoppeld hebben
+
+    def _attach(self, conn, job_id: str):
+        """Koppel een (nieuwe) client aan een job; een al bewaard resultaat wordt direct verstuurd"""
+        with self._owners_lock:
+            event = self.queue.result(job_id)
+            known = event is not None or job_id in self.queue
+            if event is None and known:
+                self._owners[job_id] = conn
+        if event is not None:
+            if self._send(conn, event):
+                self.queue.finish(job_id)
+        elif not known:
+            self._send(conn, {"type": EVENT_ERROR, "job_id": job_id, "error": "onbekende job"})
+
+    def _handle_client(self, conn):
+        try:
+            while not self._stopping.is_set():
+                message = conn.recv()
+                kind = message.get("type")
+                if kind == MSG_SUBMIT:
+                    job = self.queue.add(message["audio_path"], message.get("options"))
+                    with self._owners_lock:
+                        self._owners[job["id"]] = conn
+                    self._send(conn, {"type": EVENT_ACCEPTED, "job_id": job["id"],
+                                      "position": len(self.queue)})
+                    with self._wakeup:
+                        self._wakeup.notify_all()
+                elif kind == MSG_CANCEL:
+                    self.cancel(message["job_id"])
+                elif kind == MSG_ATTACH:
+                    self._attach(conn, message["job_id"])
+                elif kind == MSG_STATUS:
+                    running = [slot.current["id"] for slot in self._workers if slot.current]
+                    self._send(conn, {"type": EVENT_STATUS, "jobs": self.queue.pending(),
+                                      "current": running[0] if running else None, "running": running,
+                                      "workers": len(self._workers), "restarts": self.restarts})
+                elif kind == MSG_SHUTDOWN:
+                    self._send(conn, {"type": EVENT_STATUS, "shutdown": True})
+                    threading.Thread(target=self.shutdown, daemon=True).start()
+                    return
+        except (EOFError, OSError):
+            pass  # Client is weg; zijn jobs blijven in de queue en de resultaten worden bewaard
+        finally:
+            with self._owners_lock:
+                for job_id in [job_id for job_id, owner in self._owners.items() if owner is conn]:
+                    del self._owners[job_id]
+            self._send_locks.pop(id(conn), None)
+            conn.close()
+
+    def cancel(self, job_id: str):
+        """Annuleer een wachtende of lopende job"""
+        if self.queue.cancel(job_id):
+            self._notify(job_id, {"type": EVENT_ERROR, "error": "cancelled", "cancelled": True})
+            return
+        # Job loopt (of wordt net gestart): _run_job stuurt de cancel door als hij nog niet bij de worker is
+        self._cancel_requested.add(job_id)
+        for slot in self._workers:
+            if slot.current and slot.current["id"] == job_id:
+                slot.send({"type": MSG_CANCEL, "job_id": job_id})
+
+    # Worker processen
+
+    def _ensure_worker(self, slot: _WorkerSlot):
+        if slot.process is not None and slot.process.is_alive():
+            return
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=self.worker_target, args=(child_conn,) + slot.args,
+                                        name=f"magic-time-transcription-worker-{slot.index}", daemon=True)
+        process.start()
+        child_conn.close()
+        slot.process = process
+        slot.conn = parent_conn
+        logger.info(f"Transcriptie worker {slot.index} gestart (pid {process.pid})")
+
+    def _stop_worker(self, slot: _WorkerSlot, timeout: float = 5.0):
+        process, conn = slot.process, slot.conn
+        slot.send({"type": MSG_SHUTDOWN})
+        slot.process = None
+        slot.conn = None
+        if process is not None:
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout)
+        if conn is not None:
+            conn.close()
+
+    def _run_job(self, slot: _WorkerSlot, job: Dict[str, Any]):
+        self._ensure_worker(slot)
+        slot.current = job
+        self._notify(job["id"], {"type": EVENT_STARTED, "attempt": job["attempts"], "worker": slot.index})
+        try:
+            with slot.send_lock:
+                slot.conn.send({"type": MSG_JOB, "job": job})
+            if job["id"] in self._cancel_requested:
+                slot.send({"type": MSG_CANCEL, "job_id": job["id"]})
+            while True:
+                event = slot.conn.recv()
+                if event.get("type") in FINAL_EVENTS:
+                    self._complete(job["id"], event)
+                    return
+                self._notify(job["id"], event)
+        except (EOFError, OSError):
+            exitcode = slot.process.exitcode if slot.process else None
+            logger.warning(f"Transcriptie worker {slot.index} gestopt tijdens job {job['id']} (exit code {exitcode})")
+            self._stop_worker(slot, timeout=1.0)
+            self.restarts += 1
+            if self._stopping.is_set():
+                self.queue.requeue(job["id"])
+            elif job["attempts"] >= self.max_attempts:
+                self._complete(job["id"], {"type": EVENT_ERROR,
+                                           "error": f"worker crashte {job['attempts']} keer (exit code {exitcode})"})
+            else:
+                self.queue.requeue(job["id"])
+                self._notify(job["id"], {"type": EVENT_RESTARTED, "exitcode": exitcode})
+                self._stopping.wait(RESTART_DELAY)
+        finally:
+            slot.current = None
+            self._cancel_requested.discard(job["id"])
+
+    def _dispatch_loop(self, slot: _WorkerSlot):
+        while not self._stopping.is_set():
+            job = self.queue.next()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(0.5)
+                continue
+            self._run_job(slot, job)
+
+    # Levenscyclus
+
+    def serve_forever(self):
+        """Accepteer clients tot shutdown() aangeroepen wordt"""
+        if not self.address.startswith("\\\\") and os.path.exists(self.address):
+            try:
+                Client(self.address, authkey=self.authkey).close()
+                raise RuntimeError(f"Er draait al een transcriptie server op {self.address}")
+            except (OSError, EOFError):
+                os.remove(self.address)  # Achtergebleven socket van een gecrashte server
+        self._listener = Listener(self.address, authkey=self.authkey)
+        dispatchers = [threading.Thread(target=self._dispatch_loop, args=(slot,), daemon=True,
+                                        name=f"transcription-dispatch-{slot.index}") for slot in self._workers]
+        for dispatcher in dispatchers:
+            dispatcher.start()
+        logger.info(f"Transcriptie server luistert op {self.address} ({len(self._workers)} worker(s))")
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn = self._listener.accept()
+                except multiprocessing.AuthenticationError:
+                    logger.warning("Verbinding met ongeldige sleutel geweigerd")
+                    continue
+                except OSError:
+                    if self._stopping.is_set():
+                        break
+                    raise
+                if self._stopping.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
+        finally:
+            self._stopping.set()
+            with self._wakeup:
+                self._wakeup.notify_all()
+            for dispatcher in dispatchers:
+                dispatcher.join(timeout=5.0)
+            for slot in self._workers:
+                self._stop_worker(slot)
+            try:
+                self._listener.close()
+            except OSError:
+                pass  # Socket bestand al verwijderd
+
+    def start(self) -> threading.Thread:
+        """Start serve_forever in een achtergrond thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="transcription-server", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def shutdown(self):
+        """Stop de server; wachtende jobs blijven in de queue voor de volgende start"""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        # accept() blokkeert: maak één verbinding om hem te laten terugkeren
+        try:
+            Client(self.address, authkey=self.authkey).close()
+        except Exception:
+            pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=10.0)
+
+class TranscriptionClient:
+    """
+    Client voor de transcriptie server
+
+    Events voor andere jobs van deze client worden bewaard tot erom gevraagd wordt.
+    """
+
+    def __init__(self, address: Optional[str] = None, authkey: Optional[bytes] = None):
+        self.address = address or default_address()
+        self._conn = Client(self.address, authkey=authkey if authkey is not None else load_authkey())
+        self._backlog: Dict[str, List[Dict[str, Any]]] = {}
+
+    def close(self):
+        """Sluit de verbinding (jobs blijven op de server)"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _receive(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        if timeout is not None and not self._conn.poll(timeout):
+            return None
+        return self._conn.recv()
+
+    def _wait_reply(self, kind: str) -> Dict[str, Any]:
+        while True:
+            event = self._receive()
+            if event.get("type") == kind:
+                return event
+            self._backlog.setdefault(event.get("job_id"), []).append(event)
+
+    def submit(self, audio_path: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Dien een job in; geeft de job id terug"""
+        self._conn.send({"type": MSG_SUBMIT, "audio_path": audio_path, "options": options or {}})
+        return self._wait_reply(EVENT_ACCEPTED)["job_id"]
+
+    def cancel(self, job_id: str):
+        """Annuleer een job"""
+        self._conn.send({"type": MSG_CANCEL, "job_id": job_id})
+
+    def attach(self, job_id: str):
+        """
+        Ontvang de events van een job die door een andere (verbroken) verbinding is ingediend
+
+        Is de job al klaar, dan stuurt de server het bewaarde resultaat; bij een
+        onbekende job volgt een error event. Lees de events met events() of wait().
+        """
+        self._conn.send({"type": MSG_ATTACH, "job_id": job_id})
+
+    def result(self, job_id: str, progress_callback: Optional[Callable[[float, str], None]] = None,
+               cancel_token=None) -> Optional[Dict[str, Any]]:
+        """attach() gevolgd door wait(): resultaat van een job uit een eerdere sessie"""
+        self.attach(job_id)
+        return self.wait(job_id, progress_callback, cancel_token)
+
+    def status(self) -> Dict[str, Any]:
+        """Queue en worker status van de server"""
+        self._conn.send({"type": MSG_STATUS})
+        return self._wait_reply(EVENT_STATUS)
+
+    def shutdown_server(self):
+        """Vraag de server om te stoppen"""
+        self._conn.send({"type": MSG_SHUTDOWN})
+
+    def events(self, job_id: str, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Events van één job tot en met het resultaat of de fout
+
+        Args:
+            job_id: Job id uit submit()
+            timeout: Maximale wachttijd per event; bij overschrijden stopt de iterator
+        """
+        while True:
+            backlog = self._backlog.get(job_id)
+            if backlog:
+                event = backlog.pop(0)
+            else:
+                event = self._receive(timeout)
+                if event is None:
+                    return
+                if event.get("job_id") != job_id:
+                    self._backlog.setdefault(event.get("job_id"), []).append(event)
+                    continue
+            yield event
+            if event.get("type") in FINAL_EVENTS:
+                self._backlog.pop(job_id, None)
+                return
+
+    def transcribe(self, audio_path: str, options: Optional[Dict[str, Any]] = None,
+                   progress_callback: Optional[Callable[[float, str], None]] = None,
+                   cancel_token=None) -> Optional[Dict[str, Any]]:
+        """
+        Transcribeer via de server en wacht op het resultaat
+
+        Args:
+            audio_path: Audio of video bestand
+            options: Job opties (bijv. settings, resume_key)
+            progress_callback: Callable(progress, message) voor progress events
+            cancel_token: Optioneel CancellationToken; annuleren stuurt een cancel naar de server
+
+        Returns:
+            Resultaat van de worker of None bij een fout
+
+        Raises:
+            CancelledError: Als de job via cancel_token geannuleerd werd
+        """
+        return self.wait(self.submit(audio_path, options), progress_callback, cancel_token)
+
+    def wait(self, job_id: str, progress_callback: Optional[Callable[[float, str], None]] = None,
+             cancel_token=None) -> Optional[Dict[str, Any]]:
+        """
+        Wacht op het resultaat van een eerder ingediende job
+
+        Meerdere jobs tegelijk indienen en daarna één voor één wachten laat de
+        server ze parallel over zijn workers verdelen.
+
+        Args:
+            job_id: Job id uit submit()
+            progress_callback: Callable(progress, message) voor progress events
+            cancel_token: Optioneel CancellationToken; annuleren stuurt een cancel naar de server
+
+        Returns:
+            Resultaat van de worker of None bij een fout
+
+        Raises:
+            CancelledError: Als de job via cancel_token geannuleerd werd
+        """
+        cancel_sent = False
+        while True:
+            for event in self.events(job_id, timeout=0.2):
+                if cancel_token is not None and cancel_token.cancelled and not cancel_sent:
+                    self.cancel(job_id)
+                    cancel_sent = True
+                kind = event.get("type")
+                if kind == EVENT_PROGRESS and progress_callback:
+                    progress_callback(event.get("progress", 0.0), event.get("message", ""))
+                elif kind == EVENT_RESTARTED:
+                    logger.warning(f"Transcriptie worker herstart, job {job_id} wordt opnieuw uitgevoerd")
+                    if progress_callback:
+                        progress_callback(0.0, "Transcriptie worker herstart, opnieuw proberen...")
+                elif kind == EVENT_RESULT:
+                    return event.get("result")
+                elif kind == EVENT_ERROR:
+                    if event.get("cancelled") or cancel_sent:
+                        raise CancelledError()
+                    logger.error(f"Transcriptie job {job_id} mislukt: {event.get('error')}")
+                    return None
+            # Geen event binnen de timeout: controleer op annulering
+            if cancel_token is not None and cancel_token.cancelled and not cancel_sent:
+                self.cancel(job_id)
+                cancel_sent = True
+
+def connect(address: Optional[str] = None, authkey: Optional[bytes] = None,
+            spawn_command: Optional[List[str]] = None, timeout: float = 30.0) -> Optional[TranscriptionClient]:
+    """
+    Verbind met de server en start hem zo nodig
+
+    De server wordt als losstaand proces gestart (niet als kind van de GUI),
+    zodat hij bij stoppen of afsluiten van één sessie blijft draaien voor de andere.
+
+    Args:
+        address: Server adres
+        authkey: Gedeelde sleutel
+        spawn_command: Commando om de server te starten als er geen draait
+        timeout: Maximale wachttijd tot de gestarte server bereikbaar is
+
+    Returns:
+        TranscriptionClient of None als er geen server bereikbaar is
+    """
+    try:
+        return TranscriptionClient(address, authkey)
+    except (OSError, EOFError):
+        if not spawn_command:
+            return None
+    kwargs = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "stdin": subprocess.DEVNULL}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(spawn_command, **kwargs)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.25)
+        try:
+            return TranscriptionClient(address, authkey)
+        except (OSError, EOFError):
+            continue
+    logger.error("Transcriptie server niet bereikbaar na starten")
+    return None
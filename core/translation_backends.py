@@ -0,0 +1,622 @@
+"""
+Vertaal backends voor Magic Time Studio
+Eén interface (translate_batch) voor LibreTranslate, Google, DeepL en een offline model
+
+Elke backend beschrijft met BackendCapabilities hoeveel teksten en tekens er
+in één request mogen en hoeveel requests per seconde toegestaan zijn;
+translate_batch splitst de invoer daarop. HTTP backends hergebruiken
+keep-alive verbindingen uit een pool (alleen de standaard library). De
+offline backend laadt per taalpaar één keer een MarianMT model (CTranslate2
+of transformers) en vertaalt in batches op de CPU.
+
+Voor load tests zonder netwerk is er een LibreTranslate-compatibele stub server:
+
+    python -m core.translation_backends stub --port 5000 --delay 0.05
+"""
+
+import os
+import json
+import time
+import queue
+import threading
+import http.client
+import urllib.parse
+from dataclasses import dataclass, replace
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, List, Any, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Vroegere hard-coded LibreTranslate server blijft de standaard
+DEFAULT_LIBRETRANSLATE_URL = "http://100.90.127.78:5000"
+LIBRETRANSLATE_URL_ENV = "MAGIC_TIME_LIBRETRANSLATE_URL"
+OFFLINE_MODELS_ENV = "MAGIC_TIME_TRANSLATION_MODELS"
+
+DEFAULT_TIMEOUT = 60.0
+POOL_SIZE = 8
+
+# Offline modellen: Helsinki-NLP/opus-mt-{bron}-{doel}
+OFFLINE_MODEL_TEMPLATE = "Helsinki-NLP/opus-mt-{source}-{target}"
+OFFLINE_BATCH_SIZE = 32
+
+class TranslationError(RuntimeError):
+    """Vertaling mislukt (HTTP fout, onverwacht antwoord of ontbrekend model)"""
+
+@dataclass(frozen=True)
+class BackendCapabilities:
+    """Limieten van een backend per request"""
+    max_batch_size: int = 1
+    max_chars: int = 5000
+    requests_per_second: Optional[float] = None  # None = geen limiet
+
+def plan_batches(texts: List[str], capabilities: BackendCapabilities) -> List[List[int]]:
+    """
+    Verdeel teksten over requests binnen max_batch_size en max_chars
+
+    Een tekst die alleen al te lang is krijgt een eigen request.
+
+    Returns:
+        Lijst van index lijsten (volgorde behouden)
+    """
+    batches, current, chars = [], [], 0
+    for index, text in enumerate(texts):
+        size = len(text)
+        if current and (len(current) >= capabilities.max_batch_size or chars + size > capabilities.max_chars):
+            batches.append(current)
+            current, chars = [], 0
+        current.append(index)
+        chars += size
+    if current:
+        batches.append(current)
+    return batches
+
+class RateLimiter:
+    """Minimale tijd tussen requests (thread-safe)"""
+
+    def __init__(self, requests_per_second: Optional[float] = None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        """Wacht tot het volgende request mag"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) verbindingen per host, gedeeld tussen threads
+
+    Een verbinding wordt na een request teruggelegd; bij een verbroken
+    keep-alive verbinding wordt het request één keer opnieuw geprobeerd.
+    """
+
+    def __init__(self, url: str, size: int = POOL_SIZE, timeout: float = DEFAULT_TIMEOUT):
+        parts = urllib.parse.urlsplit(url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=size)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        """
+        Voer een request uit op een verbinding uit de pool
+
+        Returns:
+            (status code, body)
+        """
+        for attempt in range(2):
+            try:
+                connection = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                connection = self._connect()
+                reused = False
+            try:
+                connection.request(method, self.base_path + path, body=body, headers=headers or {})
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                    ConnectionResetError, BrokenPipeError):
+                connection.close()
+                # Door de server gesloten keep-alive verbinding: één keer met een nieuwe verbinding
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                try:
+                    self._idle.put_nowait(connection)
+                except queue.Full:
+                    connection.close()
+            return response.status, data
+        raise TranslationError("Verbinding verbroken")
+
+    def close(self):
+        """Sluit alle vrije verbindingen"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class TranslationBackend:
+    """
+    Basis voor vertaal backends
+
+    Subclasses implementeren _translate_chunk voor één request binnen de
+    capabilities; translate_batch verzorgt lege teksten, opsplitsen en de
+    rate limit.
+    """
+
+    name = "base"
+    capabilities = BackendCapabilities()
+
+    def __init__(self):
+        self._limiter = RateLimiter(self.capabilities.requests_per_second)
+
+    def translate_batch(self, texts: List[str], source: str, target: str) -> List[str]:
+        """
+        Vertaal teksten van source naar target
+
+        Args:
+            texts: Teksten om te vertalen
+            source: Bron taal code ("auto" als de backend dat ondersteunt)
+            target: Doel taal code
+
+        Returns:
+            Vertaalde teksten, zelfde lengte en volgorde (lege teksten blijven leeg)
+
+        Raises:
+            TranslationError: Als een request mislukt
+        """
+        translated = list(texts)
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not indices:
+            return translated
+        for batch in plan_batches([texts[i] for i in indices], self.capabilities):
+            self._limiter.wait()
+            chunk = [texts[indices[i]] for i in batch]
+            result = self._translate_chunk(chunk, source, target)
+            if len(result) != len(chunk):
+                raise TranslationError(f"{self.name}: {len(result)} vertalingen voor {len(chunk)} teksten")
+            for i, text in zip(batch, result):
+                translated[indices[i]] = text
+        return translated
+
+    def translate(self, text: str, source: str, target: str) -> str:
+        """Vertaal één tekst"""
+        return self.translate_batch([text], source, target)[0]
+
+    def _translate_chunk(self, texts: List[str], source: str, target: str) -> List[str]:
+        raise NotImplementedError
+
+    def close(self):
+        """Geef verbindingen of modellen vrij"""
+
+class HTTPBackend(TranslationBackend):
+    """Gedeelde request code voor de HTTP API's"""
+
+    def __init__(self, url: str, timeout: float = DEFAULT_TIMEOUT, pool_size: int = POOL_SIZE):
+        super().__init__()
+        self.url = url.rstrip("/")
+        self.pool = ConnectionPool(self.url, pool_size, timeout)
+
+    def _request(self, method: str, path: str, json_body: Optional[Dict[str, Any]] = None,
+                 form: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None) -> Any:
+        """Request met JSON antwoord; TranslationError bij een fout"""
+        headers = dict(headers or {})
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body, ensure_ascii=False).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            body = urllib.parse.urlencode(form, doseq=True).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        try:
+            status, data = self.pool.request(method, path, body, headers)
+        except (OSError, http.client.HTTPException) as e:
+            raise TranslationError(f"{self.name} niet bereikbaar: {e}") from e
+        if status != 200:
+            raise TranslationError(f"{self.name} API fout: {status} - {data[:200].decode('utf-8', 'replace')}")
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise TranslationError(f"{self.name} gaf geen JSON: {e}") from e
+
+    def close(self):
+        self.pool.close()
+
+class LibreTranslateBackend(HTTPBackend):
+    """LibreTranslate (q als lijst: één request per batch)"""
+
+    name = "libretranslate"
+    capabilities = BackendCapabilities(max_batch_size=50, max_chars=20000)
+
+    def __init__(self, url: Optional[str] = None, api_key: Optional[str] = None,
+                 max_chars: Optional[int] = None, **kwargs):
+        url = url or os.environ.get(LIBRETRANSLATE_URL_ENV) or DEFAULT_LIBRETRANSLATE_URL
+        # Oude instellingen bevatten soms het volledige /translate endpoint
+        if url.rstrip("/").endswith("/translate"):
+            url = url.rstrip("/")[:-len("/translate")]
+        # Eigen servers kunnen met --char-limit een lagere limiet hebben
+        if max_chars:
+            self.capabilities = replace(self.capabilities, max_chars=max_chars)
+        super().__init__(url, **kwargs)
+        self.api_key = api_key
+
+    def _payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.api_key:
+            payload["api_key"] = self.api_key
+        return payload
+
+    def _translate_chunk(self, texts: List[str], source: str, target: str) -> List[str]:
+        result = self._request("POST", "/translate", self._payload(
+            {"q": texts, "source": source, "target": target, "format": "text"}))
+        translated = result.get("translatedText") if isinstance(result, dict) else None
+        if isinstance(translated, str) and len(texts) == 1:
+            return [translated]
+        if not isinstance(translated, list):
+            raise TranslationError(f"Onverwacht LibreTranslate antwoord: {str(result)[:200]}")
+        return translated
+
+    def detect(self, text: str) -> Optional[Tuple[str, float]]:
+        """Detecteer de taal; (taal code, zekerheid) of None"""
+        result = self._request("POST", "/detect", self._payload({"q": text}))
+        if result and isinstance(result, list):
+            return result[0].get("language", "unknown"), result[0].get("confidence", 0.0)
+        return None
+
+    def languages(self) -> List[Dict[str, Any]]:
+        """Talen die de server ondersteunt"""
+        return self._request("GET", "/languages")
+
+class GoogleBackend(HTTPBackend):
+    """Google Translate v2 (meerdere q parameters per request)"""
+
+    name = "google"
+    capabilities = BackendCapabilities(max_batch_size=128, max_chars=30000)
+
+    def __init__(self, api_key: str, url: str = "https://translation.googleapis.com", **kwargs):
+        super().__init__(url, **kwargs)
+        self.api_key = api_key
+
+    def _translate_chunk(self, texts: List[str], source: str, target: str) -> List[str]:
+        form = {"key": self.api_key, "q": texts, "target": target, "format": "text"}
+        if source and source != "auto":
+            form["source"] = source
+        result = self._request("POST", "/language/translate/v2", form=form)
+        try:
+            return [item["translatedText"] for item in result["data"]["translations"]]
+        except (KeyError, TypeError) as e:
+            raise TranslationError(f"Onverwacht Google antwoord: {e}") from e
+
+class DeepLBackend(HTTPBackend):
+    """DeepL (meerdere text parameters per request)"""
+
+    name = "deepl"
+    capabilities = BackendCapabilities(max_batch_size=50, max_chars=100000)
+
+    def __init__(self, api_key: str, url: str = "https://api-free.deepl.com", **kwargs):
+        super().__init__(url, **kwargs)
+        self.api_key = api_key
+
+    def _translate_chunk(self, texts: List[str], source: str, target: str) -> List[str]:
+        form = {"text": texts, "target_lang": target.upper()}
+        if source and source != "auto":
+            form["source_lang"] = source.upper()
+        result = self._request("POST", "/v2/translate", form=form,
+                               headers={"Authorization": f"DeepL-Auth-Key {self.api_key}"})
+        try:
+            return [item["text"] for item in result["translations"]]
+        except (KeyError, TypeError) as e:
+            raise TranslationError(f"Onverwacht DeepL antwoord: {e}") from e
+
+class OfflineBackend(TranslationBackend):
+    """
+    MarianMT modellen in dit proces, zonder netwerk
+
+    Per taalpaar wordt het model één keer geladen en gedeeld door alle
+    instanties. Met CTranslate2 wordt een geconverteerd model uit
+    models_dir/opus-mt-{bron}-{doel} gebruikt (ct2-transformers-converter),
+    anders het transformers model. Beide zijn optioneel.
+
+    Args:
+        models_dir: Map met CTranslate2 modellen (standaard MAGIC_TIME_TRANSLATION_MODELS)
+        threads: CPU threads per model (standaard alle cores)
+        beam_size: Beam size bij het decoderen
+    """
+
+    name = "offline"
+    capabilities = BackendCapabilities(max_batch_size=OFFLINE_BATCH_SIZE, max_chars=20000)
+
+    _models: Dict[Tuple[str, str], Any] = {}
+    _models_lock = threading.Lock()
+
+    def __init__(self, models_dir: Optional[str] = None, threads: Optional[int] = None, beam_size: int = 2):
+        super().__init__()
+        self.models_dir = models_dir or os.environ.get(OFFLINE_MODELS_ENV)
+        self.threads = threads or os.cpu_count() or 1
+        self.beam_size = beam_size
+
+    @staticmethod
+    def model_name(source: str, target: str) -> str:
+        """Naam van het MarianMT model voor een taalpaar"""
+        return OFFLINE_MODEL_TEMPLATE.format(source=source, target=target)
+
+    def _load(self, source: str, target: str) -> Dict[str, Any]:
+        """Laad het model voor een taalpaar (één keer per proces)"""
+        if not source or source == "auto":
+            raise TranslationError("Offline vertaling heeft een brontaal nodig")
+        key = (source, target)
+        with self._models_lock:
+            if key in self._models:
+                return self._models[key]
+            name = self.model_name(source, target)
+            try:
+                from transformers import AutoTokenizer
+            except ImportError as e:
+                raise TranslationError("Offline vertaling vereist transformers (pip install transformers)") from e
+            try:
+                tokenizer = AutoTokenizer.from_pretrained(name)
+                ct2_dir = os.path.join(self.models_dir, name.split("/")[-1]) if self.models_dir else None
+                try:
+                    import ctranslate2
+                except ImportError:
+                    ctranslate2 = None
+                if ctranslate2 is not None and ct2_dir and os.path.isdir(ct2_dir):
+                    model = {"engine": "ctranslate2", "tokenizer": tokenizer,
+                             "translator": ctranslate2.Translator(ct2_dir, device="cpu", compute_type="int8",
+                                                                  intra_threads=self.threads)}
+                else:
+                    import torch
+                    from transformers import MarianMTModel
+                    torch.set_num_threads(self.threads)
+                    model = {"engine": "transformers", "tokenizer": tokenizer,
+                             "model": MarianMTModel.from_pretrained(name).eval()}
+            except TranslationError:
+                raise
+            except Exception as e:
+                raise TranslationError(f"Kan offline model {name} niet laden: {e}") from e
+            logger.info(f"Offline vertaalmodel {name} geladen ({model['engine']})")
+            self._models[key] = model
+            return model
+
+    def _translate_chunk(self, texts: List[str], source: str, target: str) -> List[str]:
+        model = self._load(source, target)
+        tokenizer = model["tokenizer"]
+        if model["engine"] == "ctranslate2":
+            tokens = [tokenizer.convert_ids_to_tokens(tokenizer.encode(text)) for text in texts]
+            results = model["translator"].translate_batch(tokens, beam_size=self.beam_size,
+                                                          max_batch_size=self.capabilities.max_batch_size)
+            return [tokenizer.decode(tokenizer.convert_tokens_to_ids(result.hypotheses[0]),
+                                     skip_special_tokens=True) for result in results]
+        import torch
+        with torch.inference_mode():
+            inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+            outputs = model["model"].generate(**inputs, num_beams=self.beam_size)
+        return tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+    @classmethod
+    def unload(cls):
+        """Verwijder alle geladen modellen uit het geheugen"""
+        with cls._models_lock:
+            cls._models.clear()
+
+BACKENDS = {
+    "libretranslate": LibreTranslateBackend,
+    "google": GoogleBackend,
+    "deepl": DeepLBackend,
+    "offline": OfflineBackend,
+}
+
+def create_backend(name: str, **options) -> TranslationBackend:
+    """
+    Maak een backend op naam
+
+    Raises:
+        TranslationError: Onbekende backend of ontbrekende API key
+    """
+    cls = BACKENDS.get(name)
+    if cls is None:
+        raise TranslationError(f"Onbekende vertaling service: {name}")
+    if cls in (GoogleBackend, DeepLBackend) and not options.get("api_key"):
+        raise TranslationError(f"{cls.name} API key vereist")
+    return cls(**options)
+
+# Gedeelde backends, zodat de connection pool en geladen modellen hergebruikt worden
+_backends: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], TranslationBackend] = {}
+_backends_lock = threading.Lock()
+
+def get_backend(name: str = "libretranslate", **options) -> TranslationBackend:
+    """Gedeelde backend voor deze naam en opties (wordt één keer aangemaakt)"""
+    key = (name, tuple(sorted((k, v) for k, v in options.items() if v is not None)))
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = _backends[key] = create_backend(name, **dict(key[1]))
+        return backend
+
+def backend_from_settings(settings: Optional[Dict[str, Any]]) -> Optional[TranslationBackend]:
+    """
+    Backend volgens de app instellingen
+
+    Args:
+        settings: Instellingen met translator ("libretranslate", "offline", "google",
+            "deepl" of "none"), libretranslate_server en translation_api_key
+
+    Returns:
+        Gedeelde backend, of None als vertaling uitgeschakeld is
+    """
+    settings = settings or {}
+    name = settings.get("translator") or "libretranslate"
+    if name == "none":
+        return None
+    if name == "libretranslate":
+        return get_backend(name, url=settings.get("libretranslate_server"))
+    if name == "offline":
+        return get_backend(name, models_dir=settings.get("translation_models_dir"))
+    return get_backend(name, api_key=settings.get("translation_api_key"))
+
+def stub_translate(text: str, target: str) -> str:
+    """Voorspelbare nep-vertaling van de stub server"""
+    return f"[{target}] {text}"
+
+class StubTranslationServer:
+    """
+    LibreTranslate-compatibele server zonder model, voor load tests
+
+    Endpoints: POST /translate (q als tekst of lijst, JSON of form),
+    POST /detect, GET /languages en GET /status (aantal requests en teksten).
+
+    Args:
+        host: Adres om op te luisteren
+        port: Poort (0 = vrije poort)
+        delay: Vertraging per request in seconden (simuleert een echte server)
+        char_limit: Maximaal aantal tekens per request (None = geen limiet), zoals --char-limit
+        languages: Talen die /languages teruggeeft
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0,
+                 char_limit: Optional[int] = None, languages: Optional[List[str]] = None):
+        self.delay = delay
+        self.char_limit = char_limit
+        self.languages = languages or ["en", "nl", "de", "fr", "es", "it", "pt", "ru", "ja", "ko", "zh"]
+        self.requests = 0
+        self.texts = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def _handle(self, method: str, path: str, body: Dict[str, Any]):
+        """Verwerk één API aanroep; geeft (status code, antwoord) terug"""
+        if method == "GET" and path == "/languages":
+            return 200, [{"code": code, "name": code, "targets": self.languages} for code in self.languages]
+        if method == "GET" and path == "/status":
+            with self._lock:
+                return 200, {"requests": self.requests, "texts": self.texts}
+        if method != "POST" or path not in ("/translate", "/detect"):
+            return 404, {"error": "onbekend endpoint"}
+        q = body.get("q")
+        texts = q if isinstance(q, list) else [q or ""]
+        if self.char_limit is not None and sum(len(text) for text in texts) > self.char_limit:
+            return 400, {"error": f"Invoer te lang (limiet {self.char_limit} tekens)"}
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            self.requests += 1
+            self.texts += len(texts)
+        if path == "/detect":
+            return 200, [{"language": self.languages[0], "confidence": 90.0}]
+        target = body.get("target")
+        if target not in self.languages:
+            return 400, {"error": f"{target} wordt niet ondersteund"}
+        translated = [stub_translate(str(text), target) for text in texts]
+        return 200, {"translatedText": translated if isinstance(q, list) else translated[0]}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, zodat de connection pool van de client getest wordt
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status: int, payload: Any):
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _dispatch(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    if "application/x-www-form-urlencoded" in self.headers.get("Content-Type", ""):
+                        form = urllib.parse.parse_qs(raw.decode("utf-8"))
+                        body = {key: values if key == "q" and len(values) > 1 else values[0]
+                                for key, values in form.items()}
+                    else:
+                        body = json.loads(raw or b"{}")
+                    status, payload = server._handle(method, self.path.split("?")[0], body)
+                except (ValueError, TypeError, AttributeError) as e:
+                    status, payload = 400, {"error": str(e)}
+                self._reply(status, payload)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, format, *args):
+                logger.debug("stub vertaalserver: " + format % args)
+
+        return Handler
+
+    def serve_forever(self):
+        """Beantwoord requests tot shutdown()"""
+        logger.info(f"Stub vertaalserver luistert op {self.url}")
+        self._server.serve_forever(poll_interval=0.2)
+
+    def start(self) -> threading.Thread:
+        """Start serve_forever in een achtergrond thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-translate", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def shutdown(self):
+        """Stop de server"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line: stub server starten"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Magic Time Studio vertaal backends")
+    commands = parser.add_subparsers(dest="command", required=True)
+    stub = commands.add_parser("stub", help="Start een LibreTranslate-compatibele stub server")
+    stub.add_argument("--host", default="127.0.0.1")
+    stub.add_argument("--port", type=int, default=5000)
+    stub.add_argument("--delay", type=float, default=0.0, help="Vertraging per request in seconden")
+    stub.add_argument("--char-limit", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = StubTranslationServer(args.host, args.port, args.delay, args.char_limit)
+    print(f"🌐 Stub vertaalserver op {server.url} (libretranslate_server of {LIBRETRANSLATE_URL_ENV})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,10 +5,12 @@ Bevat alle vertaling functionaliteit
 
 import os
 import json
-import requests
 from typing import Optional, Dict, List, Any, Tuple
 import logging
 
+from .transcript import Transcript
+from .translation_backends import get_backend, TranslationError
+
 logger = logging.getLogger(__name__)
 
 # Ondersteunde vertaling services
@@ -30,6 +32,12 @@ TRANSLATION_SERVICES = {
         "url": "https://api-free.deepl.com/v2/translate",
         "free": False,
         "languages": ["en", "nl", "de", "fr", "es", "it", "pt", "ru", "ja", "ko", "zh"]
+    },
+    "offline": {
+        "name": "Offline (MarianMT)",
+        "url": None,
+        "free": True,
+        "languages": ["en", "nl", "de", "fr", "es", "it", "pt", "ru", "ja", "ko", "zh"]
     }
 }
 
@@ -48,6 +56,17 @@ LANGUAGE_CODES = {
     "zh": "中文"
 }
 
+def _translate_with(backend_name: str, texts: List[str], source_lang: str, target_lang: str,
+                    **options) -> Optional[List[str]]:
+    """Vertaal via een gedeelde backend; None bij fout"""
+    try:
+        translated = get_backend(backend_name, **options).translate_batch(texts, source_lang, target_lang)
+        logger.info(f"{backend_name} vertaling voltooid: {source_lang} -> {target_lang} ({len(texts)} teksten)")
+        return translated
+    except TranslationError as e:
+        logger.error(f"Fout bij {backend_name} vertaling: {e}")
+        return None
+
 def translate_text_libretranslate(text: str, source_lang: str, target_lang: str,
                                 api_url: str = "https://libretranslate.com/translate") -> Optional[str]:
     """
@@ -62,31 +81,8 @@ def translate_text_libretranslate(text: str, source_lang: str, target_lang: str,
     Returns:
         Vertaalde tekst of None bij fout
     """
-    try:
-        payload = {
-            "q": text,
-            "source": source_lang,
-            "target": target_lang,
-            "format": "text"
-        }
-        
-        response = requests.post(api_url, json=payload, timeout=30)
-        
-        if response.status_code == 200:
-            result = response.json()
-            translated_text = result.get("translatedText", "")
-            logger.info(f"LibreTranslate vertaling voltooid: {source_lang} -> {target_lang}")
-            return translated_text
-        else:
-            logger.error(f"LibreTranslate API fout: {response.status_code} - {response.text}")
-            return None
-            
-    except requests.exceptions.Timeout:
-        logger.error("LibreTranslate vertaling timeout")
-        return None
-    except Exception as e:
-        logger.error(f"Fout bij LibreTranslate vertaling: {e}")
-        return None
+    translated = _translate_with("libretranslate", [text], source_lang, target_lang, url=api_url)
+    return translated[0] if translated else None
 
 def translate_text_google(text: str, source_lang: str, target_lang: str,
                          api_key: str) -> Optional[str]:
@@ -102,29 +98,8 @@ def translate_text_google(text: str, source_lang: str, target_lang: str,
     Returns:
         Vertaalde tekst of None bij fout
     """
-    try:
-        url = "https://translation.googleapis.com/language/translate/v2"
-        params = {
-            "key": api_key,
-            "q": text,
-            "source": source_lang,
-            "target": target_lang
-        }
-        
-        response = requests.get(url, params=params, timeout=30)
-        
-        if response.status_code == 200:
-            result = response.json()
-            translated_text = result["data"]["translations"][0]["translatedText"]
-            logger.info(f"Google Translate vertaling voltooid: {source_lang} -> {target_lang}")
-            return translated_text
-        else:
-            logger.error(f"Google Translate API fout: {response.status_code} - {response.text}")
-            return None
-            
-    except Exception as e:
-        logger.error(f"Fout bij Google Translate vertaling: {e}")
-        return None
+    translated = _translate_with("google", [text], source_lang, target_lang, api_key=api_key)
+    return translated[0] if translated else None
 
 def translate_text_deepl(text: str, source_lang: str, target_lang: str,
                         api_key: str) -> Optional[str]:
@@ -140,33 +115,20 @@ def translate_text_deepl(text: str, source_lang: str, target_lang: str,
     Returns:
         Vertaalde tekst of None bij fout
     """
-    try:
-        url = "https://api-free.deepl.com/v2/translate"
-        headers = {
-            "Authorization": f"DeepL-Auth-Key {api_key}",
-            "Content-Type": "application/x-www-form-urlencoded"
-        }
-        
-        data = {
-            "text": text,
-            "source_lang": source_lang.upper(),
-            "target_lang": target_lang.upper()
-        }
-        
-        response = requests.post(url, headers=headers, data=data, timeout=30)
-        
-        if response.status_code == 200:
-            result = response.json()
-            translated_text = result["translations"][0]["text"]
-            logger.info(f"DeepL vertaling voltooid: {source_lang} -> {target_lang}")
-            return translated_text
-        else:
-            logger.error(f"DeepL API fout: {response.status_code} - {response.text}")
-            return None
-            
-    except Exception as e:
-        logger.error(f"Fout bij DeepL vertaling: {e}")
+    translated = _translate_with("deepl", [text], source_lang, target_lang, api_key=api_key)
+    return translated[0] if translated else None
+
+def _backend_options(service: str, kwargs: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Backend opties uit de kwargs van translate_text; None als een API key ontbreekt"""
+    if service == "libretranslate":
+        return {"url": kwargs.get("api_url", "https://libretranslate.com/translate"),
+                "api_key": kwargs.get("api_key")}
+    if service == "offline":
+        return {"models_dir": kwargs.get("models_dir")}
+    if service in ("google", "deepl") and not kwargs.get("api_key"):
+        logger.error(f"{TRANSLATION_SERVICES[service]['name']} API key vereist")
         return None
+    return {"api_key": kwargs.get("api_key")}
 
 def translate_text(text: str, source_lang: str, target_lang: str,
                   service: str = "libretranslate", **kwargs) -> Optional[str]:
@@ -177,38 +139,14 @@ def translate_text(text: str, source_lang: str, target_lang: str,
         text: Tekst om te vertalen
         source_lang: Bron taal code
         target_lang: Doel taal code
-        service: Vertaling service (libretranslate, google, deepl)
-        **kwargs: Extra parameters (api_key, api_url, etc.)
+        service: Vertaling service (libretranslate, google, deepl, offline)
+        **kwargs: Extra parameters (api_key, api_url, models_dir)
     
     Returns:
         Vertaalde tekst of None bij fout
     """
-    try:
-        if service == "libretranslate":
-            api_url = kwargs.get("api_url", "https://libretranslate.com/translate")
-            return translate_text_libretranslate(text, source_lang, target_lang, api_url)
-        
-        elif service == "google":
-            api_key = kwargs.get("api_key")
-            if not api_key:
-                logger.error("Google Translate API key vereist")
-                return None
-            return translate_text_google(text, source_lang, target_lang, api_key)
-        
-        elif service == "deepl":
-            api_key = kwargs.get("api_key")
-            if not api_key:
-                logger.error("DeepL API key vereist")
-                return None
-            return translate_text_deepl(text, source_lang, target_lang, api_key)
-        
-        else:
-            logger.error(f"Onbekende vertaling service: {service}")
-            return None
-            
-    except Exception as e:
-        logger.error(f"Fout bij vertaling: {e}")
-        return None
+    translated = batch_translate_texts([text], source_lang, target_lang, service, fallback=False, **kwargs)
+    return translated[0] if translated else None
 
 def translate_transcriptions(transcriptions: List[Dict[str, Any]], source_lang: str,
                            target_lang: str, service: str = "libretranslate", **kwargs) -> Optional[List[Dict[str, Any]]]:
@@ -229,15 +167,26 @@ def translate_transcriptions(transcriptions: List[Dict[str, Any]], source_lang:
         if not transcriptions:
             return []
         
+        if isinstance(transcriptions, Transcript):
+            # Kolomsgewijs: alleen een nieuwe tekst buffer, tijden en woorden worden gedeeld
+            indices = [i for i, text in enumerate(transcriptions.texts) if text.strip()]
+            source = transcriptions.take(indices) if len(indices) != len(transcriptions) else transcriptions
+            translated_texts = batch_translate_texts(list(source.texts), source_lang, target_lang, service, **kwargs)
+            if translated_texts is None:
+                return None
+            logger.info(f"Vertaling voltooid: {len(translated_texts)} segmenten")
+            return source.with_texts(translated_texts, source_language=source_lang, target_language=target_lang)
+        
         translated_transcriptions = []
+        segments = [segment for segment in transcriptions if segment.get("text", "").strip()]
+        # Alle segmenten in batches van de backend, niet één request per segment
+        translated_texts = batch_translate_texts([segment["text"] for segment in segments],
+                                                 source_lang, target_lang, service, fallback=False, **kwargs)
+        if translated_texts is None:
+            translated_texts = [None] * len(segments)
         
-        for segment in transcriptions:
-            original_text = segment.get("text", "")
-            if not original_text.strip():
-                continue
-            
-            # Vertaal de tekst
-            translated_text = translate_text(original_text, source_lang, target_lang, service, **kwargs)
+        for segment, translated_text in zip(segments, translated_texts):
+            original_text = segment["text"]
             
             if translated_text:
                 translated_segment = segment.copy()
@@ -262,7 +211,7 @@ def translate_transcriptions(transcriptions: List[Dict[str, Any]], source_lang:
         return None
 
 def batch_translate_texts(texts: List[str], source_lang: str, target_lang: str,
-                         service: str = "libretranslate", **kwargs) -> Optional[List[str]]:
+                         service: str = "libretranslate", fallback: bool = True, **kwargs) -> Optional[List[str]]:
     """
     Vertaal meerdere teksten in batch
     
@@ -271,6 +220,7 @@ def batch_translate_texts(texts: List[str], source_lang: str, target_lang: str,
         source_lang: Bron taal code
         target_lang: Doel taal code
         service: Vertaling service
+        fallback: Originele teksten teruggeven als de vertaling faalt (anders None)
         **kwargs: Extra parameters
     
     Returns:
@@ -280,19 +230,13 @@ def batch_translate_texts(texts: List[str], source_lang: str, target_lang: str,
         if not texts:
             return []
         
-        translated_texts = []
-        
-        for text in texts:
-            if not text.strip():
-                translated_texts.append("")
-                continue
-            
-            translated_text = translate_text(text, source_lang, target_lang, service, **kwargs)
-            if translated_text:
-                translated_texts.append(translated_text)
-            else:
-                # Gebruik originele tekst als vertaling faalt
-                translated_texts.append(text)
+        options = _backend_options(service, kwargs)
+        if options is None:
+            return list(texts) if fallback else None
+        translated_texts = _translate_with(service, list(texts), source_lang, target_lang, **options)
+        if translated_texts is None:
+            # Gebruik originele tekst als vertaling faalt
+            return list(texts) if fallback else None
         
         logger.info(f"Batch vertaling voltooid: {len(translated_texts)} teksten")
         return translated_texts
@@ -314,20 +258,7 @@ def detect_language_from_text(text: str, service: str = "libretranslate") -> Opt
     """
     try:
         if service == "libretranslate":
-            # LibreTranslate taal detectie
-            url = "https://libretranslate.com/detect"
-            payload = {"q": text}
-            
-            response = requests.post(url, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result:
-                    detected_lang = result[0].get("language", "unknown")
-                    confidence = result[0].get("confidence", 0.0)
-                    return (detected_lang, confidence)
-            
-            return None
+            return get_backend(service, url="https://libretranslate.com").detect(text)
             
         else:
             logger.error(f"Taal detectie niet ondersteund voor service: {service}")
@@ -349,21 +280,15 @@ def get_supported_languages(service: str = "libretranslate") -> Optional[List[Di
     """
     try:
         if service == "libretranslate":
-            url = "https://libretranslate.com/languages"
-            response = requests.get(url, timeout=30)
-            
-            if response.status_code == 200:
-                languages = response.json()
-                return [
-                    {
-                        "code": lang.get("code", ""),
-                        "name": lang.get("name", ""),
-                        "native_name": lang.get("nativeName", "")
-                    }
-                    for lang in languages
-                ]
-            
-            return None
+            languages = get_backend(service, url="https://libretranslate.com").languages()
+            return [
+                {
+                    "code": lang.get("code", ""),
+                    "name": lang.get("name", ""),
+                    "native_name": lang.get("nativeName", "")
+                }
+                for lang in languages
+            ]
             
         else:
             logger.error(f"Taal lijst niet ondersteund voor service: {service}")
@@ -4,45 +4,32 @@ Bevat alle video-gerelateerde functionaliteit
 """
 
 import os
-import subprocess
 import tempfile
 from typing import Optional, Tuple, List, Dict, Any
 import logging
 
+from .media_probe import get_media_info
+from .ffmpeg_runner import run_ffmpeg, TIMEOUT_FACTOR_ENCODE
+
 logger = logging.getLogger(__name__)
 
 def get_video_info(video_path: str) -> Optional[Dict[str, Any]]:
     """
-    Haal video informatie op
+    Haal video informatie op (één ffprobe aanroep, gecached op pad, grootte en mtime)
     
     Args:
         video_path: Pad naar het video bestand
     
     Returns:
-        Dictionary met video informatie of None bij fout
+        Dictionary met duration, bit_rate, format_name, video en audio_streams
+        of None bij fout
     """
     try:
         if not os.path.exists(video_path):
             logger.error(f"Video bestand bestaat niet: {video_path}")
             return None
         
-        cmd = [
-            "ffprobe", "-v", "quiet",
-            "-print_format", "json",
-            "-show_format",
-            "-show_streams",
-            video_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            import json
-            info = json.loads(result.stdout)
-            return info
-        else:
-            logger.error(f"FFprobe fout: {result.stderr}")
-            return None
+        return get_media_info(video_path)
             
     except Exception as e:
         logger.error(f"Fout bij ophalen video informatie: {e}")
@@ -59,21 +46,8 @@ def get_video_duration(video_path: str) -> Optional[float]:
         Duur in seconden of None bij fout
     """
     try:
-        cmd = [
-            "ffprobe", "-v", "quiet",
-            "-show_entries", "format=duration",
-            "-of", "csv=p=0",
-            video_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            duration = float(result.stdout.strip())
-            return duration
-        else:
-            logger.error(f"FFprobe fout: {result.stderr}")
-            return None
+        info = get_media_info(video_path)
+        return info.get("duration") if info else None
             
     except Exception as e:
         logger.error(f"Fout bij bepalen video duur: {e}")
@@ -90,26 +64,11 @@ def get_video_resolution(video_path: str) -> Optional[Tuple[int, int]]:
         Tuple met (width, height) of None bij fout
     """
     try:
-        cmd = [
-            "ffprobe", "-v", "quiet",
-            "-select_streams", "v:0",
-            "-show_entries", "stream=width,height",
-            "-of", "csv=p=0",
-            video_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
-            lines = result.stdout.strip().split('\n')
-            for line in lines:
-                if ',' in line:
-                    width, height = map(int, line.split(','))
-                    return (width, height)
-            return None
-        else:
-            logger.error(f"FFprobe fout: {result.stderr}")
-            return None
+        info = get_media_info(video_path)
+        video = info.get("video") if info else None
+        if video and video.get("width") and video.get("height"):
+            return (video["width"], video["height"])
+        return None
             
     except Exception as e:
         logger.error(f"Fout bij bepalen video resolutie: {e}")
@@ -128,22 +87,20 @@ def extract_video_frame(video_path: str, output_path: str, time_position: float
         True bij succes, False bij fout
     """
     try:
-        cmd = [
-            "ffmpeg", "-i", video_path,
+        args = [
+            "-i", video_path,
             "-ss", str(time_position),
             "-vframes", "1",
             "-y",
             output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        result = run_ffmpeg(args)
         
-        if result.returncode == 0 and os.path.exists(output_path):
+        if result["returncode"] == 0 and os.path.exists(output_path):
             logger.info(f"Frame succesvol geëxtraheerd: {output_path}")
             return True
-        else:
-            logger.error(f"FFmpeg frame extractie fout: {result.stderr}")
-            return False
+        return False
             
     except Exception as e:
         logger.error(f"Fout bij frame extractie: {e}")
@@ -162,8 +119,8 @@ def create_video_thumbnail(video_path: str, output_path: str, time_position: flo
         True bij succes, False bij fout
     """
     try:
-        cmd = [
-            "ffmpeg", "-i", video_path,
+        args = [
+            "-i", video_path,
             "-ss", str(time_position),
             "-vframes", "1",
             "-vf", "scale=320:240",  # Kleine thumbnail
@@ -171,14 +128,12 @@ def create_video_thumbnail(video_path: str, output_path: str, time_position: flo
             output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+        result = run_ffmpeg(args)
         
-        if result.returncode == 0 and os.path.exists(output_path):
+        if result["returncode"] == 0 and os.path.exists(output_path):
             logger.info(f"Thumbnail succesvol aangemaakt: {output_path}")
             return True
-        else:
-            logger.error(f"FFmpeg thumbnail fout: {result.stderr}")
-            return False
+        return False
             
     except Exception as e:
         logger.error(f"Fout bij thumbnail maken: {e}")
@@ -201,8 +156,8 @@ def merge_video_audio(video_path: str, audio_path: str, output_path: str) -> boo
             logger.error("Video of audio bestand bestaat niet")
             return False
         
-        cmd = [
-            "ffmpeg", "-i", video_path,
+        args = [
+            "-i", video_path,
             "-i", audio_path,
             "-c:v", "copy",  # Kopieer video codec
             "-c:a", "aac",   # Converteer audio naar AAC
@@ -211,14 +166,12 @@ def merge_video_audio(video_path: str, audio_path: str, output_path: str) -> boo
             output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=1800)
+        result = run_ffmpeg(args, timeout_factor=TIMEOUT_FACTOR_ENCODE)
         
-        if result.returncode == 0 and os.path.exists(output_path):
+        if result["returncode"] == 0 and os.path.exists(output_path):
             logger.info(f"Video en audio succesvol samengevoegd: {output_path}")
             return True
-        else:
-            logger.error(f"FFmpeg merge fout: {result.stderr}")
-            return False
+        return False
             
     except Exception as e:
         logger.error(f"Fout bij video-audio merge: {e}")
@@ -237,8 +190,8 @@ def convert_video_format(input_path: str, output_path: str, format_type: str = "
         True bij succes, False bij fout
     """
     try:
-        cmd = [
-            "ffmpeg", "-i", input_path,
+        args = [
+            "-i", input_path,
             "-c:v", "libx264",  # H.264 video codec
             "-c:a", "aac",      # AAC audio codec
             "-preset", "medium", # Encoding preset
@@ -247,14 +200,12 @@ def convert_video_format(input_path: str, output_path: str, format_type: str = "
             output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)
+        result = run_ffmpeg(args, timeout_factor=TIMEOUT_FACTOR_ENCODE)
         
-        if result.returncode == 0 and os.path.exists(output_path):
+        if result["returncode"] == 0 and os.path.exists(output_path):
             logger.info(f"Video succesvol geconverteerd naar {format_type}")
             return True
-        else:
-            logger.error(f"FFmpeg conversie fout: {result.stderr}")
-            return False
+        return False
             
     except Exception as e:
         logger.error(f"Fout bij video conversie: {e}")
@@ -282,8 +233,8 @@ def compress_video(input_path: str, output_path: str, target_size_mb: int = 100)
         target_size_bits = target_size_mb * 8 * 1024 * 1024
         target_bitrate = int(target_size_bits / duration)
         
-        cmd = [
-            "ffmpeg", "-i", input_path,
+        args = [
+            "-i", input_path,
             "-c:v", "libx264",
             "-b:v", str(target_bitrate),
             "-c:a", "aac",
@@ -292,14 +243,12 @@ def compress_video(input_path: str, output_path: str, target_size_mb: int = 100)
             output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)
+        result = run_ffmpeg(args, duration=duration, timeout_factor=TIMEOUT_FACTOR_ENCODE)
         
-        if result.returncode == 0 and os.path.exists(output_path):
+        if result["returncode"] == 0 and os.path.exists(output_path):
             logger.info(f"Video succesvol gecomprimeerd: {output_path}")
             return True
-        else:
-            logger.error(f"FFmpeg compressie fout: {result.stderr}")
-            return False
+        return False
             
     except Exception as e:
         logger.error(f"Fout bij video compressie: {e}")
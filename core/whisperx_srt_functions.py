@@ -4,12 +4,22 @@ Genereert zeer accurate SRT bestanden met word-level alignment
 """
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import timedelta
 
+from .subtitle_writers import (
+    seconds_to_ms,
+    format_timestamp_ms,
+    render_subtitles,
+    open_subtitle_file
+)
+from .transcript import Transcript
+from .subtitle_layout import iter_reflowed_segments, resolve_layout
+
 def create_whisperx_srt_content(transcriptions: List[Dict[str, Any]], 
                                word_alignments: List[Dict[str, Any]] = None,
-                               output_path: Optional[str] = None) -> str:
+                               output_path: Optional[str] = None,
+                               layout: Union[None, str, Dict[str, Any]] = None) -> str:
     """
     Maak SRT content met WhisperX word-level alignment voor maximale accuracy
     
@@ -17,34 +27,22 @@ def create_whisperx_srt_content(transcriptions: List[Dict[str, Any]],
         transcriptions: Lijst van transcriptie segmenten
         word_alignments: Word-level timing informatie (optioneel)
         output_path: Pad naar output bestand (optioneel)
+        layout: Ondertitel layout voor re-flow (preset naam of dict, optioneel)
     
     Returns:
         SRT content string
     """
-    srt_content = ""
-    
-    for i, segment in enumerate(transcriptions, 1):
-        # Converteer seconden naar SRT timestamp formaat
-        start_time = _seconds_to_srt_timestamp(segment["start"])
-        end_time = _seconds_to_srt_timestamp(segment["end"])
-        
-        # Gebruik word-level timing als beschikbaar voor betere accuracy
-        if word_alignments and segment.get("words"):
-            words = segment["words"]
-            if words:
-                # Gebruik eerste woord start en laatste woord end voor betere segmentatie
-                segment_start = words[0]["start"]
-                segment_end = words[-1]["end"]
-                start_time = _seconds_to_srt_timestamp(segment_start)
-                end_time = _seconds_to_srt_timestamp(segment_end)
-        
-        # Voeg segment toe aan SRT
-        srt_content += f"{i}\n{start_time} --> {end_time}\n{segment['text']}\n\n"
+    if resolve_layout(layout):
+        # Herverdeel lange segmenten over leesbare cues op basis van word timing
+        srt_content = render_subtitles(iter_reflowed_segments(transcriptions, layout), "srt")
+    else:
+        # Gebruik word-level timing (eerste woord start, laatste woord end) als beschikbaar
+        srt_content = render_subtitles(transcriptions, "srt", use_word_timing=bool(word_alignments))
     
     # Schrijf naar bestand als output_path is opgegeven
     if output_path:
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
+            with open_subtitle_file(output_path) as f:
                 f.write(srt_content)
             print(f"✅ WhisperX SRT bestand opgeslagen: {output_path}")
         except Exception as e:
@@ -66,7 +64,7 @@ def create_enhanced_srt_with_word_timing(transcriptions: List[Dict[str, Any]],
     Returns:
         Verbeterde SRT content string
     """
-    srt_content = ""
+    srt_parts = []
     
     for i, segment in enumerate(transcriptions, 1):
         # Basis segment timing
@@ -89,12 +87,14 @@ def create_enhanced_srt_with_word_timing(transcriptions: List[Dict[str, Any]],
                 word_timing_info = f" [Words: {' '.join(word_timings)}]"
         
         # Voeg segment toe aan SRT
-        srt_content += f"{i}\n{start_time} --> {end_time}\n{segment['text']}{word_timing_info}\n\n"
+        srt_parts.append(f"{i}\n{start_time} --> {end_time}\n{segment['text']}{word_timing_info}\n\n")
+    
+    srt_content = "".join(srt_parts)
     
     # Schrijf naar bestand als output_path is opgegeven
     if output_path:
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
+            with open_subtitle_file(output_path) as f:
                 f.write(srt_content)
             print(f"✅ Verbeterde WhisperX SRT bestand opgeslagen: {output_path}")
         except Exception as e:
@@ -112,17 +112,8 @@ def _seconds_to_srt_timestamp(seconds: float) -> str:
     Returns:
         SRT timestamp string
     """
-    # Gebruik timedelta voor nauwkeurige conversie
-    td = timedelta(seconds=seconds)
-    
-    # Bereken uren, minuten, seconden en milliseconden
-    total_seconds = int(td.total_seconds())
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
-    millisecs = int((seconds % 1) * 1000)
-    
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
+    # Gehele milliseconden voorkomen afrondingsdrift
+    return format_timestamp_ms(seconds_to_ms(seconds), "srt")
 
 def validate_whisperx_transcriptions(transcriptions: List[Dict[str, Any]]) -> bool:
     """
@@ -138,6 +129,15 @@ def validate_whisperx_transcriptions(transcriptions: List[Dict[str, Any]]) -> bo
         print("❌ Geen transcripties gevonden")
         return False
     
+    if isinstance(transcriptions, Transcript):
+        # Kolomsgewijze transcriptie heeft altijd start/end/text - controleer alleen waarden
+        error = transcriptions.validate()
+        if error:
+            print(f"❌ {error}")
+            return False
+        print(f"✅ {len(transcriptions)} transcriptie segmenten gevalideerd")
+        return True
+    
     required_fields = ["start", "end", "text"]
     
     for i, segment in enumerate(transcriptions):
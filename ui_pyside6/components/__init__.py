@@ -6,6 +6,7 @@ Beheert alle UI componenten en panels
 # Import core components
 from . import panels
 from . import menu_manager
+from . import file_list_model
 from . import files_panel
 from . import processing_panel
 from . import completed_files_panel
@@ -26,6 +27,7 @@ from . import whisper_selector
 __all__ = [
     'panels',
     'menu_manager',
+    'file_list_model',
     'files_panel',
     'processing_panel',
     'completed_files_panel',
@@ -0,0 +1,125 @@
+"""
+File List Model voor Magic Time Studio
+Virtualized lijst model op een FileCollection en een achtergrond map scanner
+"""
+
+import os
+from typing import List
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QThread, Signal
+
+from core.file_collection import (FileCollection, iter_scan_directory, normalize_path, VIDEO_EXTENSIONS,
+                                  SCAN_CHUNK_SIZE)
+from core.media_probe import probe_many
+
+
+class FileListModel(QAbstractListModel):
+    """Lijst model voor bestanden - toont basename, bewaart volledig pad"""
+
+    PathRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.collection = FileCollection()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.collection)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.collection):
+            return None
+        file_path = self.collection[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(file_path)
+        if role == Qt.ItemDataRole.ToolTipRole or role == self.PathRole:
+            return file_path
+        return None
+
+    def add_paths(self, paths: List[str]) -> int:
+        """Voeg paden toe als één blok rijen (duplicaten worden overgeslagen)"""
+        # Op genormaliseerd pad, zodat het aantal ingevoegde rijen klopt met wat de collectie toevoegt
+        unique = {}
+        for file_path in paths:
+            key = normalize_path(file_path)
+            if key not in unique and file_path not in self.collection:
+                unique[key] = file_path
+        new_paths = list(unique.values())
+        if not new_paths:
+            return 0
+        first = len(self.collection)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_paths) - 1)
+        added = self.collection.add_many(new_paths)
+        self.endInsertRows()
+        return len(added)
+
+    def remove_row(self, row: int) -> str:
+        """Verwijder rij en retourneer het pad"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        file_path = self.collection.pop(row)
+        self.endRemoveRows()
+        return file_path
+
+    def remove_path(self, file_path: str) -> bool:
+        """Verwijder pad uit het model"""
+        row = self.collection.index_of(file_path)
+        if row < 0:
+            return False
+        self.remove_row(row)
+        return True
+
+    def clear(self):
+        """Wis het model"""
+        self.beginResetModel()
+        self.collection.clear()
+        self.endResetModel()
+
+    def path_at(self, row: int) -> str:
+        """Pad op rij"""
+        return self.collection[row]
+
+
+class FolderScanThread(QThread):
+    """
+    Scant een map met os.scandir in de achtergrond en levert paden in chunks
+
+    Met probe_metadata worden gevonden bestanden na de scan gelijktijdig
+    geprobed, zodat duur, codecs en resolutie al in de media cache staan.
+    """
+
+    # Signals
+    chunk_found = Signal(list)  # Lijst van gevonden paden
+    scan_finished = Signal(str, int)  # map, totaal aantal gevonden bestanden
+
+    def __init__(self, folder: str, extensions=VIDEO_EXTENSIONS, parent=None, probe_metadata: bool = True):
+        super().__init__(parent)
+        self.folder = folder
+        self.extensions = extensions
+        self.probe_metadata = probe_metadata
+        self._stop_requested = False
+
+    def stop(self):
+        """Vraag de scan om te stoppen"""
+        self._stop_requested = True
+
+    def run(self):
+        """Voer de scan uit; metadata wordt na de scan in chunks geprobed"""
+        found_paths = []
+        try:
+            for chunk in iter_scan_directory(self.folder, self.extensions,
+                                             should_stop=lambda: self._stop_requested):
+                found_paths.extend(chunk)
+                self.chunk_found.emit(chunk)
+        except Exception as e:
+            print(f"❌ Fout bij scannen map {self.folder}: {e}")
+        self.scan_finished.emit(self.folder, len(found_paths))
+
+        if self.probe_metadata:
+            for start in range(0, len(found_paths), SCAN_CHUNK_SIZE):
+                if self._stop_requested:
+                    break
+                try:
+                    probe_many(found_paths[start:start + SCAN_CHUNK_SIZE])
+                except Exception as e:
+                    print(f"⚠️ Fout bij proben van metadata: {e}")
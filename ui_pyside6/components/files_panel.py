@@ -6,12 +6,15 @@ Handelt bestanden beheer af
 import os
 from typing import List
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QListWidget, 
-    QGroupBox, QTabWidget, QMessageBox, QFileDialog, QListWidgetItem, QLabel,
-    QFormLayout, QSizePolicy
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QListView, 
+    QGroupBox, QTabWidget, QMessageBox, QFileDialog, QLabel,
+    QFormLayout, QSizePolicy, QAbstractItemView
 )
 from PySide6.QtCore import Qt, Signal
 
+from core.file_collection import VIDEO_EXTENSIONS
+from .file_list_model import FileListModel, FolderScanThread
+
 class FilesPanel(QWidget):
     """Bestanden paneel met info tab voor status en model informatie"""
     
@@ -19,10 +22,17 @@ class FilesPanel(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.file_list = []
+        # Model met O(1) lidmaatschap; de view rendert alleen zichtbare rijen
+        self.file_model = FileListModel(self)
+        self._scan_threads = []  # Actieve achtergrond map scans
         self.processing_active = False  # Flag voor verwerking status
         self.setup_ui()
     
+    @property
+    def file_list(self):
+        """Bestanden collectie (geordend, O(1) lidmaatschap en basename index)"""
+        return self.file_model.collection
+    
     def setup_ui(self):
         """Setup de UI"""
         layout = QVBoxLayout(self)
@@ -39,10 +49,12 @@ class FilesPanel(QWidget):
         
         # Grote knop bovenaan is verwijderd - gebruik knoppen onderaan
         
-        # Bestanden lijst
-        self.file_list_widget = QListWidget()
-        self.file_list_widget.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
-        self.file_list_widget.itemSelectionChanged.connect(self.on_selection_changed)
+        # Bestanden lijst (virtualized view op het model)
+        self.file_list_widget = QListView()
+        self.file_list_widget.setModel(self.file_model)
+        self.file_list_widget.setUniformItemSizes(True)
+        self.file_list_widget.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.file_list_widget.selectionModel().currentChanged.connect(lambda *_: self.on_selection_changed())
         files_tab_layout.addWidget(self.file_list_widget)
         
         # Knoppen layout - 2x2 grid
@@ -151,9 +163,14 @@ class FilesPanel(QWidget):
         # Initialiseer info labels
         self.refresh_all_info()
     
+    def current_row(self) -> int:
+        """Huidige rij in de lijst (-1 als niets geselecteerd)"""
+        index = self.file_list_widget.currentIndex()
+        return index.row() if index.isValid() else -1
+    
     def on_selection_changed(self):
         """Handle bestand selectie wijziging"""
-        current_row = self.file_list_widget.currentRow()
+        current_row = self.current_row()
         if current_row >= 0 and current_row < len(self.file_list):
             selected_file = self.file_list[current_row]
             print(f"📁 Bestand geselecteerd: {selected_file}")
@@ -190,50 +207,60 @@ class FilesPanel(QWidget):
             "Video bestanden (*.mp4 *.avi *.mkv *.mov *.wmv *.flv *.webm)"
         )
         
-        added_count = 0
-        video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm']
-        
-        for file_path in files:
-            # Filter alleen video bestanden
-            if any(file_path.lower().endswith(ext) for ext in video_extensions):
-                if file_path not in self.file_list:
-                    self.file_list.append(file_path)
-                    self.file_list_widget.addItem(os.path.basename(file_path))
-                    added_count += 1
-        
+        added_count = self.add_files(files)
         if added_count > 0:
-            self.update_button_states()
-            self.update_files_count()
             print(f"✅ {added_count} bestand(en) toegevoegd")
         else:
             print("⚠️ Geen video bestanden toegevoegd")
     
+    def add_files(self, files: List[str]) -> int:
+        """Voeg video bestanden toe (duplicaten worden in O(1) overgeslagen)"""
+        # Filter alleen video bestanden
+        video_files = [file_path for file_path in files if file_path.lower().endswith(VIDEO_EXTENSIONS)]
+        added_count = self.file_model.add_paths(video_files)
+        
+        if added_count > 0:
+            self.update_button_states()
+            self.update_files_count()
+        return added_count
+    
     def add_folder(self):
         """Voeg map toe via folder dialog"""
         folder = QFileDialog.getExistingDirectory(self, "Selecteer map")
         if folder:
-            added_count = 0
-            video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm']
-            
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if any(file.lower().endswith(ext) for ext in video_extensions):
-                        if file_path not in self.file_list:
-                            self.file_list.append(file_path)
-                            self.file_list_widget.addItem(os.path.basename(file_path))
-                            added_count += 1
-            
-            if added_count > 0:
-                self.update_button_states()
-                self.update_files_count()
-                print(f"✅ {added_count} bestand(en) uit map toegevoegd")
-            else:
-                print("⚠️ Geen video bestanden gevonden in map")
+            self.scan_folder(folder)
+    
+    def scan_folder(self, folder: str):
+        """Scan map in de achtergrond; gevonden bestanden komen in chunks binnen"""
+        scan_thread = FolderScanThread(folder, VIDEO_EXTENSIONS, self)
+        scan_thread.chunk_found.connect(self._on_scan_chunk)
+        scan_thread.scan_finished.connect(self._on_scan_finished)
+        scan_thread.finished.connect(scan_thread.deleteLater)
+        self._scan_threads.append(scan_thread)
+        scan_thread.start()
+        print(f"🔍 Map wordt gescand: {folder}")
+        return scan_thread
+    
+    def _on_scan_chunk(self, paths: list):
+        """Verwerk een chunk gevonden bestanden (GUI thread)"""
+        self.add_files(paths)
+    
+    def _on_scan_finished(self, folder: str, found_count: int):
+        """Map scan voltooid"""
+        self._scan_threads = [thread for thread in self._scan_threads if thread.isRunning()]
+        if found_count > 0:
+            print(f"✅ {found_count} video bestand(en) gevonden in map: {os.path.basename(folder)}")
+        else:
+            print("⚠️ Geen video bestanden gevonden in map")
+    
+    def stop_folder_scans(self):
+        """Stop alle lopende map scans"""
+        for scan_thread in self._scan_threads:
+            scan_thread.stop()
     
     def remove_selected(self):
         """Verwijder geselecteerd bestand"""
-        current_row = self.file_list_widget.currentRow()
+        current_row = self.current_row()
         if current_row >= 0 and current_row < len(self.file_list):
             # Controleer of verwerking actief is
             if hasattr(self, 'processing_active') and self.processing_active:
@@ -247,8 +274,7 @@ class FilesPanel(QWidget):
                 pass
             
             # Verwijder het bestand
-            removed_file = self.file_list.pop(current_row)
-            self.file_list_widget.takeItem(current_row)
+            removed_file = self.file_model.remove_row(current_row)
             
             # Update button states
             self.update_button_states()
@@ -276,8 +302,8 @@ class FilesPanel(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.file_list.clear()
-            self.file_list_widget.clear()
+            self.stop_folder_scans()
+            self.file_model.clear()
             
             # Update button states
             self.update_button_states()
@@ -299,7 +325,7 @@ class FilesPanel(QWidget):
         has_files = len(self.file_list) > 0
         
         # Controleer of er een bestand is geselecteerd
-        current_row = self.file_list_widget.currentRow()
+        current_row = self.current_row()
         has_selection = current_row >= 0
         
         # Alle knoppen beschikbaar
@@ -336,7 +362,7 @@ class FilesPanel(QWidget):
         has_files = len(self.file_list) > 0
         
         # Controleer of er een bestand is geselecteerd
-        current_row = self.file_list_widget.currentRow()
+        current_row = self.current_row()
         has_selection = current_row >= 0
         
         # Toevoegen knoppen blijven beschikbaar tijdens verwerking
@@ -362,10 +388,7 @@ class FilesPanel(QWidget):
     def remove_file(self, file_path: str):
         """Verwijder specifiek bestand uit lijst"""
         try:
-            if file_path in self.file_list:
-                index = self.file_list.index(file_path)
-                self.file_list.pop(index)
-                self.file_list_widget.takeItem(index)
+            if self.file_model.remove_path(file_path):
                 print(f"🗑️ Bestand verwijderd uit lijst: {file_path}")
                 return True
             else:
@@ -377,7 +400,7 @@ class FilesPanel(QWidget):
     
     def on_file_selection_changed(self):
         """Bestand selectie veranderd"""
-        current_row = self.file_list_widget.currentRow()
+        current_row = self.current_row()
         if current_row >= 0 and current_row < len(self.file_list):
             selected_file = self.file_list[current_row]
             self.file_selected.emit(selected_file)
@@ -387,7 +410,7 @@ class FilesPanel(QWidget):
     
     def get_file_list(self) -> List[str]:
         """Krijg bestandenlijst"""
-        return self.file_list.copy()
+        return self.file_list.paths()
     
     def update_processing_status(self, is_active: bool):
         """Update verwerking status"""
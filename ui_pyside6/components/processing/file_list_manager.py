@@ -14,31 +14,44 @@ class FileListManager(QObject):
         self.ui = ui_component
         self.file_manager = file_manager
     
+    def _find_files_panel(self):
+        """Zoek het files panel via de parent keten"""
+        parent = self.ui.parent()
+        while parent:
+            if hasattr(parent, 'files_panel'):
+                return parent.files_panel
+            parent = parent.parent()
+        return None
+    
+    def _lookup_in_collection(self, files_panel, filename: str) -> str:
+        """Zoek bestand op naam via de basename index (exact, zonder extensie, hoofdletters)"""
+        collection = getattr(files_panel, 'file_list', None)
+        if hasattr(collection, 'find_by_basename'):
+            return collection.find_by_basename(filename)
+        
+        # Fallback voor panels zonder collectie: lineair zoeken
+        for file_path in files_panel.get_file_list():
+            if os.path.basename(file_path) == filename:
+                return file_path
+        return None
+    
     def find_file_path_in_list(self, filename: str) -> str:
         """Zoek naar volledig bestandspad in files lijst"""
         try:
-            # Zoek naar main window en files panel
-            parent = self.ui.parent()
-            while parent:
-                if hasattr(parent, 'files_panel'):
-                    files_panel = parent.files_panel
-                    if hasattr(files_panel, 'get_file_list'):
-                        files = files_panel.get_file_list()
-                        # Zoek naar bestand met dezelfde naam
-                        for file_path in files:
-                            if os.path.basename(file_path) == filename:
-                                print(f"🔧 [DEBUG] Bestandspad gevonden: {file_path}")
-                                return file_path
-                        
-                        print(f"⚠️ [DEBUG] Bestand niet gevonden in files lijst: {filename}")
-                        return None
-                    else:
-                        print(f"⚠️ [DEBUG] Files panel heeft geen get_file_list methode")
-                        return None
-                parent = parent.parent()
-            
-            print(f"⚠️ [DEBUG] Kan files panel niet vinden voor zoeken bestand")
-            return None
+            files_panel = self._find_files_panel()
+            if files_panel is None:
+                print(f"⚠️ [DEBUG] Kan files panel niet vinden voor zoeken bestand")
+                return None
+            if not hasattr(files_panel, 'get_file_list'):
+                print(f"⚠️ [DEBUG] Files panel heeft geen get_file_list methode")
+                return None
+            
+            file_path = self._lookup_in_collection(files_panel, filename)
+            if file_path:
+                print(f"🔧 [DEBUG] Bestandspad gevonden: {file_path}")
+            else:
+                print(f"⚠️ [DEBUG] Bestand niet gevonden in files lijst: {filename}")
+            return file_path
                 
         except Exception as e:
             print(f"⚠️ [WAARSCHUWING] Fout bij zoeken bestandspad: {e}")
@@ -49,93 +62,54 @@ class FileListManager(QObject):
         try:
             print(f"🔍 Zoek bestand in files lijst: {filename}")
             
-            # Zoek naar main window en files panel
-            parent = self.ui.parent()
-            while parent:
-                if hasattr(parent, 'files_panel'):
-                    files_panel = parent.files_panel
-                    
-                    if hasattr(files_panel, 'remove_file'):
-                        # Controleer eerst of er überhaupt bestanden in de lijst staan
-                        if hasattr(files_panel, 'get_file_list'):
-                            current_files = files_panel.get_file_list()
-                            print(f"📁 {len(current_files)} bestanden gevonden in files panel")
-                            
-                            # Als er geen bestanden zijn, is er niets om te verwijderen
-                            if len(current_files) == 0:
-                                print(f"ℹ️ Files panel is leeg, geen bestanden om te verwijderen")
-                                return True  # Geen fout, gewoon lege lijst
-                            
-                            # Debug: toon alle bestanden voor vergelijking
-                            print("🔍 Huidige bestanden in files panel:")
-                            for i, file_path in enumerate(current_files):
-                                file_basename = os.path.basename(file_path)
-                                print(f"  {i+1}: {file_basename}")
-                            
-                            # Zoek naar bestand met dezelfde naam
-                            for file_path in current_files:
-                                file_basename = os.path.basename(file_path)
-                                if file_basename == filename:
-                                    print(f"✅ Exacte match gevonden: {file_path}")
-                                    files_panel.remove_file(file_path)
-                                    print(f"🗑️ Bestand verwijderd uit files lijst: {filename}")
-                                    return True
-                            
-                            # Als geen exacte match, probeer bestandsnaam zonder extensie
-                            filename_no_ext = os.path.splitext(filename)[0]
-                            for file_path in current_files:
-                                file_basename = os.path.basename(file_path)
-                                file_basename_no_ext = os.path.splitext(file_basename)[0]
-                                if file_basename_no_ext == filename_no_ext:
-                                    print(f"✅ Match zonder extensie gevonden: {file_path}")
-                                    files_panel.remove_file(file_path)
-                                    print(f"🗑️ Bestand verwijderd uit files lijst: {filename}")
-                                    return True
-                            
-                            # Als nog steeds geen match, probeer case-insensitive
-                            for file_path in current_files:
-                                file_basename = os.path.basename(file_path)
-                                if file_basename.lower() == filename.lower():
-                                    print(f"✅ Case-insensitive match gevonden: {file_path}")
-                                    files_panel.remove_file(file_path)
-                                    print(f"🗑️ Bestand verwijderd uit files lijst: {filename}")
-                                    return True
-                            
-                            # Als nog steeds geen match, probeer gedeeltelijke match
-                            for file_path in current_files:
-                                file_basename = os.path.basename(file_path)
-                                # Controleer of de bestandsnaam de zoekterm bevat
-                                if filename.lower() in file_basename.lower() or file_basename.lower() in filename.lower():
-                                    print(f"✅ Gedeeltelijke match gevonden: {file_path}")
-                                    files_panel.remove_file(file_path)
-                                    print(f"🗑️ Bestand verwijderd uit files lijst: {filename}")
-                                    return True
-                            
-                            # Als nog steeds geen match, probeer bestandsnaam zonder seizoen/episode info
-                            # Bijvoorbeeld: "Foundation.2021.S01E01.The.Emperors.Peace.mp4" -> "Foundation.mp4"
-                            for file_path in current_files:
-                                file_basename = os.path.basename(file_path)
-                                # Verwijder seizoen/episode info voor vergelijking
-                                clean_filename = self._clean_filename_for_comparison(filename)
-                                clean_file_basename = self._clean_filename_for_comparison(file_basename)
-                                
-                                if clean_filename == clean_file_basename:
-                                    print(f"✅ Clean match gevonden: {file_path}")
-                                    files_panel.remove_file(file_path)
-                                    print(f"🗑️ Bestand verwijderd uit files lijst: {filename}")
-                                    return True
-                            
-                            print(f"❌ Bestand niet gevonden in files lijst: {filename}")
-                            return False
-                        else:
-                            print(f"⚠️ Files panel heeft geen get_file_list methode")
-                            return False
-                    else:
-                        print(f"⚠️ Files panel heeft geen remove_file methode")
-                        return False
-                parent = parent.parent()
-            
-            print(f"❌ Kan files panel niet vinden voor verwijderen bestand")
+            files_panel = self._find_files_panel()
+            if files_panel is None:
+                print(f"❌ Kan files panel niet vinden voor verwijderen bestand")
+                return False
+            if not hasattr(files_panel, 'remove_file'):
+                print(f"⚠️ Files panel heeft geen remove_file methode")
+                return False
+            if not hasattr(files_panel, 'get_file_list'):
+                print(f"⚠️ Files panel heeft geen get_file_list methode")
+                return False
+            
+            # Als er geen bestanden zijn, is er niets om te verwijderen
+            if len(files_panel.file_list) == 0:
+                print(f"ℹ️ Files panel is leeg, geen bestanden om te verwijderen")
+                return True  # Geen fout, gewoon lege lijst
+            
+            # Exacte, zonder-extensie en case-insensitive match via de index (O(1))
+            file_path = self._lookup_in_collection(files_panel, filename)
+            if file_path:
+                print(f"✅ Match gevonden: {file_path}")
+                files_panel.remove_file(file_path)
+                print(f"🗑️ Bestand verwijderd uit files lijst: {filename}")
+                return True
+            
+            current_files = files_panel.get_file_list()
+            
+            # Als nog steeds geen match, probeer gedeeltelijke match
+            for file_path in current_files:
+                file_basename = os.path.basename(file_path)
+                # Controleer of de bestandsnaam de zoekterm bevat
+                if filename.lower() in file_basename.lower() or file_basename.lower() in filename.lower():
+                    print(f"✅ Gedeeltelijke match gevonden: {file_path}")
+                    files_panel.remove_file(file_path)
+                    print(f"🗑️ Bestand verwijderd uit files lijst: {filename}")
+                    return True
+            
+            # Als nog steeds geen match, probeer bestandsnaam zonder seizoen/episode info
+            # Bijvoorbeeld: "Foundation.2021.S01E01.The.Emperors.Peace.mp4" -> "Foundation.mp4"
+            clean_filename = self._clean_filename_for_comparison(filename)
+            for file_path in current_files:
+                clean_file_basename = self._clean_filename_for_comparison(os.path.basename(file_path))
+                if clean_filename == clean_file_basename:
+                    print(f"✅ Clean match gevonden: {file_path}")
+                    files_panel.remove_file(file_path)
+                    print(f"🗑️ Bestand verwijderd uit files lijst: {filename}")
+                    return True
+            
+            print(f"❌ Bestand niet gevonden in files lijst: {filename}")
             return False
                 
         except Exception as e:
@@ -226,44 +200,25 @@ class FileListManager(QObject):
         try:
             print(f"🔍 Probeer alternatieve verwijdering via main window: {filename}")
             
-            # Zoek naar main window
-            parent = self.ui.parent()
-            while parent:
-                if hasattr(parent, 'files_panel'):
-                    files_panel = parent.files_panel
-                    
-                    # Controleer of het bestand nog steeds in de lijst staat
-                    if hasattr(files_panel, 'get_file_list'):
-                        current_files = files_panel.get_file_list()
-                        print(f"📁 Huidige bestanden in files panel: {len(current_files)}")
-                        
-                        # Debug: toon alle bestanden
-                        print("🔍 Huidige bestanden in files panel:")
-                        for i, file_path in enumerate(current_files):
-                            file_basename = os.path.basename(file_path)
-                            print(f"  {i+1}: {file_basename}")
-                        
-                        # Zoek naar bestand
-                        for file_path in current_files:
-                            file_basename = os.path.basename(file_path)
-                            if file_basename == filename:
-                                print(f"✅ Bestand gevonden in files panel: {file_path}")
-                                if hasattr(files_panel, 'remove_file'):
-                                    files_panel.remove_file(file_path)
-                                    print(f"🗑️ Bestand verwijderd via main window: {filename}")
-                                    return True
-                                else:
-                                    print(f"⚠️ Files panel heeft geen remove_file methode")
-                                    return False
-                        
-                        print(f"❌ Bestand niet meer gevonden in files panel: {filename}")
-                        return False
-                    else:
-                        print(f"⚠️ Files panel heeft geen get_file_list methode")
-                        return False
-                parent = parent.parent()
-            
-            print(f"❌ Kan main window niet vinden")
+            files_panel = self._find_files_panel()
+            if files_panel is None:
+                print(f"❌ Kan main window niet vinden")
+                return False
+            if not hasattr(files_panel, 'get_file_list'):
+                print(f"⚠️ Files panel heeft geen get_file_list methode")
+                return False
+            
+            file_path = self._lookup_in_collection(files_panel, filename)
+            if not file_path or os.path.basename(file_path) != filename:
+                print(f"❌ Bestand niet meer gevonden in files panel: {filename}")
+                return False
+            
+            print(f"✅ Bestand gevonden in files panel: {file_path}")
+            if hasattr(files_panel, 'remove_file'):
+                files_panel.remove_file(file_path)
+                print(f"🗑️ Bestand verwijderd via main window: {filename}")
+                return True
+            print(f"⚠️ Files panel heeft geen remove_file methode")
             return False
             
         except Exception as e:
@@ -6,6 +6,13 @@ Beheert LibreTranslate en andere vertaler configuratie
 from PySide6.QtWidgets import QGroupBox, QFormLayout, QComboBox
 from PySide6.QtCore import Signal, QObject
 
+# Waarde voor processing -> naam in de UI (zie core.translation_backends)
+TRANSLATOR_NAMES = {
+    "libretranslate": "LibreTranslate",
+    "offline": "Offline (MarianMT)",
+    "none": "Geen vertaling",
+}
+
 class TranslatorSettings(QObject):
     """Beheert vertaler instellingen in het settings panel"""
     
@@ -25,7 +32,7 @@ class TranslatorSettings(QObject):
         translator_layout = QFormLayout(translator_group)
         
         self.translator_combo = QComboBox()
-        self.translator_combo.addItems(["LibreTranslate", "Geen vertaling"])
+        self.translator_combo.addItems(list(TRANSLATOR_NAMES.values()))
         self.translator_combo.currentTextChanged.connect(self._on_translator_changed)
         translator_layout.addRow("Vertaler:", self.translator_combo)
         
@@ -47,10 +54,7 @@ class TranslatorSettings(QObject):
             return
         
         current_translator = config_mgr.get("default_translator", "libretranslate")
-        if current_translator == "libretranslate":
-            self.translator_combo.setCurrentText("LibreTranslate")
-        else:
-            self.translator_combo.setCurrentText("Geen vertaling")
+        self.translator_combo.setCurrentText(TRANSLATOR_NAMES.get(current_translator, TRANSLATOR_NAMES["none"]))
         
         # Debug output alleen in debug mode
         if self.parent and hasattr(self.parent, '_is_debug_mode'):
@@ -81,7 +85,8 @@ class TranslatorSettings(QObject):
                 print(f"🔧 [DEBUG] Settings panel: LibreTranslate server uit config: {libretranslate_server}")
         
         # Converteer vertaler naam naar juiste waarde voor processing
-        translator_value = "libretranslate" if self.translator_combo.currentText() == "LibreTranslate" else "none"
+        translator_value = next((value for value, name in TRANSLATOR_NAMES.items()
+                                 if name == self.translator_combo.currentText()), "none")
         
         if self.parent and hasattr(self.parent, '_is_debug_mode'):
             if self.parent._is_debug_mode():
@@ -135,10 +135,16 @@ class WhisperSettings(QObject):
             if self.parent._is_debug_mode():
                 print(f"🔧 [DEBUG] Settings panel: Taal uit UI: {language_code}")
         
+        # Handmatige inference instellingen uit het configuratie venster ("auto" = automatisch tunen)
+        batch_size = config_mgr.get("whisper_batch_size", "auto") if config_mgr else "auto"
+        compute_type = config_mgr.get("whisper_compute_type", "auto") if config_mgr else "auto"
+        
         return {
             "whisper_type": whisper_type,
             "whisper_model": whisper_model,
-            "language": language_code
+            "language": language_code,
+            "whisper_batch_size": batch_size,
+            "whisper_compute_type": compute_type
         }
     
     def save_settings(self, config_mgr):
@@ -31,6 +31,15 @@ class ProcessingTab(QWidget):
         self.device_combo.addItems(["cpu", "cuda"])
         device_layout.addRow("Device:", self.device_combo)
         
+        # Inference instellingen ("Automatisch" = benchmark bij eerste gebruik per model en device)
+        self.batch_size_combo = QComboBox()
+        self.batch_size_combo.addItems(["Automatisch", "4", "8", "16", "32"])
+        device_layout.addRow("Batch Size:", self.batch_size_combo)
+        
+        self.compute_type_combo = QComboBox()
+        self.compute_type_combo.addItems(["Automatisch", "float16", "int8_float16", "int8", "float32"])
+        device_layout.addRow("Compute Type:", self.compute_type_combo)
+        
         device_group.setLayout(device_layout)
         layout.addWidget(device_group)
         
@@ -127,6 +136,12 @@ class ProcessingTab(QWidget):
             device = config_manager.get("WHISPER_DEVICE", "cuda")
             self.device_combo.setCurrentText(device)
             
+            # Inference instellingen
+            batch_size = str(config_manager.get("whisper_batch_size", "auto"))
+            self.batch_size_combo.setCurrentText("Automatisch" if batch_size == "auto" else batch_size)
+            compute_type = str(config_manager.get("whisper_compute_type", "auto"))
+            self.compute_type_combo.setCurrentText("Automatisch" if compute_type == "auto" else compute_type)
+            
             # Worker count
             workers = config_manager.get_int("worker_count", 4)
             self.workers_spin.setValue(workers)
@@ -169,6 +184,10 @@ class ProcessingTab(QWidget):
             # Device instellingen
             config_manager.set("WHISPER_DEVICE", self.device_combo.currentText())
             
+            # Inference instellingen
+            config_manager.set("whisper_batch_size", self._auto_value(self.batch_size_combo))
+            config_manager.set("whisper_compute_type", self._auto_value(self.compute_type_combo))
+            
             # Worker count
             config_manager.set("worker_count", self.workers_spin.value())
             
@@ -187,12 +206,19 @@ class ProcessingTab(QWidget):
         """Krijg huidige instellingen als dictionary"""
         return {
             "device": self.device_combo.currentText(),
+            "whisper_batch_size": self._auto_value(self.batch_size_combo),
+            "whisper_compute_type": self._auto_value(self.compute_type_combo),
             "worker_count": self.workers_spin.value(),
             "cpu_limit_percentage": self.cpu_limit_spin.value(),
             "memory_limit_mb": self._get_memory_mb_from_display(),
             "subtitle_type": "softcoded"  # Altijd softcoded, hardcoded wordt niet meer ondersteund
         }
     
+    def _auto_value(self, combo: QComboBox) -> str:
+        """Combo waarde, waarbij Automatisch als auto wordt teruggegeven"""
+        text = combo.currentText()
+        return "auto" if text == "Automatisch" else text
+    
     def _get_memory_mb_from_display(self) -> int:
         """Converteer display tekst naar memory MB"""
         memory_text = self.memory_limit_combo.currentText()
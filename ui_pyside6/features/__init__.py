@@ -9,6 +9,7 @@ from .real_time_chart import RealTimeChart
 from .performance_chart import PerformanceChart
 from .batch_queue import BatchQueueManager
 from .file_preview import FilePreviewWidget
+from .thumbnail_service import ThumbnailService
 from .modern_styling import ModernStyling
 from .plugin_manager import PluginManager
 from .processing_progress import ProcessingProgressChart
@@ -22,6 +23,7 @@ __all__ = [
     'PerformanceChart',
     'BatchQueueManager',
     'FilePreviewWidget',
+    'ThumbnailService',
     'ModernStyling',
     'PluginManager',
     'ProcessingProgressChart',
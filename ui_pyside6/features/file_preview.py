@@ -4,8 +4,7 @@ Toon thumbnails en metadata van bestanden
 """
 
 import os
-import subprocess
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QGroupBox, QTextEdit, QScrollArea
@@ -13,6 +12,10 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QPixmap, QFont, QIcon
 
+from core.media_probe import get_media_info
+from core.thumbnail_cache import get_thumbnail
+from .thumbnail_service import ThumbnailService
+
 
 class FilePreviewWidget(QWidget):
     """Widget voor bestand preview"""
@@ -20,6 +23,10 @@ class FilePreviewWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_file = ""
+        # Thumbnails worden in de achtergrond gemaakt en gecached
+        self.thumbnail_service = ThumbnailService(self)
+        self.thumbnail_service.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self.thumbnail_service.thumbnail_failed.connect(self._on_thumbnail_failed)
         self.setup_ui()
     
     def setup_ui(self):
@@ -102,11 +109,13 @@ class FilePreviewWidget(QWidget):
             file_ext = os.path.splitext(file_path)[1].lower()
             
             if file_ext in {'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v'}:
-                # Video thumbnail
-                thumbnail = self.generate_video_thumbnail(file_path)
+                # Video thumbnail (direct uit cache, anders asynchroon)
+                thumbnail = self.thumbnail_service.request(file_path)
                 if thumbnail:
                     self.thumbnail_label.setPixmap(thumbnail)
-                    return
+                else:
+                    self.thumbnail_label.setText("⏳ Thumbnail laden...")
+                return
             elif file_ext in {'.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg', '.wma'}:
                 # Audio icoon
                 self.thumbnail_label.setText("🎵 Audio Bestand")
@@ -138,39 +147,31 @@ class FilePreviewWidget(QWidget):
             self.thumbnail_label.setText("❌ Fout bij laden preview")
     
     def generate_video_thumbnail(self, file_path: str) -> Optional[QPixmap]:
-        """Genereer video thumbnail met FFmpeg"""
+        """Genereer video thumbnail synchroon via de thumbnail cache"""
         try:
-            # Gebruik FFmpeg om thumbnail te genereren
-            output_path = os.path.join(os.path.dirname(file_path), "temp_thumbnail.jpg")
-            
-            cmd = [
-                "ffmpeg", "-i", file_path,
-                "-ss", "00:00:01",  # Neem frame op 1 seconde
-                "-vframes", "1",
-                "-vf", "scale=320:240",  # Schaal naar 320x240
-                "-y",  # Overschrijf output
-                output_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0 and os.path.exists(output_path):
-                # Laad thumbnail
-                pixmap = QPixmap(output_path)
-                
-                # Verwijder temp bestand
-                try:
-                    os.remove(output_path)
-                except:
-                    pass
-                
-                return pixmap
+            thumbnail_path = get_thumbnail(file_path)
+            if thumbnail_path:
+                return QPixmap(thumbnail_path)
             
         except Exception as e:
             print(f"❌ Fout bij genereren thumbnail: {e}")
         
         return None
     
+    def prefetch_thumbnails(self, file_paths: List[str]):
+        """Genereer thumbnails vooraf, bijv. voor zichtbare rijen in de bestandenlijst"""
+        self.thumbnail_service.prefetch(file_paths)
+    
+    def _on_thumbnail_ready(self, file_path: str, pixmap: QPixmap):
+        """Thumbnail klaar (alleen tonen als het bestand nog geselecteerd is)"""
+        if file_path == self.current_file:
+            self.thumbnail_label.setPixmap(pixmap)
+    
+    def _on_thumbnail_failed(self, file_path: str):
+        """Thumbnail kon niet gemaakt worden"""
+        if file_path == self.current_file:
+            self.thumbnail_label.setText("🎬 Video Bestand")
+    
     def load_metadata(self, file_path: str):
         """Laad metadata van bestand"""
         try:
@@ -221,51 +222,32 @@ Codec: {metadata.get('codec', 'Onbekend')}
         return metadata
     
     def get_video_metadata(self, file_path: str) -> Dict[str, Any]:
-        """Haal video metadata op met FFprobe"""
+        """Haal video metadata op (gecachede ffprobe metadata)"""
         metadata = {}
         
         try:
-            cmd = [
-                "ffprobe", "-v", "quiet",
-                "-print_format", "json",
-                "-show_format", "-show_streams",
-                file_path
-            ]
+            info = get_media_info(file_path)
+            video_stream = info.get('video') if info else None
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
-                import json
-                data = json.loads(result.stdout)
+            if video_stream:
+                # Duur
+                if info.get('duration'):
+                    metadata['duration'] = self.format_duration(info['duration'])
+                
+                # Resolutie
+                width = video_stream.get('width')
+                height = video_stream.get('height')
+                if width and height:
+                    metadata['resolution'] = f"{width}x{height}"
                 
-                # Zoek video stream
-                video_stream = None
-                for stream in data.get('streams', []):
-                    if stream.get('codec_type') == 'video':
-                        video_stream = stream
-                        break
+                # Codec
+                codec = video_stream.get('codec')
+                if codec:
+                    metadata['codec'] = codec.upper()
                 
-                if video_stream:
-                    # Duur
-                    duration = data.get('format', {}).get('duration')
-                    if duration:
-                        metadata['duration'] = self.format_duration(float(duration))
-                    
-                    # Resolutie
-                    width = video_stream.get('width')
-                    height = video_stream.get('height')
-                    if width and height:
-                        metadata['resolution'] = f"{width}x{height}"
-                    
-                    # Codec
-                    codec = video_stream.get('codec_name')
-                    if codec:
-                        metadata['codec'] = codec.upper()
-                    
-                    # Bitrate
-                    bitrate = data.get('format', {}).get('bit_rate')
-                    if bitrate:
-                        metadata['bitrate'] = f"{int(bitrate) // 1000} kbps"
+                # Bitrate
+                if info.get('bit_rate'):
+                    metadata['bitrate'] = f"{info['bit_rate'] // 1000} kbps"
             
         except Exception as e:
             print(f"❌ Fout bij ophalen video metadata: {e}")
@@ -273,50 +255,33 @@ Codec: {metadata.get('codec', 'Onbekend')}
         return metadata
     
     def get_audio_metadata(self, file_path: str) -> Dict[str, Any]:
-        """Haal audio metadata op"""
+        """Haal audio metadata op (gecachede ffprobe metadata)"""
         metadata = {}
         
         try:
-            cmd = [
-                "ffprobe", "-v", "quiet",
-                "-print_format", "json",
-                "-show_format", "-show_streams",
-                file_path
-            ]
+            info = get_media_info(file_path)
+            audio_streams = info.get('audio_streams') if info else None
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            
-            if result.returncode == 0:
-                import json
-                data = json.loads(result.stdout)
+            if audio_streams:
+                audio_stream = audio_streams[0]
+                
+                # Duur
+                if info.get('duration'):
+                    metadata['duration'] = self.format_duration(info['duration'])
+                
+                # Sample rate
+                sample_rate = audio_stream.get('sample_rate')
+                if sample_rate:
+                    metadata['sample_rate'] = f"{sample_rate} Hz"
                 
-                # Zoek audio stream
-                audio_stream = None
-                for stream in data.get('streams', []):
-                    if stream.get('codec_type') == 'audio':
-                        audio_stream = stream
-                        break
+                # Codec
+                codec = audio_stream.get('codec')
+                if codec:
+                    metadata['codec'] = codec.upper()
                 
-                if audio_stream:
-                    # Duur
-                    duration = data.get('format', {}).get('duration')
-                    if duration:
-                        metadata['duration'] = self.format_duration(float(duration))
-                    
-                    # Sample rate
-                    sample_rate = audio_stream.get('sample_rate')
-                    if sample_rate:
-                        metadata['sample_rate'] = f"{sample_rate} Hz"
-                    
-                    # Codec
-                    codec = audio_stream.get('codec_name')
-                    if codec:
-                        metadata['codec'] = codec.upper()
-                    
-                    # Bitrate
-                    bitrate = data.get('format', {}).get('bit_rate')
-                    if bitrate:
-                        metadata['bitrate'] = f"{int(bitrate) // 1000} kbps"
+                # Bitrate
+                if info.get('bit_rate'):
+                    metadata['bitrate'] = f"{info['bit_rate'] // 1000} kbps"
             
         except Exception as e:
             print(f"❌ Fout bij ophalen audio metadata: {e}")
@@ -350,6 +315,7 @@ Codec: {metadata.get('codec', 'Onbekend')}
     def clear_preview(self):
         """Wis preview"""
         self.current_file = ""
+        self.thumbnail_service.cancel_pending()
         self.thumbnail_label.setText("Geen bestand geselecteerd")
         self.thumbnail_label.setStyleSheet("""
             QLabel {
@@ -4,7 +4,6 @@ Toont spectrogrammen en frequentie analyse van audio bestanden
 """
 
 import os
-import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
@@ -18,6 +17,8 @@ import librosa
 import librosa.display
 
 from magic_time_studio.ui_pyside6.features.plugin_manager import PluginBase
+from core.media_probe import get_media_info
+from .audio_features import extract_features
 
 class AudioAnalysisThread(QThread):
     """Thread voor audio analyse"""
@@ -30,73 +31,24 @@ class AudioAnalysisThread(QThread):
         self.audio_path = audio_path
         self.analysis_type = analysis_type
         self.settings = settings
+        self._stop_requested = False
+    
+    def stop(self):
+        """Vraag de analyse om te stoppen"""
+        self._stop_requested = True
         
     def run(self):
-        """Voer audio analyse uit"""
+        """Voer audio analyse uit (alle features in één streaming pass, gecachet)"""
         try:
-            self.progress_updated.emit(10, "Audio laden...")
-            
-            # Laad audio
-            y, sr = librosa.load(self.audio_path, sr=None)
-            
-            self.progress_updated.emit(30, "Analyseren...")
-            
-            results = {}
-            
-            if self.analysis_type == "Mel Spectrogram":
-                mel_spec = librosa.feature.melspectrogram(y=y, sr=sr)
-                mel_spec_db = librosa.power_to_db(mel_spec, ref=np.max)
-                results['mel_spectrogram'] = mel_spec_db
-                results['sample_rate'] = sr
-                
-            elif self.analysis_type == "Linear Spectrogram":
-                D = librosa.stft(y)
-                S_db = librosa.amplitude_to_db(np.abs(D), ref=np.max)
-                results['linear_spectrogram'] = S_db
-                results['sample_rate'] = sr
-                
-            elif self.analysis_type == "Chroma":
-                chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-                results['chroma'] = chroma
-                results['sample_rate'] = sr
-                
-            elif self.analysis_type == "MFCC":
-                mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-                results['mfcc'] = mfcc
-                results['sample_rate'] = sr
-                
-            elif self.analysis_type == "Spectral Centroid":
-                spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-                results['spectral_centroids'] = spectral_centroids
-                results['sample_rate'] = sr
-                
-            elif self.analysis_type == "Spectral Rolloff":
-                spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-                results['spectral_rolloff'] = spectral_rolloff
-                results['sample_rate'] = sr
-                
-            elif self.analysis_type == "Zero Crossing Rate":
-                zero_crossing_rate = librosa.feature.zero_crossing_rate(y)[0]
-                results['zero_crossing_rate'] = zero_crossing_rate
-                results['sample_rate'] = sr
-                
-            elif self.analysis_type == "Complete Analysis":
-                # Alle analyses tegelijk
-                results['mel_spectrogram'] = librosa.power_to_db(
-                    librosa.feature.melspectrogram(y=y, sr=sr), ref=np.max
-                )
-                results['chroma'] = librosa.feature.chroma_stft(y=y, sr=sr)
-                results['mfcc'] = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-                results['spectral_centroids'] = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-                results['spectral_rolloff'] = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-                results['zero_crossing_rate'] = librosa.feature.zero_crossing_rate(y)[0]
-                results['sample_rate'] = sr
+            self.progress_updated.emit(10, "Audio streamen...")
             
-            # Basis statistieken
-            results['duration'] = len(y) / sr
-            results['sample_rate'] = sr
-            results['rms_energy'] = np.sqrt(np.mean(y**2))
-            results['peak_amplitude'] = np.max(np.abs(y))
+            results = extract_features(
+                self.audio_path,
+                progress_callback=self.progress_updated.emit,
+                should_stop=lambda: self._stop_requested
+            )
+            if results is None:
+                return
             
             self.progress_updated.emit(100, "Analyse voltooid!")
             self.analysis_complete.emit(results)
@@ -116,7 +68,6 @@ class AudioAnalyzerPlugin(PluginBase):
         self.category = "Analysis"
         
         self.current_file = None
-        self.audio_data = None
         self.sample_rate = None
         self.analysis_thread = None
         self.current_results = None
@@ -130,7 +81,7 @@ class AudioAnalyzerPlugin(PluginBase):
         """Cleanup bij afsluiten"""
         print(f"🔌 Advanced Audio Analyzer Plugin cleanup: {self.name}")
         if self.analysis_thread and self.analysis_thread.isRunning():
-            self.analysis_thread.quit()
+            self.analysis_thread.stop()
             self.analysis_thread.wait()
     
     def get_widget(self) -> QWidget:
@@ -246,9 +197,13 @@ class AudioAnalyzerPlugin(PluginBase):
         
         if file_path:
             try:
-                # Laad audio met librosa
-                self.audio_data, self.sample_rate = librosa.load(file_path, sr=None)
+                # Alleen metadata ophalen; audio wordt pas bij analyse gestreamd
+                info = get_media_info(file_path)
+                audio_streams = info.get('audio_streams') if info else None
+                if not audio_streams:
+                    raise ValueError("Geen audio stream gevonden")
                 self.current_file = file_path
+                self.sample_rate = audio_streams[0].get('sample_rate')
                 
                 # Update UI
                 self.file_label.setText(os.path.basename(file_path))
@@ -256,12 +211,13 @@ class AudioAnalyzerPlugin(PluginBase):
                 self.analyze_btn.setEnabled(True)
                 
                 # Toon basis info
-                duration = len(self.audio_data) / self.sample_rate
+                duration = info.get('duration') or 0.0
+                channels = audio_streams[0].get('channels') or 1
                 self.result_label.setText(
                     f"✅ Bestand geladen\n"
                     f"Duur: {duration:.2f} seconden\n"
                     f"Sample rate: {self.sample_rate} Hz\n"
-                    f"Channels: Mono"
+                    f"Channels: {'Mono' if channels == 1 else channels}"
                 )
                 
             except Exception as e:
@@ -269,7 +225,7 @@ class AudioAnalyzerPlugin(PluginBase):
     
     def analyze_audio(self):
         """Analyseer het geladen audio bestand"""
-        if self.audio_data is None:
+        if not self.current_file:
             return
         
         # Start analyse thread
@@ -340,6 +296,7 @@ class AudioAnalyzerPlugin(PluginBase):
                 librosa.display.specshow(
                     results['mel_spectrogram'], 
                     sr=results['sample_rate'],
+                    hop_length=results['hop_length'],
                     x_axis='time',
                     y_axis='mel',
                     ax=ax
@@ -351,6 +308,7 @@ class AudioAnalyzerPlugin(PluginBase):
                 librosa.display.specshow(
                     results['linear_spectrogram'],
                     sr=results['sample_rate'],
+                    hop_length=results['hop_length'],
                     x_axis='time',
                     y_axis='hz',
                     ax=ax
@@ -362,6 +320,7 @@ class AudioAnalyzerPlugin(PluginBase):
                 librosa.display.specshow(
                     results['chroma'],
                     sr=results['sample_rate'],
+                    hop_length=results['hop_length'],
                     x_axis='time',
                     y_axis='chroma',
                     ax=ax
@@ -373,6 +332,7 @@ class AudioAnalyzerPlugin(PluginBase):
                 librosa.display.specshow(
                     results['mfcc'],
                     sr=results['sample_rate'],
+                    hop_length=results['hop_length'],
                     x_axis='time',
                     ax=ax
                 )
@@ -380,21 +340,21 @@ class AudioAnalyzerPlugin(PluginBase):
                 plt.colorbar(ax.images[0], ax=ax)
                 
             elif analysis_type == "Spectral Centroid":
-                times = librosa.times_like(results['spectral_centroids'])
+                times = librosa.times_like(results['spectral_centroids'], sr=results['sample_rate'], hop_length=results['hop_length'])
                 ax.plot(times, results['spectral_centroids'])
                 ax.set_title('Spectral Centroid')
                 ax.set_ylabel('Hz')
                 ax.set_xlabel('Time')
                 
             elif analysis_type == "Spectral Rolloff":
-                times = librosa.times_like(results['spectral_rolloff'])
+                times = librosa.times_like(results['spectral_rolloff'], sr=results['sample_rate'], hop_length=results['hop_length'])
                 ax.plot(times, results['spectral_rolloff'])
                 ax.set_title('Spectral Rolloff')
                 ax.set_ylabel('Hz')
                 ax.set_xlabel('Time')
                 
             elif analysis_type == "Zero Crossing Rate":
-                times = librosa.times_like(results['zero_crossing_rate'])
+                times = librosa.times_like(results['zero_crossing_rate'], sr=results['sample_rate'], hop_length=results['hop_length'])
                 ax.plot(times, results['zero_crossing_rate'])
                 ax.set_title('Zero Crossing Rate')
                 ax.set_ylabel('Rate')
@@ -408,6 +368,7 @@ class AudioAnalyzerPlugin(PluginBase):
                 librosa.display.specshow(
                     results['mel_spectrogram'], 
                     sr=results['sample_rate'],
+                    hop_length=results['hop_length'],
                     x_axis='time',
                     y_axis='mel',
                     ax=axes[0,0]
@@ -418,6 +379,7 @@ class AudioAnalyzerPlugin(PluginBase):
                 librosa.display.specshow(
                     results['chroma'],
                     sr=results['sample_rate'],
+                    hop_length=results['hop_length'],
                     x_axis='time',
                     y_axis='chroma',
                     ax=axes[0,1]
@@ -425,13 +387,13 @@ class AudioAnalyzerPlugin(PluginBase):
                 axes[0,1].set_title('Chroma')
                 
                 # Spectral Centroid
-                times = librosa.times_like(results['spectral_centroids'])
+                times = librosa.times_like(results['spectral_centroids'], sr=results['sample_rate'], hop_length=results['hop_length'])
                 axes[1,0].plot(times, results['spectral_centroids'])
                 axes[1,0].set_title('Spectral Centroid')
                 axes[1,0].set_ylabel('Hz')
                 
                 # Zero Crossing Rate
-                times = librosa.times_like(results['zero_crossing_rate'])
+                times = librosa.times_like(results['zero_crossing_rate'], sr=results['sample_rate'], hop_length=results['hop_length'])
                 axes[1,1].plot(times, results['zero_crossing_rate'])
                 axes[1,1].set_title('Zero Crossing Rate')
                 axes[1,1].set_ylabel('Rate')
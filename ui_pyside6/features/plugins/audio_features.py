@@ -0,0 +1,314 @@
+"""
+Audio feature extractie voor de Audio Analyzer Plugin
+Streamt audio via een ffmpeg pipe, deelt één STFT over alle features en cachet als .npy
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import subprocess
+import tempfile
+from typing import Optional, Dict, Any, Callable
+
+import numpy as np
+import librosa
+
+from core.file_collection import normalize_path
+from core.media_probe import get_cache_dir, get_media_info, file_signature, find_ffmpeg
+
+# Analyse sample rate (genoeg voor weergave, veel minder geheugen dan 48 kHz)
+ANALYSIS_SAMPLE_RATE = 22050
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+N_MFCC = 13
+ROLL_PERCENT = 0.85
+
+# Maximaal aantal tijdkolommen voor weergave
+DISPLAY_FRAMES = 2000
+
+# Seconden audio per blok uit de ffmpeg pipe
+BLOCK_SECONDS = 30
+
+FEATURE_VERSION = 1
+
+ARRAY_FEATURES = (
+    "mel_spectrogram", "linear_spectrogram", "chroma", "mfcc",
+    "spectral_centroids", "spectral_rolloff", "zero_crossing_rate",
+)
+
+
+def get_feature_cache_dir() -> str:
+    """Map met gecachede feature arrays"""
+    return os.path.join(get_cache_dir(), "audio_features")
+
+
+def feature_cache_key(audio_path: str) -> Optional[str]:
+    """Cache sleutel op (pad, grootte, mtime, analyse parameters)"""
+    signature = file_signature(audio_path)
+    if signature is None:
+        return None
+    raw = (f"{normalize_path(audio_path)}|{signature[0]}|{signature[1]}|{FEATURE_VERSION}|"
+           f"{ANALYSIS_SAMPLE_RATE}|{N_FFT}|{HOP_LENGTH}|{DISPLAY_FRAMES}")
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def iter_audio_blocks(audio_path: str, sample_rate: int = ANALYSIS_SAMPLE_RATE,
+                      block_seconds: int = BLOCK_SECONDS):
+    """
+    Decodeer audio blok voor blok als mono float32 via een ffmpeg pipe
+
+    Yields:
+        numpy arrays met samples
+    """
+    cmd = [
+        find_ffmpeg(), "-v", "error", "-i", audio_path,
+        "-map", "0:a:0", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "f32le", "-"
+    ]
+    block_bytes = sample_rate * block_seconds * 4
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            usable = len(data) - len(data) % 4
+            yield np.frombuffer(data[:usable], dtype=np.float32)
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read().decode("utf-8", errors="replace")
+        process.stderr.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"FFmpeg kon audio niet decoderen: {stderr.strip()}")
+
+
+class _FramePool:
+    """Middelt opeenvolgende frames tot weergave resolutie (restant blijft bewaard)"""
+
+    def __init__(self, factor: int):
+        self.factor = factor
+        self.pending = []
+        self.pending_count = 0
+        self.columns = []
+
+    def add(self, frames: np.ndarray):
+        """Voeg frames toe (features x frames)"""
+        if frames.shape[-1] == 0:
+            return
+        self.pending.append(frames)
+        self.pending_count += frames.shape[-1]
+        if self.pending_count >= self.factor:
+            stacked = np.concatenate(self.pending, axis=-1)
+            usable = stacked.shape[-1] - stacked.shape[-1] % self.factor
+            pooled = stacked[..., :usable].reshape(stacked.shape[:-1] + (-1, self.factor)).mean(axis=-1)
+            self.columns.append(pooled)
+            rest = stacked[..., usable:]
+            self.pending = [rest] if rest.shape[-1] else []
+            self.pending_count = rest.shape[-1]
+
+    def result(self) -> np.ndarray:
+        columns = list(self.columns)
+        if self.pending_count:
+            columns.append(np.concatenate(self.pending, axis=-1).mean(axis=-1, keepdims=True))
+        return np.concatenate(columns, axis=-1) if columns else np.zeros((0,))
+
+
+def _pool_factor(duration: Optional[float], sample_rate: int) -> int:
+    if not duration:
+        return 1
+    total_frames = int(duration * sample_rate / HOP_LENGTH) + 1
+    return max(1, -(-total_frames // DISPLAY_FRAMES))
+
+
+def compute_features(audio_path: str, progress_callback: Optional[Callable[[int, str], None]] = None,
+                     should_stop: Optional[Callable[[], bool]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Bereken alle features in één streaming pass
+
+    Per blok wordt één STFT berekend; mel, chroma, MFCC, centroid en rolloff
+    worden daaruit afgeleid en direct naar weergave resolutie gemiddeld.
+    Het geheugengebruik hangt daardoor af van de blokgrootte, niet van de
+    lengte van het bestand.
+
+    Args:
+        audio_path: Pad naar audio of video bestand
+        progress_callback: Optioneel, aangeroepen met (procent, bericht)
+        should_stop: Optionele callable; berekening stopt als deze True teruggeeft
+
+    Returns:
+        Dictionary met feature arrays en statistieken of None bij stoppen
+    """
+    sr = ANALYSIS_SAMPLE_RATE
+    info = get_media_info(audio_path)
+    duration_hint = info.get("duration") if info else None
+    factor = _pool_factor(duration_hint, sr)
+
+    window = np.hanning(N_FFT + 1)[:-1].astype(np.float32)
+    freqs = librosa.fft_frequencies(sr=sr, n_fft=N_FFT)
+    mel_basis = librosa.filters.mel(sr=sr, n_fft=N_FFT, n_mels=N_MELS)
+    chroma_basis = librosa.filters.chroma(sr=sr, n_fft=N_FFT)
+
+    pools = {name: _FramePool(factor) for name in
+             ("magnitude", "mel", "chroma", "mfcc", "centroid", "rolloff", "zcr")}
+
+    carry = np.zeros(N_FFT // 2, dtype=np.float32)  # Gecentreerde frames zoals librosa
+    total_samples = 0
+    sum_squares = 0.0
+    peak = 0.0
+
+    for block in iter_audio_blocks(audio_path, sr):
+        if should_stop and should_stop():
+            return None
+
+        total_samples += len(block)
+        sum_squares += float(np.dot(block, block))
+        if len(block):
+            peak = max(peak, float(np.max(np.abs(block))))
+
+        buffer = np.concatenate([carry, block])
+        if len(buffer) < N_FFT:
+            carry = buffer
+            continue
+
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, N_FFT)[::HOP_LENGTH].T
+        n_frames = frames.shape[1]
+        carry = buffer[n_frames * HOP_LENGTH:]
+
+        _add_frame_features(frames, window, freqs, mel_basis, chroma_basis, pools)
+
+        if progress_callback and duration_hint:
+            percent = min(95, 10 + int(85 * total_samples / (duration_hint * sr)))
+            progress_callback(percent, "Analyseren...")
+
+    # Laatste frames (met stilte opgevuld zoals librosa center=True)
+    tail = np.concatenate([carry, np.zeros(N_FFT // 2, dtype=np.float32)])
+    if len(tail) >= N_FFT:
+        frames = np.lib.stride_tricks.sliding_window_view(tail, N_FFT)[::HOP_LENGTH].T
+        _add_frame_features(frames, window, freqs, mel_basis, chroma_basis, pools)
+
+    if not total_samples:
+        raise RuntimeError("Geen audio gevonden in bestand")
+
+    magnitude = pools["magnitude"].result()
+    mel = pools["mel"].result()
+    return {
+        "mel_spectrogram": librosa.power_to_db(mel, ref=np.max).astype(np.float32),
+        "linear_spectrogram": librosa.amplitude_to_db(magnitude, ref=np.max).astype(np.float32),
+        "chroma": pools["chroma"].result().astype(np.float32),
+        "mfcc": pools["mfcc"].result().astype(np.float32),
+        "spectral_centroids": pools["centroid"].result()[0].astype(np.float32),
+        "spectral_rolloff": pools["rolloff"].result()[0].astype(np.float32),
+        "zero_crossing_rate": pools["zcr"].result()[0].astype(np.float32),
+        "sample_rate": sr,
+        "hop_length": HOP_LENGTH * factor,
+        "duration": total_samples / sr,
+        "rms_energy": float(np.sqrt(sum_squares / total_samples)),
+        "peak_amplitude": peak,
+    }
+
+
+def _add_frame_features(frames: np.ndarray, window: np.ndarray, freqs: np.ndarray,
+                        mel_basis: np.ndarray, chroma_basis: np.ndarray, pools: Dict[str, _FramePool]):
+    """Leid alle features af uit één STFT van de frames (n_fft x frames)"""
+    magnitude = np.abs(np.fft.rfft(frames * window[:, None], axis=0)).astype(np.float32)
+    power = magnitude ** 2
+
+    mel = mel_basis @ power
+    chroma = chroma_basis @ power
+    chroma /= np.maximum(chroma.max(axis=0, keepdims=True), 1e-10)
+    mfcc = librosa.feature.mfcc(S=librosa.power_to_db(mel), n_mfcc=N_MFCC)
+
+    total = np.maximum(magnitude.sum(axis=0), 1e-10)
+    centroid = (freqs[:, None] * magnitude).sum(axis=0) / total
+    cumulative = np.cumsum(magnitude, axis=0)
+    rolloff = freqs[np.argmax(cumulative >= ROLL_PERCENT * cumulative[-1], axis=0)]
+    zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=0)), axis=0)
+
+    pools["magnitude"].add(magnitude)
+    pools["mel"].add(mel)
+    pools["chroma"].add(chroma)
+    pools["mfcc"].add(mfcc)
+    pools["centroid"].add(centroid[None, :])
+    pools["rolloff"].add(rolloff[None, :])
+    pools["zcr"].add(zcr[None, :])
+
+
+def load_cached_features(audio_path: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Laad features uit de .npy cache (memory mapped)
+
+    Returns:
+        Dictionary met features of None als er geen geldige cache is
+    """
+    key = feature_cache_key(audio_path)
+    if key is None:
+        return None
+    feature_dir = os.path.join(cache_dir or get_feature_cache_dir(), key)
+    meta_path = os.path.join(feature_dir, "meta.json")
+    try:
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            results = json.load(f)
+        for name in ARRAY_FEATURES:
+            results[name] = np.load(os.path.join(feature_dir, name + ".npy"), mmap_mode="r")
+        return results
+    except Exception as e:
+        print(f"⚠️ Kon feature cache niet laden: {e}")
+        return None
+
+
+def save_features(audio_path: str, results: Dict[str, Any], cache_dir: Optional[str] = None) -> bool:
+    """
+    Sla features op als .npy bestanden (map wordt atomair geplaatst)
+
+    Returns:
+        True bij succes, False bij fout
+    """
+    key = feature_cache_key(audio_path)
+    if key is None:
+        return False
+    root = cache_dir or get_feature_cache_dir()
+    feature_dir = os.path.join(root, key)
+    temp_dir = None
+    try:
+        os.makedirs(root, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(prefix=".features_", dir=root)
+        for name in ARRAY_FEATURES:
+            np.save(os.path.join(temp_dir, name + ".npy"), np.asarray(results[name]))
+        meta = {name: value for name, value in results.items() if name not in ARRAY_FEATURES}
+        with open(os.path.join(temp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        if os.path.exists(feature_dir):
+            shutil.rmtree(feature_dir, ignore_errors=True)
+        os.replace(temp_dir, feature_dir)
+        temp_dir = None
+        return True
+    except Exception as e:
+        print(f"⚠️ Kon features niet cachen: {e}")
+        return False
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def extract_features(audio_path: str, progress_callback: Optional[Callable[[int, str], None]] = None,
+                     should_stop: Optional[Callable[[], bool]] = None,
+                     use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Features uit de cache of met één streaming pass berekend (en daarna gecachet)
+
+    Returns:
+        Dictionary met features of None bij stoppen
+    """
+    if use_cache:
+        results = load_cached_features(audio_path)
+        if results is not None:
+            return results
+
+    results = compute_features(audio_path, progress_callback, should_stop)
+    if results is not None and use_cache:
+        save_features(audio_path, results)
+    return results
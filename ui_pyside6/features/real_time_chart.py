@@ -4,9 +4,15 @@ Basis chart functionaliteit voor alle monitoring grafieken
 """
 
 import time
+from collections import deque
 from PySide6.QtWidgets import QWidget, QSizePolicy
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPainter, QPen, QColor, QFont
+from PySide6.QtCore import Qt, QPointF, QTimer
+from PySide6.QtGui import QPainter, QPen, QColor, QFont, QPolygonF
+
+from core.ring_buffer import RingBuffer
+
+# Minimale tijd tussen repaints (ms); samples daartussen worden samengevoegd
+REPAINT_INTERVAL_MS = 33
 
 
 class RealTimeChart(QWidget):
@@ -16,7 +22,9 @@ class RealTimeChart(QWidget):
         super().__init__(parent)
         self.title = title
         self.max_points = max_points
-        self.data_points = []
+        self.buffer = RingBuffer(max_points)
+        self.timestamps = deque(maxlen=max_points)
+        self.labels = deque(maxlen=max_points)
         self.colors = {
             'cpu': QColor(76, 175, 80),      # Groen
             'memory': QColor(33, 150, 243),   # Blauw
@@ -25,8 +33,29 @@ class RealTimeChart(QWidget):
             'error': QColor(244, 67, 54),     # Rood
             'temperature': QColor(255, 87, 34) # Oranje
         }
+        self.line_color = self._choose_color()
+        self.title_font = QFont("Arial", 10, QFont.Weight.Bold)
+        self.label_font = QFont("Arial", 8)
+        self.empty_font = QFont("Arial", 12)
+        
+        # Polyline wordt alleen herberekend als data of afmeting veranderd is
+        self._polygon = QPolygonF()
+        self._polygon_key = None
+        self._data_version = 0
+        
+        # Repaints samenvoegen: hoogstens één update per interval
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(REPAINT_INTERVAL_MS)
+        self._repaint_timer.timeout.connect(self.update)
         self.setup_ui()
     
+    @property
+    def data_points(self):
+        """Datapunten als lijst van dicts (compatibiliteit; niet gebruiken in hot paths)"""
+        return [{'value': value, 'timestamp': timestamp, 'label': label}
+                for value, timestamp, label in zip(self.buffer.values, self.timestamps, self.labels)]
+    
     def setup_ui(self):
         """Setup de UI"""
         self.setMinimumHeight(150)
@@ -41,37 +70,57 @@ class RealTimeChart(QWidget):
             }
         """)
     
+    def _choose_color(self) -> QColor:
+        """Kies lijnkleur gebaseerd op titel"""
+        title = self.title.lower()
+        if 'cpu' in title:
+            return self.colors['cpu']
+        elif 'memory' in title or 'ram' in title:
+            return self.colors['memory']
+        elif 'gpu' in title:
+            return self.colors['gpu']
+        elif 'progress' in title:
+            return self.colors['progress']
+        elif 'temp' in title:
+            return self.colors['temperature']
+        return self.colors['cpu']
+    
     def add_data_point(self, value: float, label: str = ""):
-        """Voeg datapunt toe"""
+        """Voeg datapunt toe (O(1); repaint wordt samengevoegd)"""
         try:
-            timestamp = time.time()
-            self.data_points.append({
-                'value': value,
-                'timestamp': timestamp,
-                'label': label
-            })
-            
-            # Behoud alleen de laatste max_points
-            if len(self.data_points) > self.max_points:
-                self.data_points.pop(0)
-            
-            self.update()
-        except Exception as e:
+            value = float(value)
+        except (TypeError, ValueError) as e:
             print(f"⚠️ Fout bij toevoegen datapunt: {e}")
             # Voeg een veilig datapunt toe als fallback
-            try:
-                self.data_points.append({
-                    'value': 0.0,
-                    'timestamp': time.time(),
-                    'label': 'error'
-                })
-                if len(self.data_points) > self.max_points:
-                    self.data_points.pop(0)
-            except:
-                pass
+            value, label = 0.0, 'error'
+        
+        self.buffer.append(value)
+        self.timestamps.append(time.time())
+        self.labels.append(label)
+        self._data_version += 1
+        self.schedule_repaint()
+    
+    def clear_data(self):
+        """Wis alle datapunten"""
+        self.buffer.clear()
+        self.timestamps.clear()
+        self.labels.clear()
+        self._data_version += 1
+        self.schedule_repaint()
+    
+    def schedule_repaint(self):
+        """Plan een repaint; meerdere samples binnen het interval geven één repaint"""
+        if self.isVisible() and not self._repaint_timer.isActive():
+            self._repaint_timer.start()
+    
+    def showEvent(self, event):
+        """Teken bijgewerkte data bij zichtbaar worden"""
+        super().showEvent(event)
+        self.update()
     
     def paintEvent(self, event):
         """Teken de grafiek"""
+        painter = None
         try:
             painter = QPainter(self)
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
@@ -84,17 +133,16 @@ class RealTimeChart(QWidget):
             # Teken achtergrond
             painter.fillRect(self.rect(), QColor(45, 45, 45))
             
-            if not self.data_points:
+            if not len(self.buffer):
                 # Toon lege staat
                 painter.setPen(QColor(150, 150, 150))
-                painter.setFont(QFont("Arial", 12))
+                painter.setFont(self.empty_font)
                 painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "Geen data")
                 return
             
-            # Bereken schaal
-            values = [p['value'] for p in self.data_points]
-            min_val = min(values) if values else 0
-            max_val = max(values) if values else 100
+            # Bereken schaal (lopende min/max)
+            min_val = self.buffer.min()
+            max_val = self.buffer.max()
             
             if max_val == min_val:
                 max_val = min_val + 1
@@ -107,18 +155,17 @@ class RealTimeChart(QWidget):
             
             # Teken titel
             painter.setPen(QColor(255, 255, 255))
-            painter.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+            painter.setFont(self.title_font)
             painter.drawText(margin, 15, self.title)
             
             # Teken huidige waarde
-            if self.data_points:
-                current_value = self.data_points[-1]['value']
-                painter.drawText(width - margin - 50, 15, f"{current_value:.1f}%")
+            painter.drawText(width - margin - 50, 15, f"{self.buffer.last():.1f}%")
         except Exception as e:
             print(f"⚠️ Fout bij tekenen grafiek: {e}")
             # Teken een eenvoudige foutmelding
             try:
-                painter = QPainter(self)
+                if painter is None or not painter.isActive():
+                    painter = QPainter(self)
                 painter.fillRect(self.rect(), QColor(45, 45, 45))
                 painter.setPen(QColor(244, 67, 54))  # Rood voor fout
                 painter.setFont(QFont("Arial", 10))
@@ -144,50 +191,43 @@ class RealTimeChart(QWidget):
                 # Waarde labels
                 value = max_val - (max_val - min_val) * i / 4
                 painter.setPen(QColor(150, 150, 150))
-                painter.setFont(QFont("Arial", 8))
+                painter.setFont(self.label_font)
                 painter.drawText(5, y + 3, f"{value:.0f}")
         except Exception as e:
             print(f"⚠️ Fout bij tekenen raster: {e}")
     
+    def build_polygon(self, width: int, height: int, margin: int, min_val: float, max_val: float) -> QPolygonF:
+        """Bereken de polyline; hergebruikt zolang data, afmeting en schaal gelijk zijn"""
+        key = (self._data_version, width, height, margin, min_val, max_val)
+        if key == self._polygon_key:
+            return self._polygon
+        
+        count = len(self.buffer)
+        x_step = (width - 2 * margin) / (count - 1) if count > 1 else 0.0
+        y_scale = (height - 2 * margin) / (max_val - min_val)
+        bottom = height - margin
+        # X (tijd) van links naar rechts, Y (waarde) van onder naar boven
+        self._polygon = QPolygonF([
+            QPointF(margin + x_step * i, bottom - (value - min_val) * y_scale)
+            for i, value in enumerate(self.buffer.values)
+        ])
+        self._polygon_key = key
+        return self._polygon
+    
     def draw_line(self, painter: QPainter, width: int, height: int, margin: int, min_val: float, max_val: float):
-        """Teken grafieklijn (horizontaal)"""
+        """Teken grafieklijn (horizontaal) in één drawPolyline aanroep"""
         try:
-            if len(self.data_points) < 2:
+            if len(self.buffer) < 2:
                 return
             
-            # Kies kleur gebaseerd op titel
-            if 'cpu' in self.title.lower():
-                color = self.colors['cpu']
-            elif 'memory' in self.title.lower() or 'ram' in self.title.lower():
-                color = self.colors['memory']
-            elif 'gpu' in self.title.lower():
-                color = self.colors['gpu']
-            elif 'progress' in self.title.lower():
-                color = self.colors['progress']
-            elif 'temp' in self.title.lower():
-                color = self.colors['temperature']
-            else:
-                color = self.colors['cpu']
-            
-            painter.setPen(QPen(color, 2))
-            
-            # Teken lijn (horizontaal - tijd op x-as, waarden op y-as)
-            points = []
-            for i, point in enumerate(self.data_points):
-                # X-coördinaat (tijd) - van links naar rechts
-                x = margin + (width - 2 * margin) * i / (len(self.data_points) - 1)
-                # Y-coördinaat (waarde) - van onder naar boven (omgekeerd voor betere leesbaarheid)
-                y = height - margin - (height - 2 * margin) * (point['value'] - min_val) / (max_val - min_val)
-                points.append((x, y))
-            
-            # Teken verbonden lijnen
-            for i in range(len(points) - 1):
-                painter.drawLine(int(points[i][0]), int(points[i][1]), 
-                               int(points[i+1][0]), int(points[i+1][1]))
+            polygon = self.build_polygon(width, height, margin, min_val, max_val)
+            painter.setPen(QPen(self.line_color, 2))
+            painter.drawPolyline(polygon)
             
-            # Teken datapunten als kleine cirkels voor betere zichtbaarheid
-            painter.setBrush(color)
-            for point in points:
-                painter.drawEllipse(int(point[0]) - 2, int(point[1]) - 2, 4, 4)
+            # Teken datapunten als kleine cirkels (ronde pen, één drawPoints aanroep)
+            point_pen = QPen(self.line_color, 5)
+            point_pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+            painter.setPen(point_pen)
+            painter.drawPoints(polygon)
         except Exception as e:
-            print(f"⚠️ Fout bij tekenen grafieklijn: {e}") 
\ No newline at end of file
+            print(f"⚠️ Fout bij tekenen grafieklijn: {e}")
@@ -11,6 +11,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QDragEnterEvent, QDropEvent, QDragLeaveEvent
 
+from core.subtitle_index import load_cue_index, detect_subtitle_format
+
 
 class SubtitlePreviewWidget(QWidget):
     """Eenvoudige interface zonder VLC en Whisper evaluatie"""
@@ -21,6 +23,9 @@ class SubtitlePreviewWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         
+        # Cue index van het laatst geladen ondertitel bestand (O(log n) lookup)
+        self.cue_index = None
+        
         self.setup_ui()
         self.setup_drag_drop()
     
@@ -97,6 +102,23 @@ class SubtitlePreviewWidget(QWidget):
         from datetime import datetime
         return datetime.now().strftime("%H:%M:%S")
     
+    def load_subtitles(self, file_path: str) -> bool:
+        """Laad een ondertitel bestand als cue index"""
+        index = load_cue_index(file_path)
+        if index is None:
+            self.update_status(f"❌ Kon ondertitels niet laden: {os.path.basename(file_path)}")
+            return False
+        
+        self.cue_index = index
+        self.update_status(f"📝 {len(index)} cues geladen uit {os.path.basename(file_path)}")
+        return True
+    
+    def get_cue_at(self, seconds: float):
+        """Haal de actieve ondertitel cue op tijdstip (seconden) op"""
+        if self.cue_index is None:
+            return None
+        return self.cue_index.cue_at(seconds)
+    
 
     
     def setup_drag_drop(self):
@@ -134,6 +156,8 @@ class SubtitlePreviewWidget(QWidget):
             self.update_status(f"Bestanden gedropt: {len(files)} bestanden")
             for file_path in files:
                 self.update_status(f"  - {os.path.basename(file_path)}")
+                if detect_subtitle_format(file_path):
+                    self.load_subtitles(file_path)
     
     def dragLeaveEvent(self, event: QDragLeaveEvent):
         """Handle drag leave event"""
@@ -0,0 +1,135 @@
+"""
+Thumbnail Service voor Magic Time Studio
+Asynchrone thumbnail generatie met schijf cache en QPixmap LRU
+"""
+
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QPixmap
+
+from core.thumbnail_cache import get_thumbnail, get_cached_thumbnail
+
+# Aantal gelijktijdige ffmpeg processen
+THUMBNAIL_WORKERS = 2
+
+# Aantal QPixmaps in het geheugen
+PIXMAP_CACHE_SIZE = 64
+
+
+class ThumbnailService(QObject):
+    """
+    Genereert thumbnails in een worker pool
+
+    Workers schrijven alleen JPEG bestanden in de schijf cache; QPixmaps worden
+    in de GUI thread gemaakt en in een LRU bewaard. Een nieuwe request maakt
+    eerdere requests verouderd: wachtende taken worden geannuleerd en late
+    resultaten alleen nog in de cache gezet.
+    """
+
+    # Signals
+    thumbnail_ready = Signal(str, QPixmap)  # bestandspad, thumbnail
+    thumbnail_failed = Signal(str)  # bestandspad
+    _generated = Signal(str, str)  # bestandspad, thumbnail pad (intern, naar GUI thread)
+
+    def __init__(self, parent=None, max_workers: int = THUMBNAIL_WORKERS,
+                 cache_size: int = PIXMAP_CACHE_SIZE):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnail")
+        self._pixmaps: "OrderedDict[str, QPixmap]" = OrderedDict()
+        self._cache_size = cache_size
+        self._request_ids = itertools.count(1)
+        self._current_request = 0
+        self._pending: Dict[str, object] = {}  # bestandspad -> future
+        self._generated.connect(self._on_generated)
+
+    def cached_pixmap(self, file_path: str) -> Optional[QPixmap]:
+        """Thumbnail uit de LRU of de schijf cache (zonder ffmpeg)"""
+        pixmap = self._pixmaps.get(file_path)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(file_path)
+            return pixmap
+        thumbnail_path = get_cached_thumbnail(file_path)
+        if thumbnail_path:
+            pixmap = QPixmap(thumbnail_path)
+            if not pixmap.isNull():
+                self._remember(file_path, pixmap)
+                return pixmap
+        return None
+
+    def request(self, file_path: str) -> Optional[QPixmap]:
+        """
+        Vraag een thumbnail aan; eerdere (niet gestarte) requests worden geannuleerd
+
+        Returns:
+            QPixmap als de thumbnail al beschikbaar is, anders None (volgt via thumbnail_ready)
+        """
+        pixmap = self.cached_pixmap(file_path)
+        if pixmap is not None:
+            return pixmap
+
+        request_id = next(self._request_ids)
+        self._current_request = request_id
+        self.cancel_pending(keep=file_path)
+        if file_path not in self._pending:
+            self._submit(file_path, request_id)
+        else:
+            # Al onderweg (bijv. prefetch): resultaat geldt nu voor deze request
+            self._pending[file_path].request_id = request_id
+        return None
+
+    def prefetch(self, paths: List[str]):
+        """Genereer thumbnails vooraf (bijv. voor zichtbare rijen) zonder signals"""
+        for file_path in paths:
+            if file_path not in self._pixmaps and file_path not in self._pending:
+                self._submit(file_path, 0)
+
+    def cancel_pending(self, keep: Optional[str] = None):
+        """Annuleer wachtende taken (lopende ffmpeg processen maken hun werk af)"""
+        for file_path, future in list(self._pending.items()):
+            if file_path != keep and future.cancel():
+                del self._pending[file_path]
+
+    def shutdown(self):
+        """Stop de worker pool"""
+        self.cancel_pending()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, file_path: str, request_id: int):
+        future = self._executor.submit(self._work, file_path)
+        future.request_id = request_id
+        self._pending[file_path] = future
+
+    def _work(self, file_path: str):
+        """Worker thread: genereer JPEG in de schijf cache"""
+        try:
+            thumbnail_path = get_thumbnail(file_path) or ""
+        except Exception as e:
+            print(f"❌ Fout bij genereren thumbnail: {e}")
+            thumbnail_path = ""
+        self._generated.emit(file_path, thumbnail_path)
+
+    def _on_generated(self, file_path: str, thumbnail_path: str):
+        """GUI thread: laad QPixmap en meld alleen de actuele request"""
+        future = self._pending.pop(file_path, None)
+        request_id = getattr(future, "request_id", 0)
+        pixmap = QPixmap(thumbnail_path) if thumbnail_path else None
+        if pixmap is not None and not pixmap.isNull():
+            self._remember(file_path, pixmap)
+        else:
+            pixmap = None
+
+        if request_id and request_id == self._current_request:
+            if pixmap is not None:
+                self.thumbnail_ready.emit(file_path, pixmap)
+            else:
+                self.thumbnail_failed.emit(file_path)
+
+    def _remember(self, file_path: str, pixmap: QPixmap):
+        self._pixmaps[file_path] = pixmap
+        self._pixmaps.move_to_end(file_path)
+        while len(self._pixmaps) > self._cache_size:
+            self._pixmaps.popitem(last=False)
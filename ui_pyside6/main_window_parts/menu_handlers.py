@@ -95,20 +95,10 @@ class MenuHandlersMixin:
             self, "Selecteer bestanden", "",
             "Video bestanden (*.mp4 *.avi *.mkv *.mov *.wmv *.flv *.webm)"
         )
-        added_count = 0
-        video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm']
-        
-        for file_path in files:
-            # Filter alleen video bestanden
-            if any(file_path.lower().endswith(ext) for ext in video_extensions):
-                if file_path not in self.files_panel.get_file_list():
-                    self.files_panel.file_list.append(file_path)
-                    self.files_panel.file_list_widget.addItem(os.path.basename(file_path))
-                    added_count += 1
+        # Filtert video bestanden en slaat duplicaten over (O(1) per bestand)
+        added_count = self.files_panel.add_files(files)
         
         if added_count > 0:
-            # Update remove button state na toevoegen
-            self.files_panel.update_remove_button_state()
             self.update_status(f"✅ {added_count} video bestand(en) toegevoegd")
         else:
             self.update_status("⚠️ Geen video bestanden toegevoegd")
@@ -122,25 +112,16 @@ class MenuHandlersMixin:
         
         folder = QFileDialog.getExistingDirectory(self, "Selecteer map")
         if folder:
-            added_count = 0
-            video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm']
-            
-            # Zoek naar video bestanden in de map en subdirectories
-            for root, dirs, files in os.walk(folder):
-                for file in files:
-                    if any(file.lower().endswith(ext) for ext in video_extensions):
-                        file_path = os.path.join(root, file)
-                        if file_path not in self.files_panel.get_file_list():
-                            self.files_panel.file_list.append(file_path)
-                            self.files_panel.file_list_widget.addItem(os.path.basename(file_path))
-                            added_count += 1
-            
-            if added_count > 0:
-                # Update remove button state na toevoegen
-                self.files_panel.update_remove_button_state()
-                self.update_status(f"✅ {added_count} video bestand(en) uit map '{os.path.basename(folder)}' toegevoegd")
-            else:
-                self.update_status(f"⚠️ Geen video bestanden gevonden in map '{os.path.basename(folder)}'")
+            # Zoek naar video bestanden in de map en subdirectories (achtergrond scan)
+            scan_thread = self.files_panel.scan_folder(folder)
+            self.update_status(f"🔍 Map '{os.path.basename(folder)}' wordt gescand...")
+            scan_thread.scan_finished.connect(
+                lambda scanned_folder, found_count: self.update_status(
+                    f"✅ {found_count} video bestand(en) uit map '{os.path.basename(scanned_folder)}' gevonden"
+                    if found_count else
+                    f"⚠️ Geen video bestanden gevonden in map '{os.path.basename(scanned_folder)}'"
+                )
+            )
     
     def remove_selected(self):
         """Verwijder geselecteerd bestand via menu"""
@@ -150,7 +131,7 @@ class MenuHandlersMixin:
             QMessageBox.warning(self, "Waarschuwing", "Kan bestanden niet verwijderen tijdens verwerking!")
             return
         
-        current_row = self.files_panel.file_list_widget.currentRow()
+        current_row = self.files_panel.current_row()
         if current_row >= 0:
             # Voorkom verwijdering van het eerste bestand (index 0)
             if current_row == 0:
@@ -158,8 +139,8 @@ class MenuHandlersMixin:
                 QMessageBox.warning(self, "Waarschuwing", "Kan het eerste bestand niet verwijderen!")
                 return
             
-            self.files_panel.file_list_widget.takeItem(current_row)
-            self.files_panel.file_list.pop(current_row)
+            self.files_panel.file_model.remove_row(current_row)
+            self.files_panel.update_files_count()
             # Update de remove button state na verwijdering
             self.files_panel.update_remove_button_state()
             self.update_status("Geselecteerd bestand verwijderd")